@@ -0,0 +1,25 @@
+"""Add reserved_cents to credit_balances for credit reservation leases.
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-15
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "007"
+down_revision = "006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "credit_balances",
+        sa.Column("reserved_cents", sa.Integer(), server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("credit_balances", "reserved_cents")
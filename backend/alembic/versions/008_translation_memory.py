@@ -0,0 +1,54 @@
+"""Add translation_memory: exact and near-duplicate lookup over translation_logs.
+
+translation_logs gain the user and translation context, so only context-free
+translations are indexed and near matches stay within one user's history.
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-15
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "008"
+down_revision = "007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "translation_logs",
+        sa.Column(
+            "user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=True
+        ),
+    )
+    op.add_column("translation_logs", sa.Column("context_hash", sa.String(16), nullable=True))
+    op.create_table(
+        "translation_memory",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("owner_id", sa.String(36), nullable=False, server_default=""),
+        sa.Column("source_language", sa.String(10), nullable=False),
+        sa.Column("target_language", sa.String(10), nullable=False),
+        sa.Column("source_hash", sa.String(40), nullable=False),
+        sa.Column("source_text", sa.Text, nullable=False),
+        sa.Column("translated_text", sa.Text, nullable=False),
+        sa.Column("bands", postgresql.ARRAY(sa.String(16)), nullable=False),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime, server_default=sa.func.now()),
+        sa.UniqueConstraint(
+            "owner_id", "source_language", "target_language", "source_hash", name="uq_tm_source"
+        ),
+    )
+    op.create_index(
+        "ix_tm_bands", "translation_memory", ["bands"], postgresql_using="gin"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tm_bands", table_name="translation_memory")
+    op.drop_table("translation_memory")
+    op.drop_column("translation_logs", "context_hash")
+    op.drop_column("translation_logs", "user_id")
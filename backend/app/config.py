@@ -1,6 +1,7 @@
 """Application configuration via environment variables."""
 
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings
 
@@ -19,16 +20,89 @@ class Settings(BaseSettings):
 
     # Deepgram (STT)
     deepgram_api_key: str = ""
+    deepgram_api_url: str = "https://api.deepgram.com/v1"  # batch endpoint
+    deepgram_ws_url: str = "wss://api.deepgram.com/v1/listen"  # streaming endpoint
+    vad_enabled: bool = True  # drop silent chunks / trim silence before STT
+
+    # Audio DSP stage (process pool) — STT ingress prep and TTS re-encoding
+    dsp_enabled: bool = True
+    dsp_workers: int = 2
+    dsp_max_pending: int = 64  # queued + running tasks; beyond this audio passes through
+    dsp_timeout_ms: int = 2000
+    dsp_stt_sample_rate: int = 16000  # Deepgram's preferred rate for speech
+    dsp_target_dbfs: float = -20.0  # loudness target for STT input
+    dsp_max_gain_db: float = 20.0
 
     # ElevenLabs (TTS + Voice Cloning)
     elevenlabs_api_key: str = ""
+    elevenlabs_api_url: str = "https://api.elevenlabs.io/v1"
+    tts_cache_memory_mb: int = 64  # in-process phrase cache (per worker)
+    tts_cache_dir: str = "/tmp/voicetranslate-tts-cache"  # "" disables the disk tier
+    tts_cache_disk_mb: int = 1024
+    tts_cache_max_chars: int = 200  # longer phrases are never cached
 
     # OpenAI (Translation — primary)
     openai_api_key: str = ""
+    openai_base_url: str = ""  # OpenAI-compatible endpoint; "" = api.openai.com
 
     # Anthropic (Translation — fallback)
     anthropic_api_key: str = ""
 
+    # Translation cache — in-process tier in front of Redis (per worker)
+    translation_cache_memory_entries: int = 10_000
+    translation_cache_memory_ttl_s: float = 600.0
+    translation_cache_namespace_kb: int = 256  # per user with a persona/industry/glossary
+    translation_cache_max_namespaces: int = 2000
+
+    # Translation memory — past translations (translation_logs) reused after a cache miss
+    translation_memory_enabled: bool = True
+    translation_memory_reference_similarity: float = 0.6  # given to the LLM as a reference
+    translation_memory_candidates: int = 20  # near-duplicates scored per lookup
+    translation_memory_max_chars: int = 500
+    translation_memory_retry_s: float = 30.0  # lookups pause this long after a database error
+
+    # Emoji / URL / code / @mention-only messages skip the LLM; such spans are masked in others
+    translation_fast_path: bool = True
+
+    # Local language identification (chat source language, voice STT hint on "auto")
+    language_id_enabled: bool = True
+    language_id_min_letters: int = 8  # shorter Latin-script text keeps the assumed language
+    language_id_min_margin: float = 0.1  # best trigram score must beat the runner-up by this
+    language_id_recheck: int = 10  # STT falls back to "auto" after this many hinted utterances
+
+    # Glossary — only the terms found in the text go into the prompt
+    glossary_matcher_cache_size: int = 256  # compiled glossaries kept per worker
+    glossary_verify: bool = False  # check required target terms; retry once if missing
+
+    # Chat message translation
+    chat_progressive_delivery: bool = True  # send the original first, translations as they finish
+    chat_translation_timeout_ms: int = 8000  # per language; later ones fall back to the original
+
+    # Translation hedging — race Anthropic when OpenAI is slower than usual
+    translation_hedge_enabled: bool = True
+    translation_hedge_percentile: float = 0.95  # hedge once the primary passes its own p95
+    translation_hedge_min_delay_ms: int = 150
+    translation_hedge_max_delay_ms: int = 2000  # also used until latency samples exist
+    translation_hedge_max_tokens: int = 500  # per-request budget: longer texts never hedge
+    translation_hedge_max_rate: float = 0.1  # hedges per request, process-wide
+
+    # Outbound HTTP — one pooled client per provider (Deepgram, OpenAI, ElevenLabs, ...)
+    http_max_connections: int = 100  # per provider pool
+    http_max_keepalive: int = 20
+    http_keepalive_expiry_s: float = 30.0
+    http_timeout_s: float = 30.0  # default read/write timeout (calls may override)
+    http_connect_timeout_s: float = 5.0
+    http_pool_timeout_s: float = 5.0  # wait for a free pooled connection
+    http2_enabled: bool = True  # used when the h2 package is installed
+
+    # Provider circuit breakers (per provider + model, STT / LLM / TTS)
+    circuit_window_seconds: int = 60  # rolling window for error rate and latency
+    circuit_min_requests: int = 10  # error rate is ignored below this many calls
+    circuit_error_threshold: float = 0.5
+    circuit_consecutive_failures: int = 5
+    circuit_open_seconds: int = 15  # first cooldown; doubles after each failed probe
+    circuit_max_open_seconds: int = 300
+
     # Daily.co (WebRTC) — DEPRECATED, kept for reference
     daily_api_key: str = ""
     daily_api_url: str = "https://api.daily.co/v1"
@@ -63,6 +137,24 @@ class Settings(BaseSettings):
     chat_plan_price_cents: int = 1500  # $15 one-time lifetime chat
     credit_cost_pipeline: int = 4   # per audio chunk (STT+translate+TTS)
     credit_cost_voice_clone: int = 50  # per voice clone
+    credit_lease_block_cents: int = 100  # credits reserved per lease (billed from memory)
+    credit_lease_ttl_seconds: int = 300  # leases settle at least this often
+
+    # WebSocket voice scheduling (per connection)
+    ws_audio_queue_size: int = 3  # queued audio chunks before the overflow policy kicks in
+    ws_audio_policy: Literal["drop_oldest", "drop_newest", "merge"] = "drop_oldest"
+    ws_audio_max_age_ms: int = 4000  # queued audio older than this is stale
+    utterance_silence_ms: int = 600  # trailing silence that closes an utterance
+    utterance_max_ms: int = 8000  # longest utterance dispatched to STT
+    utterance_max_bytes: int = 512_000  # largest utterance payload
+    utterance_deadline_ms: int = 10_000  # queued → last audio; later work is dropped
+    deadline_min_stage_ms: int = 150  # don't start a stage with less budget than this
+
+    # Pipeline traces (opt-in) — sampled utterance timelines for offline replay
+    trace_sample_rate: float = 0.0  # fraction of utterances traced; 0 disables
+    trace_dir: str = "/tmp/voicetranslate-traces"
+    trace_retention_hours: float = 72.0
+    trace_max_mb: int = 256  # per host; oldest files pruned first
 
     # Cookies
     cookie_domain: str = ""  # e.g. ".flaskai.xyz" in prod so JS on frontend can read CSRF cookie
@@ -54,15 +54,28 @@ async def lifespan(app: FastAPI):
     # -- Startup --
     from app.services.redis_service import redis_service
     from app.services.pubsub_service import pubsub_service
-
+    from app.services.credit_lease_service import credit_lease_service
+    from app.services.http_clients import http_clients
+    from app.services.audio_dsp import dsp_stage
+    from app.services.pipeline_traces import trace_recorder
+    from app.services.language_id import language_identifier
+
+    http_clients.start()
+    language_identifier.load()
+    dsp_stage.start()
     await redis_service.connect(settings.redis_url)
     await pubsub_service.connect(settings.redis_url)
     await pubsub_service.start_listener()
+    credit_lease_service.start_reaper()
     print(f"🚀 {settings.app_name} backend started")
     yield
     # -- Shutdown --
+    await credit_lease_service.shutdown()
     await pubsub_service.disconnect()
     await redis_service.disconnect()
+    await http_clients.close()
+    await dsp_stage.close()
+    await trace_recorder.flush()
     print("🛑 Backend shut down")
 
 
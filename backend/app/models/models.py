@@ -10,6 +10,7 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -242,6 +243,7 @@ class CreditBalance(Base):
     stripe_customer_id = Column(String(255), unique=True)
     chat_plan_purchased = Column(Boolean, default=False)  # $15 lifetime chat access
     balance_cents = Column(Integer, default=0)  # voice/video credits in cents ($1 = 100)
+    reserved_cents = Column(Integer, default=0)  # held by active credit leases, not spendable
     total_purchased_cents = Column(Integer, default=0)  # lifetime credit purchases
     total_used_cents = Column(Integer, default=0)  # lifetime voice/video usage
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -282,9 +284,34 @@ class TranslationLog(Base):
     translated_text = Column(Text, nullable=False)
     latency_ms = Column(Float)
     model_used = Column(String(50))
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    context_hash = Column(String(16), nullable=True)  # persona/industry/glossary; "" = none
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+class TranslationMemoryEntry(Base):
+    """One user's latest context-free translation of a source text, built from translation_logs."""
+
+    __tablename__ = "translation_memory"
+    __table_args__ = (
+        UniqueConstraint(
+            "owner_id", "source_language", "target_language", "source_hash", name="uq_tm_source"
+        ),
+        Index("ix_tm_bands", "bands", postgresql_using="gin"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    owner_id = Column(String(36), nullable=False, default="")  # user it came from; "" = unknown
+    source_language = Column(String(10), nullable=False)
+    target_language = Column(String(10), nullable=False)
+    source_hash = Column(String(40), nullable=False)  # of the normalized source text
+    source_text = Column(Text, nullable=False)
+    translated_text = Column(Text, nullable=False)
+    bands = Column(ARRAY(String(16)), nullable=False)  # MinHash LSH band keys
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
 # ─── Webhook Configs ────────────────────────────────────────
 
 class WebhookConfig(Base):
@@ -15,6 +15,7 @@ from app.models.database import get_db
 from app.models.models import Call, CallParticipant, Chat, ChatMember, User
 from app.services.livekit_service import livekit_service
 from app.services.credit_service import credit_service
+from app.services.credit_lease_service import credit_lease_service
 from app.routers.websocket import (
     notify_incoming_call,
     notify_call_ended,
@@ -252,6 +253,8 @@ async def end_call(
             )
         )
         for p in participants_result.scalars().all():
+            # Return any pipeline credits still held by a lease before billing the call
+            await credit_lease_service.release(p.user_id, db)
             # Per-participant duration: use their own join/leave or call duration
             p_duration = duration_secs
             if p.joined_at and p.left_at:
@@ -335,6 +338,7 @@ async def leave_call(
                 )
             )
             for p in all_parts.scalars().all():
+                await credit_lease_service.release(p.user_id, db)
                 p_duration = duration_secs
                 if p.joined_at and p.left_at:
                     p_duration = (p.left_at - p.joined_at).total_seconds()
@@ -11,9 +11,14 @@ from sqlalchemy.orm import selectinload
 from app.dependencies import get_current_user
 from app.models.database import get_db
 from app.models.models import Chat, ChatMember, Friendship, Message, User
-from app.services.translation_service import translation_service
 from app.services.credit_service import credit_service
-from app.routers.websocket import notify_group_update, manager
+from app.services.language_id import detect_language
+from app.routers.websocket import (
+    deliver_translations,
+    manager,
+    notify_group_update,
+    translate_for_send,
+)
 
 router = APIRouter()
 
@@ -345,28 +350,16 @@ async def send_message(
         )
 
     chat, membership = await get_chat_with_access(chat_id, current_user.id, db)
-    source_lang = current_user.preferred_language or "en"
+    # What the message is actually written in; the sender's language if unsure
+    source_lang = detect_language(body.content, current_user.preferred_language or "en")
 
     # Collect unique target languages from each member's preferred_language
-    target_languages = set()
-    for m in chat.members:
-        lang = m.user.preferred_language or "en"
-        if lang != source_lang:
-            target_languages.add(lang)
-
-    # Translate to all needed languages
-    translations = {source_lang: body.content}
-    for target_lang in target_languages:
-        try:
-            translated = await translation_service.translate(
-                text=body.content,
-                source_language=source_lang,
-                target_language=target_lang,
-            )
-            translations[target_lang] = translated
-        except Exception as e:
-            # If translation fails, store original
-            translations[target_lang] = body.content
+    member_langs = {str(m.user_id): m.user.preferred_language or "en" for m in chat.members}
+    target_languages = set(member_langs.values()) - {source_lang}
+
+    # Translate to all needed languages in one call — or, in progressive
+    # mode, after the original has been delivered
+    translations = await translate_for_send(body.content, source_lang, target_languages)
 
     # Create message
     message = Message(
@@ -398,6 +391,7 @@ async def send_message(
             "sender_display_name": current_user.display_name,
             "content": body.content,
             "translated_content": translations.get(member_lang, body.content),
+            "translation_pending": member_lang not in translations,
             "source_language": source_lang,
             "translations": translations,
             "message_type": body.message_type,
@@ -409,6 +403,9 @@ async def send_message(
             {"type": "new_message", "data": msg_data},
         )
 
+    if target_languages - translations.keys():
+        deliver_translations(message.id, str(chat.id), body.content, source_lang, member_langs)
+
     return format_message(message, current_user.preferred_language or "en")
 
 
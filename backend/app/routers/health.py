@@ -22,7 +22,7 @@ async def health_check():
 
 @router.get("/health/detailed")
 async def detailed_health():
-    """Detailed health: checks Redis and database connectivity."""
+    """Detailed health: Redis and database connectivity, external provider circuits."""
     checks = {"redis": "unknown", "database": "unknown"}
 
     # Check Redis
@@ -43,10 +43,16 @@ async def detailed_health():
     except Exception as e:
         checks["database"] = f"unhealthy: {e}"
 
+    # External providers (STT / LLM / TTS) — circuit state per provider + model
+    from app.services.provider_health import provider_health
+
     overall = "healthy" if all(v == "healthy" for v in checks.values()) else "degraded"
+    if provider_health.any_open():
+        overall = "degraded"
     return {
         "status": overall,
         "checks": checks,
+        "providers": provider_health.snapshot(),
         "uptime_seconds": round(time.time() - _start_time),
         "python_version": platform.python_version(),
         "timestamp": datetime.utcnow().isoformat(),
@@ -67,6 +73,20 @@ async def metrics():
         cache_hits = cache_misses = total_translations = 0
         hit_rate = 0.0
 
+    from app.services.audio_dsp import dsp_stage
+    from app.services.call_fanout_service import call_fanout_service
+    from app.services.credit_lease_service import credit_lease_service
+    from app.services.glossary_matcher import glossary_matchers
+    from app.services.http_clients import http_clients
+    from app.services.language_id import language_identifier
+    from app.services.latency_histograms import latency_registry
+    from app.services.pipeline import pipeline
+    from app.services.pipeline_traces import trace_recorder
+    from app.services.translation_memory import translation_memory
+    from app.services.translation_service import translation_service
+    from app.services.tts_cache import tts_cache
+    from app.services.vad_service import vad_service
+
     return {
         "uptime_seconds": round(time.time() - _start_time),
         "translations": {
@@ -75,5 +95,23 @@ async def metrics():
             "cache_misses": cache_misses,
             "cache_hit_rate_pct": hit_rate,
         },
+        "latency": latency_registry.snapshot(),
+        "speculation": pipeline.speculation.summary(),
+        "call_fanout": call_fanout_service.stats.summary(),
+        "vad": vad_service.stats.summary(),
+        "tts_cache": tts_cache.stats.summary(),
+        "credit_leases": credit_lease_service.stats.summary(),
+        "translation_cache": translation_service.cache_stats.summary(),
+        "glossary": glossary_matchers.stats.summary(),
+        "fast_path": translation_service.fast_path.summary(),
+        "translation_memory": translation_memory.stats.summary(),
+        "language_id": language_identifier.stats.summary(),
+        "hedging": {
+            "translate": translation_service.hedger.stats.summary(),
+            "stream": translation_service.stream_hedger.stats.summary(),
+        },
+        "http_pools": http_clients.snapshot(),
+        "dsp": dsp_stage.summary(),
+        "traces": trace_recorder.summary(),
         "timestamp": datetime.utcnow().isoformat(),
     }
@@ -15,39 +15,111 @@ Protocol (JSON messages):
 
   Server → Client:
     { "type": "new_message", "data": { message object } }
+    { "type": "message_translation", "data": { "message_id": "...", "chat_id": "...",
+      "language": "th", "translated_content": "..." } }
     { "type": "typing", "data": { "chat_id": "...", "user_id": "...", "username": "..." } }
     { "type": "presence", "data": { "user_id": "...", "status": "online" } }
     { "type": "friend_request", "data": { ... } }
 
+  Group messages are delivered progressively (chat_progressive_delivery):
+  new_message carries the original with "translation_pending": true, and a
+  message_translation event follows for each language as soon as its
+  translation is done (the original again if it misses the deadline).
+
   === Voice Translation ===
     { "type": "audio", "data": "<base64 audio>" }
-    { "type": "config", "source_lang": "th", "target_lang": "en" }
+    { "type": "audio_end" }   (flush the open utterance / pending transcripts)
+    { "type": "config", "source_lang": "th", "target_lang": "en", "stt_mode": "batch|stream",
+      "speculative": false, "audio_policy": "drop_oldest|drop_newest|merge",
+      "audio_queue_size": 3, "utterance_silence_ms": 600, "utterance_max_ms": 8000,
+      "utterance_max_bytes": 512000, "audio_codec": "mp3|opus", "audio_bitrate": 32,
+      "persona": "...", "industry": "...", "glossary": { "term": "translation" } }
+
+  "audio_codec" / "audio_bitrate" negotiate the format TTS audio is sent in;
+  config_ack reports what the server settled on ("audio_format"). Opus needs
+  the server's DSP codecs — without them the request falls back to MP3 at
+  the nearest bitrate.
+
+  Group calls: { "type": "config", "call_id": "...", "listen_voice_id": "..." } joins the
+  call's fan-out. Audio is then transcribed once, translated once per listener
+  language (CallParticipant.language) and synthesized once per (language, voice);
+  listeners receive transcript/text/audio events tagged with "speaker_id".
+  Send "call_id": null to leave.
+
+  Batch audio slices are assembled into whole utterances first — an utterance
+  closes on trailing VAD silence, max duration, max bytes or when the client
+  stops sending — and only whole utterances reach STT. Utterances are queued
+  per connection and processed one at a time, off the receive loop; chat
+  messages use their own FIFO lane. When the audio queue overflows or goes
+  stale the server sends
+  { "type": "audio_dropped", "data": { "count": 1, "reason": "queue_full|stale", ... } }.
+
+  In "stream" mode the connection keeps one live STT session open; audio
+  frames are pushed into it and finals are translated as they arrive.
+  audio_end (or a config changing source_lang/stt_mode) ends the session;
+  its last finals are still delivered, and the next frame opens a new one.
+  With "speculative": true, stable interims are translated early and
+  "text" events carry "segment"/"revision" — replace text of the same
+  segment whenever a higher revision arrives.
+
+  Binary audio (see app/services/audio_frames.py): audio may instead travel
+  as WebSocket binary frames — 8-byte header (version, flags, stream id,
+  sequence) + raw bytes — in both directions. The server switches to binary
+  output once the client sends { "type": "config", "binary_audio": true } or
+  its first binary frame; each server audio stream is announced with
+  { "type": "audio_stream", "stream_id": N, ... } and closed by an END frame.
+  Clients that never opt in keep receiving base64 JSON.
 
   Server → Client:
+    { "type": "interim", "data": "..." }   (stream mode only)
     { "type": "transcript", "data": "..." }
     { "type": "translation", "data": "..." }
     { "type": "audio", "data": "<base64 audio chunk>" }
     { "type": "metrics", "data": { ... } }
+    { "type": "dropped", "data": { "reason": "deadline", "stage": "stt|translate|tts|queue",
+      "budget_ms": 10000, "late_ms": ... } }   (utterance too late to be useful — not billed)
 """
 
+import asyncio
 import base64
 import json
 import traceback
+from collections.abc import Callable
 from datetime import datetime
+from functools import partial
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import selectinload
+from starlette.websockets import WebSocketState
 
+from app.config import get_settings
 from app.models.database import async_session
-from app.models.models import Chat, ChatMember, Message, User
+from app.models.models import CallParticipant, Chat, ChatMember, Message, User
+from app.services.audio_dsp import negotiate_format
+from app.services.audio_frames import AudioFrameWriter, FrameError, decode_frame
 from app.services.auth_service import decode_access_token
+from app.services.call_fanout_service import Listener, call_fanout_service
+from app.services.connection_scheduler import ConnectionScheduler
+from app.services.credit_lease_service import credit_lease_service
+from app.services.language_id import detect_language
 from app.services.pipeline import TranslationContext, pipeline
 from app.services.redis_service import redis_service
+from app.services.stt_service import stt_service
 from app.services.translation_service import translation_service
+from app.services.utterance_assembler import UtteranceAssembler
 
 router = APIRouter()
 
+# How long an ended STT session may keep delivering its last finals
+STT_DRAIN_TIMEOUT_S = 5.0
+
+# Translation profile limits for config messages (they go into every prompt)
+MAX_PERSONA_CHARS = 500
+MAX_INDUSTRY_CHARS = 100
+MAX_GLOSSARY_TERMS = 100
+MAX_GLOSSARY_TERM_CHARS = 100
+
 
 # ─── Connection Manager ────────────────────────────────────
 
@@ -61,7 +133,9 @@ class ConnectionManager:
         self.chat_viewers: dict[str, set[str]] = {}
 
     async def connect(self, user_id: str, websocket: WebSocket):
-        await websocket.accept()
+        # The endpoint accepts before authenticating; a second accept() is an ASGI error
+        if websocket.application_state == WebSocketState.CONNECTING:
+            await websocket.accept()
         if user_id not in self.active_connections:
             self.active_connections[user_id] = []
         self.active_connections[user_id].append(websocket)
@@ -218,6 +292,73 @@ async def notify_group_update(
     )
 
 
+# ─── Chat Translation Delivery ─────────────────────────────
+
+_delivery_tasks: set[asyncio.Task] = set()
+
+
+async def translate_for_send(content: str, source_lang: str, target_langs: set[str]) -> dict:
+    """
+    Translations to store with a new message. In progressive mode that is
+    just the original — deliver_translations pushes the rest afterwards.
+    """
+    translations = {source_lang: content}
+    if target_langs and not get_settings().chat_progressive_delivery:
+        translations |= await translation_service.translate_many(content, source_lang, target_langs)
+    return translations
+
+
+def deliver_translations(
+    message_id, chat_id: str, content: str, source_lang: str, member_langs: dict[str, str]
+):
+    """
+    Translate a just-broadcast message in the background: each member gets a
+    message_translation event as soon as their language is done, and
+    Message.translations is patched as languages complete.
+    """
+    task = asyncio.create_task(
+        _deliver_translations(message_id, chat_id, content, source_lang, member_langs)
+    )
+    _delivery_tasks.add(task)
+    task.add_done_callback(_delivery_tasks.discard)
+
+
+async def _deliver_translations(
+    message_id, chat_id: str, content: str, source_lang: str, member_langs: dict[str, str]
+):
+    recipients: dict[str, list[str]] = {}
+    for uid, lang in member_langs.items():
+        if lang != source_lang:
+            recipients.setdefault(lang, []).append(uid)
+
+    translations = {source_lang: content}
+    timeout_s = get_settings().chat_translation_timeout_ms / 1000
+    async for lang, translated in translation_service.translate_each(
+        content, source_lang, list(recipients), timeout_s=timeout_s
+    ):
+        translations[lang] = translated
+        try:
+            async with async_session() as db:
+                await db.execute(
+                    update(Message)
+                    .where(Message.id == message_id)
+                    .values(translations=dict(translations))
+                )
+                await db.commit()
+        except Exception:
+            traceback.print_exc()
+        for uid in recipients[lang]:
+            await manager.send_to_user(uid, {
+                "type": "message_translation",
+                "data": {
+                    "message_id": str(message_id),
+                    "chat_id": chat_id,
+                    "language": lang,
+                    "translated_content": translated,
+                },
+            })
+
+
 # ─── Main WebSocket Endpoint ───────────────────────────────
 
 @router.websocket("/ws")
@@ -272,11 +413,121 @@ async def websocket_endpoint(websocket: WebSocket, token: str = ""):
         user_id=user_id, source_language=preferred_lang
     )
     voice_id = None
+    stt_mode = "batch"
+    speculative = False
+    stt_stream = None
+    stream_task = None
+    draining: set[asyncio.Task] = set()  # ended STT sessions still delivering finals
+    call_id = None
+    listener_id = f"{user_id}:{id(websocket)}"
+    audio_writer: AudioFrameWriter | None = None  # set once the client speaks binary
+
+    def enable_binary_audio():
+        nonlocal audio_writer
+        if audio_writer is None:
+            audio_writer = AudioFrameWriter(websocket)
+            fanout = call_fanout_service.get(call_id) if call_id else None
+            if fanout and listener_id in fanout.listeners:
+                fanout.listeners[listener_id].audio_writer = audio_writer
+
+    def current_audio_writer() -> AudioFrameWriter | None:
+        return audio_writer
+
+    async def close_stt_stream():
+        nonlocal stt_stream, stream_task
+        if stt_stream:
+            await stt_stream.close()
+        if stream_task:
+            stream_task.cancel()
+        stt_stream = stream_task = None
+        for task in draining:
+            task.cancel()
+
+    async def retire_stt_stream():
+        """End the current STT session without losing its last finals; audio opens a new one."""
+        nonlocal stt_stream, stream_task
+        if stt_stream:
+            await stt_stream.finish()
+            task = asyncio.create_task(_drain_stt_stream(stt_stream, stream_task))
+            draining.add(task)
+            task.add_done_callback(draining.discard)
+        stt_stream = stream_task = None
+
+    async def run_audio(audio_data: bytes):
+        fanout = call_fanout_service.get(call_id) if call_id else None
+        if fanout:
+            metrics = await fanout.broadcast(user_id, audio_data, voice_context, voice_id)
+            await websocket.send_json({"type": "metrics", "data": metrics.summary()})
+            return
+        await _send_pipeline_events(
+            websocket,
+            pipeline.process_audio_streaming(
+                audio_data=audio_data,
+                context=voice_context,
+                voice_id=voice_id,
+            ),
+            current_audio_writer,
+        )
+
+    async def report_error(e: Exception):
+        traceback.print_exc()
+        try:
+            await websocket.send_json({"type": "error", "data": str(e)})
+        except Exception:
+            pass
+
+    # Audio and chat work run off the receive loop so pings/typing never wait on them
+    scheduler = ConnectionScheduler(
+        handle_audio=run_audio, on_error=report_error, notify=websocket.send_json
+    )
+    scheduler.start()
+    assembler = UtteranceAssembler(dispatch=scheduler.submit_audio)
+
+    async def handle_audio(audio_data: bytes | memoryview):
+        nonlocal stt_stream, stream_task
+        if stt_mode == "stream":
+            if stt_stream is None or stt_stream.closed:
+                await retire_stt_stream()
+                stt_stream = await stt_service.open_stream(voice_context.stt_language())
+                stream_task = asyncio.create_task(
+                    _run_stt_stream(
+                        websocket,
+                        pipeline.process_stream(
+                            stt_stream, voice_context, voice_id, speculative=speculative
+                        ),
+                        current_audio_writer,
+                    )
+                )
+            await stt_stream.send(audio_data)
+        else:
+            await assembler.feed(audio_data)
+
+    async def handle_audio_end():
+        if stt_stream:
+            await stt_stream.finish()
+        await assembler.flush()
 
     try:
         while True:
-            raw = await websocket.receive_text()
-            msg = json.loads(raw)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            # ── Binary audio frames ──
+            if message.get("bytes") is not None:
+                try:
+                    frame = decode_frame(message["bytes"])
+                except FrameError as e:
+                    await websocket.send_json({"type": "error", "data": str(e)})
+                    continue
+                enable_binary_audio()
+                if frame.payload:
+                    await handle_audio(frame.payload)
+                if frame.end:
+                    await handle_audio_end()
+                continue
+
+            msg = json.loads(message["text"])
             msg_type = msg.get("type", "")
 
             # ── Chat Messages ──
@@ -290,7 +541,7 @@ async def websocket_endpoint(websocket: WebSocket, token: str = ""):
                 manager.leave_chat(user_id, chat_id)
 
             elif msg_type == "message":
-                await _handle_chat_message(user_id, msg, websocket)
+                scheduler.submit_control(partial(_handle_chat_message, user_id, msg, websocket))
 
             elif msg_type == "typing":
                 chat_id = msg["chat_id"]
@@ -308,80 +559,107 @@ async def websocket_endpoint(websocket: WebSocket, token: str = ""):
                 )
 
             elif msg_type == "mark_read":
-                chat_id = msg["chat_id"]
-                # Update last_read_at in DB
-                async with async_session() as session:
-                    result = await session.execute(
-                        select(ChatMember).where(
-                            ChatMember.chat_id == chat_id,
-                            ChatMember.user_id == user_id,
-                        )
-                    )
-                    membership = result.scalar_one_or_none()
-                    if membership:
-                        membership.last_read_at = datetime.utcnow()
-                        await session.commit()
-                        # Broadcast read receipt
-                        await manager.broadcast_to_chat(
-                            chat_id,
-                            {
-                                "type": "read_receipt",
-                                "data": {
-                                    "chat_id": chat_id,
-                                    "user_id": user_id,
-                                    "username": username,
-                                    "read_at": membership.last_read_at.isoformat(),
-                                },
-                            },
-                            exclude_user=user_id,
-                        )
+                scheduler.submit_control(
+                    partial(_handle_mark_read, user_id, username, msg["chat_id"])
+                )
 
             # ── Voice Translation ──
             elif msg_type == "config":
+                invalid = _profile_error(msg)
+                if invalid:
+                    await websocket.send_json({"type": "error", "data": invalid})
+                    continue
+                stream_settings = (voice_context.source_language, stt_mode)
                 if "source_lang" in msg:
                     voice_context.source_language = msg["source_lang"]
                 if "target_lang" in msg:
                     voice_context.target_language = msg["target_lang"]
                 if "voice_id" in msg:
                     voice_id = msg["voice_id"]
-                await websocket.send_json({"type": "config_ack", "data": "ok"})
+                if msg.get("stt_mode") in ("batch", "stream"):
+                    stt_mode = msg["stt_mode"]
+                if "speculative" in msg:
+                    speculative = bool(msg["speculative"])
+                if msg.get("binary_audio"):
+                    enable_binary_audio()
+                if {"persona", "industry", "glossary"} & msg.keys():
+                    voice_context.persona = msg.get("persona", voice_context.persona) or ""
+                    voice_context.industry = msg.get("industry", voice_context.industry) or ""
+                    glossary = dict(msg.get("glossary") or {})
+                    if "glossary" in msg and glossary != voice_context.custom_glossary:
+                        voice_context.custom_glossary = glossary
+                        # Translations made with the old glossary are stale
+                        scheduler.submit_control(
+                            partial(translation_service.invalidate_namespace, user_id)
+                        )
+                if "audio_codec" in msg or "audio_bitrate" in msg:
+                    voice_context.audio_format = negotiate_format(
+                        msg.get("audio_codec"), msg.get("audio_bitrate")
+                    )
+                scheduler.configure(
+                    policy=msg.get("audio_policy"), queue_size=msg.get("audio_queue_size")
+                )
+                assembler.configure(
+                    silence_ms=msg.get("utterance_silence_ms"),
+                    max_duration_ms=msg.get("utterance_max_ms"),
+                    max_bytes=msg.get("utterance_max_bytes"),
+                )
+                # Never stitch audio across a config change
+                await assembler.flush()
+                if "call_id" in msg:
+                    if call_id:
+                        call_fanout_service.leave(call_id, listener_id)
+                    call_id = msg["call_id"]
+                    language = (
+                        await _call_language(call_id, user_id, preferred_lang) if call_id else None
+                    )
+                    if call_id and language is None:
+                        # Only active participants may listen in
+                        await websocket.send_json({"type": "error", "data": "Not in this call"})
+                        call_id = None
+                    elif call_id:
+                        call_fanout_service.join(call_id, Listener(
+                            listener_id=listener_id,
+                            user_id=user_id,
+                            language=language,
+                            send=websocket.send_json,
+                            voice_id=msg.get("listen_voice_id"),
+                            audio_writer=audio_writer,
+                        ))
+                # Session settings are fixed at open — reopen lazily on next audio
+                if (voice_context.source_language, stt_mode) != stream_settings:
+                    await retire_stt_stream()
+                await websocket.send_json({
+                    "type": "config_ack",
+                    "data": "ok",
+                    "audio_format": voice_context.audio_format.summary(),
+                })
 
             elif msg_type == "audio":
-                audio_data = base64.b64decode(msg["data"])
-                async for result in pipeline.process_audio_streaming(
-                    audio_data=audio_data,
-                    context=voice_context,
-                    voice_id=voice_id,
-                ):
-                    if result["type"] == "audio":
-                        await websocket.send_json({
-                            "type": "audio",
-                            "data": base64.b64encode(result["data"]).decode(),
-                        })
-                    else:
-                        await websocket.send_json({
-                            "type": result["type"],
-                            "data": result["data"],
-                        })
+                await handle_audio(base64.b64decode(msg["data"]))
+
+            elif msg_type == "audio_end":
+                await handle_audio_end()
 
             # ── Call Events ──
             elif msg_type == "call_decline":
-                call_id = msg.get("call_id", "")
+                declined_call_id = msg.get("call_id", "")
                 chat_id = msg.get("chat_id", "")
                 if chat_id:
-                    await manager.notify_chat_members(
+                    scheduler.submit_control(partial(
+                        manager.notify_chat_members,
                         chat_id,
                         {
                             "type": "call_declined",
                             "data": {
-                                "call_id": call_id,
+                                "call_id": declined_call_id,
                                 "chat_id": chat_id,
                                 "user_id": user_id,
                                 "username": username,
                             },
                         },
                         exclude_user=user_id,
-                    )
+                    ))
 
             elif msg_type == "ping":
                 await websocket.send_json({"type": "pong"})
@@ -395,7 +673,14 @@ async def websocket_endpoint(websocket: WebSocket, token: str = ""):
         except Exception:
             pass
     finally:
+        assembler.close()
+        await scheduler.close()
+        await close_stt_stream()
+        if call_id:
+            call_fanout_service.leave(call_id, listener_id)
         manager.disconnect(user_id, websocket)
+        if not manager.is_online(user_id):
+            await credit_lease_service.release(user_id)
         # Update status to offline
         async with async_session() as db:
             result = await db.execute(select(User).where(User.id == user_id))
@@ -409,6 +694,97 @@ async def websocket_endpoint(websocket: WebSocket, token: str = ""):
 
 # ─── Internal Handlers ─────────────────────────────────────
 
+async def _send_pipeline_events(
+    websocket: WebSocket,
+    events,
+    audio_writer: Callable[[], AudioFrameWriter | None] = lambda: None,
+):
+    """
+    Forward pipeline events to the client. Audio goes out as binary frames
+    (one stream per utterance) when the client supports them, else base64 JSON.
+    `audio_writer` is asked at each utterance's first audio chunk, so a
+    long-lived stream picks up binary audio enabled after it started.
+    """
+    writer = None
+    stream_id = None
+    try:
+        async for result in events:
+            if result["type"] == "audio":
+                if stream_id is None and (writer := audio_writer()):
+                    stream_id = await writer.open_stream(voice_id=result.get("voice_id"))
+                if stream_id is not None:
+                    await writer.send(stream_id, result["data"])
+                else:
+                    await websocket.send_json({
+                        "type": "audio",
+                        "data": base64.b64encode(result["data"]).decode(),
+                    })
+            else:
+                # "metrics" (or "dropped") closes an utterance
+                if result["type"] in ("metrics", "dropped") and stream_id is not None:
+                    await writer.end(stream_id)
+                    stream_id = None
+                await websocket.send_json(result)
+    finally:
+        if stream_id is not None:
+            try:
+                await writer.end(stream_id)
+            except Exception:
+                pass
+
+
+def _profile_error(msg: dict) -> str | None:
+    """Why a config message's persona/industry/glossary can't be used, or None."""
+    for key, limit in (("persona", MAX_PERSONA_CHARS), ("industry", MAX_INDUSTRY_CHARS)):
+        value = msg.get(key)
+        if value is not None and (not isinstance(value, str) or len(value) > limit):
+            return f"{key} must be a string of at most {limit} characters"
+    glossary = msg.get("glossary")
+    if glossary is None:
+        return None
+    if not isinstance(glossary, dict) or len(glossary) > MAX_GLOSSARY_TERMS:
+        return f"glossary must be an object of at most {MAX_GLOSSARY_TERMS} terms"
+    for term, translation in glossary.items():
+        if (
+            not isinstance(translation, str)
+            or not 0 < len(term) <= MAX_GLOSSARY_TERM_CHARS
+            or len(translation) > MAX_GLOSSARY_TERM_CHARS
+        ):
+            return f"glossary terms must be strings of at most {MAX_GLOSSARY_TERM_CHARS} characters"
+    return None
+
+
+async def _drain_stt_stream(stt_stream, stream_task: asyncio.Task | None):
+    """Let an ended STT session deliver its last finals, then tear it down."""
+    try:
+        if stream_task:
+            await asyncio.wait_for(asyncio.shield(stream_task), STT_DRAIN_TIMEOUT_S)
+    except TimeoutError:
+        stream_task.cancel()
+    except asyncio.CancelledError:
+        if stream_task:
+            stream_task.cancel()
+        raise
+    finally:
+        await stt_stream.close()
+
+
+async def _run_stt_stream(
+    websocket: WebSocket,
+    events,
+    audio_writer: Callable[[], AudioFrameWriter | None] = lambda: None,
+):
+    """Background task for stream mode — reports failures instead of dying silently."""
+    try:
+        await _send_pipeline_events(websocket, events, audio_writer)
+    except Exception as e:
+        traceback.print_exc()
+        try:
+            await websocket.send_json({"type": "error", "data": str(e)})
+        except Exception:
+            pass
+
+
 async def _handle_chat_message(user_id: str, msg: dict, websocket: WebSocket):
     """Process an incoming chat message — translate and broadcast."""
     chat_id = msg["chat_id"]
@@ -436,22 +812,13 @@ async def _handle_chat_message(user_id: str, msg: dict, websocket: WebSocket):
             await websocket.send_json({"type": "error", "data": "Not a member"})
             return
 
-        source_lang = sender_membership.user.preferred_language or "en"
+        # What the message is actually written in; the sender's language if unsure
+        source_lang = detect_language(content, sender_membership.user.preferred_language or "en")
 
-        # Translate to all needed languages
-        target_langs = {m.user.preferred_language or "en" for m in chat.members if (m.user.preferred_language or "en") != source_lang}
-        translations = {source_lang: content}
-
-        for tl in target_langs:
-            try:
-                translated = await translation_service.translate(
-                    text=content,
-                    source_language=source_lang,
-                    target_language=tl,
-                )
-                translations[tl] = translated
-            except Exception:
-                translations[tl] = content
+        # Translate to all needed languages (or, progressively, after the broadcast)
+        member_langs = {str(m.user_id): m.user.preferred_language or "en" for m in chat.members}
+        target_langs = set(member_langs.values()) - {source_lang}
+        translations = await translate_for_send(content, source_lang, target_langs)
 
         # Save message
         message = Message(
@@ -480,6 +847,7 @@ async def _handle_chat_message(user_id: str, msg: dict, websocket: WebSocket):
                 "sender_display_name": sender_membership.user.display_name,
                 "content": content,
                 "translated_content": translations.get(member_lang, content),
+                "translation_pending": member_lang not in translations,
                 "source_language": source_lang,
                 "message_type": message_type,
                 "reply_to_id": str(reply_to_id) if reply_to_id else None,
@@ -490,6 +858,57 @@ async def _handle_chat_message(user_id: str, msg: dict, websocket: WebSocket):
                 {"type": "new_message", "data": msg_data},
             )
 
+        if target_langs - translations.keys():
+            deliver_translations(message.id, str(chat.id), content, source_lang, member_langs)
+
+
+async def _call_language(call_id: str, user_id: str, default: str) -> str | None:
+    """
+    The language this participant listens in for a call, or None if the user
+    isn't an active (joined) participant of it.
+    """
+    async with async_session() as db:
+        result = await db.execute(
+            select(CallParticipant.language).where(
+                CallParticipant.call_id == call_id,
+                CallParticipant.user_id == user_id,
+                CallParticipant.status == "joined",
+            )
+        )
+        row = result.first()
+    if row is None:
+        return None
+    return row[0] or default or "en"
+
+
+async def _handle_mark_read(user_id: str, username: str, chat_id: str):
+    """Update last_read_at and broadcast a read receipt."""
+    async with async_session() as session:
+        result = await session.execute(
+            select(ChatMember).where(
+                ChatMember.chat_id == chat_id,
+                ChatMember.user_id == user_id,
+            )
+        )
+        membership = result.scalar_one_or_none()
+        if membership:
+            membership.last_read_at = datetime.utcnow()
+            await session.commit()
+            # Broadcast read receipt
+            await manager.broadcast_to_chat(
+                chat_id,
+                {
+                    "type": "read_receipt",
+                    "data": {
+                        "chat_id": chat_id,
+                        "user_id": user_id,
+                        "username": username,
+                        "read_at": membership.last_read_at.isoformat(),
+                    },
+                },
+                exclude_user=user_id,
+            )
+
 
 async def _broadcast_presence(user_id: str, status: str):
     """Broadcast presence update to all friends."""
@@ -10,6 +10,8 @@ from datetime import datetime
 from typing import Optional
 
 from app.config import get_settings
+from app.services.http_clients import http_clients, http_timeout
+from app.services.provider_health import provider_health
 
 logger = logging.getLogger(__name__)
 
@@ -67,33 +69,35 @@ class AIFeaturesService:
         if not settings.openai_api_key:
             return {"tone": "neutral", "confidence": 0.5, "emotions": {}}
 
+        async def request() -> dict:
+            client = http_clients.get("openai")
+            resp = await client.post(
+                "https://api.openai.com/v1/chat/completions",
+                headers={"Authorization": f"Bearer {settings.openai_api_key}"},
+                json={
+                    "model": "gpt-4o-mini",
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": "Analyze the emotional tone of this speech transcript. "
+                            "Return JSON: {\"primary_tone\": str, \"confidence\": float, "
+                            "\"emotions\": {\"happy\": float, \"sad\": float, \"angry\": float, "
+                            "\"neutral\": float, \"formal\": float, \"excited\": float}}. "
+                            "All floats 0-1.",
+                        },
+                        {"role": "user", "content": text},
+                    ],
+                    "response_format": {"type": "json_object"},
+                    "max_tokens": 200,
+                },
+                timeout=http_timeout(10),
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            return json.loads(data["choices"][0]["message"]["content"])
+
         try:
-            import httpx
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers={"Authorization": f"Bearer {settings.openai_api_key}"},
-                    json={
-                        "model": "gpt-4o-mini",
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "Analyze the emotional tone of this speech transcript. "
-                                "Return JSON: {\"primary_tone\": str, \"confidence\": float, "
-                                "\"emotions\": {\"happy\": float, \"sad\": float, \"angry\": float, "
-                                "\"neutral\": float, \"formal\": float, \"excited\": float}}. "
-                                "All floats 0-1.",
-                            },
-                            {"role": "user", "content": text},
-                        ],
-                        "response_format": {"type": "json_object"},
-                        "max_tokens": 200,
-                    },
-                    timeout=10,
-                )
-                data = resp.json()
-                result = json.loads(data["choices"][0]["message"]["content"])
-                return result
+            return await provider_health.call("openai", "gpt-4o-mini", request)
         except Exception as e:
             logger.warning(f"Tone detection failed: {e}")
             return {"primary_tone": "neutral", "confidence": 0.5, "emotions": {}}
@@ -109,34 +113,34 @@ class AIFeaturesService:
             return {"notes": "", "action_items": [], "decisions": []}
 
         try:
-            import httpx
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers={"Authorization": f"Bearer {settings.openai_api_key}"},
-                    json={
-                        "model": "gpt-4o-mini",
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are a meeting notes assistant. Generate structured "
-                                "meeting notes from the transcript. Return JSON: "
-                                '{"summary": str, "key_points": [str], '
-                                '"action_items": [{"task": str, "assignee": str, "deadline": str}], '
-                                '"decisions": [str], "follow_ups": [str]}',
-                            },
-                            {
-                                "role": "user",
-                                "content": f"Participants: {', '.join(participants)}\n\nTranscript:\n{transcript}",
-                            },
-                        ],
-                        "response_format": {"type": "json_object"},
-                        "max_tokens": 2000,
-                    },
-                    timeout=30,
-                )
-                data = resp.json()
-                return json.loads(data["choices"][0]["message"]["content"])
+            client = http_clients.get("openai")
+            resp = await client.post(
+                "https://api.openai.com/v1/chat/completions",
+                headers={"Authorization": f"Bearer {settings.openai_api_key}"},
+                json={
+                    "model": "gpt-4o-mini",
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": "You are a meeting notes assistant. Generate structured "
+                            "meeting notes from the transcript. Return JSON: "
+                            '{"summary": str, "key_points": [str], '
+                            '"action_items": [{"task": str, "assignee": str, "deadline": str}], '
+                            '"decisions": [str], "follow_ups": [str]}',
+                        },
+                        {
+                            "role": "user",
+                            "content": f"Participants: {', '.join(participants)}\n\n"
+                            f"Transcript:\n{transcript}",
+                        },
+                    ],
+                    "response_format": {"type": "json_object"},
+                    "max_tokens": 2000,
+                },
+                timeout=http_timeout(30),
+            )
+            data = resp.json()
+            return json.loads(data["choices"][0]["message"]["content"])
         except Exception as e:
             logger.warning(f"Auto meeting notes failed: {e}")
             return {"summary": "", "key_points": [], "action_items": [], "decisions": []}
@@ -195,29 +199,32 @@ class AIFeaturesService:
             return {"suggestion": "", "type": "none"}
 
         try:
-            import httpx
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers={"Authorization": f"Bearer {settings.openai_api_key}"},
-                    json={
-                        "model": "gpt-4o-mini",
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are a real-time call assistant. Based on the conversation, "
-                                "provide brief, actionable suggestions. Return JSON: "
-                                '{"suggestion": str, "type": "info|action|warning", "confidence": float}',
-                            },
-                            {"role": "user", "content": f"Context: {context}\n\nRecent transcript: {transcript}"},
-                        ],
-                        "response_format": {"type": "json_object"},
-                        "max_tokens": 200,
-                    },
-                    timeout=8,
-                )
-                data = resp.json()
-                return json.loads(data["choices"][0]["message"]["content"])
+            client = http_clients.get("openai")
+            resp = await client.post(
+                "https://api.openai.com/v1/chat/completions",
+                headers={"Authorization": f"Bearer {settings.openai_api_key}"},
+                json={
+                    "model": "gpt-4o-mini",
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": "You are a real-time call assistant. Based on the "
+                            "conversation, provide brief, actionable suggestions. Return JSON: "
+                            '{"suggestion": str, "type": "info|action|warning", '
+                            '"confidence": float}',
+                        },
+                        {
+                            "role": "user",
+                            "content": f"Context: {context}\n\nRecent transcript: {transcript}",
+                        },
+                    ],
+                    "response_format": {"type": "json_object"},
+                    "max_tokens": 200,
+                },
+                timeout=http_timeout(8),
+            )
+            data = resp.json()
+            return json.loads(data["choices"][0]["message"]["content"])
         except Exception as e:
             logger.warning(f"AI suggestion failed: {e}")
             return {"suggestion": "", "type": "none"}
@@ -275,30 +282,30 @@ class AIFeaturesService:
             return {"stress_level": "unknown", "confidence": 0}
 
         try:
-            import httpx
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers={"Authorization": f"Bearer {settings.openai_api_key}"},
-                    json={
-                        "model": "gpt-4o-mini",
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "Analyze the speaker's stress and confidence level from "
-                                "their speech patterns. Return JSON: "
-                                '{"stress_level": "low|medium|high", "confidence_level": "low|medium|high", '
-                                '"indicators": [str], "analysis_confidence": float}',
-                            },
-                            {"role": "user", "content": text},
-                        ],
-                        "response_format": {"type": "json_object"},
-                        "max_tokens": 300,
-                    },
-                    timeout=10,
-                )
-                data = resp.json()
-                return json.loads(data["choices"][0]["message"]["content"])
+            client = http_clients.get("openai")
+            resp = await client.post(
+                "https://api.openai.com/v1/chat/completions",
+                headers={"Authorization": f"Bearer {settings.openai_api_key}"},
+                json={
+                    "model": "gpt-4o-mini",
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": "Analyze the speaker's stress and confidence level from "
+                            "their speech patterns. Return JSON: "
+                            '{"stress_level": "low|medium|high", '
+                            '"confidence_level": "low|medium|high", '
+                            '"indicators": [str], "analysis_confidence": float}',
+                        },
+                        {"role": "user", "content": text},
+                    ],
+                    "response_format": {"type": "json_object"},
+                    "max_tokens": 300,
+                },
+                timeout=http_timeout(10),
+            )
+            data = resp.json()
+            return json.loads(data["choices"][0]["message"]["content"])
         except Exception as e:
             logger.warning(f"Voice stress analysis failed: {e}")
             return {"stress_level": "unknown", "confidence_level": "unknown"}
@@ -327,33 +334,36 @@ class AIFeaturesService:
             return {"response": "AI agent unavailable", "confidence": 0}
 
         try:
-            import httpx
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers={"Authorization": f"Bearer {settings.openai_api_key}"},
-                    json={
-                        "model": "gpt-4o-mini",
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": f"You are a digital twin AI agent representing {user_profile.get('name', 'the user')}. "
-                                f"Respond in their style based on this profile: {json.dumps(user_profile)}. "
-                                "Be helpful and match their communication patterns. "
-                                'Return JSON: {"response": str, "confidence": float, "should_notify_user": bool}',
-                            },
-                            {
-                                "role": "user",
-                                "content": f"Context: {conversation_context}\n\nMessage to respond to: {message}",
-                            },
-                        ],
-                        "response_format": {"type": "json_object"},
-                        "max_tokens": 500,
-                    },
-                    timeout=15,
-                )
-                data = resp.json()
-                return json.loads(data["choices"][0]["message"]["content"])
+            client = http_clients.get("openai")
+            resp = await client.post(
+                "https://api.openai.com/v1/chat/completions",
+                headers={"Authorization": f"Bearer {settings.openai_api_key}"},
+                json={
+                    "model": "gpt-4o-mini",
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": "You are a digital twin AI agent representing "
+                            f"{user_profile.get('name', 'the user')}. "
+                            "Respond in their style based on this profile: "
+                            f"{json.dumps(user_profile)}. "
+                            "Be helpful and match their communication patterns. "
+                            'Return JSON: {"response": str, "confidence": float, '
+                            '"should_notify_user": bool}',
+                        },
+                        {
+                            "role": "user",
+                            "content": f"Context: {conversation_context}\n\n"
+                            f"Message to respond to: {message}",
+                        },
+                    ],
+                    "response_format": {"type": "json_object"},
+                    "max_tokens": 500,
+                },
+                timeout=http_timeout(15),
+            )
+            data = resp.json()
+            return json.loads(data["choices"][0]["message"]["content"])
         except Exception as e:
             logger.warning(f"Digital twin response failed: {e}")
             return {"response": "", "confidence": 0, "should_notify_user": True}
@@ -4,12 +4,15 @@ import json
 import logging
 from typing import Any
 
-import httpx
-
 from app.config import get_settings
+from app.services.http_clients import http_clients, http_timeout
+from app.services.provider_health import provider_health
 
 logger = logging.getLogger(__name__)
 
+OPENAI_MODEL = "gpt-4-turbo-preview"
+CLAUDE_MODEL = "claude-3-5-sonnet-20241022"
+
 SYSTEM_PROMPT = """You are an AI assistant that analyzes conversation transcripts.
 Always respond with valid JSON only — no markdown fences, no commentary."""
 
@@ -91,57 +94,67 @@ class AIService:
     # ─── LLM Backends ──────────────────────────────────
 
     async def _call_llm(self, prompt: str) -> str:
-        """Try OpenAI first, fallback to Anthropic."""
+        """OpenAI first, Anthropic as fallback — skipping any provider whose circuit is open."""
+        candidates = {}
         if self._settings.openai_api_key:
-            try:
-                return await self._call_openai(prompt)
-            except Exception as e:
-                logger.warning("OpenAI failed, trying Anthropic: %s", e)
-
+            candidates[("openai", OPENAI_MODEL)] = lambda: self._call_openai(prompt)
         if self._settings.anthropic_api_key:
-            return await self._call_anthropic(prompt)
+            candidates[("anthropic", CLAUDE_MODEL)] = lambda: self._call_anthropic(prompt)
+        if not candidates:
+            raise RuntimeError(
+                "No AI provider configured (set OPENAI_API_KEY or ANTHROPIC_API_KEY)"
+            )
 
-        raise RuntimeError("No AI provider configured (set OPENAI_API_KEY or ANTHROPIC_API_KEY)")
+        routes = provider_health.plan(candidates)
+        for i, (provider, call) in enumerate(routes):
+            try:
+                return await call()
+            except Exception as e:
+                if i == len(routes) - 1:
+                    raise
+                logger.warning("%s failed, trying %s: %s", provider, routes[i + 1][0], e)
 
     async def _call_openai(self, prompt: str) -> str:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            resp = await client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={"Authorization": f"Bearer {self._settings.openai_api_key}"},
-                json={
-                    "model": "gpt-4-turbo-preview",
-                    "messages": [
-                        {"role": "system", "content": SYSTEM_PROMPT},
-                        {"role": "user", "content": prompt},
-                    ],
-                    "temperature": 0.3,
-                    "max_tokens": 2000,
-                    "response_format": {"type": "json_object"},
-                },
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            return data["choices"][0]["message"]["content"]
+        client = http_clients.get("openai")
+        resp = await client.post(
+            "https://api.openai.com/v1/chat/completions",
+            headers={"Authorization": f"Bearer {self._settings.openai_api_key}"},
+            json={
+                "model": OPENAI_MODEL,
+                "messages": [
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                "temperature": 0.3,
+                "max_tokens": 2000,
+                "response_format": {"type": "json_object"},
+            },
+            timeout=http_timeout(60.0),
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        return data["choices"][0]["message"]["content"]
 
     async def _call_anthropic(self, prompt: str) -> str:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            resp = await client.post(
-                "https://api.anthropic.com/v1/messages",
-                headers={
-                    "x-api-key": self._settings.anthropic_api_key,
-                    "anthropic-version": "2023-06-01",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": "claude-3-5-sonnet-20241022",
-                    "max_tokens": 2000,
-                    "system": SYSTEM_PROMPT,
-                    "messages": [{"role": "user", "content": prompt}],
-                },
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            return data["content"][0]["text"]
+        client = http_clients.get("anthropic")
+        resp = await client.post(
+            "https://api.anthropic.com/v1/messages",
+            headers={
+                "x-api-key": self._settings.anthropic_api_key,
+                "anthropic-version": "2023-06-01",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model": CLAUDE_MODEL,
+                "max_tokens": 2000,
+                "system": SYSTEM_PROMPT,
+                "messages": [{"role": "user", "content": prompt}],
+            },
+            timeout=http_timeout(60.0),
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        return data["content"][0]["text"]
 
     # ─── Helpers ────────────────────────────────────────
 
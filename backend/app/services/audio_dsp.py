@@ -0,0 +1,432 @@
+"""Audio DSP stage — decode, resample, normalize and re-encode off the event loop.
+
+Two jobs, both run in a process pool (never on the loop):
+
+  STT ingress   prepare_for_stt(): decode to mono PCM, resample to the STT
+                provider's preferred rate (dsp_stt_sample_rate), normalize
+                loudness to dsp_target_dbfs (gain capped at dsp_max_gain_db,
+                peaks kept below -1 dBFS) and re-wrap as WAV
+  TTS egress    encode_for_client(): re-encode synthesized audio into the
+                codec/bitrate negotiated with the client
+
+WAV/PCM is handled with numpy alone. Other containers (webm/opus, ogg, mp3)
+are decoded and Opus is encoded with PyAV when it's installed (the `dsp`
+extra); without it those inputs pass through unchanged and clients can only
+negotiate MP3 — which ElevenLabs encodes for us at the requested bitrate, so
+the cheapest way to cut egress costs no CPU at all.
+
+The stage is bounded: at most dsp_max_pending tasks are queued or running.
+Beyond that — or past dsp_timeout_ms — audio passes through unprocessed
+rather than stalling the call. Per-operation queue wait and run time are
+published on /health/metrics.
+"""
+
+import asyncio
+import importlib.util
+import io
+import logging
+import multiprocessing
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from app.config import get_settings
+from app.services.latency_histograms import LogHistogram
+
+logger = logging.getLogger(__name__)
+
+CODECS_AVAILABLE = importlib.util.find_spec("av") is not None
+
+PEAK_DBFS = -1.0
+FRAME_MS = 20
+SILENCE_DBFS = -50.0  # frames below this don't count towards loudness
+FIR_TAPS = 63  # anti-aliasing filter length when downsampling
+
+# ElevenLabs MP3 output formats (rate, kbps); 22.05 kHz is only offered at 32 kbps
+MP3_FORMATS = ((22050, 32), (44100, 32), (44100, 64), (44100, 96), (44100, 128), (44100, 192))
+OPUS_BITRATES = (16, 24, 32, 48, 64, 96, 128)
+OPUS_SOURCE_RATE = 24000  # raw PCM requested from ElevenLabs for Opus re-encoding
+
+
+class DSPUnavailable(RuntimeError):
+    """The stage is disabled, full or timed out — the caller keeps the original audio."""
+
+
+def audio_mimetype(data: bytes) -> str:
+    """Sniff the container from its magic bytes."""
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        return "audio/wav"
+    if data[:4] == b"\x1a\x45\xdf\xa3":
+        return "audio/webm"
+    if data[:4] == b"OggS":
+        return "audio/ogg"
+    if data[:3] == b"ID3" or (len(data) > 1 and data[0] == 0xFF and data[1] & 0xE0 == 0xE0):
+        return "audio/mpeg"
+    if data[:4] == b"fLaC":
+        return "audio/flac"
+    return "application/octet-stream"  # let the provider detect it
+
+
+# ── Negotiated client format ──
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    """Codec and bitrate a client receives TTS audio in."""
+
+    codec: str = "mp3"
+    bitrate_kbps: int = 128
+    sample_rate: int = 44100
+
+    @property
+    def provider_format(self) -> str | None:
+        """ElevenLabs `output_format` to request for this client (None = its default)."""
+        if self == DEFAULT_FORMAT:
+            return None
+        if self.codec == "opus":
+            return f"pcm_{OPUS_SOURCE_RATE}"
+        return f"mp3_{self.sample_rate}_{self.bitrate_kbps}"
+
+    @property
+    def transcode(self) -> bool:
+        """Whether provider audio has to go through encode_for_client()."""
+        return self.codec != "mp3"
+
+    def summary(self) -> dict:
+        return {
+            "codec": self.codec,
+            "bitrate_kbps": self.bitrate_kbps,
+            "sample_rate": self.sample_rate,
+        }
+
+
+DEFAULT_FORMAT = AudioFormat()
+
+
+def negotiate_format(codec: str | None = None, bitrate_kbps: int | None = None) -> AudioFormat:
+    """
+    Closest format to what the client asked for that the server can produce.
+    Opus without PyAV degrades to MP3 at the same bitrate.
+    """
+    if codec == "opus" and CODECS_AVAILABLE:
+        target = bitrate_kbps or 32
+        kbps = min(OPUS_BITRATES, key=lambda b: (abs(b - target), b))
+        return AudioFormat("opus", kbps, 48000)
+    if not bitrate_kbps:
+        return DEFAULT_FORMAT
+    # At equal bitrate the lower sample rate spends its bits on the speech band
+    rate, kbps = min(MP3_FORMATS, key=lambda f: (abs(f[1] - bitrate_kbps), f[0]))
+    return AudioFormat("mp3", kbps, rate)
+
+
+# ── PCM primitives (numpy, run in the workers) ──
+
+
+def decode_pcm(data: bytes, sample_rate: int) -> tuple[np.ndarray, int] | None:
+    """Any supported container → (mono int16 samples, rate). None if undecodable."""
+    if audio_mimetype(data) == "audio/wav":
+        try:
+            with wave.open(io.BytesIO(data)) as wav:
+                params = wav.getparams()
+                pcm = wav.readframes(params.nframes)
+        except (wave.Error, EOFError):
+            return None
+        if params.sampwidth != 2:
+            return None
+        samples = np.frombuffer(pcm, dtype="<i2")
+        if params.nchannels > 1:
+            samples = samples[: len(samples) - len(samples) % params.nchannels]
+            samples = samples.reshape(-1, params.nchannels).mean(axis=1).astype(np.int16)
+        return samples, params.framerate
+    if CODECS_AVAILABLE:
+        return _av_decode(data, sample_rate)
+    return None
+
+
+def resample(samples: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """Band-limited linear resampling; a windowed-sinc low-pass guards against aliasing."""
+    if src_rate == dst_rate or not samples.size:
+        return samples
+    x = samples.astype(np.float32)
+    if dst_rate < src_rate:
+        cutoff = 0.5 * dst_rate / src_rate
+        n = np.arange(FIR_TAPS) - (FIR_TAPS - 1) / 2
+        taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(FIR_TAPS)
+        x = np.convolve(x, taps / taps.sum(), mode="same")
+    length = int(round(len(x) * dst_rate / src_rate))
+    positions = np.arange(length) * (src_rate / dst_rate)
+    out = np.interp(positions, np.arange(len(x)), x)
+    return np.clip(np.round(out), -32768, 32767).astype(np.int16)
+
+
+def normalize_loudness(
+    samples: np.ndarray, sample_rate: int, target_dbfs: float, max_gain_db: float
+) -> np.ndarray:
+    """Scale speech to target RMS loudness (silent frames ignored), peaks below -1 dBFS."""
+    if not samples.size:
+        return samples
+    x = samples.astype(np.float32) / 32768.0
+    frame_len = max(1, sample_rate * FRAME_MS // 1000)
+    usable = len(x) - len(x) % frame_len
+    if usable:
+        frame_power = np.mean(x[:usable].reshape(-1, frame_len) ** 2, axis=1)
+    else:
+        frame_power = np.array([np.mean(x ** 2)])
+    voiced = frame_power[frame_power > 10 ** (SILENCE_DBFS / 10)]
+    if not voiced.size:
+        return samples  # nothing worth normalizing — don't amplify noise
+
+    loudness_db = 10 * np.log10(np.mean(voiced))
+    gain_db = min(target_dbfs - loudness_db, max_gain_db)
+    peak = float(np.max(np.abs(x))) or 1.0
+    gain_db = min(gain_db, PEAK_DBFS - 20 * np.log10(peak))
+    return np.clip(np.round(x * 10 ** (gain_db / 20) * 32768), -32768, 32767).astype(np.int16)
+
+
+def encode_wav(samples: np.ndarray, sample_rate: int) -> bytes:
+    out = io.BytesIO()
+    with wave.open(out, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.astype("<i2").tobytes())
+    return out.getvalue()
+
+
+# ── Worker tasks (top-level so the pool can pickle them) ──
+
+
+def stt_task(data: bytes, sample_rate: int, target_dbfs: float, max_gain_db: float) -> bytes | None:
+    """Container → normalized mono WAV at `sample_rate`; None to keep the original."""
+    decoded = decode_pcm(data, sample_rate)
+    if decoded is None:
+        return None
+    samples, rate = decoded
+    samples = resample(samples, rate, sample_rate)
+    samples = normalize_loudness(samples, sample_rate, target_dbfs, max_gain_db)
+    return encode_wav(samples, sample_rate)
+
+
+def egress_task(pcm: bytes, source_rate: int, fmt: AudioFormat) -> bytes:
+    """Raw 16-bit mono PCM from the TTS provider → the client's codec."""
+    samples = _pcm_samples(pcm)
+    if fmt.codec == "opus" and CODECS_AVAILABLE:
+        return _av_encode_opus(samples, source_rate, fmt.bitrate_kbps)
+    return encode_wav(samples, source_rate)
+
+
+def _av_decode(data: bytes, sample_rate: int) -> tuple[np.ndarray, int] | None:
+    import av
+
+    resampler = av.AudioResampler(format="s16", layout="mono", rate=sample_rate)
+    chunks = []
+    try:
+        with av.open(io.BytesIO(data)) as container:
+            for frame in container.decode(audio=0):
+                chunks += [f.to_ndarray().reshape(-1) for f in resampler.resample(frame)]
+            chunks += [f.to_ndarray().reshape(-1) for f in resampler.resample(None)]
+    except av.error.FFmpegError:
+        return None
+    if not chunks:
+        return None
+    return np.concatenate(chunks).astype(np.int16), sample_rate
+
+
+def _av_encode_opus(samples: np.ndarray, sample_rate: int, bitrate_kbps: int) -> bytes:
+    import av
+
+    out = io.BytesIO()
+    with av.open(out, "w", format="ogg") as container:
+        stream = container.add_stream("libopus", rate=sample_rate)
+        stream.bit_rate = bitrate_kbps * 1000
+        frame = av.AudioFrame.from_ndarray(samples.reshape(1, -1), format="s16", layout="mono")
+        frame.sample_rate = sample_rate
+        for packet in stream.encode(frame):
+            container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+    return out.getvalue()
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+# ── Stage ──
+
+
+@dataclass
+class DSPTaskStats:
+    tasks: int = 0
+    shed: int = 0  # stage full — passed through unprocessed
+    timeouts: int = 0
+    errors: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    queue_wait: LogHistogram = field(default_factory=LogHistogram)
+    run_time: LogHistogram = field(default_factory=LogHistogram)
+
+    def summary(self) -> dict:
+        return {
+            "tasks": self.tasks,
+            "shed": self.shed,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "queue_wait": self.queue_wait.summary(),
+            "run_time": self.run_time.summary(),
+        }
+
+
+class DSPStage:
+    """Bounded process pool for audio DSP."""
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        max_pending: int | None = None,
+        timeout_ms: int | None = None,
+    ):
+        settings = get_settings()
+        self.workers = workers if workers is not None else settings.dsp_workers
+        self.max_pending = max_pending if max_pending is not None else settings.dsp_max_pending
+        self.timeout_ms = timeout_ms if timeout_ms is not None else settings.dsp_timeout_ms
+        self.pending = 0
+        self.peak_pending = 0
+        self.stats: dict[str, DSPTaskStats] = {}
+        self._pool: ProcessPoolExecutor | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return get_settings().dsp_enabled and self.workers > 0
+
+    def start(self) -> None:
+        """Spawn the workers up front (app startup) so the first call doesn't pay for it."""
+        if self.enabled:
+            self._executor().submit(_timed, int, 0)
+            logger.info("DSP stage ready (%d workers, codecs=%s)", self.workers, CODECS_AVAILABLE)
+
+    async def close(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool:
+            await asyncio.to_thread(pool.shutdown, cancel_futures=True)
+
+    async def run(self, op: str, fn, *args, size: int = 0):
+        """Run `fn(*args)` in the pool. Raises DSPUnavailable instead of queueing past the bound."""
+        stats = self.stats.setdefault(op, DSPTaskStats())
+        if not self.enabled:
+            raise DSPUnavailable("DSP stage disabled")
+        if self.pending >= self.max_pending:
+            stats.shed += 1
+            raise DSPUnavailable("DSP stage full")
+
+        stats.tasks += 1
+        stats.bytes_in += size
+        submitted = time.perf_counter()
+        try:
+            future = self._executor().submit(_timed, fn, *args)
+        except Exception as e:
+            stats.errors += 1
+            logger.warning("DSP %s failed: %s", op, e)
+            raise DSPUnavailable(f"DSP {op} failed") from e
+        # A task that timed out keeps its worker busy: it stays pending until it finishes
+        self.pending += 1
+        self.peak_pending = max(self.peak_pending, self.pending)
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda _: _call_soon(loop, self._task_done))
+        try:
+            result, run_ms = await asyncio.wait_for(
+                asyncio.wrap_future(future), self.timeout_ms / 1000
+            )
+        except TimeoutError:
+            stats.timeouts += 1
+            raise DSPUnavailable(f"DSP {op} timed out") from None
+        except Exception as e:
+            stats.errors += 1
+            logger.warning("DSP %s failed: %s", op, e)
+            raise DSPUnavailable(f"DSP {op} failed") from e
+
+        total_ms = (time.perf_counter() - submitted) * 1000
+        stats.run_time.record(run_ms)
+        stats.queue_wait.record(max(0.0, total_ms - run_ms))
+        if isinstance(result, bytes):
+            stats.bytes_out += len(result)
+        return result
+
+    async def prepare_for_stt(self, audio: bytes) -> tuple[bytes, str]:
+        """Audio for the STT provider → (audio, mimetype); the original if it can't be processed."""
+        mimetype = audio_mimetype(audio)
+        if mimetype != "audio/wav" and not CODECS_AVAILABLE:
+            return audio, mimetype
+        settings = get_settings()
+        try:
+            prepared = await self.run(
+                "stt_prepare",
+                stt_task,
+                audio,
+                settings.dsp_stt_sample_rate,
+                settings.dsp_target_dbfs,
+                settings.dsp_max_gain_db,
+                size=len(audio),
+            )
+        except DSPUnavailable:
+            return audio, mimetype
+        if prepared is None:
+            return audio, mimetype
+        return prepared, "audio/wav"
+
+    async def encode_for_client(self, pcm: bytes, fmt: AudioFormat) -> bytes:
+        """
+        Raw PCM synthesized for `fmt` → the client's codec. When the stage
+        can't take it the PCM is wrapped as WAV (header only) so the client
+        still gets playable audio.
+        """
+        try:
+            return await self.run(
+                f"encode_{fmt.codec}", egress_task, pcm, OPUS_SOURCE_RATE, fmt, size=len(pcm)
+            )
+        except DSPUnavailable:
+            return encode_wav(_pcm_samples(pcm), OPUS_SOURCE_RATE)
+
+    def summary(self) -> dict:
+        return {
+            "workers": self.workers if self.enabled else 0,
+            "codecs": CODECS_AVAILABLE,
+            "pending": self.pending,
+            "peak_pending": self.peak_pending,
+            "max_pending": self.max_pending,
+            "operations": {op: stats.summary() for op, stats in sorted(self.stats.items())},
+        }
+
+    def _task_done(self) -> None:
+        self.pending -= 1
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn, not fork: forking a process with live event-loop threads is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, callback) -> None:
+    """Hand a pool callback (run in the pool's thread) back to the event loop."""
+    try:
+        loop.call_soon_threadsafe(callback)
+    except RuntimeError:
+        pass  # loop already closed (shutdown)
+
+
+def _pcm_samples(pcm: bytes) -> np.ndarray:
+    return np.frombuffer(pcm[: len(pcm) - len(pcm) % 2], dtype="<i2")
+
+
+# Singleton
+dsp_stage = DSPStage()
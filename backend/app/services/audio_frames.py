@@ -0,0 +1,90 @@
+"""Binary audio frames for /ws — raw audio instead of base64-in-JSON.
+
+Every audio frame is a WebSocket binary message:
+
+    offset  size  field
+    0       1     magic / version (0xA1)
+    1       1     flags           (bit 0: END — last frame of the stream)
+    2       2     stream id       (uint16, big-endian)
+    4       4     sequence        (uint32, big-endian, per stream, from 0)
+    8       ...   raw audio bytes
+
+Control messages stay JSON text frames. Server → client audio streams are
+announced first with { "type": "audio_stream", "stream_id": N, ... } carrying
+metadata (speaker_id, voice_id) so frames themselves stay fixed-size.
+
+Client → server: stream id is free for the client to choose (one mic = 0);
+an END frame (payload may be empty) acts like { "type": "audio_end" }.
+"""
+
+import struct
+from dataclasses import dataclass
+
+from fastapi import WebSocket
+
+MAGIC = 0xA1
+FLAG_END = 0x01
+HEADER = struct.Struct(">BBHI")
+HEADER_SIZE = HEADER.size  # 8
+
+
+class FrameError(ValueError):
+    """Binary message is not a valid audio frame."""
+
+
+@dataclass
+class AudioFrame:
+    stream_id: int
+    sequence: int
+    flags: int
+    payload: memoryview  # view into the received message — no copy
+
+    @property
+    def end(self) -> bool:
+        return bool(self.flags & FLAG_END)
+
+
+def encode_frame(stream_id: int, sequence: int, payload: bytes = b"", flags: int = 0) -> bytes:
+    return HEADER.pack(MAGIC, flags, stream_id & 0xFFFF, sequence & 0xFFFFFFFF) + payload
+
+
+def decode_frame(data: bytes) -> AudioFrame:
+    if len(data) < HEADER_SIZE:
+        raise FrameError("Audio frame shorter than header")
+    magic, flags, stream_id, sequence = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise FrameError(f"Unknown audio frame version 0x{magic:02x}")
+    return AudioFrame(stream_id, sequence, flags, memoryview(data)[HEADER_SIZE:])
+
+
+class AudioFrameWriter:
+    """Server → client binary audio for one connection."""
+
+    def __init__(self, websocket: WebSocket):
+        self._websocket = websocket
+        self._next_stream = 1
+        self._sequence: dict[int, int] = {}
+
+    async def open_stream(self, **metadata) -> int:
+        """Announce a new audio stream (JSON) and return its id."""
+        stream_id = self._next_stream
+        self._next_stream = self._next_stream % 0xFFFF + 1
+        self._sequence[stream_id] = 0
+        await self._websocket.send_json(
+            {"type": "audio_stream", "stream_id": stream_id, **metadata}
+        )
+        return stream_id
+
+    async def send(self, stream_id: int, chunk: bytes) -> None:
+        await self._websocket.send_bytes(encode_frame(stream_id, self._next_seq(stream_id), chunk))
+
+    async def end(self, stream_id: int) -> None:
+        await self._websocket.send_bytes(
+            encode_frame(stream_id, self._next_seq(stream_id), flags=FLAG_END)
+        )
+        self._sequence.pop(stream_id, None)
+
+    def _next_seq(self, stream_id: int) -> int:
+        seq = self._sequence.get(stream_id, 0)
+        self._sequence[stream_id] = seq + 1
+        return seq
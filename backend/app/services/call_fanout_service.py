@@ -0,0 +1,250 @@
+"""Group-call fan-out — one STT per utterance, one translation per language.
+
+Without fan-out every listener in a group call runs its own
+STT → translate → TTS chain for the same speaker. Here the speaker's audio
+is transcribed once, translated once per distinct listener language, and
+synthesized once per (language, voice_id); the results (including the
+base64 audio, encoded once, or raw binary frames for clients that support
+them) are sent to every listener that needs them.
+
+Listeners are registered by the /ws handler of each participant's
+connection. State is per backend instance.
+"""
+
+import asyncio
+import base64
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, replace
+
+from app.services.audio_dsp import DEFAULT_FORMAT, dsp_stage
+from app.services.audio_frames import AudioFrameWriter
+from app.services.deadlines import Deadline, DeadlineExceeded, current_deadline
+from app.services.latency_histograms import latency_registry
+from app.services.pipeline import PipelineMetrics, TranslationContext, detect_speech, pipeline
+from app.services.stt_service import stt_service
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Listener:
+    """One participant connection listening to a call."""
+
+    listener_id: str  # unique per connection
+    user_id: str
+    language: str  # CallParticipant.language
+    send: Callable[[dict], Awaitable[None]]
+    voice_id: str | None = None  # preferred TTS voice; None = speaker's voice
+    audio_writer: AudioFrameWriter | None = None  # binary audio frames, if the client supports them
+
+
+@dataclass
+class FanoutStats:
+    utterances: int = 0
+    stt_calls: int = 0
+    translations: int = 0
+    tts_streams: int = 0
+    deliveries: int = 0  # (listener, utterance) pairs served
+
+    @property
+    def provider_calls_saved(self) -> int:
+        """Calls a per-listener chain (STT + translate + TTS each) would have made."""
+        return max(0, self.deliveries * 3 - (self.stt_calls + self.translations + self.tts_streams))
+
+    def summary(self) -> dict:
+        return {
+            "utterances": self.utterances,
+            "stt_calls": self.stt_calls,
+            "translations": self.translations,
+            "tts_streams": self.tts_streams,
+            "deliveries": self.deliveries,
+            "provider_calls_saved": self.provider_calls_saved,
+        }
+
+
+class CallFanout:
+    """Fan-out state for a single call."""
+
+    def __init__(self, call_id: str, stats: FanoutStats):
+        self.call_id = call_id
+        self.listeners: dict[str, Listener] = {}
+        self._stats = stats
+
+    async def broadcast(
+        self,
+        speaker_id: str,
+        audio_data: bytes,
+        context: TranslationContext,
+        voice_id: str | None = None,
+    ) -> PipelineMetrics:
+        """Transcribe a speaker's chunk once and deliver it to every listener."""
+        metrics = PipelineMetrics(total_start=time.time())
+        deadline = current_deadline.get() or Deadline.start()
+        self._stats.utterances += 1
+
+        try:
+            async with deadline.stage("stt"):
+                # Decoded first: VAD only analyzes PCM
+                audio_data, mimetype = await dsp_stage.prepare_for_stt(audio_data)
+                audio_data = detect_speech(audio_data, metrics)
+                if audio_data is None:
+                    metrics.total_end = time.time()
+                    return metrics
+                metrics.stt_start = time.time()
+                transcript = await stt_service.transcribe(
+                    audio_data=audio_data,
+                    language=context.stt_language(),
+                    mimetype=mimetype,
+                )
+                metrics.stt_end = time.time()
+        except DeadlineExceeded as e:
+            metrics.dropped = e.stage
+            metrics.total_end = time.time()
+            await self._send(
+                list(self.listeners.values()),
+                {"type": "dropped", "data": e.summary(), "speaker_id": speaker_id},
+            )
+            return metrics
+        self._stats.stt_calls += 1
+
+        if not transcript.strip():
+            metrics.total_end = time.time()
+            return metrics
+        context = context.for_transcript(transcript)
+
+        await self._send(
+            list(self.listeners.values()),
+            {"type": "transcript", "data": transcript, "speaker_id": speaker_id},
+        )
+
+        # Group the audience by language; same-language listeners hear the speaker directly
+        by_language: dict[str, list[Listener]] = {}
+        for listener in self.listeners.values():
+            if listener.user_id == speaker_id or listener.language == context.source_language:
+                continue
+            by_language.setdefault(listener.language, []).append(listener)
+
+        await asyncio.gather(*(
+            self._deliver_language(
+                language, audience, transcript, context, voice_id, speaker_id, metrics, deadline
+            )
+            for language, audience in by_language.items()
+        ))
+
+        metrics.total_end = time.time()
+        # One sample per utterance; the target side is the whole audience
+        latency_registry.observe(metrics, context.source_language, "group")
+        return metrics
+
+    async def _deliver_language(
+        self,
+        language: str,
+        audience: list[Listener],
+        transcript: str,
+        context: TranslationContext,
+        speaker_voice_id: str | None,
+        speaker_id: str,
+        metrics: PipelineMetrics,
+        deadline: Deadline,
+    ) -> None:
+        by_voice: dict[str | None, list[Listener]] = {}
+        for listener in audience:
+            by_voice.setdefault(listener.voice_id or speaker_voice_id, []).append(listener)
+
+        self._stats.translations += 1
+        self._stats.tts_streams += len(by_voice)
+        self._stats.deliveries += len(audience)
+
+        # One stream serves every listener — keep the provider's default format
+        target_context = replace(context, target_language=language, audio_format=DEFAULT_FORMAT)
+        streams: dict[str, int] = {}  # listener_id -> binary audio stream id
+        try:
+            async for event in pipeline.translate_and_speak(
+                transcript,
+                target_context,
+                speaker_voice_id,
+                metrics,
+                voices=list(by_voice),
+                deadline=deadline,
+            ):
+                if event["type"] == "audio":
+                    await self._send_audio(by_voice[event["voice_id"]], event, speaker_id, streams)
+                else:
+                    await self._send(audience, {**event, "speaker_id": speaker_id})
+        except DeadlineExceeded as e:
+            await self._send(
+                audience, {"type": "dropped", "data": e.summary(), "speaker_id": speaker_id}
+            )
+        except Exception as e:
+            logger.warning("Fan-out to %s failed for call %s: %s", language, self.call_id, e)
+            await self._send(audience, {"type": "error", "data": str(e), "speaker_id": speaker_id})
+        finally:
+            for listener in audience:
+                if listener.listener_id in streams:
+                    try:
+                        await listener.audio_writer.end(streams[listener.listener_id])
+                    except Exception:
+                        pass
+
+    async def _send_audio(
+        self, listeners: list[Listener], event: dict, speaker_id: str, streams: dict[str, int]
+    ) -> None:
+        """Raw binary frames to listeners that support them; base64 (encoded once) to the rest."""
+        encoded = None
+        for listener in listeners:
+            try:
+                if writer := listener.audio_writer:
+                    stream_id = streams.get(listener.listener_id)
+                    if stream_id is None:
+                        stream_id = await writer.open_stream(speaker_id=speaker_id)
+                        streams[listener.listener_id] = stream_id
+                    await writer.send(stream_id, event["data"])
+                else:
+                    if encoded is None:
+                        encoded = base64.b64encode(event["data"]).decode()
+                    await listener.send(
+                        {"type": "audio", "data": encoded, "speaker_id": speaker_id}
+                    )
+            except Exception:
+                # Dead connection — its /ws handler will unregister it
+                pass
+
+    async def _send(self, listeners: list[Listener], message: dict) -> None:
+        for listener in listeners:
+            try:
+                await listener.send(message)
+            except Exception:
+                # Dead connection — its /ws handler will unregister it
+                pass
+
+
+class CallFanoutService:
+    """Registry of active call fan-outs."""
+
+    def __init__(self):
+        self._calls: dict[str, CallFanout] = {}
+        self.stats = FanoutStats()
+
+    def join(self, call_id: str, listener: Listener) -> CallFanout:
+        fanout = self._calls.get(call_id)
+        if fanout is None:
+            fanout = self._calls[call_id] = CallFanout(call_id, self.stats)
+        fanout.listeners[listener.listener_id] = listener
+        return fanout
+
+    def leave(self, call_id: str, listener_id: str) -> None:
+        fanout = self._calls.get(call_id)
+        if not fanout:
+            return
+        fanout.listeners.pop(listener_id, None)
+        if not fanout.listeners:
+            del self._calls[call_id]
+
+    def get(self, call_id: str) -> CallFanout | None:
+        return self._calls.get(call_id)
+
+
+# Singleton
+call_fanout_service = CallFanoutService()
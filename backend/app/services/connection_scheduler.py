@@ -0,0 +1,194 @@
+"""Per-connection work scheduler for the /ws receive loop.
+
+The receive loop must never block on the STT → LLM → TTS round trip, or
+pings, typing indicators and chat messages queue up behind it and clients
+time out and reconnect. Each connection gets two lanes:
+
+  audio   — bounded queue, processed one utterance at a time; when it fills
+            up or entries go stale the overflow policy decides what to do
+  control — FIFO lane for chat messages and other DB-bound work, so chat
+            ordering is preserved without waiting on audio
+
+Cheap messages (ping, typing, config) stay inline in the receive loop.
+
+Overflow policies:
+  drop_oldest — discard the oldest queued audio (default; favours "live")
+  drop_newest — reject the incoming frame, keep what is queued
+  merge       — append to the newest queued entry; only headerless PCM
+                concatenates into valid audio, so containers (WAV, webm,
+                ogg, ...) are handled as drop_oldest instead
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from app.config import get_settings
+from app.services.audio_dsp import audio_mimetype
+from app.services.deadlines import Deadline, current_deadline
+
+logger = logging.getLogger(__name__)
+
+AUDIO_POLICIES = ("drop_oldest", "drop_newest", "merge")
+MAX_AUDIO_QUEUE_SIZE = 32
+
+
+def _queue_size(value) -> int | None:
+    """A queue size clamped to 1..MAX_AUDIO_QUEUE_SIZE; None if it isn't a number."""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return None
+    return min(max(size, 1), MAX_AUDIO_QUEUE_SIZE)
+
+
+def _mergeable(data: bytes) -> bool:
+    """Headerless PCM — chunks that still decode once concatenated."""
+    return audio_mimetype(data) == "application/octet-stream"
+
+
+@dataclass
+class _AudioJob:
+    data: bytes
+    enqueued_at: float
+
+
+class ConnectionScheduler:
+    """Two-lane scheduler owned by a single WebSocket connection."""
+
+    def __init__(
+        self,
+        handle_audio: Callable[[bytes], Awaitable[None]],
+        on_error: Callable[[Exception], Awaitable[None]],
+        notify: Callable[[dict], Awaitable[None]],
+        queue_size: int | None = None,
+        policy: str | None = None,
+        max_age_ms: int | None = None,
+    ):
+        settings = get_settings()
+        self._handle_audio = handle_audio
+        self._on_error = on_error
+        self._notify = notify
+        self.queue_size = _queue_size(queue_size or settings.ws_audio_queue_size) or 1
+        self.policy = policy if policy in AUDIO_POLICIES else settings.ws_audio_policy
+        self.max_age_ms = max_age_ms or settings.ws_audio_max_age_ms
+
+        self._audio: deque[_AudioJob] = deque()
+        self._audio_ready = asyncio.Event()
+        self._control: asyncio.Queue[Callable[[], Awaitable[None]]] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+        self.dropped = 0
+        self.merged = 0
+
+    def configure(self, policy: str | None = None, queue_size: int | None = None) -> None:
+        """Per-connection overrides from the client's config message; invalid values are ignored."""
+        if policy in AUDIO_POLICIES:
+            self.policy = policy
+        if queue_size is not None and (size := _queue_size(queue_size)):
+            self.queue_size = size
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._audio_worker()),
+            asyncio.create_task(self._control_worker()),
+        ]
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @property
+    def audio_backlog(self) -> int:
+        return len(self._audio)
+
+    # ── Submission (called from the receive loop — never blocks on work) ──
+
+    async def submit_audio(self, data: bytes) -> None:
+        if len(self._audio) >= self.queue_size:
+            if self.policy == "drop_newest":
+                await self._report_drop(1, "queue_full")
+                return
+            if self.policy == "merge" and _mergeable(self._audio[-1].data) and _mergeable(data):
+                self._audio[-1].data += data
+                self.merged += 1
+                return
+            self._audio.popleft()
+            await self._report_drop(1, "queue_full")
+
+        self._audio.append(_AudioJob(data, time.monotonic()))
+        self._audio_ready.set()
+
+    def submit_control(self, job: Callable[[], Awaitable[None]]) -> None:
+        self._control.put_nowait(job)
+
+    # ── Workers ──
+
+    def _take_audio(self) -> tuple[bytes, float, int]:
+        """
+        Pop the next payload, applying the stale policy.
+        Returns (data, enqueued_at, stale_dropped).
+        """
+        cutoff = time.monotonic() - self.max_age_ms / 1000
+        stale = 0
+
+        merge = self.policy == "merge" and all(_mergeable(job.data) for job in self._audio)
+        if merge and len(self._audio) > 1 and self._audio[0].enqueued_at < cutoff:
+            merged = b"".join(job.data for job in self._audio)
+            enqueued_at = self._audio[0].enqueued_at
+            self.merged += len(self._audio) - 1
+            self._audio.clear()
+            return merged, enqueued_at, 0
+
+        if self.policy == "drop_oldest" or (self.policy == "merge" and not merge):
+            # Keep at least the newest entry — something should still be said
+            while len(self._audio) > 1 and self._audio[0].enqueued_at < cutoff:
+                self._audio.popleft()
+                stale += 1
+
+        job = self._audio.popleft()
+        return job.data, job.enqueued_at, stale
+
+    async def _audio_worker(self) -> None:
+        while True:
+            await self._audio_ready.wait()
+            data, enqueued_at, stale = self._take_audio()
+            if not self._audio:
+                self._audio_ready.clear()
+            if stale:
+                await self._report_drop(stale, "stale")
+            # Time spent queued counts against the utterance's deadline
+            token = current_deadline.set(Deadline.start(started_at=enqueued_at))
+            try:
+                await self._handle_audio(data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await self._on_error(e)
+            finally:
+                current_deadline.reset(token)
+
+    async def _control_worker(self) -> None:
+        while True:
+            job = await self._control.get()
+            try:
+                await job()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await self._on_error(e)
+
+    async def _report_drop(self, count: int, reason: str) -> None:
+        self.dropped += count
+        logger.debug("Dropped %d audio chunk(s): %s", count, reason)
+        try:
+            await self._notify({
+                "type": "audio_dropped",
+                "data": {"count": count, "reason": reason, "policy": self.policy},
+            })
+        except Exception:
+            pass
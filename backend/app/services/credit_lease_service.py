@@ -0,0 +1,283 @@
+"""Credit reservation leases — bill pipeline chunks without a DB round trip each.
+
+Instead of a balance check and a deduction (plus a ledger row) per audio
+chunk, a user's first chunk reserves a block of credits: the block moves
+from CreditBalance.balance_cents into reserved_cents in one transaction.
+Later chunks are charged against the lease in memory. The lease settles
+— one CreditTransaction for everything used, the rest returned to the
+balance — when it runs out, expires, or the session/call ends.
+
+No overdraft: a lease never charges more than it reserved, and reserving
+only moves credits that exist.
+
+Crash safety: every lease is mirrored in Redis (sorted set by expiry +
+a hash with its usage). A reaper settles leases whose owner vanished.
+Settlement is claimed by removing the lease from the sorted set, so a
+lease is settled exactly once even with several backend instances.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from app.config import get_settings
+from app.models.database import async_session
+from app.services.credit_service import credit_service
+from app.services.redis_service import redis_service
+
+logger = logging.getLogger(__name__)
+
+_LEASES_KEY = "credit_leases"  # zset: lease_id -> expires_at
+_LEASE_KEY = "credit_lease:{}"  # hash: user_id, reserved, used, chunks
+REAPER_INTERVAL_SECONDS = 60
+
+
+@dataclass
+class CreditLease:
+    """A block of reserved credits owned by this process."""
+
+    user_id: str
+    reserved_cents: int
+    expires_at: float
+    lease_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    used_cents: int = 0
+    chunks: int = 0
+    language_pairs: dict[str, int] = field(default_factory=dict)
+    mirrored: bool = False  # registered in Redis (reaper-visible)
+
+    @property
+    def remaining_cents(self) -> int:
+        return self.reserved_cents - self.used_cents
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+
+@dataclass
+class LeaseStats:
+    reservations: int = 0
+    settlements: int = 0
+    charges: int = 0  # chunks billed from memory instead of a DB deduction
+    rejected: int = 0  # charges refused for lack of credits
+    active: int = 0
+
+    def summary(self) -> dict:
+        return {
+            "reservations": self.reservations,
+            "settlements": self.settlements,
+            "charges": self.charges,
+            "rejected": self.rejected,
+            "active": self.active,
+        }
+
+
+class CreditLeaseService:
+    """Per-process lease registry, one active lease per user."""
+
+    def __init__(self):
+        self._leases: dict[str, CreditLease] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._reaper: asyncio.Task | None = None
+        self.stats = LeaseStats()
+
+    async def charge(
+        self, user_id, db, amount_cents: int, language_pair: str = ""
+    ) -> str | None:
+        """
+        Charge amount_cents against the user's lease, reserving a new block
+        when there is no lease or it is expired/exhausted.
+        Returns the id of the lease charged (for refund()), or None (charges
+        nothing) if the user cannot cover it.
+        """
+        user_id = str(user_id)
+        async with self._locks.setdefault(user_id, asyncio.Lock()):
+            lease = self._leases.get(user_id)
+            if lease and (lease.expired or lease.remaining_cents < amount_cents):
+                await self._settle(lease, db)
+                lease = None
+            if lease is None:
+                lease = await self._acquire(user_id, db, amount_cents)
+                if lease is None:
+                    self.stats.rejected += 1
+                    return None
+
+            lease.used_cents += amount_cents
+            lease.chunks += 1
+            if language_pair:
+                lease.language_pairs[language_pair] = lease.language_pairs.get(language_pair, 0) + 1
+            self.stats.charges += 1
+            await self._mirror_usage(lease)
+            return lease.lease_id
+
+    async def refund(self, user_id, lease_id: str, amount_cents: int) -> None:
+        """
+        Undo a charge for work that produced nothing (e.g. empty transcript).
+        A no-op once the lease it was charged to has settled — the refund
+        must not come out of a newer lease.
+        """
+        user_id = str(user_id)
+        async with self._locks.setdefault(user_id, asyncio.Lock()):
+            lease = self._leases.get(user_id)
+            if lease is None or lease.lease_id != lease_id:
+                return
+            lease.used_cents = max(0, lease.used_cents - amount_cents)
+            lease.chunks = max(0, lease.chunks - 1)
+            await self._mirror_usage(lease)
+
+    async def release(self, user_id, db=None) -> None:
+        """Settle the user's lease now (session or call ended)."""
+        user_id = str(user_id)
+        lease = self._leases.get(user_id)
+        if not lease:
+            return
+        async with self._locks.setdefault(user_id, asyncio.Lock()):
+            if self._leases.get(user_id) is lease:
+                await self._settle(lease, db)
+
+    # ── Lifecycle ──
+
+    def start_reaper(self) -> None:
+        self._reaper = asyncio.create_task(self._reap_forever())
+
+    async def shutdown(self) -> None:
+        """Stop the reaper and settle every lease this process holds."""
+        if self._reaper:
+            self._reaper.cancel()
+            await asyncio.gather(self._reaper, return_exceptions=True)
+            self._reaper = None
+        for user_id in list(self._leases):
+            await self.release(user_id)
+
+    async def reap(self) -> None:
+        """Settle our expired leases, then orphans left behind by dead processes."""
+        for user_id, lease in list(self._leases.items()):
+            if lease.expired:
+                await self.release(user_id)
+
+        grace = get_settings().credit_lease_ttl_seconds
+        try:
+            orphans = await redis_service.client.zrangebyscore(_LEASES_KEY, 0, time.time() - grace)
+        except Exception:
+            return
+        for lease_id in orphans:
+            await self._settle_orphan(lease_id)
+
+    # ── Internals ──
+
+    async def _acquire(self, user_id: str, db, min_cents: int) -> CreditLease | None:
+        settings = get_settings()
+        block = max(settings.credit_lease_block_cents, min_cents)
+        reserved = await credit_service.reserve(user_id, db, block, min_cents)
+        if not reserved:
+            return None
+
+        lease = CreditLease(
+            user_id=user_id,
+            reserved_cents=reserved,
+            expires_at=time.time() + settings.credit_lease_ttl_seconds,
+        )
+        self._leases[user_id] = lease
+        self.stats.reservations += 1
+        self.stats.active = len(self._leases)
+        try:
+            await redis_service.client.hset(_LEASE_KEY.format(lease.lease_id), mapping={
+                "user_id": user_id,
+                "reserved": lease.reserved_cents,
+                "used": 0,
+                "chunks": 0,
+            })
+            await redis_service.client.zadd(_LEASES_KEY, {lease.lease_id: lease.expires_at})
+            lease.mirrored = True
+        except Exception as e:
+            logger.warning("Credit lease %s not mirrored to Redis: %s", lease.lease_id, e)
+        return lease
+
+    async def _mirror_usage(self, lease: CreditLease) -> None:
+        try:
+            await redis_service.client.hset(
+                _LEASE_KEY.format(lease.lease_id),
+                mapping={"used": lease.used_cents, "chunks": lease.chunks},
+            )
+        except Exception:
+            pass  # Redis down — the in-memory lease is authoritative
+
+    async def _claim(self, lease_id: str) -> bool:
+        """Take ownership of settling a lease. False if someone else already did."""
+        try:
+            return bool(await redis_service.client.zrem(_LEASES_KEY, lease_id))
+        except Exception:
+            return True  # Redis down — we hold the lease, settle it
+
+    async def _settle(self, lease: CreditLease, db=None) -> None:
+        self._leases.pop(lease.user_id, None)
+        self.stats.active = len(self._leases)
+        if lease.mirrored and not await self._claim(lease.lease_id):
+            return  # a reaper already settled it from the Redis mirror
+        pairs = ", ".join(f"{pair} ×{n}" for pair, n in lease.language_pairs.items())
+        await self._write_settlement(
+            lease.user_id,
+            db,
+            lease.reserved_cents,
+            lease.used_cents,
+            description=f"Translation — {lease.chunks} chunks" + (f" ({pairs})" if pairs else ""),
+            metadata={
+                "lease_id": lease.lease_id,
+                "chunks": lease.chunks,
+                "language_pairs": lease.language_pairs,
+            },
+        )
+        try:
+            await redis_service.client.delete(_LEASE_KEY.format(lease.lease_id))
+        except Exception:
+            pass
+
+    async def _settle_orphan(self, lease_id: str) -> None:
+        try:
+            data = await redis_service.client.hgetall(_LEASE_KEY.format(lease_id))
+        except Exception:
+            return
+        if not data or not await self._claim(lease_id):
+            return
+        chunks = int(data.get("chunks", 0))
+        await self._write_settlement(
+            data["user_id"],
+            None,
+            int(data.get("reserved", 0)),
+            int(data.get("used", 0)),
+            description=f"Translation — {chunks} chunks (recovered lease)",
+            metadata={"lease_id": lease_id, "chunks": chunks, "recovered": True},
+        )
+        await redis_service.client.delete(_LEASE_KEY.format(lease_id))
+
+    async def _write_settlement(
+        self, user_id: str, db, reserved: int, used: int, description: str, metadata: dict
+    ) -> None:
+        kwargs = dict(
+            user_id=user_id,
+            reserved_cents=reserved,
+            used_cents=used,
+            transaction_type="pipeline",
+            description=description,
+            metadata=metadata,
+        )
+        if db is not None:
+            await credit_service.settle_reservation(db=db, **kwargs)
+        else:
+            async with async_session() as session:
+                await credit_service.settle_reservation(db=session, **kwargs)
+        self.stats.settlements += 1
+
+    async def _reap_forever(self) -> None:
+        while True:
+            await asyncio.sleep(REAPER_INTERVAL_SECONDS)
+            try:
+                await self.reap()
+            except Exception as e:
+                logger.warning("Credit lease reaper failed: %s", e)
+
+
+# Singleton
+credit_lease_service = CreditLeaseService()
@@ -90,6 +90,74 @@ class CreditService:
         )
         return True
 
+    async def reserve(self, user_id, db: AsyncSession, amount_cents: int, min_cents: int) -> int:
+        """
+        Move up to amount_cents from the spendable balance into reserved_cents.
+        Reserves nothing unless at least min_cents are available.
+        Returns the amount actually reserved.
+        """
+        result = await db.execute(
+            select(CreditBalance).where(CreditBalance.user_id == user_id).with_for_update()
+        )
+        bal = result.scalar_one_or_none()
+
+        if not bal or bal.balance_cents < min_cents:
+            await db.rollback()
+            return 0
+
+        block = min(bal.balance_cents, amount_cents)
+        bal.balance_cents -= block
+        bal.reserved_cents = (bal.reserved_cents or 0) + block
+        bal.updated_at = datetime.utcnow()
+        await db.commit()
+        return block
+
+    async def settle_reservation(
+        self,
+        user_id,
+        db: AsyncSession,
+        reserved_cents: int,
+        used_cents: int,
+        transaction_type: str,
+        description: str = "",
+        metadata: dict | None = None,
+    ) -> None:
+        """
+        Close a reservation: charge used_cents (one ledger row), return the rest
+        to the spendable balance.
+        """
+        result = await db.execute(
+            select(CreditBalance).where(CreditBalance.user_id == user_id).with_for_update()
+        )
+        bal = result.scalar_one_or_none()
+        if not bal:
+            await db.rollback()
+            return
+
+        used_cents = min(used_cents, reserved_cents)
+        bal.reserved_cents = max(0, (bal.reserved_cents or 0) - reserved_cents)
+        bal.balance_cents += reserved_cents - used_cents
+        bal.total_used_cents += used_cents
+        bal.updated_at = datetime.utcnow()
+
+        if used_cents:
+            db.add(CreditTransaction(
+                credit_balance_id=bal.id,
+                amount_cents=-used_cents,
+                transaction_type=transaction_type,
+                description=description,
+                metadata_json=metadata or {},
+            ))
+        await db.commit()
+
+        logger.info(
+            "Settled reservation for user %s: used %d of %d cents (type=%s)",
+            user_id,
+            used_cents,
+            reserved_cents,
+            transaction_type,
+        )
+
     async def deduct_pipeline(
         self,
         user_id,
@@ -0,0 +1,104 @@
+"""Per-utterance deadlines carried through STT → translation → TTS.
+
+Audio that arrives too late to be useful is worse than no audio: the
+conversation has moved on, and every provider call made for it is wasted
+spend. Each utterance gets one end-to-end budget (utterance_deadline_ms),
+counted from the moment it was queued on the connection, and every stage
+runs under whatever is left of it:
+
+    stage(name)  — refuses to start a stage with less than
+                   deadline_min_stage_ms left, and cancels the stage (and
+                   its provider call) when the budget runs out
+    wait(aw)     — the same for a single await inside a streaming stage
+
+Both raise DeadlineExceeded — only when the budget itself ran out; a
+TimeoutError from inside (a provider's own timeout, a hedge) propagates
+unchanged. The pipeline turns it into a `dropped` event for the client.
+The connection scheduler sets the ambient deadline (current_deadline) so
+queueing time counts against the budget too.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TypeVar
+
+from app.config import get_settings
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(Exception):
+    """An utterance ran out of budget; its remaining work was dropped."""
+
+    def __init__(self, stage: str, budget_ms: float, late_ms: float):
+        super().__init__(f"Deadline exceeded in {stage} ({budget_ms:.0f} ms budget)")
+        self.stage = stage
+        self.budget_ms = budget_ms
+        self.late_ms = late_ms
+
+    def summary(self) -> dict:
+        return {
+            "reason": "deadline",
+            "stage": self.stage,
+            "budget_ms": round(self.budget_ms),
+            "late_ms": round(self.late_ms, 1),
+        }
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """Absolute deadline on the monotonic clock."""
+
+    expires_at: float
+    budget_ms: float
+
+    @classmethod
+    def start(cls, budget_ms: float | None = None, started_at: float | None = None) -> "Deadline":
+        """A budget counted from `started_at` (monotonic; default now)."""
+        if budget_ms is None:
+            budget_ms = get_settings().utterance_deadline_ms
+        started_at = time.monotonic() if started_at is None else started_at
+        return cls(started_at + budget_ms / 1000, budget_ms)
+
+    def remaining_ms(self) -> float:
+        return (self.expires_at - time.monotonic()) * 1000
+
+    def check(self, stage: str, min_ms: float | None = None) -> None:
+        """Raise DeadlineExceeded unless at least `min_ms` is left."""
+        if min_ms is None:
+            min_ms = get_settings().deadline_min_stage_ms
+        remaining = self.remaining_ms()
+        if remaining < min_ms:
+            raise DeadlineExceeded(stage, self.budget_ms, max(0.0, -remaining))
+
+    @asynccontextmanager
+    async def stage(self, name: str):
+        """Run a stage under the remaining budget."""
+        self.check(name)
+        budget = asyncio.timeout(self.remaining_ms() / 1000)
+        try:
+            async with budget:
+                yield
+        except TimeoutError:
+            if not budget.expired():
+                raise  # timed out inside the stage, not out of budget
+            raise DeadlineExceeded(name, self.budget_ms, max(0.0, -self.remaining_ms())) from None
+
+    async def wait(self, aw: Awaitable[T], stage: str) -> T:
+        """Await one step of a streaming stage under the remaining budget."""
+        budget = asyncio.timeout(max(0.0, self.remaining_ms() / 1000))
+        try:
+            async with budget:
+                return await aw
+        except TimeoutError:
+            if not budget.expired():
+                raise
+            raise DeadlineExceeded(stage, self.budget_ms, max(0.0, -self.remaining_ms())) from None
+
+
+# Deadline of the utterance being processed by the current task, if any
+current_deadline: ContextVar[Deadline | None] = ContextVar("current_deadline", default=None)
@@ -5,9 +5,8 @@ import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
-import httpx
-
 from app.config import get_settings
+from app.services.http_clients import http_clients, http_timeout
 
 logger = logging.getLogger(__name__)
 
@@ -86,29 +85,29 @@ class EmailService:
 
     async def _send_sendgrid(self, to_email: str, subject: str, html_body: str) -> bool:
         """Send via SendGrid v3 API."""
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                "https://api.sendgrid.com/v3/mail/send",
-                headers={
-                    "Authorization": f"Bearer {self._settings.sendgrid_api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "personalizations": [{"to": [{"email": to_email}]}],
-                    "from": {
-                        "email": self._settings.email_from_address,
-                        "name": self._settings.email_from_name,
-                    },
-                    "subject": subject,
-                    "content": [{"type": "text/html", "value": html_body}],
+        client = http_clients.get("sendgrid")
+        resp = await client.post(
+            "https://api.sendgrid.com/v3/mail/send",
+            headers={
+                "Authorization": f"Bearer {self._settings.sendgrid_api_key}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "personalizations": [{"to": [{"email": to_email}]}],
+                "from": {
+                    "email": self._settings.email_from_address,
+                    "name": self._settings.email_from_name,
                 },
-                timeout=10.0,
-            )
-            if resp.status_code in (200, 202):
-                logger.info("Email sent to %s via SendGrid", to_email)
-                return True
-            logger.error("SendGrid error %d: %s", resp.status_code, resp.text)
-            return False
+                "subject": subject,
+                "content": [{"type": "text/html", "value": html_body}],
+            },
+            timeout=http_timeout(10.0),
+        )
+        if resp.status_code in (200, 202):
+            logger.info("Email sent to %s via SendGrid", to_email)
+            return True
+        logger.error("SendGrid error %d: %s", resp.status_code, resp.text)
+        return False
 
     def _send_smtp(self, to_email: str, subject: str, html_body: str) -> bool:
         """Send via SMTP (synchronous)."""
@@ -0,0 +1,181 @@
+"""Glossary term matching — only terms that occur in the text go into the prompt.
+
+Industry glossaries run to thousands of terms, and a sentence uses a handful
+of them. Each glossary is compiled once into an Aho-Corasick automaton
+(cached by glossary hash, glossary_matcher_cache_size of them) that finds
+every term occurring in a text in a single pass over it:
+
+    relevant_glossary(glossary, text)  — the subset to put in the prompt
+    missing_terms(terms, translation)  — required target terms the output lacks
+                                         (the optional glossary_verify post-pass)
+
+Matching is case-insensitive and whitespace-normalized. Terms that start or
+end in a space-delimited script (Latin, Cyrillic, Arabic, Devanagari, ...)
+must match whole words — "art" doesn't fire inside "start"; Thai, CJK and
+other unspaced scripts match anywhere.
+"""
+
+import hashlib
+import json
+import unicodedata
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+
+from app.config import get_settings
+
+# Scripts before Thai (U+0E00) separate words with spaces
+_UNSPACED_SCRIPTS_FROM = 0x0E00
+
+
+def _fold(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text).lower().split())
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() and ord(ch) < _UNSPACED_SCRIPTS_FROM
+
+
+def glossary_hash(glossary: dict[str, str]) -> str:
+    raw = json.dumps(sorted(glossary.items()), ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+class GlossaryMatcher:
+    """Aho-Corasick automaton over one glossary's source terms."""
+
+    def __init__(self, glossary: dict[str, str]):
+        self.glossary = dict(glossary)
+        self._terms: list[str] = []  # glossary keys, by output index
+        self._lengths: list[int] = []  # folded term lengths
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+
+        for term in self.glossary:
+            needle = _fold(term)
+            if not needle:
+                continue
+            node = 0
+            for ch in needle:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(len(self._terms))
+            self._terms.append(term)
+            self._lengths.append(len(needle))
+
+        # Failure links, breadth first: the longest proper suffix that is also a prefix
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0  # root's children
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def find(self, text: str) -> list[str]:
+        """Glossary terms occurring in `text`, in glossary order."""
+        haystack = _fold(text)
+        found: set[int] = set()
+        node = 0
+        for end, ch in enumerate(haystack):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for index in self._out[node]:
+                if index not in found and self._whole_word(haystack, end, self._lengths[index]):
+                    found.add(index)
+        return [self._terms[i] for i in sorted(found)]
+
+    @staticmethod
+    def _whole_word(haystack: str, end: int, length: int) -> bool:
+        start, after = end - length + 1, end + 1
+        before = haystack[start - 1] if start > 0 else " "
+        following = haystack[after] if after < len(haystack) else " "
+        if _is_word_char(haystack[start]) and _is_word_char(before):
+            return False
+        return not (_is_word_char(haystack[end]) and _is_word_char(following))
+
+
+@dataclass
+class GlossaryStats:
+    matchers_built: int = 0
+    prompts: int = 0  # prompts built from a glossary
+    terms_available: int = 0  # glossary terms those prompts could have carried
+    terms_injected: int = 0  # terms that matched and went into the prompt
+    verified: int = 0  # translations checked by the post-pass
+    missing_terms: int = 0  # required target terms absent from the output
+    retries: int = 0
+
+    def summary(self) -> dict:
+        return {
+            "matchers_built": self.matchers_built,
+            "prompts": self.prompts,
+            "terms_available": self.terms_available,
+            "terms_injected": self.terms_injected,
+            "verified": self.verified,
+            "missing_terms": self.missing_terms,
+            "retries": self.retries,
+        }
+
+
+class GlossaryMatchers:
+    """Compiled matchers, LRU by glossary hash."""
+
+    def __init__(self, max_size: int | None = None):
+        self.max_size = max_size or get_settings().glossary_matcher_cache_size
+        self.stats = GlossaryStats()
+        self._matchers: OrderedDict[str, GlossaryMatcher] = OrderedDict()
+
+    def get(self, glossary: dict[str, str]) -> GlossaryMatcher:
+        key = glossary_hash(glossary)
+        matcher = self._matchers.get(key)
+        if matcher is not None:
+            self._matchers.move_to_end(key)
+            return matcher
+        matcher = self._matchers[key] = GlossaryMatcher(glossary)
+        self.stats.matchers_built += 1
+        while len(self._matchers) > self.max_size:
+            self._matchers.popitem(last=False)
+        return matcher
+
+    def relevant(self, glossary: dict[str, str] | None, text: str) -> dict[str, str]:
+        """The part of `glossary` whose source terms occur in `text`."""
+        if not glossary:
+            return {}
+        terms = self.get(glossary).find(text)
+        self.stats.prompts += 1
+        self.stats.terms_available += len(glossary)
+        self.stats.terms_injected += len(terms)
+        return {term: glossary[term] for term in terms}
+
+    def missing(self, terms: dict[str, str], translation: str) -> dict[str, str]:
+        """Required terms whose target wording doesn't appear in the translation."""
+        output = _fold(translation)
+        missing = {k: v for k, v in terms.items() if _fold(v) and _fold(v) not in output}
+        self.stats.verified += 1
+        self.stats.missing_terms += len(missing)
+        return missing
+
+
+glossary_matchers = GlossaryMatchers()
+
+
+def relevant_glossary(glossary: dict[str, str] | None, text: str) -> dict[str, str]:
+    return glossary_matchers.relevant(glossary, text)
+
+
+def missing_terms(terms: dict[str, str], translation: str) -> dict[str, str]:
+    return glossary_matchers.missing(terms, translation)
@@ -0,0 +1,217 @@
+"""Hedged requests — race a second provider when the first one is slow.
+
+A slow-but-successful primary sets the tail latency: plain fallback only
+helps when the primary fails. A hedged call starts the primary, and if it
+hasn't answered after the hedge delay, starts the secondary alongside it.
+The first good answer wins and the other is cancelled.
+
+    hedge delay  — the primary's recent latency at `percentile` (p95 by
+                   default), clamped to [min_delay_ms, max_delay_ms]; until
+                   enough samples exist the max is used
+    budget       — requests estimated above `max_tokens` are never hedged
+                   (duplicating them costs too much)
+    rate cap     — process-wide token bucket shared by all hedgers: every
+                   request earns `max_rate` tokens, every hedge spends one,
+                   so hedges stay under max_rate × requests
+
+A primary that fails (or answers empty) before the delay still falls back
+to the secondary straight away — that is not counted against the cap.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from app.config import get_settings
+
+MIN_SAMPLES = 20  # below this the percentile is noise — use max_delay_ms
+WINDOW = 512  # latency samples kept per provider
+BURST = 10  # hedges that may fire back to back after a quiet spell
+
+Provider = tuple[str, Callable[[], Awaitable[Any]]]
+
+
+@dataclass
+class HedgeStats:
+    requests: int = 0
+    hedged: int = 0  # secondary started while the primary was still running
+    hedge_wins: int = 0  # ...and the secondary answered first
+    fallbacks: int = 0  # secondary started because the primary failed
+    throttled: int = 0  # hedge skipped by the global rate cap
+    over_budget: int = 0  # hedge skipped by the per-request budget
+
+    def summary(self) -> dict:
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": round(self.hedged / self.requests, 4) if self.requests else 0.0,
+            "fallbacks": self.fallbacks,
+            "throttled": self.throttled,
+            "over_budget": self.over_budget,
+        }
+
+
+class HedgeBudget:
+    """Global token bucket capping hedges to a fraction of requests."""
+
+    def __init__(self, max_rate: float | None = None, burst: int = BURST):
+        if max_rate is None:
+            max_rate = get_settings().translation_hedge_max_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.tokens = float(burst)
+
+    def earn(self) -> None:
+        self.tokens = min(self.burst, self.tokens + self.max_rate)
+
+    def spend(self) -> bool:
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+hedge_budget = HedgeBudget()
+
+
+class LatencyWindow:
+    """Last `size` latency samples of one provider."""
+
+    def __init__(self, size: int = WINDOW):
+        self.samples: deque[float] = deque(maxlen=size)
+
+    def record(self, value_ms: float) -> None:
+        self.samples.append(value_ms)
+
+    def percentile(self, q: float) -> float | None:
+        if len(self.samples) < MIN_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Hedger:
+    """Runs primary/secondary provider calls with hedging and fallback."""
+
+    def __init__(
+        self,
+        percentile: float | None = None,
+        min_delay_ms: int | None = None,
+        max_delay_ms: int | None = None,
+        max_tokens: int | None = None,
+        budget: HedgeBudget | None = None,
+    ):
+        settings = get_settings()
+        self.percentile = percentile or settings.translation_hedge_percentile
+        self.min_delay_ms = _default(min_delay_ms, settings.translation_hedge_min_delay_ms)
+        self.max_delay_ms = _default(max_delay_ms, settings.translation_hedge_max_delay_ms)
+        self.max_tokens = _default(max_tokens, settings.translation_hedge_max_tokens)
+        self.budget = budget or hedge_budget
+        self.latency: dict[str, LatencyWindow] = {}
+        self.stats = HedgeStats()
+
+    def delay_ms(self, provider: str) -> float:
+        window = self.latency.get(provider)
+        observed = window.percentile(self.percentile) if window else None
+        if observed is None:
+            return self.max_delay_ms
+        return min(self.max_delay_ms, max(self.min_delay_ms, observed))
+
+    def _record(self, provider: str, started: float) -> None:
+        elapsed_ms = (time.monotonic() - started) * 1000
+        self.latency.setdefault(provider, LatencyWindow()).record(elapsed_ms)
+
+    def _may_hedge(self, cost_tokens: int) -> bool:
+        if not get_settings().translation_hedge_enabled:
+            return False
+        if cost_tokens > self.max_tokens:
+            self.stats.over_budget += 1
+            return False
+        if not self.budget.spend():
+            self.stats.throttled += 1
+            return False
+        return True
+
+    async def run(
+        self,
+        primary: Provider,
+        secondary: Provider | None = None,
+        cost_tokens: int = 0,
+        hedge: bool = True,
+        accept: Callable[[Any], bool] = bool,
+        discard: Callable[[Any], Awaitable[None]] | None = None,
+    ) -> tuple[str, Any]:
+        """
+        Returns (provider name, result) of the first result `accept` approves.
+        If none is approved, the first result wins; if every call raised,
+        the first error is re-raised. `discard` disposes of results that
+        lost the race (e.g. closes an open stream).
+        """
+        self.stats.requests += 1
+        self.budget.earn()
+        started = time.monotonic()
+        primary_name = primary[0]
+        tasks: dict[asyncio.Task, str] = {asyncio.create_task(primary[1]()): primary_name}
+        pending_secondary = secondary
+        hedged = False
+        first_result: tuple[str, Any] | None = None
+        first_error: BaseException | None = None
+
+        try:
+            if secondary and hedge:
+                done, _ = await asyncio.wait(tasks, timeout=self.delay_ms(primary_name) / 1000)
+                if not done and self._may_hedge(cost_tokens):
+                    self.stats.hedged += 1
+                    tasks[asyncio.create_task(secondary[1]())] = secondary[0]
+                    pending_secondary = None
+                    hedged = True
+
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = tasks.pop(task)
+                    if task.exception() is not None:
+                        first_error = first_error or task.exception()
+                        continue
+                    result = task.result()
+                    if name == primary_name:
+                        self._record(name, started)
+                    if accept(result):
+                        if hedged and name != primary_name:
+                            self.stats.hedge_wins += 1
+                        if first_result and discard:
+                            await discard(first_result[1])
+                        return name, result
+                    if first_result is None:
+                        first_result = (name, result)
+                    elif discard:
+                        await discard(result)
+
+                if not tasks and pending_secondary:
+                    # Primary failed or came back empty before the hedge — plain fallback
+                    self.stats.fallbacks += 1
+                    tasks[asyncio.create_task(pending_secondary[1]())] = pending_secondary[0]
+                    pending_secondary = None
+
+            if first_result:
+                return first_result
+            raise first_error
+        finally:
+            for task, name in tasks.items():
+                if name == primary_name and not task.done():
+                    self._record(name, started)  # censored: at least this slow
+                task.cancel()
+            if tasks:
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+                if discard:
+                    for result in results:
+                        if not isinstance(result, BaseException):
+                            await discard(result)
+
+
+def _default(value, fallback):
+    return value if value is not None else fallback
@@ -0,0 +1,214 @@
+"""Shared outbound HTTP clients — one pooled client per provider.
+
+Opening an httpx.AsyncClient per call pays for a TCP + TLS handshake (and an
+SSL context build, ~25 ms of event-loop CPU) on every request. The registry
+keeps one long-lived client per provider instead:
+
+    deepgram, elevenlabs, openai, anthropic, sendgrid, webhooks
+
+Each has its own connection pool (http_max_connections / http_max_keepalive
+from Settings), keep-alive, and HTTP/2 when the `h2` package is installed
+(httpx[http2]). The OpenAI and Anthropic SDK clients are built once on top
+of the same pools.
+
+Created in the app lifespan, closed on shutdown. Used outside the app (tests,
+scripts) clients are created lazily on first use, and rebuilt if the event
+loop changed — a pooled connection can't outlive its loop.
+
+Pool saturation per provider (in-flight requests vs. pool size, peak, pool
+timeouts) is published on /health/metrics.
+"""
+
+import asyncio
+import importlib.util
+import logging
+from dataclasses import dataclass
+
+import httpx
+from anthropic import AsyncAnthropic
+from openai import AsyncOpenAI
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = ("deepgram", "elevenlabs", "openai", "anthropic", "sendgrid", "webhooks")
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def http_timeout(seconds: float) -> httpx.Timeout:
+    """Per-request read/write timeout; connect and pool waits stay as configured."""
+    settings = get_settings()
+    return httpx.Timeout(
+        seconds, connect=settings.http_connect_timeout_s, pool=settings.http_pool_timeout_s
+    )
+
+
+@dataclass
+class PoolStats:
+    max_connections: int
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    requests: int = 0
+    pool_timeouts: int = 0  # gave up waiting for a free connection
+
+    def started(self) -> None:
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finished(self) -> None:
+        self.in_flight -= 1
+
+    def summary(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "max_connections": self.max_connections,
+            "saturation": round(self.in_flight / self.max_connections, 3),
+            "peak_saturation": round(self.peak_in_flight / self.max_connections, 3),
+            "requests": self.requests,
+            "pool_timeouts": self.pool_timeouts,
+        }
+
+
+class _MeteredStream(httpx.AsyncByteStream):
+    """Response body wrapper — the request holds its connection until this closes."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, stats: PoolStats):
+        self._stream = stream
+        self._stats = stats
+        self._closed = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._closed:
+                self._closed = True
+                self._stats.finished()
+
+
+class _MeteredTransport(httpx.AsyncBaseTransport):
+    """Counts in-flight requests on a pooled transport."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, stats: PoolStats):
+        self._transport = transport
+        self._stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self._stats.started()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException as e:
+            if isinstance(e, httpx.PoolTimeout):
+                self._stats.pool_timeouts += 1
+            self._stats.finished()
+            raise
+        response.stream = _MeteredStream(response.stream, self._stats)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class HTTPClientRegistry:
+    """Process-wide pooled clients, one per provider."""
+
+    def __init__(self):
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._sdk: dict[tuple, object] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.stats: dict[str, PoolStats] = {}
+
+    def start(self) -> None:
+        """Open every provider's pool up front (app startup)."""
+        for provider in PROVIDERS:
+            self.get(provider)
+        http2 = HTTP2_AVAILABLE and get_settings().http2_enabled
+        logger.info("HTTP client pools ready (http2=%s)", http2)
+
+    def get(self, provider: str) -> httpx.AsyncClient:
+        self._check_loop()
+        client = self._clients.get(provider)
+        if client is None or client.is_closed:
+            client = self._clients[provider] = self._build(provider)
+            self._sdk = {k: v for k, v in self._sdk.items() if k[0] != provider}
+        return client
+
+    def openai(self) -> AsyncOpenAI:
+        """OpenAI SDK client on the shared pool (rebuilt if the key or endpoint changes)."""
+        settings = get_settings()
+        return self._sdk_client(
+            AsyncOpenAI,
+            "openai",
+            api_key=settings.openai_api_key,
+            base_url=settings.openai_base_url or None,
+        )
+
+    def anthropic(self) -> AsyncAnthropic:
+        return self._sdk_client(
+            AsyncAnthropic, "anthropic", api_key=get_settings().anthropic_api_key
+        )
+
+    async def close(self) -> None:
+        clients, self._clients = self._clients, {}
+        sdk_clients, self._sdk = self._sdk, {}
+        for client in clients.values():
+            await client.aclose()
+        for sdk in sdk_clients.values():
+            if sdk._client not in clients.values():
+                await sdk.close()
+
+    def snapshot(self) -> dict:
+        return {provider: stats.summary() for provider, stats in sorted(self.stats.items())}
+
+    def _sdk_client(self, cls, provider: str, **kwargs):
+        client = self.get(provider)
+        key = (provider, id(client), *kwargs.values())
+        if key not in self._sdk:
+            seconds = get_settings().http_timeout_s
+            try:
+                self._sdk[key] = cls(**kwargs, timeout=http_timeout(seconds), http_client=client)
+            except TypeError:
+                # SDK built on a different httpx distribution — it keeps its own
+                # (still long-lived) pool, outside the saturation metrics
+                logger.info("%s SDK can't share the %s pool", cls.__name__, provider)
+                self._sdk[key] = cls(**kwargs, timeout=seconds)
+        return self._sdk[key]
+
+    def _build(self, provider: str) -> httpx.AsyncClient:
+        settings = get_settings()
+        limits = httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive,
+            keepalive_expiry=settings.http_keepalive_expiry_s,
+        )
+        http2 = HTTP2_AVAILABLE and settings.http2_enabled
+        stats = self.stats.setdefault(provider, PoolStats(settings.http_max_connections))
+        transport = httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+        return httpx.AsyncClient(
+            transport=_MeteredTransport(transport, stats),
+            timeout=http_timeout(settings.http_timeout_s),
+        )
+
+    def _check_loop(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # created outside a loop (startup) — bound on first use
+        if self._loop is not loop:
+            if self._loop is not None and self._clients:
+                # Connections belong to the old loop; they can't be reused or closed from here
+                self._clients = {}
+                self._sdk.clear()
+            self._loop = loop
+
+
+# Singleton
+http_clients = HTTPClientRegistry()
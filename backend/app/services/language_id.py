@@ -0,0 +1,344 @@
+"""Local language identification — what a message or transcript is actually in.
+
+A user's preferred_language says what they read, not what they type: a Thai
+user writing English to English readers needs no translation. Detection is
+two-step and in-process (microseconds, no provider call):
+
+    script   — Thai, Hangul, kana, Han, Arabic, Devanagari and Cyrillic letters
+               name the language outright (kana + Han → ja, Han alone → zh)
+    trigrams — Latin-script text is scored against character-trigram profiles
+               built once (load(), at startup) from the samples below
+
+Detection only counts when confident: enough letters, a clear winner. Callers
+pass what they'd otherwise assume as `hint`, which wins whenever detection is
+unsure or lands in the hint's confusable group (id/ms, zh/ja on Han alone).
+
+Voice: a LanguageTracker keeps a speaker's recent detections, so STT gets a
+concrete language instead of "auto" (Deepgram detect_language is slower) —
+and every language_id_recheck utterances gets "auto" again, in case the
+speaker switched.
+"""
+
+import math
+import re
+from collections import Counter, deque
+from dataclasses import dataclass
+
+from app.config import get_settings
+
+# Frequent words per Latin-script language — enough trigrams to tell chat apart
+_SAMPLES = {
+    "en": (
+        "the and you that was for are with his they this have from one had word but not what "
+        "all were when your can said there use each which she how their will other about out "
+        "many then them these some her would make like him into time has look two more write "
+        "see number way could people than first been call who its now find long down day did "
+        "get come made may part thank thanks please hello okay tomorrow today meeting where "
+        "should know think just going want need good right here very much what's don't it's "
+        "to of in is it be on at as by we me my us so an or if no do go up our next week soon"
+    ),
+    "es": (
+        "que de no la el en los se del las por un para con una su al lo como más pero sus le "
+        "ya o este sí porque esta entre cuando muy sin sobre también me hasta hay donde quien "
+        "desde todo nos durante todos uno les ni contra otros ese eso ante ellos esto mí antes "
+        "algunos qué unos yo otro otras otra él tanto esa estos mucho quienes nada muchos cual "
+        "gracias hola mañana hoy reunión dónde tengo tienes quiero necesito bueno está están"
+    ),
+    "fr": (
+        "le de un être et à il avoir ne je son que se qui ce dans en du elle au pour pas vous "
+        "par sur faire plus dire me on mon lui nous comme mais pouvoir avec tout y aller voir "
+        "bien où sans tu ou leur homme si deux mari moi vouloir te femme venir quand grand "
+        "celui notre devoir là jour prendre même votre rien petit encore aussi quelque dont "
+        "merci bonjour demain aujourd'hui réunion c'est je suis est les des une très"
+    ),
+    "de": (
+        "der die und in den von zu das mit sich des auf für ist im dem nicht ein eine als "
+        "auch es an werden aus er hat dass sie nach wird bei einer um am sind noch wie einem "
+        "über einen so zum war haben nur oder aber vor zur bis mehr durch man sein wurde "
+        "sei ich wir ihr du mich dich heute morgen danke bitte hallo besprechung wo gut "
+        "können müssen wollen schon jetzt immer wieder sehr gibt geht machen"
+    ),
+    "pt": (
+        "de a o que e do da em um para é com não uma os no se na por mais as dos como mas "
+        "foi ao ele das tem à seu sua ou ser quando muito há nos já está eu também só pelo "
+        "pela até isso ela entre era depois sem mesmo aos ter seus quem nas me esse eles "
+        "estão você tinha foram essa num nem suas meu às minha têm numa pelos obrigado olá "
+        "amanhã hoje reunião onde preciso quero então não é isso"
+    ),
+    "it": (
+        "di che è e la il un a per non in una sono mi ho ma lo ha le si ti con cosa se io "
+        "come da ci questo qui hai bene sei del tu no me più al mio c'è solo della lei fatto "
+        "gli era molto sì niente perché lui anche tutto grazie ciao domani oggi riunione "
+        "dove sto voglio devo posso quando allora ancora stato sempre nostro questa quello"
+    ),
+    "nl": (
+        "de en van ik te dat die in een hij het niet zijn is was op aan met als voor had er "
+        "maar om hem dan zou of wat mijn men dit zo door over ze zich bij ook tot je mij uit "
+        "der daar haar naar heb hoe heeft hebben deze u want nog zal me zij nu ge geen omdat "
+        "iets worden toch al waren veel meer doen toen moet ben zonder kan hun dus alles "
+        "bedankt hallo morgen vandaag vergadering waar goed graag"
+    ),
+    "sv": (
+        "och i att det som en på är av för med till den har de inte om ett han men var jag "
+        "sig från vi så kan man när år säger hon under också efter eller nu sin där vid mot "
+        "ska skulle kommer ut får finns vara hade alla andra mycket än här då sedan över "
+        "bara in blir upp även vad få två vill ha många hur mer går sverige tack hej "
+        "imorgon idag möte var bra jättebra"
+    ),
+    "pl": (
+        "nie się i w na że z do to jest co jak ale tak o ja mi po za by już czy od jego tylko "
+        "ten może było być był ty jej dla mnie go jeszcze kiedy są bardzo mam tu tym teraz "
+        "wszystko więc nic też ich jestem gdzie ma można ze wiem żeby będzie dobrze dziękuję "
+        "cześć jutro dzisiaj spotkanie proszę chcę muszę który która które"
+    ),
+    "tr": (
+        "bir ve bu da de için ile çok ne ben o ama daha gibi var sen mi değil olarak en kadar "
+        "sonra her şey bana benim onun ki olan ya hiç şimdi nasıl evet hayır neden iyi bunu "
+        "biz siz onlar değil mi teşekkür ederim merhaba yarın bugün toplantı nerede istiyorum "
+        "lazım oldu olur yok burada şu çünkü diye ise"
+    ),
+    "id": (
+        "yang dan di itu dengan untuk tidak ini dari dalam akan pada juga saya ke karena "
+        "tersebut bisa ada mereka lebih kata tahun sudah atau saat oleh menjadi orang kami "
+        "telah secara hanya harus anda kita sebagai masih seperti hal bahwa banyak belum "
+        "terima kasih halo besok hari ini rapat di mana mau perlu sangat baik bagaimana"
+    ),
+    "ms": (
+        "yang dan di itu dengan untuk tidak ini dari dalam akan pada juga saya ke kerana "
+        "boleh ada mereka lebih kata tahun sudah atau semasa oleh menjadi orang kami telah "
+        "secara hanya perlu anda kita sebagai masih seperti hal bahawa banyak belum terima "
+        "kasih helo esok hari ini mesyuarat di mana mahu sangat baik bagaimana awak"
+    ),
+    "vi": (
+        "của và có là không được trong cho người những một các với đã này để khi đến cũng "
+        "như về từ thì nhiều ra làm sẽ tôi bạn chúng ta họ nhưng rất đó vào năm lại nào "
+        "đang còn việc mình gì đi nói biết muốn cần cảm ơn xin chào ngày mai hôm nay cuộc "
+        "họp ở đâu tốt lắm thế được rồi"
+    ),
+}
+
+# Letters only some Latin-script languages use: they break near-ties between
+# candidates when the text has at least _MIN_MARKERS of them
+_MIN_MARKERS = 2
+_MARKERS = {
+    "ñ¿¡": {"es"},
+    "ãõ": {"pt"},
+    "œ": {"fr"},
+    "ß": {"de"},
+    "å": {"sv"},
+    "łśźżćńąę": {"pl"},
+    "ığş": {"tr"},
+    "đơưạảấầếềệốồộớờợủ": {"vi"},
+    "ä": {"de", "sv"},
+    "ö": {"de", "sv", "tr"},
+    "ü": {"de", "tr"},
+    "ç": {"fr", "pt", "tr"},
+}
+_MARKER_LANGUAGES = {ch: langs for chars, langs in _MARKERS.items() for ch in chars}
+
+# Letters of these scripts name the language outright
+_SCRIPT_RANGES = [
+    (0x0E00, 0x0E7F, "th"),
+    (0x1100, 0x11FF, "ko"),
+    (0x3130, 0x318F, "ko"),
+    (0xAC00, 0xD7AF, "ko"),
+    (0x3040, 0x30FF, "kana"),
+    (0x4E00, 0x9FFF, "han"),
+    (0x3400, 0x4DBF, "han"),
+    (0x0600, 0x06FF, "ar"),
+    (0x0900, 0x097F, "hi"),
+    (0x0400, 0x04FF, "ru"),
+]
+
+# Detections in the same group as the hint don't override it
+_CONFUSABLE = [{"id", "ms"}, {"zh", "ja"}]
+
+
+def _confusable(a: str, b: str) -> bool:
+    return any(a in group and b in group for group in _CONFUSABLE)
+
+
+_WORDS = re.compile(r"[^\W\d_]+")
+
+
+def _script(ch: str) -> str:
+    code = ord(ch)
+    if code < 0x0250 or 0x1E00 <= code <= 0x1EFF:
+        return "latin"
+    for lo, hi, script in _SCRIPT_RANGES:
+        if lo <= code <= hi:
+            return script
+    return "other"
+
+
+def _trigrams(text: str) -> Counter:
+    grams: Counter = Counter()
+    for word in _WORDS.findall(text.lower()):
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            grams[padded[i : i + 3]] += 1
+    return grams
+
+
+@dataclass(frozen=True)
+class Detection:
+    language: str = ""  # "" = not confident
+    confidence: float = 0.0
+
+
+@dataclass
+class LanguageIdStats:
+    detections: int = 0
+    confident: int = 0
+    overrides: int = 0  # detection replaced the assumed (hint) language
+    stt_hints: int = 0  # STT calls given a detected language instead of "auto"
+
+    def summary(self) -> dict:
+        return {
+            "detections": self.detections,
+            "confident": self.confident,
+            "overrides": self.overrides,
+            "stt_hints": self.stt_hints,
+        }
+
+
+class LanguageIdentifier:
+    def __init__(self, samples: dict[str, str] | None = None):
+        self._samples = samples or _SAMPLES
+        self._profiles: dict[str, dict[str, float]] = {}
+        self._words: dict[str, set[str]] = {}
+        self.stats = LanguageIdStats()
+
+    def load(self) -> None:
+        """Build the trigram profiles (unit vectors); idempotent."""
+        if self._profiles:
+            return
+        for language, sample in self._samples.items():
+            grams = _trigrams(sample)
+            norm = math.sqrt(sum(c * c for c in grams.values()))
+            self._profiles[language] = {g: c / norm for g, c in grams.items()}
+            self._words[language] = set(_WORDS.findall(sample.lower()))
+
+    def detect(self, text: str) -> Detection:
+        settings = get_settings()
+        self.stats.detections += 1
+        scripts = Counter(_script(ch) for ch in text if ch.isalpha())
+        letters = sum(scripts.values())
+        if not letters:
+            return Detection()
+
+        script, count = scripts.most_common(1)[0]
+        if script == "han" and scripts["kana"]:
+            script, count = "ja", count + scripts["kana"]
+        share = count / letters
+        if script != "latin":
+            language = {"kana": "ja", "han": "zh", "other": ""}.get(script, script)
+            if not language or share < 0.6:
+                return Detection()
+            self.stats.confident += 1
+            return Detection(language, share)
+
+        if letters < settings.language_id_min_letters:
+            return Detection()
+        self.load()
+        lowered = text.lower()
+        words = _WORDS.findall(lowered)
+        grams = _trigrams(lowered)
+        norm = math.sqrt(sum(c * c for c in grams.values()))
+        # Trigram cosine, plus the share of words that are common words of the language
+        scores = sorted(
+            (
+                (
+                    sum(c * self._profiles[lang].get(g, 0.0) for g, c in grams.items()) / norm
+                    + 0.5 * sum(w in self._words[lang] for w in words) / len(words),
+                    lang,
+                )
+                for lang in self._profiles
+            ),
+            reverse=True,
+        )
+        best, language = scores[0]
+        ruled_out = {language}
+        # Marker letters only break near-ties, and only a few of them: one in a
+        # name ("São Paulo", "Jürgen") doesn't make the text Portuguese or German
+        floor = best * (1 - settings.language_id_min_margin)
+        tied = {lang for score, lang in scores if score >= floor}
+        if len(tied) > 1:
+            markers = Counter(
+                lang for ch in lowered for lang in _MARKER_LANGUAGES.get(ch, ()) if lang in tied
+            ).most_common(2)
+            if markers and markers[0][1] >= _MIN_MARKERS and (
+                len(markers) == 1 or markers[0][1] > markers[1][1]
+            ):
+                language = markers[0][0]
+                best = next(score for score, lang in scores if lang == language)
+                ruled_out = tied
+        # The runner-up that counts is one detection could be confused with
+        second = next(
+            (
+                score
+                for score, lang in scores
+                if lang not in ruled_out and not _confusable(lang, language)
+            ),
+            0,
+        )
+        margin = (best - second) / best if best else 0.0
+        if best < 0.1 or margin < settings.language_id_min_margin:
+            return Detection()
+        self.stats.confident += 1
+        return Detection(language, round(margin, 3))
+
+    def resolve(self, text: str, hint: str) -> str:
+        """The language `text` is in: the detection if confident, else `hint`."""
+        detected = self.detect(text).language
+        if not detected or detected == hint:
+            return hint
+        if _confusable(detected, hint):
+            return hint
+        self.stats.overrides += 1
+        return detected
+
+
+class LanguageTracker:
+    """One speaker's recent detections: the STT hint and a fallback for unsure transcripts."""
+
+    def __init__(self, window: int = 5):
+        self._recent: deque[str] = deque(maxlen=window)
+        self._hinted = 0
+
+    @property
+    def current(self) -> str:
+        """The language of most recent detections, once at least two agree."""
+        if not self._recent:
+            return ""
+        language, count = Counter(self._recent).most_common(1)[0]
+        return language if count >= 2 else ""
+
+    def observe(self, transcript: str) -> str:
+        """Language to translate `transcript` from; "" if unknown."""
+        detected = language_identifier.detect(transcript).language
+        if detected:
+            self._recent.append(detected)
+        return detected or self.current
+
+    def stt_language(self) -> str:
+        """Concrete language for STT, or "auto" (no majority yet, or time to re-check)."""
+        language = self.current
+        if not language:
+            return "auto"
+        if self._hinted >= get_settings().language_id_recheck:
+            self._hinted = 0
+            return "auto"
+        self._hinted += 1
+        language_identifier.stats.stt_hints += 1
+        return language
+
+
+language_identifier = LanguageIdentifier()
+
+
+def detect_language(text: str, hint: str) -> str:
+    """Chat: the language a message is written in, defaulting to the sender's `hint`."""
+    if not get_settings().language_id_enabled:
+        return hint
+    return language_identifier.resolve(text, hint)
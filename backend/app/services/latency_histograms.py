@@ -0,0 +1,120 @@
+"""Process-wide latency histograms for the translation pipeline.
+
+PipelineMetrics is one sample per request and only goes back to the client
+that made it. Every finished request is also folded into a histogram per
+(stage, language pair, provider), so /health/metrics can show p50/p90/p99
+for e.g. "translate, th→en, anthropic".
+
+Histograms are log-bucketed: fixed bucket count (~330), each bucket 5%
+wider than the last, covering 0.1 ms to 10 min. Memory per series is
+constant no matter how many samples it sees, and percentiles are accurate
+to within one bucket (~5%).
+"""
+
+import math
+from array import array
+
+STAGES = ("stt", "translate", "tts", "total", "ttfa")
+STAGE_PROVIDERS = {"stt": "deepgram", "tts": "elevenlabs"}
+
+_MIN_MS = 0.1
+_MAX_MS = 600_000.0
+_GROWTH = 1.05
+_LOG_GROWTH = math.log(_GROWTH)
+_BUCKETS = math.ceil(math.log(_MAX_MS / _MIN_MS) / _LOG_GROWTH) + 1
+
+# Series beyond this collapse into language pair "other" — bounds total memory
+MAX_SERIES = 1024
+
+
+class LogHistogram:
+    """Fixed-size log-bucketed histogram of millisecond values."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = array("Q", bytes(8 * _BUCKETS))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value_ms: float) -> None:
+        if value_ms <= _MIN_MS:
+            index = 0
+        else:
+            index = min(_BUCKETS - 1, math.ceil(math.log(value_ms / _MIN_MS) / _LOG_GROWTH))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value_ms
+        self.max = max(self.max, value_ms)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile (0 < q <= 1)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(_MIN_MS * _GROWTH ** index, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 1) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50), 1),
+            "p90_ms": round(self.percentile(0.90), 1),
+            "p99_ms": round(self.percentile(0.99), 1),
+            "max_ms": round(self.max, 1),
+        }
+
+
+class LatencyRegistry:
+    """Histograms keyed by (stage, language pair, provider)."""
+
+    def __init__(self, max_series: int = MAX_SERIES):
+        self.max_series = max_series
+        self._series: dict[tuple[str, str, str], LogHistogram] = {}
+
+    def record(self, stage: str, value_ms: float, language_pair: str, provider: str) -> None:
+        key = (stage, language_pair, provider)
+        histogram = self._series.get(key)
+        if histogram is None:
+            if len(self._series) >= self.max_series:
+                key = (stage, "other", provider)
+                histogram = self._series.get(key)
+            if histogram is None:
+                histogram = self._series[key] = LogHistogram()
+        histogram.record(value_ms)
+
+    def observe(self, metrics, source_language: str, target_language: str) -> None:
+        """Fold one finished PipelineMetrics sample into the histograms."""
+        pair = f"{source_language}→{target_language}"
+        llm = metrics.translate_provider or "unknown"
+        stages = {
+            "stt": (metrics.stt_end and metrics.stt_latency_ms),
+            "translate": (metrics.translate_end and metrics.translate_latency_ms),
+            "tts": (metrics.tts_end and metrics.tts_latency_ms),
+            "total": (metrics.total_end and metrics.total_latency_ms),
+            "ttfa": metrics.time_to_first_audio_ms,
+        }
+        for stage, value in stages.items():
+            if value > 0:
+                # End-to-end stages are labelled by the LLM — the provider that varies
+                self.record(stage, value, pair, STAGE_PROVIDERS.get(stage, llm))
+
+    def snapshot(self) -> dict:
+        """{stage: {"th→en|openai": {count, p50_ms, ...}}}"""
+        out: dict[str, dict] = {stage: {} for stage in STAGES}
+        for (stage, pair, provider), histogram in sorted(self._series.items()):
+            out.setdefault(stage, {})[f"{pair}|{provider}"] = histogram.summary()
+        return out
+
+    def reset(self) -> None:
+        self._series.clear()
+
+
+# Singleton
+latency_registry = LatencyRegistry()
@@ -1,10 +1,14 @@
 """Translation & API call logging — populate TranslationLog table."""
 
+import logging
 import time
 from datetime import datetime
 
 from app.models.database import async_session
 from app.models.models import TranslationLog
+from app.services.translation_memory import translation_memory
+
+logger = logging.getLogger(__name__)
 
 
 class LoggingService:
@@ -20,8 +24,14 @@ class LoggingService:
         model_used: str = "gpt-4-turbo",
         message_id: str | None = None,
         call_id: str | None = None,
+        user_id: str | None = None,
+        context_hash: str = "",
     ) -> None:
-        """Write a translation log entry to the database."""
+        """
+        Write a translation log entry to the database, and index it in
+        translation memory if it was made without a persona/industry/glossary
+        (`context_hash`).
+        """
         try:
             async with async_session() as db:
                 log = TranslationLog(
@@ -33,12 +43,25 @@ class LoggingService:
                     translated_text=translated_text,
                     latency_ms=latency_ms,
                     model_used=model_used,
+                    user_id=user_id,
+                    context_hash=context_hash,
                     created_at=datetime.utcnow(),
                 )
                 db.add(log)
                 await db.commit()
-        except Exception:
-            pass  # Don't let logging break the main flow
+                # Separate commit: the log is kept even if indexing fails
+                if await translation_memory.add(
+                    db,
+                    source_language,
+                    target_language,
+                    source_text,
+                    translated_text,
+                    owner=user_id or "",
+                    context=context_hash,
+                ):
+                    await db.commit()
+        except Exception as e:
+            logger.debug("Translation logging failed: %s", e)  # never breaks the main flow
 
 
 # Singleton
@@ -9,13 +9,33 @@ Credit check: user must have credits before processing.
 
 import asyncio
 import time
-from dataclasses import dataclass, field
-
-from app.services.stt_service import stt_service
-from app.services.translation_service import translation_service
+from dataclasses import dataclass, field, replace
+
+from app.config import get_settings
+from app.services.audio_dsp import DEFAULT_FORMAT, AudioFormat, dsp_stage
+from app.services.deadlines import Deadline, DeadlineExceeded, current_deadline
+from app.services.stt_service import STTStream, stt_service
+from app.services.translation_cache import context_hash
+from app.services.translation_service import translation_provider, translation_service
 from app.services.tts_service import tts_service
 from app.services.logging_service import logging_service
-from app.services.credit_service import credit_service
+from app.services.credit_lease_service import credit_lease_service
+from app.services.credit_service import COST_PIPELINE_PER_CHUNK
+from app.services.language_id import LanguageTracker, language_identifier
+from app.services.latency_histograms import latency_registry
+from app.services.pipeline_traces import UNTRACED, PipelineTrace, trace_recorder
+from app.services.segmenter import ClauseSegmenter
+from app.services.speculation import SpeculationStats, Speculator, estimate_tokens
+from app.services.vad_service import vad_service
+
+# Max clauses per voice being synthesized or waiting to be played — a clause's
+# slot is freed once the caller has taken its last audio chunk
+MAX_PARALLEL_TTS = 2
+
+_DONE = object()
+
+# Target languages written without spaces between words
+_UNSPACED = {"ja", "zh", "th", "lo", "km", "my"}
 
 
 @dataclass
@@ -30,6 +50,10 @@ class PipelineMetrics:
     tts_end: float = 0
     total_start: float = 0
     total_end: float = 0
+    first_audio: float = 0
+    speech_ratio: float = 1.0  # fraction of the input chunk the VAD kept as speech
+    translate_provider: str = ""  # openai | anthropic | cache | speculation
+    dropped: str = ""  # stage whose deadline ran out; the utterance was dropped there
 
     @property
     def stt_latency_ms(self) -> float:
@@ -47,12 +71,20 @@ class PipelineMetrics:
     def total_latency_ms(self) -> float:
         return (self.total_end - self.total_start) * 1000
 
+    @property
+    def time_to_first_audio_ms(self) -> float:
+        if not self.first_audio:
+            return 0.0
+        return (self.first_audio - self.total_start) * 1000
+
     def summary(self) -> dict:
         return {
             "stt_ms": round(self.stt_latency_ms, 1),
             "translate_ms": round(self.translate_latency_ms, 1),
             "tts_ms": round(self.tts_latency_ms, 1),
             "total_ms": round(self.total_latency_ms, 1),
+            "ttfa_ms": round(self.time_to_first_audio_ms, 1),
+            "speech_ratio": round(self.speech_ratio, 3),
         }
 
 
@@ -60,23 +92,87 @@ class PipelineMetrics:
 class TranslationContext:
     """User context injected into translation prompts."""
 
-    user_id: str = ""
+    user_id: str = ""  # owns persona/industry/glossary: their translation cache namespace
     source_language: str = "auto"
     target_language: str = "en"
     persona: str = ""  # e.g., "Factory owner, formal tone"
     industry: str = ""  # e.g., "manufacturing"
     custom_glossary: dict[str, str] = field(default_factory=dict)
+    audio_format: AudioFormat = DEFAULT_FORMAT  # TTS codec/bitrate negotiated with the client
+    languages: LanguageTracker = field(default_factory=LanguageTracker)  # what the speaker speaks
+
+    def stt_language(self) -> str:
+        """Language for STT: the configured source, or on "auto" the speaker's detected one."""
+        if self.source_language != "auto" or not get_settings().language_id_enabled:
+            return self.source_language
+        return self.languages.stt_language()
+
+    def for_transcript(self, transcript: str) -> "TranslationContext":
+        """
+        This context with source_language resolved for `transcript`: on "auto",
+        the detected language (feeding the speaker's rolling detection); else
+        the target language if that is what the speaker actually used, so the
+        transcript goes out untranslated.
+        """
+        if not get_settings().language_id_enabled:
+            return self
+        if self.source_language == "auto":
+            spoken = self.languages.observe(transcript)
+        else:
+            spoken = language_identifier.resolve(transcript, self.source_language)
+            if spoken != self.target_language:
+                return self
+        return replace(self, source_language=spoken) if spoken else self
+
+
+def detect_speech(audio_data: bytes, metrics: PipelineMetrics) -> bytes | None:
+    """
+    Run server-side VAD on an audio chunk — after dsp_stage.prepare_for_stt:
+    VAD only analyzes PCM WAV, and clients send webm/opus.
+
+    Returns the chunk with leading/trailing silence trimmed, or None if it
+    holds no speech. Records the speech ratio on metrics.
+    """
+    if not get_settings().vad_enabled:
+        return audio_data
+    result = vad_service.process(audio_data)
+    metrics.speech_ratio = result.speech_ratio
+    return result.audio if result.has_speech else None
+
+
+async def _charge_chunk(user_id, db, context: TranslationContext) -> str | None:
+    """
+    Bill one pipeline chunk against the user's credit lease.
+    Returns the lease charged, None if no charge was made; raises ValueError
+    if the user is out of credits.
+    """
+    if not (user_id and db):
+        return None
+    lease_id = await credit_lease_service.charge(
+        user_id,
+        db,
+        COST_PIPELINE_PER_CHUNK,
+        language_pair=f"{context.source_language}→{context.target_language}",
+    )
+    if not lease_id:
+        raise ValueError("Insufficient credits")
+    return lease_id
 
 
 class TranslationPipeline:
     """
     Orchestrates the full STT → Translate → TTS pipeline.
 
-    Supports two modes:
+    Supports three modes:
     1. Batch: process a complete audio chunk end-to-end
     2. Streaming: stream each stage for minimum latency
+    3. Continuous: consume a live STT session, optionally translating
+       interim transcripts speculatively
     """
 
+    def __init__(self):
+        self.speculation = SpeculationStats()
+
     async def process_audio(
         self,
         audio_data: bytes,
@@ -84,10 +180,17 @@ class TranslationPipeline:
         voice_id: str | None = None,
         user_id: str | None = None,
         db=None,
+        deadline: Deadline | None = None,
+        trace: PipelineTrace | None = None,
     ) -> tuple[bytes, str, PipelineMetrics]:
         """
         Process a chunk of audio through the full pipeline.
-        If user_id and db are provided, deducts credits first.
+        If user_id and db are provided, the chunk is charged against the
+        user's credit lease (refunded if it produces no translation).
+        Every stage runs under the utterance's deadline (by default the
+        one set by the connection scheduler, else utterance_deadline_ms);
+        when it runs out the chunk is dropped and metrics.dropped names the stage.
+        Sampled like process_audio_streaming; `trace` forces one.
 
         Returns:
             (translated_audio, translated_text, metrics)
@@ -96,64 +199,128 @@ class TranslationPipeline:
             ValueError: if user has insufficient credits
         """
         metrics = PipelineMetrics(total_start=time.time())
-
-        # --- Credit check ---
-        if user_id and db:
-            has_credits = await credit_service.has_sufficient_credits(user_id, db)
-            if not has_credits:
-                raise ValueError("Insufficient credits")
-
-        # --- Stage 1: Speech-to-Text ---
-        metrics.stt_start = time.time()
-        transcript = await stt_service.transcribe(
-            audio_data=audio_data,
-            language=context.source_language,
-        )
-        metrics.stt_end = time.time()
-
-        if not transcript.strip():
+        deadline = deadline or current_deadline.get() or Deadline.start()
+
+        if trace is None:
+            trace = trace_recorder.begin(
+                audio_data,
+                context.source_language,
+                context.target_language,
+                voice_id,
+                queued_ms=deadline.budget_ms - deadline.remaining_ms(),
+            )
+        try:
+            # Already too late — don't bill or call anyone
+            deadline.check("queue")
+            # --- Stage 0: decode, then drop silence before anything is billed ---
+            async with deadline.stage("stt"):
+                audio_data, mimetype = await dsp_stage.prepare_for_stt(audio_data)
+        except DeadlineExceeded as e:
+            trace.note(outcome="dropped")
+            trace.mark("dropped", e.stage)
+            trace_recorder.finish(trace)
+            return self._dropped(metrics, e)
+        audio_data = detect_speech(audio_data, metrics)
+        if audio_data is None:
+            trace.note(outcome="silent")
+            trace_recorder.finish(trace)
             metrics.total_end = time.time()
             return b"", "", metrics
 
-        # --- Stage 2: Translation ---
-        metrics.translate_start = time.time()
-        translated_text = await translation_service.translate(
-            text=transcript,
-            source_language=context.source_language,
-            target_language=context.target_language,
-            persona=context.persona,
-            industry=context.industry,
-            glossary=context.custom_glossary,
-        )
-        metrics.translate_end = time.time()
-
-        # Log translation for analytics
-        asyncio.create_task(
-            self._log_translation(context, transcript, translated_text, metrics.translate_latency_ms)
-        )
-
-        # --- Stage 3: Text-to-Speech ---
-        metrics.tts_start = time.time()
-        audio_out = await tts_service.synthesize(
-            text=translated_text,
-            voice_id=voice_id,
-            language=context.target_language,
-        )
-        metrics.tts_end = time.time()
+        # --- Credit check ---
+        lease_id = await _charge_chunk(user_id, db, context)
+        delivered = False
+        try:
+            # --- Stage 1: Speech-to-Text ---
+            async with deadline.stage("stt"):
+                metrics.stt_start = time.time()
+                trace.mark("stt.start")
+                transcript = await stt_service.transcribe(
+                    audio_data=audio_data,
+                    language=context.stt_language(),
+                    mimetype=mimetype,
+                )
+                metrics.stt_end = time.time()
+                trace.mark("stt.end", len(transcript))
+                trace.note(transcript=transcript)
+
+            if not transcript.strip():
+                trace.note(outcome="empty")
+                metrics.total_end = time.time()
+                return b"", "", metrics
+            context = context.for_transcript(transcript)
+
+            # --- Stage 2: Translation ---
+            metrics.translate_start = time.time()
+            trace.mark("translate.start")
+            async with deadline.stage("translate"):
+                translated_text = await translation_service.translate(
+                    text=transcript,
+                    source_language=context.source_language,
+                    target_language=context.target_language,
+                    persona=context.persona,
+                    industry=context.industry,
+                    glossary=context.custom_glossary,
+                    namespace=context.user_id,
+                )
+            metrics.translate_end = time.time()
+            metrics.translate_provider = translation_provider.get()
+            trace.mark("translate.end", metrics.translate_provider)
+            trace.note(translation=translated_text, provider=metrics.translate_provider)
+
+            # Log translation for analytics
+            asyncio.create_task(
+                self._log_translation(
+                    context, transcript, translated_text, metrics.translate_latency_ms
+                )
+            )
 
-        metrics.total_end = time.time()
+            # --- Stage 3: Text-to-Speech ---
+            metrics.tts_start = time.time()
+            trace.mark("tts.start", 0)
+            async with deadline.stage("tts"):
+                audio_out = await tts_service.synthesize(
+                    text=translated_text,
+                    voice_id=voice_id,
+                    language=context.target_language,
+                    output_format=context.audio_format.provider_format,
+                )
+                if context.audio_format.transcode:
+                    audio_out = await dsp_stage.encode_for_client(audio_out, context.audio_format)
+            metrics.tts_end = time.time()
+            metrics.first_audio = metrics.tts_end
+            trace.mark("tts.end", 0)
+            trace.mark("audio", len(audio_out))
 
-        # --- Deduct credits after successful processing ---
-        if user_id and db:
-            await credit_service.deduct_pipeline(
-                user_id=user_id,
-                db=db,
-                source_lang=context.source_language,
-                target_lang=context.target_language,
-            )
+            metrics.total_end = time.time()
+            latency_registry.observe(metrics, context.source_language, context.target_language)
+            delivered = True
+            trace.note(outcome="ok")
+        except DeadlineExceeded as e:
+            trace.note(outcome="dropped")
+            trace.mark("dropped", e.stage)
+            return self._dropped(metrics, e)
+        except Exception as e:
+            trace.note(outcome="error")
+            trace.mark("error", type(e).__name__)
+            raise
+        finally:
+            # Only successful chunks are billed
+            if lease_id and not delivered:
+                await credit_lease_service.refund(user_id, lease_id, COST_PIPELINE_PER_CHUNK)
+            trace.mark("end")
+            trace_recorder.finish(trace)
 
         return audio_out, translated_text, metrics
 
+    @staticmethod
+    def _dropped(
+        metrics: PipelineMetrics, e: DeadlineExceeded
+    ) -> tuple[bytes, str, PipelineMetrics]:
+        metrics.dropped = e.stage
+        metrics.total_end = time.time()
+        return b"", "", metrics
+
     async def _log_translation(
         self, context: TranslationContext, source_text: str, translated_text: str, latency_ms: float
     ):
@@ -166,6 +333,10 @@ class TranslationPipeline:
                 translated_text=translated_text,
                 latency_ms=latency_ms,
                 model_used="gpt-4-turbo",
+                user_id=context.user_id or None,
+                context_hash=context_hash(
+                    context.persona, context.industry, context.custom_glossary
+                ),
             )
         except Exception:
             pass
@@ -177,87 +348,453 @@ class TranslationPipeline:
         voice_id: str | None = None,
         user_id: str | None = None,
         db=None,
+        deadline: Deadline | None = None,
+        trace: PipelineTrace | None = None,
     ):
         """
         Streaming pipeline: yields audio chunks as soon as they're available.
-        This is how we hit <500ms — we don't wait for full sentences.
-        If user_id and db are provided, deducts credits first.
+        This is how we hit <500ms — we don't wait for full sentences:
+        each clause goes to TTS while the LLM is still streaming the rest.
+        If user_id and db are provided, the chunk is charged against the
+        user's credit lease (refunded if it produces no translation).
+        When the utterance's deadline runs out, outstanding provider calls
+        are cancelled and a "dropped" event ends the stream (not billed).
+        A sampled fraction of utterances is traced for offline replay
+        (see pipeline_traces); `trace` forces one (replay).
 
         Yields:
-            dict with keys: "type" (text|audio|metrics), "data" (the payload)
+            dict with keys: "type" (transcript|text|audio|metrics|dropped), "data" (the payload)
 
         Raises:
             ValueError: if user has insufficient credits
         """
-        total_start = time.time()
+        metrics = PipelineMetrics(total_start=time.time())
+        deadline = deadline or current_deadline.get() or Deadline.start()
+
+        if trace is None:
+            trace = trace_recorder.begin(
+                audio_data,
+                context.source_language,
+                context.target_language,
+                voice_id,
+                queued_ms=deadline.budget_ms - deadline.remaining_ms(),
+            )
+        try:
+            deadline.check("queue")
+            # Decoded first: VAD only analyzes PCM
+            async with deadline.stage("stt"):
+                audio_data, mimetype = await dsp_stage.prepare_for_stt(audio_data)
+        except DeadlineExceeded as e:
+            metrics.dropped = e.stage
+            trace.note(outcome="dropped")
+            trace.mark("dropped", e.stage)
+            trace_recorder.finish(trace)
+            yield {"type": "dropped", "data": e.summary()}
+            return
+
+        # Silent chunks never reach STT (or the credit check)
+        audio_data = detect_speech(audio_data, metrics)
+        if audio_data is None:
+            trace.note(outcome="silent")
+            trace_recorder.finish(trace)
+            return
 
         # --- Credit check ---
-        if user_id and db:
-            has_credits = await credit_service.has_sufficient_credits(user_id, db)
-            if not has_credits:
-                raise ValueError("Insufficient credits")
-
-        # Stage 1: STT
-        stt_start = time.time()
-        transcript = await stt_service.transcribe(
-            audio_data=audio_data,
-            language=context.source_language,
-        )
-        stt_end = time.time()
-
-        if not transcript.strip():
+        lease_id = await _charge_chunk(user_id, db, context)
+        delivered = False
+        try:
+            # Stage 1: STT
+            async with deadline.stage("stt"):
+                metrics.stt_start = time.time()
+                trace.mark("stt.start")
+                transcript = await stt_service.transcribe(
+                    audio_data=audio_data,
+                    language=context.stt_language(),
+                    mimetype=mimetype,
+                )
+                metrics.stt_end = time.time()
+                trace.mark("stt.end", len(transcript))
+                trace.note(transcript=transcript)
+
+            if not transcript.strip():
+                trace.note(outcome="empty")
+                return
+            context = context.for_transcript(transcript)
+
+            yield {"type": "transcript", "data": transcript}
+
+            # Stages 2 + 3: Translation (streaming) overlapped with clause-level TTS
+            async for event in self.translate_and_speak(
+                transcript, context, voice_id, metrics, deadline=deadline, trace=trace
+            ):
+                yield event
+
+            metrics.total_end = time.time()
+            latency_registry.observe(metrics, context.source_language, context.target_language)
+            delivered = True
+            trace.note(outcome="ok")
+        except DeadlineExceeded as e:
+            metrics.dropped = e.stage
+            trace.note(outcome="dropped")
+            trace.mark("dropped", e.stage)
+            yield {"type": "dropped", "data": e.summary()}
             return
+        except Exception as e:
+            trace.note(outcome="error")
+            trace.mark("error", type(e).__name__)
+            raise
+        finally:
+            # Only successful chunks are billed
+            if lease_id and not delivered:
+                await credit_lease_service.refund(user_id, lease_id, COST_PIPELINE_PER_CHUNK)
+            trace.mark("end")
+            trace_recorder.finish(trace)
+
+        yield {"type": "metrics", "data": metrics.summary()}
+
+    async def process_stream(
+        self,
+        stream: STTStream,
+        context: TranslationContext,
+        voice_id: str | None = None,
+        speculative: bool = False,
+    ):
+        """
+        Continuous pipeline over a live STT session.
 
-        yield {"type": "transcript", "data": transcript}
-
-        # Stage 2: Translation (streaming)
-        translate_start = time.time()
-        translated_chunks: list[str] = []
-
-        async for chunk in translation_service.translate_stream(
-            text=transcript,
-            source_language=context.source_language,
-            target_language=context.target_language,
-            persona=context.persona,
-            industry=context.industry,
-            glossary=context.custom_glossary,
-        ):
-            translated_chunks.append(chunk)
-            yield {"type": "text", "data": chunk}
-
-        translate_end = time.time()
-        full_translation = "".join(translated_chunks)
-
-        # Stage 3: TTS (streaming)
-        tts_start = time.time()
-        async for audio_chunk in tts_service.synthesize_stream(
-            text=full_translation,
-            voice_id=voice_id,
-            language=context.target_language,
-        ):
-            yield {"type": "audio", "data": audio_chunk}
-
-        tts_end = time.time()
-        total_end = time.time()
-
-        # --- Deduct credits after successful processing ---
-        if user_id and db:
-            await credit_service.deduct_pipeline(
-                user_id=user_id,
-                db=db,
-                source_lang=context.source_language,
-                target_lang=context.target_language,
-            )
+        Interim transcripts are forwarded as soon as they arrive; each final
+        segment is translated and spoken without waiting for the client to
+        cut the audio. Finals are processed in order, one at a time.
 
-        yield {
-            "type": "metrics",
-            "data": {
-                "stt_ms": round((stt_end - stt_start) * 1000, 1),
-                "translate_ms": round((translate_end - translate_start) * 1000, 1),
-                "tts_ms": round((tts_end - tts_start) * 1000, 1),
-                "total_ms": round((total_end - total_start) * 1000, 1),
-            },
-        }
+        With speculative=True, stable interims are translated before the
+        final arrives. Text events then carry "segment" and "revision":
+        a higher revision replaces earlier text for the same segment, and
+        "speculative": true marks a preview that may still be rolled back.
+
+        Yields:
+            dict with keys: "type" (interim|transcript|text|audio|metrics), "data"
+        """
+        out: asyncio.Queue = asyncio.Queue()
+        finals: asyncio.Queue = asyncio.Queue()
+        speculator = None
+
+        if speculative:
+            async def translate_interim(text: str) -> str:
+                return await translation_service.translate(
+                    text=text,
+                    source_language=context.source_language,
+                    target_language=context.target_language,
+                    persona=context.persona,
+                    industry=context.industry,
+                    glossary=context.custom_glossary,
+                    namespace=context.user_id,
+                )
+
+            def preview(translation: str, segment: int, revision: int):
+                out.put_nowait({
+                    "type": "text",
+                    "data": translation,
+                    "segment": segment,
+                    "revision": revision,
+                    "speculative": True,
+                })
+
+            speculator = Speculator(translate_interim, preview, self.speculation)
+
+        async def listen():
+            try:
+                async for result in stream:
+                    if not result.is_final:
+                        await out.put({"type": "interim", "data": result.text})
+                        if speculator:
+                            speculator.observe_interim(result.text)
+                    elif result.text.strip():
+                        await finals.put((result, speculator.claim() if speculator else None))
+            except Exception as e:
+                await out.put(e)
+            finally:
+                await finals.put(None)
+
+        async def translate_finals():
+            try:
+                while (item := await finals.get()) is not None:
+                    result, claim = item
+                    arrived = result.received_at or time.time()
+                    metrics = PipelineMetrics(
+                        total_start=arrived, stt_start=arrived, stt_end=arrived
+                    )
+                    age_s = max(0.0, time.time() - arrived)
+                    deadline = Deadline.start(started_at=time.monotonic() - age_s)
+                    await out.put({
+                        "type": "transcript",
+                        "data": result.text,
+                        "words": result.words,
+                    })
+
+                    spoken = context.for_transcript(result.text)
+                    tokens = None
+                    reused = ""  # speculative translation the segment's text starts with
+                    if claim:
+                        resolved = await claim.resolve(result.text, self.speculation)
+                        if resolved:
+                            reused, rest = resolved
+                            tokens = _continued(reused, rest, spoken)
+                            metrics.translate_provider = "speculation"
+                        else:
+                            rest = result.text
+                        self.speculation.tokens_total += estimate_tokens(rest)
+
+                    # Traced from the final's arrival; a stream has no per-segment audio
+                    trace = trace_recorder.begin(
+                        b"",
+                        spoken.source_language,
+                        spoken.target_language,
+                        voice_id,
+                        queued_ms=age_s * 1000,
+                    )
+                    trace.mark("stt.end", len(result.text))
+                    trace.note(transcript=result.text)
+                    translated: list[str] = []
+                    try:
+                        async for event in self.translate_and_speak(
+                            result.text,
+                            spoken,
+                            voice_id,
+                            metrics,
+                            tokens=tokens,
+                            deadline=deadline,
+                            trace=trace,
+                        ):
+                            if event["type"] == "text" and claim:
+                                translated.append(event["data"])
+                                event.update(
+                                    segment=claim.segment,
+                                    revision=claim.revision + 1,
+                                    speculative=False,
+                                )
+                            await out.put(event)
+                        trace.note(outcome="ok")
+                    except DeadlineExceeded as e:
+                        # Too late for this segment — move on to the next final
+                        trace.note(outcome="dropped")
+                        trace.mark("dropped", e.stage)
+                        await out.put({"type": "dropped", "data": e.summary()})
+                        continue
+                    except Exception as e:
+                        trace.note(outcome="error")
+                        trace.mark("error", type(e).__name__)
+                        raise
+                    finally:
+                        trace.mark("end")
+                        trace_recorder.finish(trace)
+                    if claim:
+                        fresh = "".join(translated)[len(reused) :]
+                        self.speculation.tokens_total += estimate_tokens(fresh)
+
+                    metrics.total_end = time.time()
+                    latency_registry.observe(
+                        metrics, spoken.source_language, spoken.target_language
+                    )
+                    await out.put({"type": "metrics", "data": metrics.summary()})
+                await out.put(_DONE)
+            except Exception as e:
+                await out.put(e)
+
+        tasks = [asyncio.create_task(listen()), asyncio.create_task(translate_finals())]
+        try:
+            while (item := await out.get()) is not _DONE:
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            if speculator:
+                speculator.cancel()
+
+    async def translate_and_speak(
+        self,
+        transcript: str,
+        context: TranslationContext,
+        voice_id: str | None,
+        metrics: PipelineMetrics,
+        tokens=None,
+        voices: list[str | None] | None = None,
+        deadline: Deadline | None = None,
+        trace: PipelineTrace = UNTRACED,
+    ):
+        """
+        Stream translation tokens and synthesize each completed clause right away.
+        `tokens` overrides the LLM stream (e.g. an already-finished translation).
+        `voices` synthesizes the same translation in several voices (group calls);
+        defaults to [voice_id]. Audio events carry the "voice_id" they belong to.
+        With a `deadline`, no LLM/TTS call starts without enough budget left and
+        DeadlineExceeded is raised (cancelling the rest) once it runs out.
+        Token, clause and audio arrivals are marked on `trace`.
+
+        translator — streams LLM tokens once, emits text events, and queues each
+                     completed clause for every voice (never waits on TTS)
+        starters   — one per voice, start that voice's TTS tasks in clause order,
+                     each only once it holds one of MAX_PARALLEL_TTS slots
+        players    — one per voice, forward that voice's audio strictly in clause order;
+                     a clause's slot is released once the caller has taken all of it
+        Yields text/audio events; fills translate/tts/first_audio in metrics.
+        """
+        voices = voices if voices is not None else [voice_id]
+        out: asyncio.Queue = asyncio.Queue()
+        playlists = {v: asyncio.Queue() for v in voices}
+        pending = {v: asyncio.Queue() for v in voices}  # clauses not yet started, per voice
+        tts_slots = {v: asyncio.Semaphore(MAX_PARALLEL_TTS) for v in voices}
+        tts_tasks: list[asyncio.Task] = []
+
+        async def synthesize(index: int, clause: str, voice: str | None, audio: asyncio.Queue):
+            if not metrics.tts_start:
+                metrics.tts_start = time.time()
+            fmt = context.audio_format
+            try:
+                if deadline:
+                    deadline.check("tts")
+                trace.mark("tts.start", index)
+                stream = tts_service.synthesize_stream(
+                    text=clause,
+                    voice_id=voice,
+                    language=context.target_language,
+                    output_format=fmt.provider_format,
+                )
+                if fmt.transcode:
+                    # Re-encoding needs the whole clause: trades stream-through for bytes
+                    pcm = b"".join([chunk async for chunk in stream])
+                    await audio.put(await dsp_stage.encode_for_client(pcm, fmt))
+                else:
+                    async for audio_chunk in stream:
+                        trace.mark("tts.chunk", [index, len(audio_chunk)])
+                        await audio.put(audio_chunk)
+                trace.mark("tts.end", index)
+            except Exception as e:
+                await audio.put(e)
+            finally:
+                await audio.put(None)
+
+        async def starter(voice: str | None, queue: asyncio.Queue):
+            while (item := await queue.get()) is not None:
+                index, clause, audio = item
+                await tts_slots[voice].acquire()  # released once the caller took the clause
+                tts_tasks.append(asyncio.create_task(synthesize(index, clause, voice, audio)))
+
+        clauses = 0
+
+        async def speak(clause: str):
+            nonlocal clauses
+            for voice, playlist in playlists.items():
+                audio: asyncio.Queue = asyncio.Queue()
+                await pending[voice].put((clauses, clause, audio))
+                await playlist.put(audio)
+            clauses += 1
+
+        async def translator():
+            segmenter = ClauseSegmenter()
+            metrics.translate_start = time.time()
+            trace.mark("translate.start")
+            if deadline:
+                try:
+                    deadline.check("translate")
+                except DeadlineExceeded as e:
+                    await out.put(e)
+                    return
+            source = tokens if tokens is not None else translation_service.translate_stream(
+                text=transcript,
+                source_language=context.source_language,
+                target_language=context.target_language,
+                persona=context.persona,
+                industry=context.industry,
+                glossary=context.custom_glossary,
+                namespace=context.user_id,
+            )
+            translation = []
+            try:
+                async for chunk in source:
+                    trace.mark("token", len(chunk))
+                    translation.append(chunk)
+                    await out.put({"type": "text", "data": chunk})
+                    for clause in segmenter.feed(chunk):
+                        await speak(clause)
+                tail = segmenter.flush()
+                if tail:
+                    await speak(tail)
+            except Exception as e:
+                await out.put(e)
+            finally:
+                metrics.translate_end = time.time()
+                if tokens is None:
+                    metrics.translate_provider = translation_provider.get()
+                trace.mark("translate.end", metrics.translate_provider)
+                trace.note(translation="".join(translation), provider=metrics.translate_provider)
+                for voice in voices:
+                    await pending[voice].put(None)
+                    await playlists[voice].put(None)
+
+        async def player(voice: str | None, playlist: asyncio.Queue):
+            try:
+                while (audio := await playlist.get()) is not None:
+                    while (chunk := await audio.get()) is not None:
+                        if isinstance(chunk, BaseException):
+                            raise chunk
+                        if not metrics.first_audio:
+                            metrics.first_audio = time.time()
+                        trace.mark("audio", len(chunk))
+                        await out.put({"type": "audio", "data": chunk, "voice_id": voice})
+                    await out.put(tts_slots[voice])  # clause played: its slot is free
+                await out.put(_DONE)
+            except Exception as e:
+                await out.put(e)
+
+        tasks = [asyncio.create_task(translator())]
+        for voice in voices:
+            tasks.append(asyncio.create_task(starter(voice, pending[voice])))
+            tasks.append(asyncio.create_task(player(voice, playlists[voice])))
+        try:
+            remaining = len(playlists)
+            while remaining:
+                if deadline:
+                    stage = "tts" if metrics.translate_end else "translate"
+                    item = await deadline.wait(out.get(), stage)
+                else:
+                    item = await out.get()
+                if item is _DONE:
+                    remaining -= 1
+                    continue
+                if isinstance(item, asyncio.Semaphore):
+                    item.release()
+                    continue
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+            metrics.tts_end = time.time()
+            metrics.tts_start = metrics.tts_start or metrics.tts_end
+        finally:
+            for task in tasks + tts_tasks:
+                task.cancel()
+
+
+async def _continued(translation: str, rest: str, context: TranslationContext):
+    """
+    A speculated prefix's `translation`, then the streamed translation of
+    the `rest` of the final.
+    """
+    if not rest:
+        yield translation
+        return
+    yield translation if context.target_language in _UNSPACED else f"{translation} "
+    async for chunk in translation_service.translate_stream(
+        text=rest,
+        source_language=context.source_language,
+        target_language=context.target_language,
+        persona=context.persona,
+        industry=context.industry,
+        glossary=context.custom_glossary,
+        namespace=context.user_id,
+    ):
+        yield chunk
 
 
 # Singleton
@@ -0,0 +1,315 @@
+"""Sampled pipeline traces for offline profiling and replay.
+
+Latency histograms say *that* an utterance was slow; a trace says *where*.
+A sampled fraction of utterances (trace_sample_rate, off by default) is
+recorded as it runs through TranslationPipeline.process_audio,
+process_audio_streaming, or — one trace per final segment — process_stream:
+
+    audio     — sha256 and size only (never the audio itself)
+    text      — transcript, translation and the provider that answered
+    events    — [t_ms, kind, detail] relative to the start of the utterance:
+                stt.start/stt.end, translate.start, token (chars),
+                translate.end (provider), tts.start/tts.chunk/tts.end per
+                clause, audio (bytes delivered), dropped, error, end
+
+A process_stream segment has no audio chunk of its own (audio_bytes is 0):
+its trace starts when the final transcript is taken up, queued_ms is the
+time since it arrived, and only stt.end is marked. process_audio marks no
+tokens or TTS chunks (one translation, one synthesis).
+
+Traces are appended as gzipped JSON lines to one file per worker and hour
+under trace_dir (one gzip member per trace — a plain `zcat` reads them).
+Files older than trace_retention_hours, or beyond trace_max_mb in total,
+are pruned whenever a worker starts a new file. Writes happen in a thread
+after the utterance finished, never on the audio path.
+
+`python -m tests.benchmarks.replay` loads traces, replays them against the
+fake (or the configured) providers and prints latency waterfalls.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+TRACE_VERSION = 1
+
+
+class PipelineTrace:
+    """Events and outcome of one utterance, timed from its start."""
+
+    sampled = True
+
+    def __init__(
+        self,
+        audio: bytes,
+        source_language: str,
+        target_language: str,
+        voice_id: str | None = None,
+        queued_ms: float = 0.0,
+    ):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.fields = {
+            "source_language": source_language,
+            "target_language": target_language,
+            "voice_id": voice_id,
+            "audio_sha256": hashlib.sha256(audio).hexdigest(),
+            "audio_bytes": len(audio),
+            "queued_ms": round(queued_ms, 1),
+            "transcript": "",
+            "translation": "",
+            "provider": "",
+            "outcome": "",
+        }
+        self.events: list[list] = []
+
+    def mark(self, kind: str, detail=None) -> None:
+        event = [round((time.perf_counter() - self._t0) * 1000, 1), kind]
+        if detail is not None:
+            event.append(detail)
+        self.events.append(event)
+
+    def note(self, **fields) -> None:
+        """Set transcript / translation / provider / outcome."""
+        self.fields.update(fields)
+
+    def record(self) -> dict:
+        return {
+            "v": TRACE_VERSION,
+            "id": self.trace_id,
+            "ts": round(self.started_at, 3),
+            **self.fields,
+            "events": self.events,
+        }
+
+
+class _Untraced:
+    """Stand-in for utterances that weren't sampled: everything is a no-op."""
+
+    sampled = False
+
+    def mark(self, kind: str, detail=None) -> None:
+        pass
+
+    def note(self, **fields) -> None:
+        pass
+
+
+UNTRACED = _Untraced()
+
+
+@dataclass
+class TraceStats:
+    sampled: int = 0
+    written: int = 0
+    bytes_written: int = 0
+    write_errors: int = 0
+    pruned_files: int = 0
+
+    def summary(self) -> dict:
+        return {
+            "sampled": self.sampled,
+            "written": self.written,
+            "bytes_written": self.bytes_written,
+            "write_errors": self.write_errors,
+            "pruned_files": self.pruned_files,
+        }
+
+
+class TraceRecorder:
+    """Samples utterances and appends their traces to hourly gzip files."""
+
+    def __init__(
+        self,
+        sample_rate: float | None = None,
+        trace_dir: str | None = None,
+        retention_hours: float | None = None,
+        max_bytes: int | None = None,
+    ):
+        settings = get_settings()
+        self.sample_rate = sample_rate if sample_rate is not None else settings.trace_sample_rate
+        dir_name = trace_dir if trace_dir is not None else settings.trace_dir
+        self.trace_dir = Path(dir_name) if dir_name else None
+        self.retention_s = (
+            retention_hours if retention_hours is not None else settings.trace_retention_hours
+        ) * 3600
+        self.max_bytes = max_bytes if max_bytes is not None else settings.trace_max_mb << 20
+        self.stats = TraceStats()
+        self._current: Path | None = None
+        self._lock = threading.Lock()  # writes run in worker threads
+        self._writes: set[asyncio.Task] = set()
+
+    def begin(
+        self,
+        audio: bytes,
+        source_language: str,
+        target_language: str,
+        voice_id: str | None = None,
+        queued_ms: float = 0.0,
+    ) -> PipelineTrace | _Untraced:
+        """A trace for this utterance if it is sampled, else UNTRACED."""
+        if not self.trace_dir or random.random() >= self.sample_rate:
+            return UNTRACED
+        self.stats.sampled += 1
+        return PipelineTrace(audio, source_language, target_language, voice_id, queued_ms)
+
+    def finish(self, trace: PipelineTrace | _Untraced) -> None:
+        """Queue a finished trace for writing (in a thread, off the audio path)."""
+        if not trace.sampled or not self.trace_dir:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # generator finalized outside the loop
+            return
+        if not trace.fields["outcome"]:
+            trace.note(outcome="cancelled")
+        line = json.dumps(trace.record(), ensure_ascii=False, separators=(",", ":")) + "\n"
+        task = loop.create_task(asyncio.to_thread(self._write, gzip.compress(line.encode())))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def flush(self) -> None:
+        """Wait for queued writes (shutdown, tests)."""
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+
+    def summary(self) -> dict:
+        return {"sample_rate": self.sample_rate, **self.stats.summary()}
+
+    # ── Files (runs in a worker thread) ──
+
+    def _write(self, member: bytes) -> None:
+        with self._lock:
+            try:
+                path = self.trace_dir / time.strftime(
+                    f"traces-%Y%m%d-%H-{os.getpid()}.jsonl.gz", time.gmtime()
+                )
+                if path != self._current:
+                    self.trace_dir.mkdir(parents=True, exist_ok=True)
+                    self._prune()
+                    self._current = path
+                with open(path, "ab") as f:
+                    f.write(member)
+            except OSError as e:
+                self.stats.write_errors += 1
+                logger.warning("Pipeline trace write failed: %s", e)
+                return
+            self.stats.written += 1
+            self.stats.bytes_written += len(member)
+
+    def _prune(self) -> None:
+        files = []
+        for path in self.trace_dir.glob("traces-*.jsonl.gz"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()  # oldest first
+        total = sum(size for _, size, _ in files)
+        cutoff = time.time() - self.retention_s
+        for mtime, size, path in files:
+            if mtime >= cutoff and total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.stats.pruned_files += 1
+
+
+def load_traces(path: str | Path) -> Iterator[dict]:
+    """Traces from one trace file or every file in a trace directory, oldest first."""
+    path = Path(path)
+    files = sorted(path.glob("traces-*.jsonl.gz")) if path.is_dir() else [path]
+    for file in files:
+        with gzip.open(file, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+# ── Waterfalls ──
+
+
+@dataclass
+class Span:
+    name: str
+    start_ms: float
+    end_ms: float
+    ticks: list[float] = field(default_factory=list)  # arrivals inside the span
+
+
+def waterfall(record: dict) -> list[Span]:
+    """Stage spans of a trace record: queue, stt, translate, tts per clause, audio."""
+    spans: dict[str, Span] = {}
+
+    def span(name: str, t: float) -> Span:
+        if name not in spans:
+            spans[name] = Span(name, t, t)
+        s = spans[name]
+        s.start_ms, s.end_ms = min(s.start_ms, t), max(s.end_ms, t)
+        return s
+
+    if record.get("queued_ms"):
+        span("queue", -record["queued_ms"])
+        span("queue", 0.0)
+    for t, kind, *detail in record["events"]:
+        if kind in ("stt.start", "stt.end"):
+            span("stt", t)
+        elif kind in ("translate.start", "translate.end"):
+            span("translate", t)
+        elif kind == "token":
+            span("translate", t).ticks.append(t)
+        elif kind in ("tts.start", "tts.end"):
+            span(f"tts {detail[0]}", t)
+        elif kind == "tts.chunk":
+            span(f"tts {detail[0][0]}", t).ticks.append(t)
+        elif kind == "audio":
+            span("audio", t).ticks.append(t)
+    return list(spans.values())
+
+
+def format_waterfall(record: dict, width: int = 48) -> str:
+    """Text waterfall of one trace: a bar per stage, `|` marks arrivals."""
+    spans = waterfall(record)
+    ends = [t for t, *_ in record["events"]]
+    origin = min([0.0] + [s.start_ms for s in spans])
+    total = max([1.0] + ends + [s.end_ms for s in spans]) - origin
+    scale = width / total
+
+    header = (
+        f"trace {record['id']}  {record['source_language']}→{record['target_language']}  "
+        f"{total:.0f} ms  {record.get('outcome') or '?'}"
+    )
+    if record.get("provider"):
+        header += f"  via {record['provider']}"
+    lines = [header]
+    for s in spans:
+        lo = int((s.start_ms - origin) * scale)
+        hi = max(lo + 1, int((s.end_ms - origin) * scale))
+        bar = [" "] * width
+        for i in range(lo, min(hi, width)):
+            bar[i] = "="
+        for t in s.ticks:
+            bar[min(width - 1, int((t - origin) * scale))] = "|"
+        lines.append(
+            f"  {s.name:<10} {''.join(bar)}  {s.start_ms:8.1f} → {s.end_ms:8.1f} ms"
+        )
+    return "\n".join(lines)
+
+
+trace_recorder = TraceRecorder()
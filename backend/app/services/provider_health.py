@@ -0,0 +1,319 @@
+"""Provider health — circuit breakers and health-scored routing for STT/LLM/TTS.
+
+Every external call (Deepgram, OpenAI, Anthropic, ElevenLabs) goes through a
+breaker keyed by provider and model that keeps a rolling window of outcomes:
+
+    closed     — normal. Opens when the window's error rate reaches
+                 circuit_error_threshold (after circuit_min_requests calls)
+                 or after circuit_consecutive_failures failures in a row.
+    open       — calls are refused immediately (CircuitOpenError) instead of
+                 waiting for the provider to time out.
+    half_open  — the cooldown has passed; one probe call at a time is let
+                 through. Success closes the circuit, failure re-opens it
+                 with twice the cooldown (up to circuit_max_open_seconds).
+
+Only provider faults count as failures: timeouts, connection errors, 5xx and
+429. A 4xx caused by our own request says nothing about provider health.
+
+`plan()` turns a set of candidate providers into an ordered list of guarded
+calls: healthy providers first in declared order, degraded ones (high error
+rate or far slower than the best) after them, open ones dropped. A
+half-open provider is probed with a shadow copy of the call when a healthy
+alternative serves the real one; when it's the only option, the real call
+is the probe.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+MAX_OUTCOMES = 256  # per breaker, on top of the time window
+SLOW_FACTOR = 3.0  # p50 this many times the best candidate's counts as degraded
+
+
+class CircuitOpenError(RuntimeError):
+    """Every candidate provider for a call has an open circuit."""
+
+
+def is_provider_fault(exc: BaseException) -> bool:
+    """Timeouts, connection errors, 5xx and 429 count against the provider; other 4xx don't."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", None)
+    if isinstance(status, int):
+        return status >= 500 or status == 429
+    return True
+
+
+@dataclass
+class Outcome:
+    at: float
+    ok: bool
+    latency_ms: float
+
+
+class CircuitBreaker:
+    """Rolling health and circuit state of one provider + model."""
+
+    def __init__(self, provider: str, model: str):
+        settings = get_settings()
+        self.provider = provider
+        self.model = model
+        self.window_seconds = settings.circuit_window_seconds
+        self.min_requests = settings.circuit_min_requests
+        self.error_threshold = settings.circuit_error_threshold
+        self.max_consecutive = settings.circuit_consecutive_failures
+        self.base_open_seconds = settings.circuit_open_seconds
+        self.max_open_seconds = settings.circuit_max_open_seconds
+
+        self.outcomes: deque[Outcome] = deque(maxlen=MAX_OUTCOMES)
+        self.consecutive_failures = 0
+        self._state = CLOSED
+        self.opened_at = 0.0
+        self.open_seconds = float(self.base_open_seconds)
+        self.probing = False
+        self.times_opened = 0
+        self.rejected = 0
+        self.probes = 0
+
+    @property
+    def key(self) -> str:
+        return f"{self.provider}:{self.model}"
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self.opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+        return self._state
+
+    # ── Rolling window ──
+
+    def _recent(self) -> list[Outcome]:
+        cutoff = time.monotonic() - self.window_seconds
+        while self.outcomes and self.outcomes[0].at < cutoff:
+            self.outcomes.popleft()
+        return list(self.outcomes)
+
+    def error_rate(self) -> float:
+        recent = self._recent()
+        return sum(not o.ok for o in recent) / len(recent) if recent else 0.0
+
+    def latency_ms(self, q: float = 0.5) -> float | None:
+        latencies = sorted(o.latency_ms for o in self._recent() if o.ok)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+    # ── State transitions ──
+
+    def acquire_probe(self) -> bool:
+        """Claim the half-open probe slot."""
+        if self.state != HALF_OPEN or self.probing:
+            return False
+        self.probing = True
+        self.probes += 1
+        return True
+
+    def release_probe(self) -> None:
+        """A probe was cancelled before it produced an outcome."""
+        self.probing = False
+
+    def record_success(self, latency_ms: float) -> None:
+        self.outcomes.append(Outcome(time.monotonic(), True, latency_ms))
+        self.consecutive_failures = 0
+        if self._state != CLOSED:
+            logger.info("Circuit %s closed", self.key)
+            self._state = CLOSED
+            self.open_seconds = float(self.base_open_seconds)
+        self.probing = False
+
+    def record_failure(self, latency_ms: float) -> None:
+        self.outcomes.append(Outcome(time.monotonic(), False, latency_ms))
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN:
+            self._open(self.open_seconds * 2)
+        elif self._state == CLOSED and self._should_open():
+            self._open(self.base_open_seconds)
+        self.probing = False
+
+    def _should_open(self) -> bool:
+        if self.consecutive_failures >= self.max_consecutive:
+            return True
+        recent = self._recent()
+        return len(recent) >= self.min_requests and self.error_rate() >= self.error_threshold
+
+    def _open(self, seconds: float) -> None:
+        self._state = OPEN
+        self.opened_at = time.monotonic()
+        self.open_seconds = min(seconds, self.max_open_seconds)
+        self.times_opened += 1
+        logger.warning(
+            "Circuit %s opened for %.0fs (error rate %.0f%%, %d consecutive failures)",
+            self.key, self.open_seconds, self.error_rate() * 100, self.consecutive_failures,
+        )
+
+    def degraded(self, best_latency_ms: float | None) -> bool:
+        if self.error_rate() >= self.error_threshold / 2:
+            return True
+        latency = self.latency_ms()
+        return bool(best_latency_ms and latency and latency > best_latency_ms * SLOW_FACTOR)
+
+    def summary(self) -> dict:
+        latency_p50, latency_p95 = self.latency_ms(0.5), self.latency_ms(0.95)
+        return {
+            "state": self.state,
+            "requests": len(self._recent()),
+            "error_rate": round(self.error_rate(), 3),
+            "latency_p50_ms": round(latency_p50, 1) if latency_p50 is not None else None,
+            "latency_p95_ms": round(latency_p95, 1) if latency_p95 is not None else None,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "probes": self.probes,
+        }
+
+
+Candidate = tuple[str, str]  # (provider, model)
+
+
+class ProviderHealthRegistry:
+    """Process-wide breakers, one per provider + model."""
+
+    def __init__(self):
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._shadow_probes: set[asyncio.Task] = set()
+
+    def breaker(self, provider: str, model: str) -> CircuitBreaker:
+        key = f"{provider}:{model}"
+        if key not in self._breakers:
+            self._breakers[key] = CircuitBreaker(provider, model)
+        return self._breakers[key]
+
+    def plan(
+        self,
+        candidates: dict[Candidate, Callable[[], Awaitable[Any]]],
+        discard: Callable[[Any], Awaitable[None]] | None = None,
+    ) -> list[tuple[str, Callable[[], Awaitable[Any]]]]:
+        """
+        Order candidate calls by provider health → [(provider, guarded call)].
+        Candidates are given in preference order. Raises CircuitOpenError if
+        none may be called. `discard` disposes of a shadow probe's result.
+        """
+        breakers = {self.breaker(*candidate): call for candidate, call in candidates.items()}
+        closed = [b for b in breakers if b.state == CLOSED]
+        latencies = [lat for b in closed if (lat := b.latency_ms()) is not None]
+        best = min(latencies, default=None)
+        usable = sorted(closed, key=lambda b: b.degraded(best))  # stable: keeps preference
+
+        probing = [b for b in breakers if b.state == HALF_OPEN]
+        if not usable:
+            probe = next((b for b in probing if b.acquire_probe()), None)
+            if probe is None:
+                for b in breakers:
+                    b.rejected += 1
+                names = ", ".join(b.key for b in breakers)
+                raise CircuitOpenError(f"Provider circuit open: {names}")
+            usable = [probe]
+        else:
+            for b in probing:
+                if b.acquire_probe():
+                    self._shadow_probe(b, breakers[b], discard)
+
+        return [(b.provider, self._guard(b, breakers[b], probe=b.probing)) for b in usable]
+
+    async def call(self, provider: str, model: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Single-provider call through its breaker (no alternative to route to)."""
+        [(_, guarded)] = self.plan({(provider, model): fn})
+        return await guarded()
+
+    async def stream(self, provider: str, model: str, open_stream: Callable[[], Any]):
+        """
+        Guard an async-iterator call: latency is time to the first item; a
+        failure before or during the stream counts against the provider.
+        """
+        [(_, guarded)] = self.plan({(provider, model): lambda: _first_item(open_stream())})
+        first, stream = await guarded()
+        if first is _EMPTY:
+            return
+        breaker = self.breaker(provider, model)
+        yield first
+        try:
+            async for item in stream:
+                yield item
+        except Exception as e:
+            if is_provider_fault(e):
+                breaker.record_failure(0.0)
+            raise
+        finally:
+            await stream.aclose()
+
+    def snapshot(self) -> dict:
+        return {key: breaker.summary() for key, breaker in sorted(self._breakers.items())}
+
+    def any_open(self) -> bool:
+        return any(b.state != CLOSED for b in self._breakers.values())
+
+    def reset(self) -> None:
+        self._breakers.clear()
+
+    def _guard(self, breaker: CircuitBreaker, fn, probe: bool):
+        async def guarded():
+            started = time.monotonic()
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                if probe:
+                    breaker.release_probe()
+                raise
+            except Exception as e:
+                elapsed_ms = (time.monotonic() - started) * 1000
+                if is_provider_fault(e):
+                    breaker.record_failure(elapsed_ms)
+                elif probe:
+                    breaker.release_probe()
+                raise
+            breaker.record_success((time.monotonic() - started) * 1000)
+            return result
+        return guarded
+
+    def _shadow_probe(self, breaker: CircuitBreaker, fn, discard) -> None:
+        async def probe():
+            try:
+                result = await self._guard(breaker, fn, probe=True)()
+            except Exception as e:
+                logger.info("Probe of %s failed: %s", breaker.key, e)
+                return
+            if discard:
+                await discard(result)
+
+        task = asyncio.create_task(probe())
+        self._shadow_probes.add(task)
+        task.add_done_callback(self._shadow_probes.discard)
+
+
+_EMPTY = object()
+
+
+async def _first_item(stream):
+    """Wait for a stream's first item → (item, stream); (_EMPTY, stream) if it has none."""
+    try:
+        async for item in stream:
+            return item, stream
+        return _EMPTY, stream
+    except BaseException:
+        await stream.aclose()
+        raise
+
+
+# Singleton
+provider_health = ProviderHealthRegistry()
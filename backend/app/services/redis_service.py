@@ -64,17 +64,24 @@ class RedisService:
 
     # -- Translation cache --
 
-    def _translation_key(self, source_lang: str, target_lang: str, text: str) -> str:
-        """Generate a cache key for translations using a hash of the text."""
+    def _translation_key(
+        self, source_lang: str, target_lang: str, text: str, namespace: str = ""
+    ) -> str:
+        """
+        Generate a cache key for translations using a hash of the text.
+        Namespaced translations (user-specific context) live under trans:ns:<namespace>:.
+        """
         import hashlib
         text_hash = hashlib.md5(text.strip().lower().encode()).hexdigest()
+        if namespace:
+            return f"trans:ns:{namespace}:{source_lang}:{target_lang}:{text_hash}"
         return f"trans:{source_lang}:{target_lang}:{text_hash}"
 
     async def get_translation(
-        self, text: str, source_lang: str, target_lang: str
+        self, text: str, source_lang: str, target_lang: str, namespace: str = ""
     ) -> str | None:
         """Get cached translation if available."""
-        key = self._translation_key(source_lang, target_lang, text)
+        key = self._translation_key(source_lang, target_lang, text, namespace)
         return await self.get(key)
 
     async def set_translation(
@@ -84,11 +91,25 @@ class RedisService:
         target_lang: str,
         translated: str,
         expire_seconds: int = 86400,  # 24 hours
+        namespace: str = "",
     ) -> None:
         """Cache a translation result."""
-        key = self._translation_key(source_lang, target_lang, text)
+        key = self._translation_key(source_lang, target_lang, text, namespace)
         await self.set(key, translated, expire_seconds)
 
+    async def delete_translations(self, namespace: str) -> int:
+        """Delete every cached translation under a namespace prefix."""
+        deleted = 0
+        batch = []
+        async for key in self.client.scan_iter(match=f"trans:ns:{namespace}:*", count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                deleted += await self.client.delete(*batch)
+                batch = []
+        if batch:
+            deleted += await self.client.delete(*batch)
+        return deleted
+
     # -- Rate limiting --
 
     async def check_rate_limit(
@@ -0,0 +1,73 @@
+"""Clause segmenter — cut streamed LLM tokens into speakable chunks for TTS.
+
+The streaming pipeline feeds translation tokens in as they arrive and hands
+each complete sentence (or long-enough clause) to TTS straight away, instead
+of waiting for the whole translation to finish.
+"""
+
+import re
+
+# Sentence end: terminator (+ closing quotes/brackets) followed by whitespace.
+# Requiring whitespace keeps "3.14" or "e.g" intact mid-stream.
+_SENTENCE_END = re.compile(r"[.!?…]+[\"'”’)\]]*\s+")
+# CJK full-width terminators end a sentence without trailing whitespace
+_CJK_SENTENCE_END = re.compile(r"[。！？]+[」』”’）]*")
+# Clause break: comma/semicolon/colon (ASCII + full-width) followed by whitespace
+_CLAUSE_END = re.compile(r"[,;:]\s+|[，、；：]")
+
+
+class ClauseSegmenter:
+    """
+    Incremental sentence/clause splitter.
+
+    feed() returns every clause completed by the new text; flush() returns
+    whatever is left once the stream ends.
+    """
+
+    def __init__(self, min_clause_chars: int = 24, max_clause_chars: int = 160):
+        # Clauses shorter than this are only cut at sentence boundaries
+        self.min_clause_chars = min_clause_chars
+        # Hard cap — split at the last whitespace (Thai has no punctuation)
+        self.max_clause_chars = max_clause_chars
+        self._buffer = ""
+
+    def feed(self, text: str) -> list[str]:
+        """Add streamed text; return clauses that are now complete."""
+        self._buffer += text
+        clauses: list[str] = []
+        while True:
+            cut = self._find_cut()
+            if cut is None:
+                break
+            clause = self._buffer[:cut].strip()
+            self._buffer = self._buffer[cut:]
+            if clause:
+                clauses.append(clause)
+        return clauses
+
+    def flush(self) -> str:
+        """Return (and clear) the trailing partial clause."""
+        tail = self._buffer.strip()
+        self._buffer = ""
+        return tail
+
+    def _find_cut(self) -> int | None:
+        buf = self._buffer
+
+        # 1. Sentence boundaries — always cut
+        ends = [m.end() for m in (_SENTENCE_END.search(buf), _CJK_SENTENCE_END.search(buf)) if m]
+        if ends:
+            return min(ends)
+
+        # 2. Clause boundaries — only once the clause is long enough to be worth a TTS call
+        if len(buf) >= self.min_clause_chars:
+            for m in _CLAUSE_END.finditer(buf):
+                if m.end() >= self.min_clause_chars:
+                    return m.end()
+
+        # 3. Runaway clause — split at the last whitespace before the cap
+        if len(buf) > self.max_clause_chars:
+            space = buf.rfind(" ", self.min_clause_chars, self.max_clause_chars)
+            return space + 1 if space > 0 else self.max_clause_chars
+
+        return None
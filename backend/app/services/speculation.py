@@ -0,0 +1,207 @@
+"""Speculative translation — start translating interim transcripts before the final.
+
+Deepgram interims usually converge on the final text well before the final
+arrives. Once an interim stops changing (or reaches a clause boundary) we
+translate it in the background; if the final matches, the translation is
+already done. If the final only continues it past a clause boundary
+("see you at noon," → "see you at noon, bring the slides"), the prefix's
+translation is kept and only the rest is translated. If the final diverges,
+the speculative work is cancelled and the caller re-issues the translation
+under a new revision.
+"""
+
+import asyncio
+import re
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+_CLAUSE_BOUNDARY = re.compile(r"[.!?,;:。！？，、]$")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token estimate (~4 chars/token) for waste accounting."""
+    return max(1, len(text) // 4) if text else 0
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def stable_prefix(previous: str, current: str) -> str:
+    """Longest common word prefix of two consecutive interims."""
+    prev_words, cur_words = previous.split(), current.split()
+    n = 0
+    for a, b in zip(prev_words, cur_words):
+        if a != b:
+            break
+        n += 1
+    return " ".join(cur_words[:n])
+
+
+def remainder(speculated: str, final: str) -> str | None:
+    """
+    What `final` adds after `speculated`: "" if they match, the rest if
+    `final` continues it past a clause boundary, else None.
+    """
+    spec_words, final_words = speculated.lower().split(), final.split()
+    if [w.lower() for w in final_words[: len(spec_words)]] != spec_words:
+        return None
+    rest = " ".join(final_words[len(spec_words) :])
+    if rest and not _CLAUSE_BOUNDARY.search(speculated):
+        return None  # a clause cut short translates differently on its own
+    return rest
+
+
+@dataclass
+class SpeculationStats:
+    """Process-wide speculation counters."""
+
+    attempts: int = 0
+    hits: int = 0
+    partial_hits: int = 0  # hits where the final continued past the speculated clause
+    misses: int = 0
+    tokens_total: int = 0  # prompt + output tokens for all translations in speculative mode
+    tokens_wasted: int = 0  # tokens spent on speculations that were thrown away
+
+    @property
+    def hit_rate(self) -> float:
+        resolved = self.hits + self.misses
+        return self.hits / resolved if resolved else 0.0
+
+    @property
+    def wasted_token_rate(self) -> float:
+        return self.tokens_wasted / self.tokens_total if self.tokens_total else 0.0
+
+    def summary(self) -> dict:
+        return {
+            "attempts": self.attempts,
+            "hits": self.hits,
+            "partial_hits": self.partial_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+            "wasted_token_rate": round(self.wasted_token_rate, 3),
+        }
+
+
+@dataclass
+class Speculation:
+    """One in-flight speculative translation."""
+
+    text: str
+    task: asyncio.Task
+
+    def discard(self, stats: SpeculationStats) -> None:
+        """Cancel (if still running) and charge its tokens as waste."""
+        wasted = estimate_tokens(self.text)
+        if not self.task.done():
+            self.task.cancel()
+        elif not self.task.cancelled() and self.task.exception() is None:
+            wasted += estimate_tokens(self.task.result())
+        stats.tokens_wasted += wasted
+
+
+@dataclass
+class SegmentClaim:
+    """Speculation state handed over when a final transcript arrives."""
+
+    segment: int
+    revision: int  # revisions already shown to the client for this segment
+    speculation: Speculation | None
+
+    async def resolve(self, final_text: str, stats: SpeculationStats) -> tuple[str, str] | None:
+        """
+        Return (speculative translation, rest of the final still to translate)
+        if the final matches or continues the speculated text, else None.
+        """
+        spec = self.speculation
+        if spec is None:
+            return None
+        rest = remainder(spec.text, final_text)
+        if rest is not None:
+            try:
+                result = await spec.task
+            except Exception:
+                result = None
+            if result:
+                stats.hits += 1
+                if rest:
+                    stats.partial_hits += 1
+                return result, rest
+        stats.misses += 1
+        spec.discard(stats)
+        return None
+
+
+class Speculator:
+    """
+    Per-stream speculation driver.
+
+    observe_interim() is called for every interim result; claim() when the
+    final for the current segment arrives.
+    """
+
+    def __init__(
+        self,
+        translate: Callable[[str], Awaitable[str]],
+        on_preview: Callable[[str, int, int], None],
+        stats: SpeculationStats,
+        min_words: int = 3,
+    ):
+        self._translate = translate
+        self._on_preview = on_preview  # (translation, segment, revision)
+        self._stats = stats
+        self.min_words = min_words
+        self.segment = 0
+        self._revision = 0
+        self._last_interim = ""
+        self._current: Speculation | None = None
+
+    def observe_interim(self, text: str) -> None:
+        stable = stable_prefix(self._last_interim, text)
+        fully_stable = normalize(self._last_interim) == normalize(text)
+        self._last_interim = text
+
+        if len(stable.split()) < self.min_words:
+            return
+        if not (fully_stable or _CLAUSE_BOUNDARY.search(stable)):
+            return
+        if self._current and normalize(self._current.text) == normalize(stable):
+            return
+
+        # A newer stable prefix supersedes the previous speculation
+        if self._current:
+            self._current.discard(self._stats)
+        self._start(stable)
+
+    def claim(self) -> SegmentClaim:
+        """Snapshot this segment's speculation and reset for the next one."""
+        claim = SegmentClaim(self.segment, self._revision, self._current)
+        self.segment += 1
+        self._revision = 0
+        self._last_interim = ""
+        self._current = None
+        return claim
+
+    def cancel(self) -> None:
+        if self._current:
+            self._current.discard(self._stats)
+            self._current = None
+
+    def _start(self, text: str) -> None:
+        self._stats.attempts += 1
+        self._stats.tokens_total += estimate_tokens(text)
+        spec = Speculation(text=text, task=asyncio.create_task(self._translate(text)))
+        segment = self.segment
+
+        def done(task: asyncio.Task) -> None:
+            if task.cancelled() or task.exception() is not None:
+                return
+            result = task.result()
+            self._stats.tokens_total += estimate_tokens(result)
+            # Only preview if still the live speculation for the live segment
+            if self._current is spec and self.segment == segment:
+                self._revision += 1
+                self._on_preview(result, segment, self._revision)
+
+        spec.task.add_done_callback(done)
+        self._current = spec
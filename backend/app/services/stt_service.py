@@ -1,20 +1,178 @@
 """Deepgram STT — Speech-to-Text with streaming support."""
 
-import httpx
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlencode
+
+from websockets.asyncio.client import ClientConnection, connect
 
 from app.config import get_settings
+from app.services.audio_dsp import audio_mimetype
+from app.services.http_clients import http_clients, http_timeout
+from app.services.provider_health import provider_health
+
+logger = logging.getLogger(__name__)
+
+# Deepgram closes idle streams after ~10s without audio
+KEEPALIVE_INTERVAL_SECONDS = 5
+
+
+@dataclass
+class TranscriptResult:
+    """One interim or final result from a streaming STT session."""
+
+    text: str
+    is_final: bool
+    speech_final: bool = False
+    start: float = 0.0  # seconds from stream start
+    duration: float = 0.0
+    words: list[dict] = field(default_factory=list)  # {"word", "start", "end", "confidence"}
+    received_at: float = 0.0
+
+
+class STTStream:
+    """
+    A long-lived Deepgram streaming session.
+
+    Push audio with send(); iterate the session for TranscriptResult objects.
+    Interim results revise the current segment; finals never change again.
+    """
+
+    def __init__(self, url: str, api_key: str):
+        self._url = url
+        self._api_key = api_key
+        self._ws: ClientConnection | None = None
+        self._results: asyncio.Queue[TranscriptResult | BaseException | None] = asyncio.Queue()
+        self._reader_task: asyncio.Task | None = None
+        self._keepalive_task: asyncio.Task | None = None
+        self._last_send = 0.0
+        self._finished = False
+
+    async def start(self) -> "STTStream":
+        self._ws = await connect(
+            self._url,
+            additional_headers={"Authorization": f"Token {self._api_key}"},
+        )
+        self._last_send = time.monotonic()
+        self._reader_task = asyncio.create_task(self._read())
+        self._keepalive_task = asyncio.create_task(self._keepalive())
+        return self
+
+    @property
+    def closed(self) -> bool:
+        return self._finished or self._ws is None
+
+    async def send(self, audio_data: bytes) -> None:
+        """Push a frame of audio into the session."""
+        if self.closed:
+            raise RuntimeError("STT stream is closed")
+        await self._ws.send(audio_data)
+        self._last_send = time.monotonic()
+
+    async def finish(self) -> None:
+        """Ask Deepgram to flush pending results and end the stream."""
+        if self.closed:
+            return
+        self._finished = True
+        try:
+            await self._ws.send(json.dumps({"type": "CloseStream"}))
+        except Exception:
+            await self.close()
+
+    async def close(self) -> None:
+        """Tear down the session immediately."""
+        self._finished = True
+        if self._keepalive_task:
+            self._keepalive_task.cancel()
+        if self._ws:
+            await self._ws.close()
+        if self._reader_task:
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+
+    def __aiter__(self):
+        return self._iter_results()
+
+    async def _iter_results(self):
+        while True:
+            item = await self._results.get()
+            if item is None:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    async def _read(self) -> None:
+        try:
+            async for raw in self._ws:
+                if isinstance(raw, bytes):
+                    continue
+                result = _parse_stream_message(json.loads(raw))
+                if result is not None:
+                    await self._results.put(result)
+        except Exception as e:
+            if not self._finished:
+                logger.warning("STT stream failed: %s", e)
+                await self._results.put(e)
+        finally:
+            self._finished = True
+            if self._keepalive_task:
+                self._keepalive_task.cancel()
+            await self._results.put(None)
+
+    async def _keepalive(self) -> None:
+        try:
+            while not self._finished:
+                await asyncio.sleep(KEEPALIVE_INTERVAL_SECONDS)
+                if time.monotonic() - self._last_send >= KEEPALIVE_INTERVAL_SECONDS:
+                    await self._ws.send(json.dumps({"type": "KeepAlive"}))
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.debug("STT keepalive stopped: %s", e)
+
+
+def _parse_stream_message(data: dict) -> TranscriptResult | None:
+    """Convert a Deepgram streaming "Results" message into a TranscriptResult."""
+    if data.get("type") != "Results":
+        return None
+    alternatives = data.get("channel", {}).get("alternatives", [])
+    if not alternatives:
+        return None
+    best = alternatives[0]
+    return TranscriptResult(
+        text=best.get("transcript", ""),
+        is_final=bool(data.get("is_final")),
+        speech_final=bool(data.get("speech_final")),
+        start=data.get("start", 0.0),
+        duration=data.get("duration", 0.0),
+        words=[
+            {
+                "word": w.get("punctuated_word") or w.get("word", ""),
+                "start": w.get("start", 0.0),
+                "end": w.get("end", 0.0),
+                "confidence": w.get("confidence", 0.0),
+            }
+            for w in best.get("words", [])
+        ],
+        received_at=time.time(),
+    )
 
 
 class STTService:
     """Deepgram Nova-2 speech-to-text service."""
 
-    BASE_URL = "https://api.deepgram.com/v1"
-
     async def transcribe(
         self,
         audio_data: bytes,
         language: str = "auto",
         model: str = "nova-2",
+        mimetype: str | None = None,
     ) -> str:
         """
         Transcribe audio bytes → text.
@@ -23,6 +181,7 @@ class STTService:
             audio_data: Raw audio bytes (WAV, MP3, etc.)
             language: BCP-47 language code or "auto" for detection
             model: Deepgram model (nova-2 recommended)
+            mimetype: Content-Type of audio_data; sniffed from its header if omitted
 
         Returns:
             Transcribed text string
@@ -42,18 +201,21 @@ class STTService:
 
         headers = {
             "Authorization": f"Token {settings.deepgram_api_key}",
-            "Content-Type": "audio/wav",
+            "Content-Type": mimetype or audio_mimetype(audio_data),
         }
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.post(
-                f"{self.BASE_URL}/listen",
+        async def request() -> dict:
+            resp = await http_clients.get("deepgram").post(
+                f"{settings.deepgram_api_url}/listen",
                 params=params,
                 headers=headers,
                 content=audio_data,
+                timeout=http_timeout(30),
             )
             resp.raise_for_status()
-            data = resp.json()
+            return resp.json()
+
+        data = await provider_health.call("deepgram", model, request)
 
         # Extract transcript from Deepgram response
         channels = data.get("results", {}).get("channels", [])
@@ -66,19 +228,59 @@ class STTService:
 
         return alternatives[0].get("transcript", "")
 
+    async def open_stream(
+        self,
+        language: str = "auto",
+        model: str = "nova-2",
+        encoding: str | None = None,
+        sample_rate: int | None = None,
+    ) -> STTStream:
+        """
+        Open a long-lived streaming session (Deepgram WebSocket API).
+
+        Args:
+            language: BCP-47 language code; "auto" uses Deepgram's multilingual mode
+                      (language detection is batch-only)
+            model: Deepgram model
+            encoding / sample_rate: only for raw audio (e.g. "linear16", 16000);
+                      containerized audio (webm, ogg, wav) is detected automatically
+        """
+        settings = get_settings()
+
+        params = {
+            "model": model,
+            "smart_format": "true",
+            "punctuate": "true",
+            "interim_results": "true",
+            "language": language if language != "auto" else "multi",
+        }
+        if encoding:
+            params["encoding"] = encoding
+        if sample_rate:
+            params["sample_rate"] = str(sample_rate)
+
+        url = f"{settings.deepgram_ws_url}?{urlencode(params)}"
+        return await provider_health.call(
+            "deepgram", f"{model}-stream", STTStream(url, settings.deepgram_api_key).start
+        )
+
     async def transcribe_stream(self, audio_data: bytes, language: str = "auto"):
         """
         Stream audio to Deepgram WebSocket for real-time transcription.
-        This is used for live call audio — lower latency than batch.
+        One-shot helper around open_stream() for callers that already hold
+        a complete buffer.
 
-        Yields partial transcripts as they arrive.
+        Yields final transcripts as they arrive.
         """
-        # For MVP, we use the batch endpoint above.
-        # Production: use Deepgram's WebSocket streaming API
-        # wss://api.deepgram.com/v1/listen
-        transcript = await self.transcribe(audio_data, language)
-        if transcript:
-            yield transcript
+        stream = await self.open_stream(language)
+        try:
+            await stream.send(audio_data)
+            await stream.finish()
+            async for result in stream:
+                if result.is_final and result.text:
+                    yield result.text
+        finally:
+            await stream.close()
 
 
 # Singleton
@@ -0,0 +1,290 @@
+"""In-process translation cache tier and request coalescing.
+
+TranslationService.translate looks translations up in two tiers:
+
+    memory — per-process LRU with a short TTL (translation_cache_memory_*):
+             a phrase this worker translated a moment ago never leaves the
+             process again
+    redis  — RedisService.get_translation/set_translation, shared by every
+             worker (24 h)
+
+Misses are coalesced (Singleflight): concurrent requests for the same key —
+the same sticker text posted to 20 chats, a retry storm — wait on one Redis
+lookup and at most one provider call instead of each paying for their own.
+
+Translations made with a persona, industry or glossary are cached too, under
+keys that carry a hash of that (normalized) context and in the namespace of
+the user it belongs to: a changed glossary simply misses, and
+TranslationService.invalidate_namespace drops the stale entries of that one
+user. Each namespace has its own memory budget (translation_cache_namespace_kb).
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+from app.config import get_settings
+
+T = TypeVar("T")
+
+
+def translation_key(
+    text: str, source_language: str, target_language: str, context: str = ""
+) -> str:
+    """Same normalization as the Redis tier: stripped, lower-cased text."""
+    text_hash = hashlib.md5(text.strip().lower().encode()).hexdigest()
+    key = f"{source_language}:{target_language}:{text_hash}"
+    return f"{context}:{key}" if context else key
+
+
+def _normalize(value: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", value).split())
+
+
+def context_hash(
+    persona: str = "", industry: str = "", glossary: dict[str, str] | None = None
+) -> str:
+    """
+    Stable hash of everything besides the text that shapes a translation.
+    "" for no context; whitespace and glossary order don't change it.
+    """
+    persona, industry = _normalize(persona), _normalize(industry)
+    terms = sorted((_normalize(k), _normalize(v)) for k, v in (glossary or {}).items())
+    if not (persona or industry or terms):
+        return ""
+    raw = json.dumps([persona, industry, terms], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class CacheScope:
+    """Where one translation lives in the cache tiers."""
+
+    key: str  # memory tier key
+    namespace: str = ""  # memory partition; "" = shared
+    redis_namespace: str = ""  # RedisService namespace; "" = plain keys
+
+    @classmethod
+    def of(
+        cls,
+        text: str,
+        source_language: str,
+        target_language: str,
+        persona: str = "",
+        industry: str = "",
+        glossary: dict[str, str] | None = None,
+        owner: str = "",
+    ) -> "CacheScope":
+        """Context-free translations are shared; others belong to `owner`'s namespace."""
+        context = context_hash(persona, industry, glossary)
+        if not context:
+            return cls(translation_key(text, source_language, target_language))
+        owner = owner or "shared"
+        return cls(
+            translation_key(text, source_language, target_language, context),
+            owner,
+            f"{owner}:{context}",
+        )
+
+
+@dataclass
+class TierStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # memory: LRU + expired entries; redis: unused
+    errors: int = 0  # redis: lookups/stores that failed (Redis down)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
+
+
+@dataclass
+class TranslationCacheStats:
+    memory: TierStats = field(default_factory=TierStats)
+    redis: TierStats = field(default_factory=TierStats)
+    coalesced: int = 0  # requests that waited on another request's lookup/provider call
+
+    def summary(self) -> dict:
+        return {
+            "memory": self.memory.summary(),
+            "redis": self.redis.summary(),
+            "coalesced": self.coalesced,
+        }
+
+
+class _Partition:
+    def __init__(self):
+        self.entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self.bytes = 0
+
+
+def _entry_bytes(key: str, value: str) -> int:
+    return len(key) + len(value.encode())
+
+
+class MemoryTier:
+    """
+    Per-process LRU whose entries expire after `ttl_s`.
+
+    Plain translations share one entry-bounded LRU. Context-keyed ones
+    (persona / industry / glossary) live in a partition per namespace —
+    the user whose context it is — with its own byte budget, so one
+    tenant's traffic only ever evicts its own entries; beyond
+    max_namespaces the least recently used namespace is dropped whole.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        ttl_s: float | None = None,
+        stats: TierStats | None = None,
+        namespace_bytes: int | None = None,
+        max_namespaces: int | None = None,
+    ):
+        settings = get_settings()
+        self.max_entries = (
+            max_entries if max_entries is not None else settings.translation_cache_memory_entries
+        )
+        self.ttl_s = ttl_s if ttl_s is not None else settings.translation_cache_memory_ttl_s
+        self.namespace_bytes = (
+            namespace_bytes
+            if namespace_bytes is not None
+            else settings.translation_cache_namespace_kb << 10
+        )
+        self.max_namespaces = (
+            max_namespaces
+            if max_namespaces is not None
+            else settings.translation_cache_max_namespaces
+        )
+        self.stats = stats or TierStats()
+        self._shared = _Partition()
+        self._namespaces: OrderedDict[str, _Partition] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._shared.entries) + sum(len(p.entries) for p in self._namespaces.values())
+
+    def namespace_size(self, namespace: str) -> int:
+        """Bytes held for a namespace."""
+        partition = self._namespaces.get(namespace)
+        return partition.bytes if partition else 0
+
+    def get(self, key: str, namespace: str = "") -> str | None:
+        partition = self._namespaces.get(namespace) if namespace else self._shared
+        entry = partition.entries.get(key) if partition else None
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                partition.entries.move_to_end(key)
+                if namespace:
+                    self._namespaces.move_to_end(namespace)
+                self.stats.hits += 1
+                return value
+            del partition.entries[key]
+            partition.bytes -= _entry_bytes(key, value)
+            self.stats.evictions += 1
+        self.stats.misses += 1
+        return None
+
+    def put(self, key: str, value: str, namespace: str = "") -> None:
+        if not value:
+            return
+        if not namespace:
+            if self.max_entries > 0:
+                self._insert(self._shared, key, value)
+                while len(self._shared.entries) > self.max_entries:
+                    self._evict(self._shared)
+            return
+
+        if _entry_bytes(key, value) > self.namespace_bytes or self.max_namespaces <= 0:
+            return
+        partition = self._namespaces.get(namespace)
+        if partition is None:
+            partition = self._namespaces[namespace] = _Partition()
+            while len(self._namespaces) > self.max_namespaces:
+                _, dropped = self._namespaces.popitem(last=False)
+                self.stats.evictions += len(dropped.entries)
+        self._namespaces.move_to_end(namespace)
+        self._insert(partition, key, value)
+        while partition.bytes > self.namespace_bytes:
+            self._evict(partition)
+
+    def invalidate(self, namespace: str) -> int:
+        """Drop every entry of a namespace; returns how many there were."""
+        partition = self._namespaces.pop(namespace, None)
+        return len(partition.entries) if partition else 0
+
+    def _insert(self, partition: _Partition, key: str, value: str) -> None:
+        old = partition.entries.pop(key, None)
+        if old is not None:
+            partition.bytes -= _entry_bytes(key, old[1])
+        partition.entries[key] = (time.monotonic() + self.ttl_s, value)
+        partition.bytes += _entry_bytes(key, value)
+
+    def _evict(self, partition: _Partition) -> None:
+        key, (_, value) = partition.entries.popitem(last=False)
+        partition.bytes -= _entry_bytes(key, value)
+        self.stats.evictions += 1
+
+
+class _Call(Generic[T]):
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class Singleflight(Generic[T]):
+    """
+    Concurrent calls for the same key share one execution of `fn`.
+
+    The work runs in its own task so one caller being cancelled (a deadline,
+    a closed socket) doesn't fail the others; it is cancelled only when
+    every caller waiting on it has gone.
+    """
+
+    def __init__(self):
+        self._calls: dict[str, _Call[T]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Returns (result, shared) — shared is True if another caller started the work."""
+        call = self._calls.get(key)
+        shared = call is not None
+        if call is None:
+            call = self._calls[key] = _Call(asyncio.ensure_future(fn()))
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task), shared
+        finally:
+            call.waiters -= 1
+            if not call.waiters and not call.task.done():
+                # Forget it now: a caller arriving before the task has wound
+                # down must start fresh, not join work that is being cancelled
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                call.task.cancel()
+
+    def _forget(self, key: str, call: _Call[T]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.task.cancelled():
+            call.task.exception()  # retrieved: every waiter may have gone
@@ -0,0 +1,327 @@
+"""Translation memory — past translations reused exactly or as LLM references.
+
+Every logged context-free translation (translation_logs without a persona,
+industry or glossary) is indexed in translation_memory, one row per user,
+normalized source text and language pair, latest translation winning.
+TranslationService consults it for context-free translations after a Redis
+miss, before the LLM:
+
+    exact   — same normalized text (hash index), from any user — like the
+              shared Redis tier: returned as is
+    fuzzy   — only within the requesting user's own history, so no one
+              else's messages end up in their prompt. MinHash LSH over
+              character trigrams finds near-duplicates ("Can we meet on
+              Monday?" / "can we meet on Tuesday") through a
+              GIN index on band keys; the candidate with the highest trigram
+              Jaccard similarity (>= translation_memory_reference_similarity)
+              is given to the LLM as a reference translation, never returned
+              as is — trigram sets ignore word order ("Monday, not Tuesday" /
+              "Tuesday, not Monday") and small edits can flip the meaning
+
+Unlike the Redis tier it never expires and tolerates small differences.
+Built in bulk with
+
+    python -m app.services.translation_memory build [--since 2026-01-01]
+
+and kept current by LoggingService.log_translation.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import logging
+import random
+import time
+import unicodedata
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.database import async_session
+from app.models.models import TranslationLog, TranslationMemoryEntry
+from app.services.untranslatable import is_untranslatable
+
+logger = logging.getLogger(__name__)
+
+# MinHash: 16 bands of 4 rows — pairs above ~0.5 Jaccard share a band
+_PERMUTATIONS = 64
+_BAND_ROWS = 4
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x7E11)
+_COEFFICIENTS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(_PERMUTATIONS)]
+
+
+def normalize(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text).lower().split())
+
+
+def source_hash(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode()).hexdigest()
+
+
+def shingles(normalized: str) -> set[str]:
+    padded = f" {normalized} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a: set[str], b: set[str]) -> float:
+    """Jaccard similarity of two shingle sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def band_keys(grams: set[str]) -> list[str]:
+    """LSH band keys of the MinHash signature; similar texts share some."""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(g.encode(), digest_size=8).digest(), "big") for g in grams
+    ]
+    signature = [min((a * h + b) % _PRIME for h in hashes) for a, b in _COEFFICIENTS]
+    keys = []
+    for band in range(_PERMUTATIONS // _BAND_ROWS):
+        rows = signature[band * _BAND_ROWS : (band + 1) * _BAND_ROWS]
+        digest = hashlib.blake2b(repr(rows).encode(), digest_size=6).hexdigest()
+        keys.append(f"{band:x}{digest}")
+    return keys
+
+
+def _eligible(
+    source_language: str, target_language: str, source_text: str, translated: str, context: str
+) -> bool:
+    settings = get_settings()
+    return (
+        context == ""  # a persona/glossary translation isn't everyone's; None = not recorded
+        and source_language not in ("", "auto")
+        and source_language != target_language
+        and 0 < len(source_text.strip()) <= settings.translation_memory_max_chars
+        and bool(translated.strip())
+        and normalize(translated) != normalize(source_text)  # fallbacks that kept the original
+        and not is_untranslatable(source_text)
+    )
+
+
+@dataclass(frozen=True)
+class MemoryMatch:
+    source_text: str
+    translated_text: str
+    similarity: float  # trigram Jaccard; 1.0 for exact matches
+    exact: bool  # same normalized text
+
+    def direct(self) -> bool:
+        """Safe to return without asking the LLM: only the same text is."""
+        return self.exact
+
+    def reference(self) -> bool:
+        return self.similarity >= get_settings().translation_memory_reference_similarity
+
+
+@dataclass
+class TranslationMemoryStats:
+    exact: int = 0
+    fuzzy: int = 0  # near-duplicate found (direct or reference)
+    misses: int = 0
+    added: int = 0
+    errors: int = 0
+
+    def summary(self) -> dict:
+        return {
+            "exact": self.exact,
+            "fuzzy": self.fuzzy,
+            "misses": self.misses,
+            "added": self.added,
+            "errors": self.errors,
+        }
+
+
+class TranslationMemory:
+    def __init__(self):
+        self.stats = TranslationMemoryStats()
+        self._retry_at = 0.0  # lookups pause after a database error
+
+    async def lookup(
+        self, text: str, source_language: str, target_language: str, owner: str = ""
+    ) -> MemoryMatch | None:
+        """
+        Best stored match for `text`, or None; never raises. Near matches come
+        only from `owner`'s entries (none without an owner).
+        """
+        settings = get_settings()
+        if (
+            not settings.translation_memory_enabled
+            or time.monotonic() < self._retry_at
+            or source_language in ("", "auto")
+            or len(text) > settings.translation_memory_max_chars
+        ):
+            return None
+        normalized = normalize(text)
+        if not normalized:
+            return None
+        try:
+            async with async_session() as db:
+                match = await self._lookup(
+                    db, normalized, source_language, target_language, owner
+                )
+        except Exception as e:
+            self.stats.errors += 1
+            self._retry_at = time.monotonic() + settings.translation_memory_retry_s
+            logger.warning("Translation memory lookup failed: %s", e)
+            return None
+
+        if match is None or not match.reference():
+            self.stats.misses += 1
+            return None
+        if match.exact:
+            self.stats.exact += 1
+        else:
+            self.stats.fuzzy += 1
+        return match
+
+    async def _lookup(
+        self,
+        db: AsyncSession,
+        normalized: str,
+        source_language: str,
+        target_language: str,
+        owner: str,
+    ) -> MemoryMatch | None:
+        pair = (
+            TranslationMemoryEntry.source_language == source_language,
+            TranslationMemoryEntry.target_language == target_language,
+        )
+        columns = (TranslationMemoryEntry.source_text, TranslationMemoryEntry.translated_text)
+        row = (
+            await db.execute(
+                select(*columns)
+                .where(*pair, TranslationMemoryEntry.source_hash == source_hash(normalized))
+                .order_by(TranslationMemoryEntry.updated_at.desc())
+                .limit(1)
+            )
+        ).first()
+        if row:
+            return MemoryMatch(row.source_text, row.translated_text, 1.0, True)
+        if not owner:
+            return None
+
+        grams = shingles(normalized)
+        rows = (
+            await db.execute(
+                select(*columns)
+                .where(
+                    *pair,
+                    TranslationMemoryEntry.owner_id == owner,
+                    TranslationMemoryEntry.bands.overlap(band_keys(grams)),
+                )
+                .limit(get_settings().translation_memory_candidates)
+            )
+        ).all()
+        matches = [
+            MemoryMatch(
+                r.source_text,
+                r.translated_text,
+                round(similarity(grams, shingles(normalize(r.source_text))), 3),
+                False,
+            )
+            for r in rows
+        ]
+        return max(matches, key=lambda m: m.similarity, default=None)
+
+    async def add(
+        self,
+        db: AsyncSession,
+        source_language: str,
+        target_language: str,
+        source_text: str,
+        translated_text: str,
+        owner: str = "",
+        context: str | None = "",
+    ) -> bool:
+        """
+        Upsert one of `owner`'s translations, made under `context` (a
+        translation_cache.context_hash); the caller commits. False if it isn't
+        worth keeping — including any translation made with a context.
+        """
+        if not _eligible(source_language, target_language, source_text, translated_text, context):
+            return False
+        normalized = normalize(source_text)
+        now = datetime.utcnow()
+        stmt = insert(TranslationMemoryEntry).values(
+            id=uuid.uuid4(),
+            owner_id=owner,
+            source_language=source_language,
+            target_language=target_language,
+            source_hash=source_hash(normalized),
+            source_text=source_text.strip(),
+            translated_text=translated_text.strip(),
+            bands=band_keys(shingles(normalized)),
+            created_at=now,
+            updated_at=now,
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_tm_source",
+                set_={
+                    "translated_text": stmt.excluded.translated_text,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+        )
+        self.stats.added += 1
+        return True
+
+    async def rebuild(self, batch_size: int = 1000, since: datetime | None = None) -> int:
+        """
+        Index translation_logs (from `since`) oldest first, so the latest
+        translation of a text wins. Logs from before their context was
+        recorded are skipped. Returns how many entries were written.
+        """
+        added = 0
+        after = None  # (created_at, id) of the last log indexed
+        while True:
+            query = select(TranslationLog).order_by(TranslationLog.created_at, TranslationLog.id)
+            if since is not None:
+                query = query.where(TranslationLog.created_at >= since)
+            if after is not None:
+                query = query.where(tuple_(TranslationLog.created_at, TranslationLog.id) > after)
+            async with async_session() as db:
+                logs = (await db.execute(query.limit(batch_size))).scalars().all()
+                if not logs:
+                    return added
+                for log in logs:
+                    added += await self.add(
+                        db,
+                        log.source_language,
+                        log.target_language,
+                        log.source_text,
+                        log.translated_text,
+                        owner=str(log.user_id) if log.user_id else "",
+                        context=log.context_hash,
+                    )
+                await db.commit()
+            after = (logs[-1].created_at, logs[-1].id)
+            logger.info("Translation memory: %d entries written", added)
+
+
+# Singleton
+translation_memory = TranslationMemory()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Translation memory maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="index translation_logs into translation_memory")
+    build.add_argument("--batch-size", type=int, default=1000)
+    build.add_argument("--since", type=datetime.fromisoformat, help="only logs from this date")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    added = asyncio.run(translation_memory.rebuild(args.batch_size, args.since))
+    print(f"{added} translation memory entries written")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,36 @@
 """Translation service — GPT-4 Turbo (primary) + Claude 3.5 Sonnet (fallback)."""
 
-from openai import AsyncOpenAI
-from anthropic import AsyncAnthropic
+import asyncio
+import json
+import logging
+from contextlib import aclosing
+from contextvars import ContextVar
 
 from app.config import get_settings
+from app.services.glossary_matcher import glossary_matchers, missing_terms, relevant_glossary
+from app.services.hedging import Hedger
+from app.services.http_clients import http_clients
+from app.services.provider_health import provider_health
+from app.services.redis_service import redis_service
+from app.services.speculation import estimate_tokens
+from app.services.translation_cache import (
+    CacheScope,
+    MemoryTier,
+    Singleflight,
+    TranslationCacheStats,
+)
+from app.services.translation_memory import MemoryMatch, translation_memory
+from app.services.untranslatable import FastPathStats, Masked, is_untranslatable, mask
+
+logger = logging.getLogger(__name__)
+
+# Which provider served the last translation in the current task
+# ("openai" | "anthropic" | "cache" | "memory" | "local") — read by the pipeline for
+# latency histograms
+translation_provider: ContextVar[str] = ContextVar("translation_provider", default="")
+
+OPENAI_MODEL = "gpt-4-turbo"
+CLAUDE_MODEL = "claude-3-5-sonnet-20241022"
 
 # Supported languages with display names
 SUPPORTED_LANGUAGES = {
@@ -49,6 +76,7 @@ RULES:
 - Do NOT add explanations, notes, or commentary
 - Preserve idioms by finding equivalent expressions in the target language
 - Keep proper nouns unchanged
+- Keep ⟦n⟧ placeholders exactly as they are
 - Output ONLY the translated text, nothing else"""
 
     if persona:
@@ -64,8 +92,91 @@ RULES:
     return prompt
 
 
+def _reference_prompt(system_prompt: str, match: MemoryMatch) -> str:
+    """System prompt with a translation-memory near match as a reference."""
+    return (
+        f"{system_prompt}\n\nREFERENCE — an earlier translation of a similar text; "
+        f"reuse its wording where it applies:\n  {match.source_text} → {match.translated_text}"
+    )
+
+
+def _required_terms_prompt(system_prompt: str, missing: dict[str, str]) -> str:
+    """Retry prompt after a translation left out glossary terms."""
+    terms = "\n".join(f"  {k} → {v}" for k, v in missing.items())
+    return f"{system_prompt}\n\nREQUIRED — the translation MUST use these exact terms:\n{terms}"
+
+
+def _build_multi_target_prompt(source_language: str, target_languages: list[str]) -> str:
+    """System prompt for translating one chat message into several languages at once."""
+    src_name = SUPPORTED_LANGUAGES.get(source_language, source_language)
+    targets = ", ".join(
+        f'"{code}" ({SUPPORTED_LANGUAGES.get(code, code)})' for code in target_languages
+    )
+    example = ", ".join(f'"{code}": "..."' for code in target_languages)
+
+    return f"""You are a chat translator. Translate the user's {src_name} message into: {targets}.
+
+RULES:
+- Preserve the sender's tone, emotion, and intent
+- Preserve idioms by finding equivalent expressions in each target language
+- Keep proper nouns, URLs, @mentions, emoji and ⟦n⟧ placeholders unchanged
+- Do NOT add explanations, notes, or commentary
+- Output ONLY a JSON object with one translation per language code: {{{example}}}"""
+
+
+def _parse_translations(raw: str, target_languages: list[str]) -> dict[str, str]:
+    """Translations from a multi-target JSON reply; languages missing or malformed are left out."""
+    start, end = raw.find("{"), raw.rfind("}")
+    if start < 0 or end < start:
+        return {}
+    try:
+        parsed = json.loads(raw[start : end + 1])
+    except ValueError:
+        return {}
+    if not isinstance(parsed, dict):
+        return {}
+    return {
+        lang: parsed[lang].strip()
+        for lang in target_languages
+        if isinstance(parsed.get(lang), str) and parsed[lang].strip()
+    }
+
+
 class TranslationService:
-    """Hybrid GPT-4 + Claude translation with automatic fallback."""
+    """
+    Hybrid GPT-4 + Claude translation, hedged: Claude races GPT-4 when it runs slow.
+    Cached in memory (per process) and Redis (shared); concurrent misses coalesce.
+    """
+
+    def __init__(self):
+        self.hedger = Hedger()  # whole-response latency
+        self.stream_hedger = Hedger()  # time to first token
+        self.cache_stats = TranslationCacheStats()
+        self.memory_cache = MemoryTier(stats=self.cache_stats.memory)
+        self.inflight: Singleflight[tuple[str, str]] = Singleflight()
+        self.fast_path = FastPathStats()
+
+    def _verbatim(self, text: str, targets: int) -> bool:
+        """Whether `text` goes out untranslated; `targets` is how many LLM calls that saves."""
+        if not get_settings().translation_fast_path or not is_untranslatable(text):
+            return False
+        self.fast_path.verbatim += 1
+        self.fast_path.llm_calls_saved += targets
+        return True
+
+    def _mask(self, text: str) -> Masked:
+        if not get_settings().translation_fast_path:
+            return Masked(text)
+        masked = mask(text)
+        if masked.spans:
+            self.fast_path.masked += 1
+            self.fast_path.spans_masked += len(masked.spans)
+        return masked
+
+    def _restore(self, masked: Masked, translation: str) -> str:
+        restored, lost = masked.restore(translation)
+        self.fast_path.placeholders_lost += lost
+        return restored
 
     async def translate(
         self,
@@ -76,48 +187,366 @@ class TranslationService:
         industry: str = "",
         glossary: dict[str, str] | None = None,
         use_claude: bool = False,
+        namespace: str = "",
     ) -> str:
-        """Translate text using GPT-4 Turbo (or Claude as fallback). Cached in Redis."""
+        """
+        Translate text using GPT-4 Turbo (or Claude as fallback).
+        Cached in memory and Redis; concurrent identical misses share one lookup
+        and provider call. Translations with a persona/industry/glossary are
+        cached under `namespace` — the user that context belongs to.
+        Only glossary terms that occur in the text go into the prompt.
+        Untranslatable text (emoji, URLs, code, ...) is returned as is, and
+        such spans in other text are masked from the LLM.
+        """
         # Skip translation if same language
         if source_language == target_language:
             return text
+        if self._verbatim(text, 1):
+            translation_provider.set("local")
+            return text
 
-        # Check Redis cache first (only for text without custom context)
-        from app.services.redis_service import redis_service
-        use_cache = not persona and not industry and not glossary
-        if use_cache:
-            try:
-                cached = await redis_service.get_translation(text, source_language, target_language)
-                if cached:
-                    await redis_service.increment_counter("translation_cache_hits")
-                    return cached
-            except Exception:
-                pass  # Redis down — proceed without cache
+        masked = self._mask(text)
+        translated = await self._translate(
+            masked.text,
+            source_language,
+            target_language,
+            persona,
+            industry,
+            glossary,
+            use_claude,
+            namespace,
+        )
+        return self._restore(masked, translated)
 
+    async def _translate(
+        self,
+        text: str,
+        source_language: str,
+        target_language: str,
+        persona: str = "",
+        industry: str = "",
+        glossary: dict[str, str] | None = None,
+        use_claude: bool = False,
+        namespace: str = "",
+    ) -> str:
+        """translate() after the fast path: cache tiers, then the providers."""
+        terms = relevant_glossary(glossary, text)
         system_prompt = _build_system_prompt(
-            source_language, target_language, persona, industry, glossary
+            source_language, target_language, persona, industry, terms
+        )
+        scope = CacheScope.of(
+            text, source_language, target_language, persona, industry, glossary, namespace
         )
+        cached = self.memory_cache.get(scope.key, scope.namespace)
+        if cached is not None:
+            translation_provider.set("cache")
+            return cached
 
-        if use_claude:
-            result = await self._translate_claude(text, system_prompt)
-        else:
-            try:
-                result = await self._translate_openai(text, system_prompt)
-            except Exception:
-                # Fallback to Claude
-                result = await self._translate_claude(text, system_prompt)
+        (result, provider), shared = await self.inflight.do(
+            scope.key,
+            lambda: self._load(
+                scope,
+                text,
+                source_language,
+                target_language,
+                system_prompt,
+                use_claude,
+                terms,
+                namespace,
+            ),
+        )
+        if shared:
+            self.cache_stats.coalesced += 1
+        translation_provider.set("cache" if shared else provider)
+        return result
+
+    async def _load(
+        self,
+        scope: CacheScope,
+        text: str,
+        source_language: str,
+        target_language: str,
+        system_prompt: str,
+        use_claude: bool,
+        terms: dict[str, str] | None = None,
+        owner: str = "",
+    ) -> tuple[str, str]:
+        """
+        Memory miss: Redis tier, translation memory (context-free translations
+        only; near matches from `owner`'s history), then the providers.
+        → (translation, provider)
+        """
+        cached = await self._redis_get(scope, text, source_language, target_language)
+        if cached:
+            return cached, "cache"
+
+        if not scope.namespace:
+            match = await translation_memory.lookup(
+                text, source_language, target_language, owner=owner
+            )
+            if match and match.direct():
+                result = match.translated_text
+                await self._store(scope, text, source_language, target_language, result)
+                return result, "memory"
+            if match:
+                system_prompt = _reference_prompt(system_prompt, match)
+
+        result, provider = await self._call_providers(text, system_prompt, use_claude)
+        if terms and get_settings().glossary_verify:
+            missing = missing_terms(terms, result)
+            if missing:
+                # One retry that insists on the terms; keep the first result if it fails
+                glossary_matchers.stats.retries += 1
+                try:
+                    retried, retry_provider = await self._call_providers(
+                        text, _required_terms_prompt(system_prompt, missing), use_claude
+                    )
+                except Exception:
+                    logger.warning("Glossary retry failed", exc_info=True)
+                else:
+                    if len(missing_terms(missing, retried)) < len(missing):
+                        result, provider = retried, retry_provider
+        await self._store(scope, text, source_language, target_language, result)
+        return result, provider
 
-        # Store in cache
-        if use_cache and result:
+    async def _redis_get(
+        self, scope: CacheScope, text: str, source_language: str, target_language: str
+    ) -> str | None:
+        try:
+            cached = await redis_service.get_translation(
+                text, source_language, target_language, namespace=scope.redis_namespace
+            )
+        except Exception:
+            self.cache_stats.redis.errors += 1
+            return None
+        if cached:
+            self.cache_stats.redis.hits += 1
+            self.memory_cache.put(scope.key, cached, scope.namespace)
             try:
-                await redis_service.set_translation(
-                    text, source_language, target_language, result
-                )
-                await redis_service.increment_counter("translation_cache_misses")
+                await redis_service.increment_counter("translation_cache_hits")
             except Exception:
                 pass
+            return cached
+        self.cache_stats.redis.misses += 1
+        return None
 
-        return result
+    async def _store(
+        self,
+        scope: CacheScope,
+        text: str,
+        source_language: str,
+        target_language: str,
+        result: str,
+    ) -> None:
+        """Fill both cache tiers with a fresh translation."""
+        if not result:
+            return
+        self.memory_cache.put(scope.key, result, scope.namespace)
+        try:
+            await redis_service.set_translation(
+                text, source_language, target_language, result, namespace=scope.redis_namespace
+            )
+            await redis_service.increment_counter("translation_cache_misses")
+        except Exception:
+            self.cache_stats.redis.errors += 1
+
+    async def invalidate_namespace(self, namespace: str) -> None:
+        """
+        Drop a user's context-keyed translations (e.g. after a glossary change):
+        their memory partition here and their Redis entries. Other users'
+        entries, and this user's plain ones, are untouched.
+        """
+        self.memory_cache.invalidate(namespace)
+        try:
+            await redis_service.delete_translations(namespace)
+        except Exception:
+            self.cache_stats.redis.errors += 1
+
+    async def _call_providers(
+        self, text: str, system_prompt: str, use_claude: bool = False
+    ) -> tuple[str, str]:
+        """One translation from the LLMs → (translation, provider)."""
+        if use_claude:
+            result = await provider_health.call(
+                "anthropic", CLAUDE_MODEL, lambda: self._translate_claude(text, system_prompt)
+            )
+            return result, "anthropic"
+
+        # Healthiest provider first; the other is the fallback on failure
+        # and the hedge when the first is slow
+        routes = provider_health.plan({
+            ("openai", OPENAI_MODEL): lambda: self._translate_openai(text, system_prompt),
+            ("anthropic", CLAUDE_MODEL): lambda: self._translate_claude(text, system_prompt),
+        })
+        provider, result = await self.hedger.run(
+            routes[0],
+            routes[1] if len(routes) > 1 else None,
+            cost_tokens=estimate_tokens(text),
+            hedge=_can_hedge(),
+        )
+        return result, provider
+
+    async def translate_many(
+        self, text: str, source_language: str, target_languages: list[str] | set[str]
+    ) -> dict[str, str]:
+        """
+        Translate one message into several languages with a single LLM call.
+        Languages that fail come back as the original text.
+        """
+        return {
+            lang: translated
+            async for lang, translated in self.translate_each(
+                text, source_language, target_languages
+            )
+        }
+
+    async def translate_each(
+        self,
+        text: str,
+        source_language: str,
+        target_languages: list[str] | set[str],
+        timeout_s: float | None = None,
+    ):
+        """
+        Yield (language, translation) for each target as soon as it is ready:
+        same-language and memory-cached targets first, then Redis hits, then
+        one multi-target LLM call (structured JSON) for the rest. Languages the
+        reply doesn't cover are translated concurrently one by one. Targets
+        that fail, or aren't ready within `timeout_s`, yield the original text.
+        Untranslatable messages yield themselves for every target at once.
+        """
+        targets = list(dict.fromkeys(target_languages))
+        if self._verbatim(text, sum(lang != source_language for lang in targets)):
+            for lang in targets:
+                yield lang, text
+            return
+
+        masked = self._mask(text)
+        async with aclosing(
+            self._translate_each(masked.text, source_language, targets, timeout_s)
+        ) as translations:
+            async for lang, translated in translations:
+                yield lang, self._restore(masked, translated)
+
+    async def _translate_each(
+        self,
+        text: str,
+        source_language: str,
+        target_languages: list[str],
+        timeout_s: float | None,
+    ):
+        pending = []
+        for lang in target_languages:
+            if lang == source_language:
+                yield lang, text
+                continue
+            cached = self.memory_cache.get(CacheScope.of(text, source_language, lang).key)
+            if cached is not None:
+                yield lang, cached
+            else:
+                pending.append(lang)
+        if not pending:
+            return
+
+        ready: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(self._translate_pending(text, source_language, pending, ready))
+        loop = asyncio.get_running_loop()
+        expires_at = loop.time() + timeout_s if timeout_s is not None else None
+        remaining = set(pending)
+        try:
+            while remaining:
+                timeout = None if expires_at is None else max(0.0, expires_at - loop.time())
+                try:
+                    lang, translated = await asyncio.wait_for(ready.get(), timeout)
+                except TimeoutError:
+                    break
+                remaining.discard(lang)
+                yield lang, translated
+        finally:
+            task.cancel()
+        for lang in pending:
+            if lang in remaining:
+                yield lang, text
+
+    async def _translate_pending(
+        self, text: str, source_language: str, targets: list[str], ready: asyncio.Queue
+    ) -> None:
+        """translate_each's producer: puts (language, translation) on `ready` for every target."""
+        done: set[str] = set()
+
+        def put(lang: str, translated: str) -> None:
+            done.add(lang)
+            ready.put_nowait((lang, translated))
+
+        async def one(lang: str) -> tuple[str, str]:
+            try:
+                return lang, await self._translate(text, source_language, lang)
+            except Exception as e:
+                logger.warning("Translation to %s failed: %s", lang, e)
+                return lang, text
+
+        try:
+            missing = targets
+            if len(targets) > 1:
+                scopes = [CacheScope.of(text, source_language, lang) for lang in targets]
+                hits = await asyncio.gather(*(
+                    self._redis_get(scope, text, source_language, lang)
+                    for scope, lang in zip(scopes, targets)
+                ))
+                missing = []
+                for lang, cached in zip(targets, hits):
+                    if cached:
+                        put(lang, cached)
+                    else:
+                        missing.append(lang)
+                matches = await asyncio.gather(*(
+                    translation_memory.lookup(text, source_language, lang) for lang in missing
+                ))
+                for lang, match in zip(list(missing), matches):
+                    if match and match.direct():
+                        missing.remove(lang)
+                        await self._store(
+                            CacheScope.of(text, source_language, lang),
+                            text,
+                            source_language,
+                            lang,
+                            match.translated_text,
+                        )
+                        put(lang, match.translated_text)
+            if len(missing) > 1:
+                batch = await self._translate_batch(text, source_language, missing)
+                for lang, translated in batch.items():
+                    put(lang, translated)
+                missing = [lang for lang in missing if lang not in batch]
+            for next_done in asyncio.as_completed([one(lang) for lang in missing]):
+                put(*await next_done)
+        except Exception as e:
+            logger.warning("Multi-target translation failed: %s", e)
+            for lang in targets:
+                if lang not in done:
+                    put(lang, text)
+
+    async def _translate_batch(
+        self, text: str, source_language: str, target_languages: list[str]
+    ) -> dict[str, str]:
+        """One LLM call for several languages; {} (or a partial dict) if the reply is unusable."""
+        prompt = _build_multi_target_prompt(source_language, target_languages)
+        try:
+            raw, _ = await self._call_providers(text, prompt)
+        except Exception as e:
+            logger.warning("Multi-target translation call failed: %s", e)
+            return {}
+        translations = _parse_translations(raw, target_languages)
+        if len(translations) < len(target_languages):
+            logger.warning(
+                "Multi-target reply covered %d of %d languages; translating the rest one by one",
+                len(translations),
+                len(target_languages),
+            )
+        for lang, translated in translations.items():
+            scope = CacheScope.of(text, source_language, lang)
+            await self._store(scope, text, source_language, lang, translated)
+        return translations
 
     async def translate_stream(
         self,
@@ -127,17 +556,89 @@ class TranslationService:
         persona: str = "",
         industry: str = "",
         glossary: dict[str, str] | None = None,
+        namespace: str = "",
     ):
-        """Stream translation tokens for lower latency."""
-        settings = get_settings()
+        """
+        Stream translation tokens for lower latency. Hedged on time to first
+        token: if GPT-4 is slow to start, Claude's stream races it and the
+        first stream to produce a token is the one that gets read.
+        Cached like translate(): a hit (or a translation-memory match) is
+        yielded as one chunk, and a stream read to the end fills the cache.
+        """
+        if source_language == target_language:
+            yield text
+            return
+        if self._verbatim(text, 1):
+            translation_provider.set("local")
+            yield text
+            return
+
+        scope = CacheScope.of(
+            text, source_language, target_language, persona, industry, glossary, namespace
+        )
+        cached = self.memory_cache.get(scope.key, scope.namespace)
+        if cached is None:
+            cached = await self._redis_get(scope, text, source_language, target_language)
+        if cached:
+            translation_provider.set("cache")
+            yield cached
+            return
+
+        terms = relevant_glossary(glossary, text)
         system_prompt = _build_system_prompt(
-            source_language, target_language, persona, industry, glossary
+            source_language, target_language, persona, industry, terms
+        )
+        if not scope.namespace:
+            match = await translation_memory.lookup(
+                text, source_language, target_language, owner=namespace
+            )
+            if match and match.direct():
+                translation_provider.set("memory")
+                await self._store(
+                    scope, text, source_language, target_language, match.translated_text
+                )
+                yield match.translated_text
+                return
+            if match:
+                system_prompt = _reference_prompt(system_prompt, match)
+
+        def opener(stream_fn):
+            return lambda: _first_token(stream_fn(text, system_prompt))
+
+        routes = provider_health.plan({
+            ("openai", OPENAI_MODEL): opener(self._stream_openai),
+            ("anthropic", CLAUDE_MODEL): opener(self._stream_claude),
+        }, discard=_close_opened)
+        provider, (first, stream) = await self.stream_hedger.run(
+            routes[0],
+            routes[1] if len(routes) > 1 else None,
+            cost_tokens=estimate_tokens(text),
+            hedge=_can_hedge(),
+            accept=lambda _: True,
+            discard=_close_opened,
         )
+        translation_provider.set(provider)
 
-        client = AsyncOpenAI(api_key=settings.openai_api_key)
+        chunks = []
+        try:
+            if first:
+                chunks.append(first)
+                yield first
+            async for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            await stream.aclose()
+        result = "".join(chunks)
+        if terms and get_settings().glossary_verify:
+            missing_terms(terms, result)  # already spoken — counted, not retried
+        await self._store(scope, text, source_language, target_language, result)
+
+    async def _stream_openai(self, text: str, system_prompt: str):
+        client = http_clients.openai()
 
         stream = await client.chat.completions.create(
-            model="gpt-4-turbo",
+            model=OPENAI_MODEL,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": text},
@@ -152,12 +653,27 @@ class TranslationService:
             if delta.content:
                 yield delta.content
 
+    async def _stream_claude(self, text: str, system_prompt: str):
+        client = http_clients.anthropic()
+
+        stream = await client.messages.create(
+            model=CLAUDE_MODEL,
+            system=system_prompt,
+            messages=[{"role": "user", "content": text}],
+            stream=True,
+            max_tokens=1024,
+            temperature=0.3,
+        )
+
+        async for event in stream:
+            if event.type == "content_block_delta" and event.delta.type == "text_delta":
+                yield event.delta.text
+
     async def _translate_openai(self, text: str, system_prompt: str) -> str:
-        settings = get_settings()
-        client = AsyncOpenAI(api_key=settings.openai_api_key)
+        client = http_clients.openai()
 
         response = await client.chat.completions.create(
-            model="gpt-4-turbo",
+            model=OPENAI_MODEL,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": text},
@@ -169,11 +685,10 @@ class TranslationService:
         return response.choices[0].message.content or ""
 
     async def _translate_claude(self, text: str, system_prompt: str) -> str:
-        settings = get_settings()
-        client = AsyncAnthropic(api_key=settings.anthropic_api_key)
+        client = http_clients.anthropic()
 
         response = await client.messages.create(
-            model="claude-3-5-sonnet-20241022",
+            model=CLAUDE_MODEL,
             system=system_prompt,
             messages=[{"role": "user", "content": text}],
             max_tokens=1024,
@@ -183,5 +698,26 @@ class TranslationService:
         return response.content[0].text if response.content else ""
 
 
+def _can_hedge() -> bool:
+    """Hedging needs a second provider to race."""
+    return bool(get_settings().anthropic_api_key)
+
+
+async def _first_token(stream):
+    """Open a token stream and wait for its first token → (token, stream)."""
+    try:
+        async for chunk in stream:
+            if chunk:
+                return chunk, stream
+        return "", stream
+    except BaseException:
+        await stream.aclose()
+        raise
+
+
+async def _close_opened(opened) -> None:
+    await opened[1].aclose()
+
+
 # Singleton
 translation_service = TranslationService()
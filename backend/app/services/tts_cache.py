@@ -0,0 +1,218 @@
+"""Phrase-level TTS audio cache.
+
+Greetings and stock phrases ("Hello, can you hear me?") are synthesized
+over and over with the same voice. Audio is cached under a key built from
+everything that changes the output: normalized text, voice_id, language,
+model, voice_settings and the output format.
+
+Two tiers:
+  memory — per-process LRU, byte-budgeted
+  disk   — shared by every worker on the host, byte-budgeted, evicted by
+           least-recent access (mtime is touched on every hit); each worker
+           enforces the budget against its own view of the directory, so
+           it is approximate with several workers
+
+Only short phrases are cached — long sentences rarely repeat and would
+just churn the budget.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_phrase(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def tts_cache_key(
+    text: str,
+    voice_id: str,
+    language: str,
+    model: str,
+    voice_settings: dict,
+    output_format: str | None = None,
+) -> str:
+    parts = [normalize_phrase(text), voice_id, language, model, voice_settings]
+    if output_format:
+        parts.append(output_format)  # provider default format keeps its existing keys
+    raw = json.dumps(
+        parts,
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+@dataclass
+class TTSCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    bytes_saved: int = 0  # audio served from cache instead of ElevenLabs
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+
+    def summary(self) -> dict:
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+            "bytes_saved": self.bytes_saved,
+            "evictions": self.evictions,
+        }
+
+
+class TTSCache:
+    """Two-tier (memory LRU + disk) cache of synthesized phrases."""
+
+    def __init__(
+        self,
+        memory_bytes: int | None = None,
+        disk_dir: str | None = None,
+        disk_bytes: int | None = None,
+        max_phrase_chars: int | None = None,
+    ):
+        settings = get_settings()
+        if memory_bytes is None:
+            memory_bytes = settings.tts_cache_memory_mb << 20
+        if disk_bytes is None:
+            disk_bytes = settings.tts_cache_disk_mb << 20
+        self.memory_budget = memory_bytes
+        self.disk_budget = disk_bytes
+        self.max_phrase_chars = max_phrase_chars or settings.tts_cache_max_chars
+        dir_name = disk_dir if disk_dir is not None else settings.tts_cache_dir
+        self.disk_dir = Path(dir_name) if dir_name else None
+
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_index: OrderedDict[str, int] | None = None  # key -> size, oldest first
+        self._disk_bytes = 0
+        self._disk_lock = threading.Lock()  # disk ops run in worker threads
+        self.stats = TTSCacheStats()
+
+    def cacheable(self, text: str) -> bool:
+        return 0 < len(text.strip()) <= self.max_phrase_chars
+
+    async def get(self, key: str) -> bytes | None:
+        audio = self._memory.get(key)
+        if audio is not None:
+            self._memory.move_to_end(key)
+            self.stats.memory_hits += 1
+            self.stats.bytes_saved += len(audio)
+            return audio
+
+        if self.disk_dir and self.disk_budget > 0:
+            audio = await asyncio.to_thread(self._locked, self._disk_get, key)
+            if audio is not None:
+                self.stats.disk_hits += 1
+                self.stats.bytes_saved += len(audio)
+                self._memory_put(key, audio)
+                return audio
+
+        self.stats.misses += 1
+        return None
+
+    async def put(self, key: str, audio: bytes) -> None:
+        if not audio:
+            return
+        self._memory_put(key, audio)
+        if self.disk_dir and self.disk_budget > 0:
+            try:
+                await asyncio.to_thread(self._locked, self._disk_put, key, audio)
+            except OSError as e:
+                logger.warning("TTS disk cache write failed: %s", e)
+
+    # ── Memory tier ──
+
+    def _memory_put(self, key: str, audio: bytes) -> None:
+        if len(audio) > self.memory_budget:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        self._memory[key] = audio
+        self._memory_bytes += len(audio)
+        while self._memory_bytes > self.memory_budget:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.stats.evictions += 1
+
+    # ── Disk tier (runs in a worker thread) ──
+
+    def _locked(self, fn, *args):
+        with self._disk_lock:
+            return fn(*args)
+
+    def _path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.audio"
+
+    def _load_disk_index(self) -> OrderedDict[str, int]:
+        if self._disk_index is None:
+            entries = []
+            if self.disk_dir.exists():
+                for path in self.disk_dir.glob("*/*.audio"):
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, path.stem, stat.st_size))
+            entries.sort()
+            self._disk_index = OrderedDict((key, size) for _, key, size in entries)
+            self._disk_bytes = sum(self._disk_index.values())
+        return self._disk_index
+
+    def _disk_get(self, key: str) -> bytes | None:
+        index = self._load_disk_index()
+        path = self._path(key)
+        try:
+            audio = path.read_bytes()
+        except OSError:
+            if key in index:
+                self._disk_bytes -= index.pop(key)
+            return None
+        os.utime(path)
+        self._disk_bytes += len(audio) - index.pop(key, 0)
+        index[key] = len(audio)
+        return audio
+
+    def _disk_put(self, key: str, audio: bytes) -> None:
+        if len(audio) > self.disk_budget:
+            return
+        index = self._load_disk_index()
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(audio)
+        os.replace(tmp, path)  # atomic — other workers never see a partial file
+
+        self._disk_bytes += len(audio) - index.pop(key, 0)
+        index[key] = len(audio)
+        while self._disk_bytes > self.disk_budget and index:
+            evicted, size = index.popitem(last=False)
+            self._disk_bytes -= size
+            self.stats.evictions += 1
+            try:
+                self._path(evicted).unlink()
+            except OSError:
+                pass
+
+
+# Singleton
+tts_cache = TTSCache()
@@ -1,15 +1,23 @@
 """ElevenLabs TTS — Text-to-Speech with voice cloning."""
 
-import httpx
-
 from app.config import get_settings
+from app.services.http_clients import http_clients, http_timeout
+from app.services.provider_health import provider_health
+from app.services.tts_cache import tts_cache, tts_cache_key
+
+STREAM_CHUNK_SIZE = 4096
 
 
 class TTSService:
     """ElevenLabs Turbo v2.5 text-to-speech service."""
 
-    BASE_URL = "https://api.elevenlabs.io/v1"
     DEFAULT_VOICE_ID = "21m00Tcm4TlvDq8ikWAM"  # Rachel — fallback voice
+    VOICE_SETTINGS = {
+        "stability": 0.5,
+        "similarity_boost": 0.8,
+        "style": 0.3,
+        "use_speaker_boost": True,
+    }
 
     async def synthesize(
         self,
@@ -17,50 +25,38 @@ class TTSService:
         voice_id: str | None = None,
         language: str = "en",
         model: str = "eleven_turbo_v2_5",
+        output_format: str | None = None,
     ) -> bytes:
         """
         Convert text to speech audio bytes.
+        Short phrases are served from the phrase cache when possible.
 
         Args:
             text: Text to speak
             voice_id: ElevenLabs voice ID (cloned or preset)
             language: Target language code
             model: ElevenLabs model (turbo for lowest latency)
+            output_format: ElevenLabs output format (e.g. "mp3_22050_32",
+                           "pcm_24000"); None for the provider default
 
         Returns:
-            Audio bytes (MP3)
+            Audio bytes (MP3 unless output_format says otherwise)
         """
-        settings = get_settings()
         vid = voice_id or self.DEFAULT_VOICE_ID
-
-        headers = {
-            "xi-api-key": settings.elevenlabs_api_key,
-            "Content-Type": "application/json",
-        }
-
-        payload = {
-            "text": text,
-            "model_id": model,
-            "voice_settings": {
-                "stability": 0.5,
-                "similarity_boost": 0.8,
-                "style": 0.3,
-                "use_speaker_boost": True,
-            },
-        }
-
-        # Add language hint for multilingual model
-        if language != "en":
-            payload["language_code"] = language
-
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.post(
-                f"{self.BASE_URL}/text-to-speech/{vid}",
-                headers=headers,
-                json=payload,
-            )
-            resp.raise_for_status()
-            return resp.content
+        key = self._cache_key(text, vid, language, model, output_format)
+        if key:
+            cached = await tts_cache.get(key)
+            if cached is not None:
+                return cached
+
+        audio = await provider_health.call(
+            "elevenlabs",
+            model,
+            lambda: self._synthesize_remote(text, vid, language, model, output_format),
+        )
+        if key:
+            await tts_cache.put(key, audio)
+        return audio
 
     async def synthesize_stream(
         self,
@@ -68,43 +64,99 @@ class TTSService:
         voice_id: str | None = None,
         language: str = "en",
         model: str = "eleven_turbo_v2_5",
+        output_format: str | None = None,
     ):
         """
         Stream TTS audio chunks for minimum latency.
-        Yields audio bytes as they arrive from ElevenLabs.
+        Yields audio bytes as they arrive from ElevenLabs — or, for cached
+        phrases, from the cache in the same chunk size.
         """
-        settings = get_settings()
         vid = voice_id or self.DEFAULT_VOICE_ID
+        key = self._cache_key(text, vid, language, model, output_format)
+        if key:
+            cached = await tts_cache.get(key)
+            if cached is not None:
+                for i in range(0, len(cached), STREAM_CHUNK_SIZE):
+                    yield cached[i:i + STREAM_CHUNK_SIZE]
+                return
+
+        chunks: list[bytes] = []
+        remote = provider_health.stream(
+            "elevenlabs",
+            model,
+            lambda: self._stream_remote(text, vid, language, model, output_format),
+        )
+        async for chunk in remote:
+            if key:
+                chunks.append(chunk)
+            yield chunk
+
+        # Only reached when the stream completed — partial audio is never cached
+        if key:
+            await tts_cache.put(key, b"".join(chunks))
+
+    def _cache_key(
+        self, text: str, voice_id: str, language: str, model: str, output_format: str | None
+    ) -> str | None:
+        if not tts_cache.cacheable(text):
+            return None
+        return tts_cache_key(text, voice_id, language, model, self.VOICE_SETTINGS, output_format)
+
+    def _payload(self, text: str, language: str, model: str) -> dict:
+        payload = {
+            "text": text,
+            "model_id": model,
+            "voice_settings": self.VOICE_SETTINGS,
+        }
 
+        # Add language hint for multilingual model
+        if language != "en":
+            payload["language_code"] = language
+        return payload
+
+    async def _synthesize_remote(
+        self, text: str, voice_id: str, language: str, model: str, output_format: str | None
+    ) -> bytes:
+        settings = get_settings()
         headers = {
             "xi-api-key": settings.elevenlabs_api_key,
             "Content-Type": "application/json",
         }
 
-        payload = {
-            "text": text,
-            "model_id": model,
-            "voice_settings": {
-                "stability": 0.5,
-                "similarity_boost": 0.8,
-                "style": 0.3,
-                "use_speaker_boost": True,
-            },
+        resp = await http_clients.get("elevenlabs").post(
+            f"{settings.elevenlabs_api_url}/text-to-speech/{voice_id}",
+            params=_format_params(output_format),
+            headers=headers,
+            json=self._payload(text, language, model),
+            timeout=http_timeout(30),
+        )
+        resp.raise_for_status()
+        return resp.content
+
+    async def _stream_remote(
+        self, text: str, voice_id: str, language: str, model: str, output_format: str | None
+    ):
+        settings = get_settings()
+        headers = {
+            "xi-api-key": settings.elevenlabs_api_key,
+            "Content-Type": "application/json",
         }
 
-        if language != "en":
-            payload["language_code"] = language
+        async with http_clients.get("elevenlabs").stream(
+            "POST",
+            f"{settings.elevenlabs_api_url}/text-to-speech/{voice_id}/stream",
+            params=_format_params(output_format),
+            headers=headers,
+            json=self._payload(text, language, model),
+            timeout=http_timeout(30),
+        ) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.aiter_bytes(chunk_size=STREAM_CHUNK_SIZE):
+                yield chunk
+
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            async with client.stream(
-                "POST",
-                f"{self.BASE_URL}/text-to-speech/{vid}/stream",
-                headers=headers,
-                json=payload,
-            ) as resp:
-                resp.raise_for_status()
-                async for chunk in resp.aiter_bytes(chunk_size=4096):
-                    yield chunk
+def _format_params(output_format: str | None) -> dict:
+    return {"output_format": output_format} if output_format else {}
 
 
 # Singleton
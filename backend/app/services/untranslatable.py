@@ -0,0 +1,91 @@
+"""Untranslatable content — what never needs an LLM round trip.
+
+A chat message that is only emoji, numbers, punctuation, URLs, @mentions or
+code reads the same in every language; TranslationService returns it
+verbatim for every target. In mixed messages those spans are masked with
+⟦n⟧ placeholders before the LLM call — so a URL can't be "translated" and
+"check ⟦0⟧" caches once for every link — and restored afterwards:
+
+    if is_untranslatable(text): return text
+    masked = mask(text)  →  masked.text to the LLM  →  masked.restore(reply)
+
+Pure regex and str methods: a few microseconds per message.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+_SPANS = re.compile(
+    r"```.*?```"  # fenced code
+    r"|`[^`\n]+`"  # inline code
+    r"|\b(?:https?://|www\.)[^\s<>]*[^\s<>.,;:!?'\")\]]"  # URLs, minus trailing punctuation
+    r"|\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+"  # emails
+    r"|(?<![\w@])@\w+",  # @mentions
+    re.DOTALL,
+)
+_PLACEHOLDER = re.compile(r"⟦\s*(\d+)\s*⟧")
+
+
+def _has_words(text: str) -> bool:
+    # Emoji, digits, punctuation and symbols aren't alphabetic; every script's letters are
+    return any(ch.isalpha() for ch in text)
+
+
+def is_untranslatable(text: str) -> bool:
+    """True if `text` has no words outside URLs, code, emails and @mentions."""
+    if not _has_words(text):
+        return True
+    return not _has_words(_SPANS.sub(" ", text))
+
+
+@dataclass
+class Masked:
+    text: str  # what the LLM sees
+    spans: list[str] = field(default_factory=list)  # spans[n] is behind ⟦n⟧
+
+    def restore(self, translation: str) -> tuple[str, int]:
+        """→ (translation with the spans put back, how many placeholders the LLM lost)."""
+        if not self.spans:
+            return translation, 0
+        seen: set[int] = set()
+
+        def put_back(match: re.Match) -> str:
+            n = int(match.group(1))
+            if n >= len(self.spans):
+                return match.group(0)
+            seen.add(n)
+            return self.spans[n]
+
+        restored = _PLACEHOLDER.sub(put_back, translation)
+        lost = [span for n, span in enumerate(self.spans) if n not in seen]
+        if lost:
+            restored = " ".join([restored, *lost])
+        return restored, len(lost)
+
+
+def mask(text: str) -> Masked:
+    spans: list[str] = []
+
+    def placeholder(match: re.Match) -> str:
+        spans.append(match.group(0))
+        return f"⟦{len(spans) - 1}⟧"
+
+    return Masked(_SPANS.sub(placeholder, text), spans)
+
+
+@dataclass
+class FastPathStats:
+    verbatim: int = 0  # messages returned without translating
+    masked: int = 0  # messages translated with spans masked
+    spans_masked: int = 0
+    llm_calls_saved: int = 0  # one per target language of a verbatim message
+    placeholders_lost: int = 0  # spans the LLM dropped; appended to the translation
+
+    def summary(self) -> dict:
+        return {
+            "verbatim": self.verbatim,
+            "masked": self.masked,
+            "spans_masked": self.spans_masked,
+            "llm_calls_saved": self.llm_calls_saved,
+            "placeholders_lost": self.placeholders_lost,
+        }
@@ -0,0 +1,244 @@
+"""Utterance assembler — turn arbitrary client audio slices into whole utterances.
+
+Clients send audio in whatever slices their recorder produces (250 ms
+MediaRecorder chunks, 20 ms PCM frames). Sending each slice to STT on its
+own costs a round trip per slice and cuts words in half. The assembler
+buffers slices per connection and dispatches one utterance at a time,
+closing it when any of these is reached:
+
+  silence      — trailing VAD silence after speech (WAV / 16-bit PCM only)
+  max duration — buffered audio length (wall clock for compressed audio)
+  max bytes    — buffered payload size
+  idle         — the client stopped sending (push-to-talk released)
+
+Compressed WebM/Opus cannot be run through the VAD, so it only closes on
+the size, duration and idle limits. MediaRecorder puts the container header
+(init segment) in its first slice only, and its slices don't line up with
+the media clusters inside. So a recording is only split where a cluster
+starts: once a limit is reached the utterance runs on to the next cluster,
+which opens the next utterance behind a copy of the init segment — each one
+decodes on its own. After an idle or explicit flush in mid-recording, the
+rest of the open cluster can't be decoded without its start and is skipped.
+"""
+
+import asyncio
+import io
+import time
+import wave
+from collections.abc import Awaitable, Callable
+
+import numpy as np
+
+from app.config import get_settings
+from app.services.vad_service import FRAME_MS, PADDING_MS, vad_service
+
+# No new audio for this long flushes whatever is buffered
+IDLE_FLUSH_MS = 1200
+
+_EBML_MAGIC = b"\x1a\x45\xdf\xa3"  # WebM/Matroska header
+_CLUSTER_ID = b"\x1f\x43\xb6\x75"  # first media cluster — everything before it is the init segment
+# A WebM utterance waiting for its next cluster is flushed anyway at this many times max_bytes
+CLUSTER_WAIT_FACTOR = 4
+
+
+class UtteranceAssembler:
+    """Per-connection jitter buffer in front of the batch STT pipeline."""
+
+    def __init__(
+        self,
+        dispatch: Callable[[bytes], Awaitable[None]],
+        silence_ms: int | None = None,
+        max_duration_ms: int | None = None,
+        max_bytes: int | None = None,
+    ):
+        settings = get_settings()
+        self._dispatch = dispatch
+        self.silence_ms = silence_ms or settings.utterance_silence_ms
+        self.max_duration_ms = max_duration_ms or settings.utterance_max_ms
+        self.max_bytes = max_bytes or settings.utterance_max_bytes
+
+        # WAV input: raw PCM of the open utterance
+        self._pcm = bytearray()
+        self._params: tuple[int, int, int] | None = None  # (channels, sample width, rate)
+        self._has_speech = False
+        self._trailing_silence_ms = 0.0
+        # Compressed input: concatenated slices of the open utterance
+        self._opaque = bytearray()
+        self._opaque_started = 0.0
+        self._init_segment = b""
+
+        self._idle: asyncio.TimerHandle | None = None
+        self._idle_flush: asyncio.Task | None = None
+        self.slices = 0
+        self.utterances = 0
+        self.skipped_bytes = 0  # WebM bytes with no cluster start to decode from
+
+    def configure(
+        self,
+        silence_ms: int | None = None,
+        max_duration_ms: int | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
+        """Per-connection overrides from the client's config message."""
+        if silence_ms and silence_ms > 0:
+            self.silence_ms = silence_ms
+        if max_duration_ms and max_duration_ms > 0:
+            self.max_duration_ms = max_duration_ms
+        if max_bytes and max_bytes > 0:
+            self.max_bytes = max_bytes
+
+    async def feed(self, data: bytes | memoryview) -> None:
+        """Buffer one client slice; dispatches an utterance if it closes one."""
+        self.slices += 1
+        self._arm_idle_timer()
+        if data[:4] == b"RIFF" and data[8:12] == b"WAVE" and await self._feed_wav(data):
+            return
+        await self._feed_opaque(data)
+
+    async def flush(self) -> None:
+        """Dispatch whatever is buffered (end of audio, idle, config change)."""
+        self._cancel_idle_timer()
+        utterance = None
+
+        if self._pcm:
+            if self._has_speech:
+                utterance = self._wrap_wav(bytes(self._pcm))
+            self._pcm.clear()
+            self._has_speech = False
+            self._trailing_silence_ms = 0.0
+        elif self._opaque:
+            utterance = bytes(self._opaque)
+            self._opaque.clear()
+
+        if utterance:
+            self.utterances += 1
+            await self._dispatch(utterance)
+
+    def close(self) -> None:
+        self._cancel_idle_timer()
+        if self._idle_flush:
+            self._idle_flush.cancel()
+
+    # ── WAV / PCM ──
+
+    async def _feed_wav(self, data: bytes | memoryview) -> bool:
+        """Buffer a WAV slice. Returns False if it isn't 16-bit PCM."""
+        try:
+            with wave.open(io.BytesIO(data)) as wav:
+                params = (wav.getnchannels(), wav.getsampwidth(), wav.getframerate())
+                pcm = wav.readframes(wav.getnframes())
+        except (wave.Error, EOFError):
+            return False
+        if params[1] != 2:
+            return False
+
+        if self._params and params != self._params:
+            await self.flush()
+        self._params = params
+        channels, _, rate = params
+
+        samples = np.frombuffer(pcm, dtype="<i2")
+        samples = samples[: len(samples) - len(samples) % channels]
+        mono = samples.reshape(-1, channels).mean(axis=1) if channels > 1 else samples
+        mask = vad_service.speech_mask(mono, rate)
+        slice_ms = len(mono) * 1000 / rate
+
+        if mask.any():
+            self._has_speech = True
+            last_speech = int(np.flatnonzero(mask)[-1])
+            self._trailing_silence_ms = slice_ms - (last_speech + 1) * FRAME_MS
+        else:
+            self._trailing_silence_ms += slice_ms
+        self._pcm += pcm
+
+        if not self._has_speech:
+            # Nothing said yet — keep a short lead-in instead of buffering silence
+            lead_in = PADDING_MS * rate // 1000 * 2 * channels
+            if len(self._pcm) > lead_in:
+                del self._pcm[: len(self._pcm) - lead_in]
+            return True
+
+        duration_ms = len(self._pcm) * 1000 / (rate * 2 * channels)
+        if (
+            self._trailing_silence_ms >= self.silence_ms
+            or duration_ms >= self.max_duration_ms
+            or len(self._pcm) >= self.max_bytes
+        ):
+            await self.flush()
+        return True
+
+    def _wrap_wav(self, pcm: bytes) -> bytes:
+        channels, width, rate = self._params
+        out = io.BytesIO()
+        with wave.open(out, "wb") as wav:
+            wav.setnchannels(channels)
+            wav.setsampwidth(width)
+            wav.setframerate(rate)
+            wav.writeframes(pcm)
+        return out.getvalue()
+
+    # ── Compressed (WebM/Opus etc.) ──
+
+    async def _feed_opaque(self, data: bytes | memoryview) -> None:
+        if self._pcm:
+            await self.flush()
+
+        if data[:4] == _EBML_MAGIC:
+            # A new recording started — close the previous one, remember its header
+            if self._opaque:
+                await self.flush()
+            data = bytes(data)
+            cluster = data.find(_CLUSTER_ID)
+            self._init_segment = data[:cluster] if cluster > 0 else data
+            self._open_opaque(data)
+        elif self._init_segment:
+            await self._feed_webm(bytes(data))
+        else:
+            if not self._opaque:
+                self._open_opaque(b"")
+            self._opaque += data
+            if self._limit_reached():
+                await self.flush()
+            return
+
+        if len(self._opaque) >= self.max_bytes * CLUSTER_WAIT_FACTOR:
+            await self.flush()
+
+    async def _feed_webm(self, data: bytes) -> None:
+        """A later slice of a WebM recording: utterances start only at a cluster."""
+        cluster = data.find(_CLUSTER_ID)
+        if self._opaque and cluster >= 0 and self._limit_reached():
+            self._opaque += data[:cluster]
+            await self.flush()
+        if not self._opaque:
+            if cluster < 0:
+                self.skipped_bytes += len(data)
+                return
+            self.skipped_bytes += cluster
+            self._open_opaque(self._init_segment)
+            data = data[cluster:]
+        self._opaque += data
+
+    def _open_opaque(self, data: bytes) -> None:
+        self._opaque_started = time.monotonic()
+        self._opaque += data
+
+    def _limit_reached(self) -> bool:
+        elapsed_ms = (time.monotonic() - self._opaque_started) * 1000
+        return len(self._opaque) >= self.max_bytes or elapsed_ms >= self.max_duration_ms
+
+    # ── Idle timer ──
+
+    def _arm_idle_timer(self) -> None:
+        self._cancel_idle_timer()
+        loop = asyncio.get_running_loop()
+        self._idle = loop.call_later(IDLE_FLUSH_MS / 1000, self._on_idle)
+
+    def _cancel_idle_timer(self) -> None:
+        if self._idle:
+            self._idle.cancel()
+            self._idle = None
+
+    def _on_idle(self) -> None:
+        self._idle = None
+        self._idle_flush = asyncio.create_task(self.flush())
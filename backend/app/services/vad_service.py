@@ -0,0 +1,159 @@
+"""Voice activity detection — drop silent chunks and trim silence before STT.
+
+Vectorized energy + zero-crossing-rate classifier over 20 ms frames:
+  voiced speech    — frame energy above an adaptive threshold
+  unvoiced speech  — high zero-crossing rate ("s", "f", "th") with energy
+                     just below that threshold
+The threshold adapts to the chunk's noise floor (10th percentile energy)
+but never drops below an absolute floor, so quiet rooms stay quiet.
+
+Only 16-bit PCM WAV (RIFF) chunks are analyzed; anything else (webm/opus,
+mp3) passes through untouched, so the pipeline runs it on the output of
+dsp_stage.prepare_for_stt. speech_mask() works on raw PCM samples.
+"""
+
+import io
+import wave
+from dataclasses import dataclass
+
+import numpy as np
+
+FRAME_MS = 20
+ABS_THRESHOLD_DB = -45.0  # below this a frame is never speech
+NOISE_MARGIN_DB = 10.0  # speech must be this far above the noise floor...
+MAX_ADAPTIVE_DB = -30.0  # ...but the adaptive threshold never rises above this
+ZCR_THRESHOLD = 0.25  # fraction of sign changes per sample for unvoiced speech
+UNVOICED_MARGIN_DB = 8.0
+PADDING_MS = 200  # keep this much audio around speech (word onsets/tails)
+MIN_SPEECH_MS = 100  # less total speech than this counts as silence
+
+
+@dataclass
+class VADResult:
+    audio: bytes  # trimmed audio, same container as the input
+    has_speech: bool
+    speech_ratio: float  # fraction of frames classified as speech
+    analyzed: bool  # False when the format is not PCM (passed through)
+
+
+@dataclass
+class VADStats:
+    chunks: int = 0
+    dropped: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+    def summary(self) -> dict:
+        return {
+            "chunks": self.chunks,
+            "silent_chunks_dropped": self.dropped,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_saved_pct": round((1 - self.bytes_out / self.bytes_in) * 100, 1)
+            if self.bytes_in else 0.0,
+        }
+
+
+class VADService:
+    """Energy/ZCR voice activity detector."""
+
+    def __init__(self):
+        self.stats = VADStats()
+
+    def process(self, audio_data: bytes) -> VADResult:
+        """Classify and trim a WAV chunk; non-PCM audio passes through."""
+        result = self._process(audio_data)
+        self.stats.chunks += 1
+        self.stats.bytes_in += len(audio_data)
+        if result.has_speech:
+            self.stats.bytes_out += len(result.audio)
+        else:
+            self.stats.dropped += 1
+        return result
+
+    def _process(self, audio_data: bytes) -> VADResult:
+        if audio_data[:4] != b"RIFF" or audio_data[8:12] != b"WAVE":
+            return VADResult(audio_data, True, 1.0, False)
+
+        try:
+            with wave.open(io.BytesIO(audio_data)) as wav:
+                params = wav.getparams()
+                pcm = wav.readframes(params.nframes)
+        except (wave.Error, EOFError):
+            return VADResult(audio_data, True, 1.0, False)
+
+        if params.sampwidth != 2:
+            return VADResult(audio_data, True, 1.0, False)
+
+        samples = np.frombuffer(pcm, dtype="<i2")
+        if params.nchannels > 1:
+            samples = samples[: len(samples) - len(samples) % params.nchannels]
+            mono = samples.reshape(-1, params.nchannels).mean(axis=1)
+        else:
+            mono = samples
+
+        start, end, ratio, has_speech = self.speech_bounds(mono, params.framerate)
+        if not has_speech:
+            return VADResult(b"", False, ratio, True)
+
+        # Rewrite the WAV with only the speech region (+ padding)
+        frame_bytes = params.sampwidth * params.nchannels
+        out = io.BytesIO()
+        with wave.open(out, "wb") as trimmed:
+            trimmed.setnchannels(params.nchannels)
+            trimmed.setsampwidth(params.sampwidth)
+            trimmed.setframerate(params.framerate)
+            trimmed.writeframes(pcm[start * frame_bytes:end * frame_bytes])
+        return VADResult(out.getvalue(), True, ratio, True)
+
+    def speech_bounds(self, samples: np.ndarray, sample_rate: int) -> tuple[int, int, float, bool]:
+        """
+        Find the speech region of mono PCM samples.
+
+        Returns:
+            (start_sample, end_sample, speech_ratio, has_speech)
+        """
+        mask = self.speech_mask(samples, sample_rate)
+        if not mask.size:
+            return 0, 0, 0.0, False
+
+        frame_len = max(1, sample_rate * FRAME_MS // 1000)
+        speech_frames = int(mask.sum())
+        ratio = speech_frames / mask.size
+        if speech_frames * FRAME_MS < MIN_SPEECH_MS:
+            return 0, 0, ratio, False
+
+        pad = PADDING_MS // FRAME_MS
+        idx = np.flatnonzero(mask)
+        first = max(0, idx[0] - pad)
+        last = min(mask.size, idx[-1] + 1 + pad)
+        end = len(samples) if last == mask.size else last * frame_len
+        return first * frame_len, end, ratio, True
+
+    def speech_mask(self, samples: np.ndarray, sample_rate: int) -> np.ndarray:
+        """Per-frame boolean speech mask for mono 16-bit PCM samples."""
+        frame_len = max(1, sample_rate * FRAME_MS // 1000)
+        n_frames = len(samples) // frame_len
+        if n_frames == 0:
+            return np.zeros(0, dtype=bool)
+
+        frames = samples[: n_frames * frame_len].reshape(n_frames, frame_len).astype(np.float32)
+        frames /= 32768.0
+
+        rms = np.sqrt(np.mean(frames * frames, axis=1) + 1e-12)
+        energy_db = 20.0 * np.log10(rms)
+        signs = np.signbit(frames)
+        zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+        noise_floor = float(np.percentile(energy_db, 10))
+        threshold = max(ABS_THRESHOLD_DB, min(noise_floor + NOISE_MARGIN_DB, MAX_ADAPTIVE_DB))
+
+        voiced = energy_db > threshold
+        unvoiced = (zcr > ZCR_THRESHOLD) & (energy_db > threshold - UNVOICED_MARGIN_DB) & (
+            energy_db > ABS_THRESHOLD_DB
+        )
+        return voiced | unvoiced
+
+
+# Singleton
+vad_service = VADService()
@@ -1,16 +1,13 @@
 """Voice cloning & profile management via ElevenLabs."""
 
-import httpx
-
 from app.config import get_settings
+from app.services.http_clients import http_clients, http_timeout
 from app.services.redis_service import redis_service
 
 
 class VoiceService:
     """Manage voice profiles — cloning, storage, retrieval."""
 
-    BASE_URL = "https://api.elevenlabs.io/v1"
-
     async def clone_voice(
         self,
         user_id: str,
@@ -33,15 +30,15 @@ class VoiceService:
             "description": f"Cloned voice for user {user_id}",
         }
 
-        async with httpx.AsyncClient(timeout=120) as client:
-            resp = await client.post(
-                f"{self.BASE_URL}/voices/add",
-                headers=headers,
-                files=files,
-                data=data,
-            )
-            resp.raise_for_status()
-            result = resp.json()
+        resp = await http_clients.get("elevenlabs").post(
+            f"{settings.elevenlabs_api_url}/voices/add",
+            headers=headers,
+            files=files,
+            data=data,
+            timeout=http_timeout(120),
+        )
+        resp.raise_for_status()
+        result = resp.json()
 
         voice_id = result["voice_id"]
 
@@ -75,11 +72,11 @@ class VoiceService:
             # Delete from ElevenLabs
             try:
                 headers = {"xi-api-key": settings.elevenlabs_api_key}
-                async with httpx.AsyncClient(timeout=30) as client:
-                    await client.delete(
-                        f"{self.BASE_URL}/voices/{profile['voice_id']}",
-                        headers=headers,
-                    )
+                await http_clients.get("elevenlabs").delete(
+                    f"{settings.elevenlabs_api_url}/voices/{profile['voice_id']}",
+                    headers=headers,
+                    timeout=http_timeout(30),
+                )
             except Exception:
                 pass  # Voice might already be deleted on ElevenLabs
 
@@ -3,9 +3,8 @@
 import logging
 from enum import Enum
 
-import httpx
-
 from app.config import get_settings
+from app.services.http_clients import http_clients, http_timeout
 
 logger = logging.getLogger(__name__)
 
@@ -67,13 +66,17 @@ class WebhookService:
         if extra_headers:
             headers.update(extra_headers)
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.post(url, json=payload, headers=headers)
-                if resp.status_code < 300:
-                    logger.info("Webhook delivered to %s", url[:60])
-                    return True
-                logger.warning("Webhook %s returned %d: %s", url[:60], resp.status_code, resp.text[:200])
-                return False
+            client = http_clients.get("webhooks")
+            resp = await client.post(
+                url, json=payload, headers=headers, timeout=http_timeout(10.0)
+            )
+            if resp.status_code < 300:
+                logger.info("Webhook delivered to %s", url[:60])
+                return True
+            logger.warning(
+                "Webhook %s returned %d: %s", url[:60], resp.status_code, resp.text[:200]
+            )
+            return False
         except Exception as e:
             logger.error("Webhook delivery failed: %s", e)
             return False
@@ -0,0 +1,70 @@
+"""
+Run the offline voice benchmark and print a report.
+
+    python -m tests.benchmarks                       # both paths, 1/10/100/1000 sessions
+    python -m tests.benchmarks --paths ws --sessions 1,10 --utterances 3
+    python -m tests.benchmarks --instant             # no provider latency: server overhead only
+    python -m tests.benchmarks --error-rate 0.02 --json
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+
+from tests.benchmarks.harness import (
+    CONCURRENCY_LEVELS,
+    ProviderProfile,
+    VoiceServer,
+    format_report,
+    offline_providers,
+    run_pipeline,
+    run_ws,
+)
+
+
+def _raise_fd_limit() -> None:
+    """1000 sessions need several sockets each — lift the soft limit to the hard one."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def main(args: argparse.Namespace) -> None:
+    profile = ProviderProfile.instant() if args.instant else ProviderProfile()
+    profile.with_error_rate(args.error_rate)
+    levels = [int(n) for n in args.sessions.split(",")]
+    results = []
+
+    async with offline_providers(
+        profile, tts_cache=args.tts_cache, translation_cache=args.translation_cache
+    ) as providers:
+        if "pipeline" in args.paths:
+            for sessions in levels:
+                results.append(await run_pipeline(sessions, args.utterances))
+        if "ws" in args.paths:
+            async with VoiceServer() as server:
+                for sessions in levels:
+                    results.append(await run_ws(server, sessions, args.utterances))
+
+    if args.json:
+        print(json.dumps({"results": [r.row() for r in results], "providers": providers.summary()}))
+    else:
+        print(format_report(results))
+        print(f"\nprovider requests: {providers.summary()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmarks")
+    parser.add_argument("--paths", default="pipeline,ws")
+    parser.add_argument("--sessions", default=",".join(map(str, CONCURRENCY_LEVELS)))
+    parser.add_argument("--utterances", type=int, default=5, help="per session")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--instant", action="store_true", help="no injected provider latency")
+    parser.add_argument("--tts-cache", action="store_true", help="keep the TTS phrase cache on")
+    parser.add_argument(
+        "--translation-cache", action="store_true", help="keep the in-process translation cache on"
+    )
+    parser.add_argument("--json", action="store_true")
+    _raise_fd_limit()
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,329 @@
+"""Offline load harness for the voice translation path.
+
+Starts fake Deepgram (batch), OpenAI-compatible and ElevenLabs servers,
+points Settings at them, and drives N concurrent sessions through either
+
+    pipeline — TranslationPipeline.process_audio_streaming, called directly
+    ws       — the real /ws endpoint over real WebSockets (binary audio
+               frames in and out, utterance assembler, connection scheduler)
+
+Latencies are measured from the caller's side: end-to-end is utterance
+submitted → "metrics" event, time-to-first-audio is utterance submitted →
+first audio chunk. Throughput is completed utterances per wall-clock second.
+
+Only Postgres is replaced for /ws (JWT auth still runs; the user lookup and
+presence queries hit an in-memory session). The TTS phrase cache and the
+translation cache are off unless asked for, so every utterance pays for
+translation and synthesis.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosed
+
+from app.config import get_settings
+from app.services.audio_frames import FLAG_END, decode_frame, encode_frame
+from app.services.auth_service import create_access_token
+from app.services.latency_histograms import LogHistogram
+from app.services.pipeline import TranslationContext, TranslationPipeline
+from app.services.translation_cache import MemoryTier
+from app.services.translation_service import translation_service
+from app.services.tts_cache import TTSCache
+from tests.fakes.deepgram import FakeDeepgramBatchServer
+from tests.fakes.elevenlabs import FakeElevenLabsServer
+from tests.fakes.llm import FakeOpenAIServer
+from tests.fakes.server import FakeHTTPServer, LatencyProfile
+
+CONCURRENCY_LEVELS = (1, 10, 100, 1000)
+UTTERANCE_TIMEOUT_S = 60
+
+SCRIPT = [
+    "Good morning, thanks for joining the call today.",
+    "Can you hear me clearly?",
+    "Let's start with the quarterly numbers, then move on to hiring.",
+    "I will send the contract over this afternoon.",
+]
+
+# A WebM-looking blob: passes VAD untouched, the assembler treats it as opaque audio
+UTTERANCE_AUDIO = b"\x1a\x45\xdf\xa3" + bytes(16_000)
+SLICE_BYTES = 4_000  # ~250 ms MediaRecorder slices
+
+
+@dataclass
+class ProviderProfile:
+    """Latency, cadence and error knobs for the three fake providers."""
+
+    stt: LatencyProfile = field(default_factory=lambda: LatencyProfile(150, 500))
+    llm_ttft: LatencyProfile = field(default_factory=lambda: LatencyProfile(250, 900))
+    llm_token: LatencyProfile = field(default_factory=lambda: LatencyProfile(15, 60))
+    tts_first_byte: LatencyProfile = field(default_factory=lambda: LatencyProfile(180, 600))
+    tts_chunk: LatencyProfile = field(default_factory=lambda: LatencyProfile(20, 80))
+
+    @classmethod
+    def instant(cls) -> "ProviderProfile":
+        """No injected latency — measures the server's own overhead."""
+        return cls(*(LatencyProfile() for _ in range(5)))
+
+    def with_error_rate(self, rate: float) -> "ProviderProfile":
+        for profile in (self.stt, self.llm_ttft, self.tts_first_byte):
+            profile.error_rate = rate
+        return self
+
+
+@dataclass
+class Providers:
+    stt: FakeDeepgramBatchServer
+    llm: FakeOpenAIServer
+    tts: FakeElevenLabsServer
+
+    def use(self, profile: ProviderProfile) -> None:
+        """Switch the running fakes to another latency profile."""
+        self.stt.latency = profile.stt
+        self.llm.ttft, self.llm.token_interval = profile.llm_ttft, profile.llm_token
+        self.tts.first_byte, self.tts.chunk_interval = profile.tts_first_byte, profile.tts_chunk
+
+    def summary(self) -> dict:
+        return {
+            name: {"requests": fake.requests, "errors": fake.errors}
+            for name, fake in (("stt", self.stt), ("llm", self.llm), ("tts", self.tts))
+        }
+
+
+@dataclass
+class BenchmarkResult:
+    path: str
+    sessions: int
+    utterances: int = 0
+    errors: int = 0
+    wall_s: float = 0.0
+    total: LogHistogram = field(default_factory=LogHistogram)
+    ttfa: LogHistogram = field(default_factory=LogHistogram)
+
+    @property
+    def throughput(self) -> float:
+        return self.utterances / self.wall_s if self.wall_s else 0.0
+
+    def record(self, started: float, first_audio: float | None, finished: float) -> None:
+        self.utterances += 1
+        self.total.record((finished - started) * 1000)
+        if first_audio is not None:
+            self.ttfa.record((first_audio - started) * 1000)
+
+    def row(self) -> dict:
+        return {
+            "path": self.path,
+            "sessions": self.sessions,
+            "utterances": self.utterances,
+            "errors": self.errors,
+            "throughput_per_s": round(self.throughput, 2),
+            "p50_ms": round(self.total.percentile(0.5), 1),
+            "p99_ms": round(self.total.percentile(0.99), 1),
+            "ttfa_p50_ms": round(self.ttfa.percentile(0.5), 1),
+            "ttfa_p99_ms": round(self.ttfa.percentile(0.99), 1),
+        }
+
+
+def format_report(results: list[BenchmarkResult]) -> str:
+    columns = list(BenchmarkResult("", 0).row())
+    rows = [[str(v) for v in r.row().values()] for r in results]
+    widths = [max(len(c), *(len(row[i]) for row in rows)) for i, c in enumerate(columns)]
+    lines = ["  ".join(c.rjust(w) for c, w in zip(columns, widths))]
+    lines += ["  ".join(v.rjust(w) for v, w in zip(row, widths)) for row in rows]
+    return "\n".join(lines)
+
+
+@asynccontextmanager
+async def offline_providers(
+    profile: ProviderProfile | None = None,
+    tts_cache: bool = False,
+    script: list[str] | None = None,
+    translation_cache: bool = False,
+):
+    """
+    Run the fake providers and point Settings (and the TTS cache) at them.
+    STT answers with `script` (cycling; default SCRIPT).
+    """
+    profile = profile or ProviderProfile()
+    settings = get_settings()
+    overrides = {
+        "deepgram_api_key": "bench",
+        "openai_api_key": "bench",
+        "elevenlabs_api_key": "bench",
+        "translation_memory_enabled": False,  # no database here
+    }
+
+    async with AsyncExitStack() as stack:
+        providers = Providers(
+            stt=await stack.enter_async_context(
+                FakeDeepgramBatchServer(script or SCRIPT, profile.stt)
+            ),
+            llm=await stack.enter_async_context(
+                FakeOpenAIServer(ttft=profile.llm_ttft, token_interval=profile.llm_token)
+            ),
+            tts=await stack.enter_async_context(
+                FakeElevenLabsServer(
+                    first_byte=profile.tts_first_byte, chunk_interval=profile.tts_chunk
+                )
+            ),
+        )
+        overrides |= {
+            "deepgram_api_url": providers.stt.url,
+            "openai_base_url": providers.llm.url,
+            "elevenlabs_api_url": providers.tts.url,
+        }
+        saved = {name: getattr(settings, name) for name in overrides}
+        for name, value in overrides.items():
+            setattr(settings, name, value)
+        stack.callback(lambda: [setattr(settings, k, v) for k, v in saved.items()])
+        if not tts_cache:
+            stack.enter_context(
+                patch("app.services.tts_service.tts_cache", TTSCache(memory_bytes=0, disk_dir=""))
+            )
+        if not translation_cache:
+            stack.enter_context(patch.object(
+                translation_service, "memory_cache", MemoryTier(max_entries=0, max_namespaces=0)
+            ))
+        yield providers
+
+
+# ── pipeline path ──
+
+
+async def run_pipeline(sessions: int, utterances_per_session: int = 5) -> BenchmarkResult:
+    """N concurrent callers, each translating utterances back to back."""
+    result = BenchmarkResult("pipeline", sessions)
+    pipeline = TranslationPipeline()
+
+    async def utterance(context: TranslationContext) -> None:
+        started, first_audio = time.perf_counter(), None
+        async for event in pipeline.process_audio_streaming(UTTERANCE_AUDIO, context):
+            if event["type"] == "audio" and first_audio is None:
+                first_audio = time.perf_counter()
+            if event["type"] == "dropped":
+                raise RuntimeError(f"dropped in {event['data']['stage']}")
+        result.record(started, first_audio, time.perf_counter())
+
+    async def session() -> None:
+        context = TranslationContext(source_language="en", target_language="th")
+        for _ in range(utterances_per_session):
+            try:
+                await asyncio.wait_for(utterance(context), UTTERANCE_TIMEOUT_S)
+            except Exception:
+                result.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(session() for _ in range(sessions)))
+    result.wall_s = time.perf_counter() - started
+    return result
+
+
+# ── /ws path ──
+
+
+class _OfflineSession:
+    """Stands in for async_session(): every user exists and has no friends."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        user = SimpleNamespace(
+            username="bench", preferred_language="en", status="offline", last_seen_at=None
+        )
+        return SimpleNamespace(scalar_one_or_none=lambda: user, all=lambda: [])
+
+    async def commit(self):
+        pass
+
+
+class VoiceServer(FakeHTTPServer):
+    """The real /ws router on its own uvicorn, minus Postgres."""
+
+    def __init__(self):
+        from app.routers import websocket
+
+        super().__init__()
+        self.app = FastAPI()
+        self.app.include_router(websocket.router)
+
+    async def __aenter__(self):
+        self._patches = [
+            patch("app.routers.websocket.async_session", _OfflineSession),
+            # PyJWT rejects HMAC keys shorter than the hash — the "change-me" default is
+            patch.object(get_settings(), "secret_key", uuid.uuid4().hex * 2),
+        ]
+        for p in self._patches:
+            p.start()
+        return await super().__aenter__()
+
+    async def __aexit__(self, *exc) -> None:
+        await super().__aexit__(*exc)
+        for p in self._patches:
+            p.stop()
+
+    def ws_url(self, user_id: str) -> str:
+        return f"ws://127.0.0.1:{self._port}/ws/{create_access_token(user_id)}"
+
+
+async def run_ws(
+    server: VoiceServer, sessions: int, utterances_per_session: int = 5
+) -> BenchmarkResult:
+    """N concurrent /ws clients, each speaking utterances back to back."""
+    result = BenchmarkResult("ws", sessions)
+
+    async def utterance(ws, sequence: int) -> int:
+        for offset in range(0, len(UTTERANCE_AUDIO), SLICE_BYTES):
+            await ws.send(encode_frame(0, sequence, UTTERANCE_AUDIO[offset:offset + SLICE_BYTES]))
+            sequence += 1
+        await ws.send(encode_frame(0, sequence, flags=FLAG_END))
+        started, first_audio = time.perf_counter(), None
+
+        async for message in ws:
+            if isinstance(message, bytes):
+                if first_audio is None and decode_frame(message).payload:
+                    first_audio = time.perf_counter()
+                continue
+            event = json.loads(message)
+            if event["type"] == "metrics":
+                result.record(started, first_audio, time.perf_counter())
+                break
+            if event["type"] in ("error", "dropped"):
+                raise RuntimeError(event["data"])
+        return sequence + 1
+
+    async def session() -> None:
+        try:
+            async with connect(server.ws_url(str(uuid.uuid4())), max_size=None) as ws:
+                await ws.send(json.dumps({
+                    "type": "config",
+                    "source_lang": "en",
+                    "target_lang": "th",
+                    "binary_audio": True,
+                }))
+                sequence = 0
+                for _ in range(utterances_per_session):
+                    try:
+                        sequence = await asyncio.wait_for(
+                            utterance(ws, sequence), UTTERANCE_TIMEOUT_S
+                        )
+                    except (RuntimeError, TimeoutError):
+                        result.errors += 1
+        except (OSError, ConnectionClosed):
+            result.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(session() for _ in range(sessions)))
+    result.wall_s = time.perf_counter() - started
+    return result
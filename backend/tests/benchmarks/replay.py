@@ -0,0 +1,172 @@
+"""
+Replay captured pipeline traces and print latency waterfalls.
+
+    python -m tests.benchmarks.replay /tmp/voicetranslate-traces
+    python -m tests.benchmarks.replay traces-20260101-12-4242.jsonl.gz --limit 5
+    python -m tests.benchmarks.replay DIR --instant       # fake providers, no latency
+    python -m tests.benchmarks.replay DIR --real          # the configured providers
+
+Each trace is printed as recorded, then as replayed. Against the fake
+providers the whole pipeline runs (the fake STT answers with the recorded
+transcripts, fed a blob of the recorded audio size); audio itself is never
+captured, so --real starts from the recorded transcript and replays
+translation + TTS only.
+
+The fakes replay each trace with the latencies it recorded (profile_from_trace):
+STT time, time to first token and token gaps, TTS first byte and chunk gaps.
+A stage the trace has no timings for answers instantly.
+"""
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+
+from app.services.latency_histograms import LogHistogram
+from app.services.pipeline import PipelineMetrics, TranslationContext, TranslationPipeline
+from app.services.pipeline_traces import PipelineTrace, format_waterfall, load_traces, waterfall
+from tests.benchmarks.harness import ProviderProfile, offline_providers
+from tests.fakes.server import LatencyProfile
+
+WEBM_MAGIC = b"\x1a\x45\xdf\xa3"
+
+
+def replayable(record: dict) -> bool:
+    return bool(record.get("transcript", "").strip())
+
+
+def _latency(samples: list[float]) -> LatencyProfile:
+    """Median and worst of the recorded samples; instant without any."""
+    if not samples:
+        return LatencyProfile()
+    return LatencyProfile(statistics.median(samples), max(samples), seed=0)
+
+
+def profile_from_trace(record: dict) -> ProviderProfile:
+    """Fake provider latencies taken from one trace's recorded events."""
+    stt: list[float] = []
+    ttft: list[float] = []
+    token_gaps: list[float] = []
+    first_byte: list[float] = []
+    chunk_gaps: list[float] = []
+    stt_start = translate_start = last_token = None
+    tts_start: dict[int, float] = {}
+    last_chunk: dict[int, float] = {}
+
+    for t, kind, *detail in record["events"]:
+        if kind == "stt.start":
+            stt_start = t
+        elif kind == "stt.end" and stt_start is not None:
+            stt.append(t - stt_start)
+        elif kind == "translate.start":
+            translate_start = t
+        elif kind == "token":
+            if last_token is not None:
+                token_gaps.append(t - last_token)
+            elif translate_start is not None:
+                ttft.append(t - translate_start)
+            last_token = t
+        elif kind == "tts.start":
+            tts_start[detail[0]] = t
+        elif kind == "tts.chunk":
+            clause = detail[0][0]
+            if clause in last_chunk:
+                chunk_gaps.append(t - last_chunk[clause])
+            elif clause in tts_start:
+                first_byte.append(t - tts_start[clause])
+            last_chunk[clause] = t
+        elif kind == "tts.end" and detail[0] not in last_chunk and detail[0] in tts_start:
+            first_byte.append(t - tts_start[detail[0]])  # synthesized in one piece
+        elif kind == "translate.end" and last_token is None and translate_start is not None:
+            ttft.append(t - translate_start)  # translated in one piece
+
+    return ProviderProfile(
+        stt=_latency(stt),
+        llm_ttft=_latency(ttft),
+        llm_token=_latency(token_gaps),
+        tts_first_byte=_latency(first_byte),
+        tts_chunk=_latency(chunk_gaps),
+    )
+
+
+async def replay_trace(
+    pipeline: TranslationPipeline, record: dict, with_stt: bool = True
+) -> PipelineTrace:
+    """Run one recorded utterance again; returns the new trace."""
+    context = TranslationContext(
+        source_language=record["source_language"], target_language=record["target_language"]
+    )
+    # A WebM-looking blob of the recorded size: passes VAD and DSP untouched
+    audio = WEBM_MAGIC + bytes(max(0, record["audio_bytes"] - len(WEBM_MAGIC)))
+    voice_id = record["voice_id"]
+    trace = PipelineTrace(audio, context.source_language, context.target_language, voice_id)
+    if with_stt:
+        events = pipeline.process_audio_streaming(audio, context, voice_id, trace=trace)
+    else:
+        trace.note(transcript=record["transcript"])
+        metrics = PipelineMetrics(total_start=time.time())
+        events = pipeline.translate_and_speak(
+            record["transcript"], context, voice_id, metrics, trace=trace
+        )
+    async for event in events:
+        if event["type"] == "dropped":
+            trace.note(outcome="dropped")
+    if not trace.fields["outcome"]:
+        trace.note(outcome="ok")
+    return trace
+
+
+def format_comparison(recorded: list[dict], replayed: list[dict]) -> str:
+    """Median stage latency, recorded vs replayed."""
+    stages: dict[str, tuple[LogHistogram, LogHistogram]] = {}
+    for column, records in enumerate((recorded, replayed)):
+        for record in records:
+            for span in waterfall(record):
+                name = "tts" if span.name.startswith("tts") else span.name
+                stages.setdefault(name, (LogHistogram(), LogHistogram()))[column].record(
+                    span.end_ms - span.start_ms
+                )
+    lines = [f"  {'stage':<10} {'recorded p50':>14} {'replayed p50':>14}"]
+    for name, (before, after) in stages.items():
+        lines.append(
+            f"  {name:<10} {before.percentile(0.5):11.1f} ms {after.percentile(0.5):11.1f} ms"
+        )
+    return "\n".join(lines)
+
+
+async def main(args: argparse.Namespace) -> None:
+    records = list(itertools.islice(filter(replayable, load_traces(args.path)), args.limit))
+    if not records:
+        print(f"no replayable traces in {args.path}")
+        return
+
+    pipeline = TranslationPipeline()
+    replayed = []
+
+    async def run_all(providers=None) -> None:
+        for record in records:
+            if providers and not args.instant:
+                providers.use(profile_from_trace(record))
+            trace = await replay_trace(pipeline, record, with_stt=not args.real)
+            replayed.append(trace.record())
+            print("recorded " + format_waterfall(record, args.width))
+            print("replayed " + format_waterfall(replayed[-1], args.width) + "\n")
+
+    if args.real:
+        await run_all()
+    else:
+        script = [record["transcript"] for record in records]
+        async with offline_providers(ProviderProfile.instant(), script=script) as providers:
+            await run_all(providers)
+    print(format_comparison(records, replayed))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmarks.replay")
+    parser.add_argument("path", help="trace file or trace directory")
+    parser.add_argument("--limit", type=int, default=None, help="replay the first N traces")
+    parser.add_argument("--real", action="store_true", help="use the configured providers")
+    parser.add_argument("--instant", action="store_true", help="fake providers without latency")
+    parser.add_argument("--width", type=int, default=48, help="waterfall width in columns")
+    asyncio.run(main(parser.parse_args()))
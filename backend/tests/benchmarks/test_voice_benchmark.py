@@ -0,0 +1,51 @@
+"""Offline load benchmark — deselected by default, run with:
+
+    pytest -m benchmark tests/benchmarks -s
+
+Small concurrency levels only; `python -m tests.benchmarks` runs the full
+1/10/100/1000 sweep.
+"""
+
+import pytest
+
+from tests.benchmarks.harness import (
+    ProviderProfile,
+    VoiceServer,
+    format_report,
+    offline_providers,
+    run_pipeline,
+    run_ws,
+)
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sessions", [1, 10])
+async def test_pipeline_path(sessions):
+    async with offline_providers():
+        result = await run_pipeline(sessions, utterances_per_session=2)
+    print("\n" + format_report([result]))
+    assert result.errors == 0
+    assert result.utterances == sessions * 2
+    assert result.ttfa.count == result.utterances
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sessions", [1, 10])
+async def test_ws_path(sessions):
+    async with offline_providers(), VoiceServer() as server:
+        result = await run_ws(server, sessions, utterances_per_session=2)
+    print("\n" + format_report([result]))
+    assert result.errors == 0
+    assert result.utterances == sessions * 2
+    assert result.ttfa.count == result.utterances
+
+
+@pytest.mark.asyncio
+async def test_provider_errors_are_reported_not_fatal():
+    profile = ProviderProfile.instant().with_error_rate(0.5)
+    async with offline_providers(profile) as providers:
+        result = await run_pipeline(5, utterances_per_session=4)
+    assert result.utterances + result.errors == 20
+    assert sum(p["errors"] for p in providers.summary().values()) > 0
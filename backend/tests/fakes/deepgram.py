@@ -0,0 +1,159 @@
+"""Fake Deepgram STT servers for offline tests.
+
+FakeDeepgramServer — streaming (WebSocket) /v1/listen.
+FakeDeepgramBatchServer — pre-recorded (HTTP POST) /v1/listen.
+
+The streaming fake speaks enough of the WebSocket protocol for STTStream:
+binary audio frames in, "Results" JSON out, KeepAlive and CloseStream.
+
+Each scripted utterance is revealed word by word as interim results while
+audio arrives; once `bytes_per_utterance` bytes have been received (or the
+client sends CloseStream) the utterance is emitted as a final.
+
+Usage:
+    async with FakeDeepgramServer(["hello there", "how are you"]) as fake:
+        settings.deepgram_ws_url = fake.url
+"""
+
+import asyncio
+import itertools
+import json
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from websockets.asyncio.server import ServerConnection, serve
+
+from tests.fakes.server import FakeHTTPServer, LatencyProfile
+
+
+class FakeDeepgramServer:
+    def __init__(
+        self,
+        utterances: list[str],
+        bytes_per_utterance: int = 3200,
+        interim_every_bytes: int = 800,
+        seconds_per_word: float = 0.3,
+    ):
+        self.utterances = list(utterances)
+        self.bytes_per_utterance = bytes_per_utterance
+        self.interim_every_bytes = interim_every_bytes
+        self.seconds_per_word = seconds_per_word
+        self.requests: list[str] = []  # request paths (incl. query) seen
+        self.keepalives = 0
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        port = self._server.sockets[0].getsockname()[1]
+        return f"ws://127.0.0.1:{port}/v1/listen"
+
+    async def __aenter__(self) -> "FakeDeepgramServer":
+        self._server = await serve(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, ws: ServerConnection) -> None:
+        self.requests.append(ws.request.path)
+        script = list(self.utterances)
+        received = 0  # bytes for the current utterance
+        since_interim = 0
+        offset = 0.0  # stream time in seconds
+
+        async def emit(text: str, is_final: bool):
+            words = text.split()
+            results = _results(text, words, offset, self.seconds_per_word, is_final)
+            await ws.send(json.dumps(results))
+
+        async for message in ws:
+            if isinstance(message, str):
+                control = json.loads(message)
+                if control.get("type") == "KeepAlive":
+                    self.keepalives += 1
+                elif control.get("type") == "CloseStream":
+                    if script and received:
+                        await emit(script.pop(0), is_final=True)
+                    await ws.send(json.dumps({"type": "Metadata"}))
+                    await ws.close()
+                    return
+                continue
+
+            if not script:
+                continue
+            received += len(message)
+            since_interim += len(message)
+            words = script[0].split()
+
+            if received >= self.bytes_per_utterance:
+                await emit(script.pop(0), is_final=True)
+                offset += len(words) * self.seconds_per_word
+                received = since_interim = 0
+            elif since_interim >= self.interim_every_bytes:
+                shown = max(1, len(words) * received // self.bytes_per_utterance)
+                await emit(" ".join(words[:shown]), is_final=False)
+                since_interim = 0
+            await asyncio.sleep(0)
+
+
+class FakeDeepgramBatchServer(FakeHTTPServer):
+    """
+    Answers every POST /v1/listen with the next scripted transcript (cycling),
+    after a delay drawn from `latency`.
+
+    Usage:
+        async with FakeDeepgramBatchServer(["hello there"]) as fake:
+            settings.deepgram_api_url = fake.url
+    """
+
+    def __init__(self, utterances: list[str], latency: LatencyProfile | None = None):
+        super().__init__()
+        self.latency = latency or LatencyProfile()
+        self.audio_bytes = 0
+        self._script = itertools.cycle(utterances)
+        self.app = Starlette(routes=[Route("/v1/listen", self._listen, methods=["POST"])])
+
+    @property
+    def url(self) -> str:
+        return f"{self.base_url}/v1"
+
+    async def _listen(self, request: Request):
+        self.audio_bytes += len(await request.body())
+        failure = self._reject(self.latency)
+        await self.latency.wait()
+        if failure:
+            return failure
+        text = next(self._script)
+        result = _results(text, text.split(), 0.0, 0.3, is_final=True)
+        return JSONResponse({"metadata": {}, "results": {"channels": [result["channel"]]}})
+
+
+def _results(text: str, words: list[str], offset: float, per_word: float, is_final: bool) -> dict:
+    return {
+        "type": "Results",
+        "is_final": is_final,
+        "speech_final": is_final,
+        "start": offset,
+        "duration": len(words) * per_word,
+        "channel": {
+            "alternatives": [
+                {
+                    "transcript": text,
+                    "confidence": 0.99,
+                    "words": [
+                        {
+                            "word": w.lower().strip(".,?!"),
+                            "punctuated_word": w,
+                            "start": offset + i * per_word,
+                            "end": offset + (i + 1) * per_word,
+                            "confidence": 0.99,
+                        }
+                        for i, w in enumerate(words)
+                    ],
+                }
+            ]
+        },
+    }
@@ -0,0 +1,70 @@
+"""Fake ElevenLabs text-to-speech server for offline tests.
+
+POST /v1/text-to-speech/{voice_id}[/stream]. The returned "audio" is
+`bytes_per_char` zero bytes per input character, streamed in `chunk_size`
+chunks.
+
+    first_byte      — delay before the first audio byte
+    chunk_interval  — gap between streamed chunks (the streaming cadence)
+
+Usage:
+    async with FakeElevenLabsServer(first_byte=LatencyProfile(150, 500)) as fake:
+        settings.elevenlabs_api_url = fake.url
+"""
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from tests.fakes.server import FakeHTTPServer, LatencyProfile
+
+
+class FakeElevenLabsServer(FakeHTTPServer):
+    def __init__(
+        self,
+        first_byte: LatencyProfile | None = None,
+        chunk_interval: LatencyProfile | None = None,
+        bytes_per_char: int = 400,
+        chunk_size: int = 4096,
+    ):
+        super().__init__()
+        self.first_byte = first_byte or LatencyProfile()
+        self.chunk_interval = chunk_interval or LatencyProfile()
+        self.bytes_per_char = bytes_per_char
+        self.chunk_size = chunk_size
+        self.characters = 0
+        self.app = Starlette(routes=[
+            Route("/v1/text-to-speech/{voice_id}", self._synthesize, methods=["POST"]),
+            Route("/v1/text-to-speech/{voice_id}/stream", self._stream, methods=["POST"]),
+        ])
+
+    @property
+    def url(self) -> str:
+        return f"{self.base_url}/v1"
+
+    async def _audio(self, request: Request) -> bytes:
+        text = (await request.json()).get("text", "")
+        self.characters += len(text)
+        return bytes(len(text) * self.bytes_per_char)
+
+    async def _synthesize(self, request: Request):
+        audio = await self._audio(request)
+        failure = self._reject(self.first_byte)
+        await self.first_byte.wait()
+        return failure or Response(audio, media_type="audio/mpeg")
+
+    async def _stream(self, request: Request):
+        audio = await self._audio(request)
+        if failure := self._reject(self.first_byte):
+            await self.first_byte.wait()
+            return failure
+
+        async def chunks():
+            await self.first_byte.wait()
+            for offset in range(0, len(audio), self.chunk_size):
+                if offset:
+                    await self.chunk_interval.wait()
+                yield audio[offset:offset + self.chunk_size]
+
+        return StreamingResponse(chunks(), media_type="audio/mpeg")
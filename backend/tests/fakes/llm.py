@@ -0,0 +1,99 @@
+"""Fake OpenAI-compatible chat completions server for offline tests.
+
+POST /v1/chat/completions, streamed (SSE) or not. The "translation" is the
+last user message echoed back word by word, so output length tracks input.
+
+    ttft            — delay before the first token (or the whole response)
+    token_interval  — gap between streamed tokens (the streaming cadence)
+
+Usage:
+    async with FakeOpenAIServer(ttft=LatencyProfile(250, 800)) as fake:
+        settings.openai_base_url = fake.url
+"""
+
+import json
+import time
+import uuid
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from tests.fakes.server import FakeHTTPServer, LatencyProfile
+
+
+class FakeOpenAIServer(FakeHTTPServer):
+    def __init__(
+        self,
+        ttft: LatencyProfile | None = None,
+        token_interval: LatencyProfile | None = None,
+    ):
+        super().__init__()
+        self.ttft = ttft or LatencyProfile()
+        self.token_interval = token_interval or LatencyProfile()
+        self.app = Starlette(
+            routes=[Route("/v1/chat/completions", self._completions, methods=["POST"])]
+        )
+
+    @property
+    def url(self) -> str:
+        return f"{self.base_url}/v1"
+
+    async def _completions(self, request: Request):
+        body = await request.json()
+        if failure := self._reject(self.ttft):
+            await self.ttft.wait()
+            return failure
+
+        text = next(
+            (m["content"] for m in reversed(body["messages"]) if m["role"] == "user"), ""
+        )
+        tokens = [w + " " for w in text.split()] or [""]
+        tokens[-1] = tokens[-1].rstrip()
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        model = body.get("model", "gpt-4-turbo")
+
+        if not body.get("stream"):
+            await self.ttft.wait()
+            for _ in tokens[1:]:
+                await self.token_interval.wait()
+            return JSONResponse({
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": len(text.split()),
+                    "completion_tokens": len(tokens),
+                    "total_tokens": len(text.split()) + len(tokens),
+                },
+            })
+
+        async def events():
+            await self.ttft.wait()
+            for i, token in enumerate(tokens):
+                if i:
+                    await self.token_interval.wait()
+                delta = {"content": token} if i else {"role": "assistant", "content": token}
+                yield _sse(completion_id, model, delta, None)
+            yield _sse(completion_id, model, {}, "stop")
+            yield "data: [DONE]\n\n"
+    
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+
+def _sse(completion_id: str, model: str, delta: dict, finish_reason: str | None) -> str:
+    chunk = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(chunk)}\n\n"
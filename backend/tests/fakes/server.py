@@ -0,0 +1,100 @@
+"""Shared plumbing for the fake HTTP providers (Deepgram batch, OpenAI, ElevenLabs).
+
+Each fake is a small Starlette app served by an in-process uvicorn on a free
+port, so the real services talk to it over real sockets with their real
+clients. Latency is drawn from a `LatencyProfile`:
+
+    LatencyProfile(median_ms=300, p99_ms=900, error_rate=0.01)
+
+is a log-normal distribution with that median and 99th percentile; a
+request fails with `error_status` at `error_rate`. `LatencyProfile()` is
+instant and never fails.
+"""
+
+import asyncio
+import math
+import random
+import socket
+from dataclasses import dataclass, field
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+
+Z_99 = 2.326  # standard normal 99th percentile
+
+
+@dataclass
+class LatencyProfile:
+    median_ms: float = 0.0
+    p99_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    seed: int | None = None
+    _rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+
+    def sample_ms(self) -> float:
+        if self.median_ms <= 0:
+            return 0.0
+        sigma = math.log(max(self.p99_ms, self.median_ms) / self.median_ms) / Z_99
+        return self._rng.lognormvariate(math.log(self.median_ms), sigma)
+
+    def fails(self) -> bool:
+        return self.error_rate > 0 and self._rng.random() < self.error_rate
+
+    async def wait(self) -> None:
+        delay = self.sample_ms()
+        if delay:
+            await asyncio.sleep(delay / 1000)
+
+    def error_response(self) -> JSONResponse:
+        return JSONResponse({"error": "injected failure"}, status_code=self.error_status)
+
+
+class FakeHTTPServer:
+    """Base class: subclasses build `self.app` (a Starlette app) in __init__."""
+
+    app: Starlette
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self._server: uvicorn.Server | None = None
+        self._task: asyncio.Task | None = None
+        self._port = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._port}"
+
+    async def __aenter__(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(("127.0.0.1", 0))
+        self._port = sock.getsockname()[1]
+
+        config = uvicorn.Config(
+            self.app, lifespan="off", log_level="warning", access_log=False, backlog=4096
+        )
+        self._server = uvicorn.Server(config)
+        self._task = asyncio.create_task(self._server.serve(sockets=[sock]))
+        while not self._server.started:
+            if self._task.done():
+                await self._task  # surfaces the startup error
+            await asyncio.sleep(0.01)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._server.should_exit = True
+        await self._task
+
+    def _reject(self, profile: LatencyProfile) -> JSONResponse | None:
+        """Count the request; an injected failure response, if this one fails."""
+        self.requests += 1
+        if profile.fails():
+            self.errors += 1
+            return profile.error_response()
+        return None
@@ -0,0 +1,157 @@
+"""Unit tests for the audio DSP stage."""
+
+import asyncio
+import io
+import time
+import wave
+
+import numpy as np
+import pytest
+
+from app.services.audio_dsp import (
+    DEFAULT_FORMAT,
+    DSPStage,
+    DSPUnavailable,
+    audio_mimetype,
+    negotiate_format,
+    normalize_loudness,
+    resample,
+    stt_task,
+)
+
+
+def _tone(freq: float, rate: int, seconds: float = 0.5, amplitude: float = 0.1) -> np.ndarray:
+    t = np.arange(int(rate * seconds)) / rate
+    return (np.sin(2 * np.pi * freq * t) * amplitude * 32767).astype(np.int16)
+
+
+def _wav(samples: np.ndarray, rate: int, channels: int = 1) -> bytes:
+    out = io.BytesIO()
+    with wave.open(out, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(np.repeat(samples, channels).astype("<i2").tobytes())
+    return out.getvalue()
+
+
+def _rms_dbfs(samples: np.ndarray) -> float:
+    x = samples.astype(np.float64) / 32768
+    return 10 * np.log10(np.mean(x ** 2))
+
+
+class TestPrimitives:
+    def test_resample_keeps_duration_and_filters_aliases(self):
+        speech = resample(_tone(440, 48000), 48000, 16000)
+        assert len(speech) == 8000
+        # 12 kHz is above the 8 kHz Nyquist limit of 16 kHz audio — must not fold back
+        alias = resample(_tone(12000, 48000), 48000, 16000)
+        assert _rms_dbfs(alias) < _rms_dbfs(speech) - 20
+
+    def test_normalize_brings_quiet_speech_to_target(self):
+        quiet = _tone(300, 16000, amplitude=0.01)
+        louder = normalize_loudness(quiet, 16000, target_dbfs=-20.0, max_gain_db=30.0)
+        assert _rms_dbfs(louder) == pytest.approx(-20.0, abs=0.5)
+
+    def test_normalize_caps_gain_and_peaks(self):
+        quiet = _tone(300, 16000, amplitude=0.01)
+        capped = normalize_loudness(quiet, 16000, target_dbfs=-20.0, max_gain_db=6.0)
+        assert _rms_dbfs(capped) == pytest.approx(_rms_dbfs(quiet) + 6.0, abs=0.5)
+
+        loud = _tone(300, 16000, amplitude=0.99)
+        limited = normalize_loudness(loud, 16000, target_dbfs=0.0, max_gain_db=20.0)
+        assert np.max(np.abs(limited)) <= 32768 * 10 ** (-1 / 20) + 1
+
+    def test_silence_is_not_amplified(self):
+        hiss = (np.random.default_rng(0).standard_normal(16000) * 3).astype(np.int16)
+        assert np.array_equal(normalize_loudness(hiss, 16000, -20.0, 20.0), hiss)
+
+    def test_stt_task_downmixes_and_resamples_wav(self):
+        prepared = stt_task(_wav(_tone(440, 48000), 48000, channels=2), 16000, -20.0, 20.0)
+        with wave.open(io.BytesIO(prepared)) as wav:
+            assert (wav.getnchannels(), wav.getframerate(), wav.getnframes()) == (1, 16000, 8000)
+
+    def test_mimetype_sniffing(self):
+        assert audio_mimetype(_wav(_tone(440, 16000), 16000)) == "audio/wav"
+        assert audio_mimetype(b"\x1a\x45\xdf\xa3" + bytes(8)) == "audio/webm"
+        assert audio_mimetype(b"OggS" + bytes(8)) == "audio/ogg"
+        assert audio_mimetype(b"ID3" + bytes(8)) == "audio/mpeg"
+        assert audio_mimetype(bytes(8)) == "application/octet-stream"
+
+
+class TestNegotiation:
+    def test_mp3_bitrate_maps_to_provider_format(self):
+        assert negotiate_format() == DEFAULT_FORMAT
+        assert DEFAULT_FORMAT.provider_format is None
+        low = negotiate_format("mp3", 24)
+        assert low.provider_format == "mp3_22050_32"
+        assert not low.transcode
+        assert negotiate_format(bitrate_kbps=70).provider_format == "mp3_44100_64"
+
+    def test_opus_needs_codecs(self, monkeypatch):
+        monkeypatch.setattr("app.services.audio_dsp.CODECS_AVAILABLE", False)
+        assert negotiate_format("opus", 32).codec == "mp3"
+
+        monkeypatch.setattr("app.services.audio_dsp.CODECS_AVAILABLE", True)
+        opus = negotiate_format("opus", 30)
+        assert (opus.codec, opus.bitrate_kbps) == ("opus", 32)
+        assert opus.transcode
+        assert opus.provider_format == "pcm_24000"
+
+
+class TestDSPStage:
+    @pytest.mark.asyncio
+    async def test_prepares_wav_in_worker_process(self):
+        stage = DSPStage(workers=1, max_pending=4, timeout_ms=30_000)
+        try:
+            audio, mimetype = await stage.prepare_for_stt(_wav(_tone(440, 44100), 44100))
+        finally:
+            await stage.close()
+        assert mimetype == "audio/wav"
+        with wave.open(io.BytesIO(audio)) as wav:
+            assert wav.getframerate() == 16000
+        stats = stage.summary()["operations"]["stt_prepare"]
+        assert stats["tasks"] == 1
+        assert stats["run_time"]["count"] == stats["queue_wait"]["count"] == 1
+        assert stage.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_timed_out_task_stays_pending_until_it_finishes(self):
+        stage = DSPStage(workers=1, max_pending=1, timeout_ms=50)
+        try:
+            with pytest.raises(DSPUnavailable):
+                await stage.run("slow", time.sleep, 0.5)
+            assert stage.pending == 1  # the worker is still busy
+            with pytest.raises(DSPUnavailable, match="full"):
+                await stage.run("slow", time.sleep, 0)
+            for _ in range(200):
+                if not stage.pending:
+                    break
+                await asyncio.sleep(0.05)
+            assert stage.pending == 0
+        finally:
+            await stage.close()
+
+    @pytest.mark.asyncio
+    async def test_full_stage_passes_audio_through(self):
+        stage = DSPStage(workers=1, max_pending=0)
+        original = _wav(_tone(440, 44100), 44100)
+        assert await stage.prepare_for_stt(original) == (original, "audio/wav")
+        assert stage.stats["stt_prepare"].shed == 1
+        assert stage._pool is None  # never touched the pool
+
+    @pytest.mark.asyncio
+    async def test_undecodable_audio_skips_the_pool(self, monkeypatch):
+        monkeypatch.setattr("app.services.audio_dsp.CODECS_AVAILABLE", False)
+        stage = DSPStage(workers=1)
+        webm = b"\x1a\x45\xdf\xa3" + bytes(64)
+        assert await stage.prepare_for_stt(webm) == (webm, "audio/webm")
+        assert stage.stats == {}
+
+    @pytest.mark.asyncio
+    async def test_egress_falls_back_to_wav(self):
+        stage = DSPStage(workers=0)
+        pcm = _tone(440, 24000).astype("<i2").tobytes()
+        encoded = await stage.encode_for_client(pcm, negotiate_format("mp3", 32))
+        with wave.open(io.BytesIO(encoded)) as wav:
+            assert (wav.getframerate(), wav.getnframes()) == (24000, 12000)
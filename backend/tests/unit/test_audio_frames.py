@@ -0,0 +1,57 @@
+"""Unit tests for the binary audio frame sub-protocol."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.audio_frames import (
+    FLAG_END,
+    HEADER_SIZE,
+    AudioFrameWriter,
+    FrameError,
+    decode_frame,
+    encode_frame,
+)
+
+
+class TestAudioFrames:
+    def test_round_trip(self):
+        frame = decode_frame(encode_frame(7, 42, b"\x00\x01pcm"))
+        assert (frame.stream_id, frame.sequence, frame.end) == (7, 42, False)
+        assert bytes(frame.payload) == b"\x00\x01pcm"
+
+    def test_payload_is_a_view(self):
+        data = encode_frame(1, 0, b"x" * 4096)
+        frame = decode_frame(data)
+        assert isinstance(frame.payload, memoryview)
+        assert frame.payload.obj is data
+
+    def test_end_flag(self):
+        frame = decode_frame(encode_frame(1, 3, flags=FLAG_END))
+        assert frame.end
+        assert len(frame.payload) == 0
+
+    def test_rejects_bad_frames(self):
+        with pytest.raises(FrameError):
+            decode_frame(b"\xa1\x00")
+        with pytest.raises(FrameError):
+            decode_frame(b"\x00" * HEADER_SIZE)
+
+
+class TestAudioFrameWriter:
+    @pytest.mark.asyncio
+    async def test_stream_announced_then_sequenced_frames(self):
+        ws = AsyncMock()
+        writer = AudioFrameWriter(ws)
+        stream_id = await writer.open_stream(speaker_id="u1")
+        await writer.send(stream_id, b"a")
+        await writer.send(stream_id, b"b")
+        await writer.end(stream_id)
+
+        ws.send_json.assert_awaited_once_with(
+            {"type": "audio_stream", "stream_id": 1, "speaker_id": "u1"}
+        )
+        frames = [decode_frame(call.args[0]) for call in ws.send_bytes.await_args_list]
+        assert [f.sequence for f in frames] == [0, 1, 2]
+        assert [bytes(f.payload) for f in frames] == [b"a", b"b", b""]
+        assert frames[-1].end
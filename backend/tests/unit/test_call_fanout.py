@@ -0,0 +1,105 @@
+"""Unit tests for group-call fan-out."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.call_fanout_service import CallFanoutService, Listener
+from app.services.pipeline import TranslationContext
+
+
+def _listener(listener_id, user_id, language, inbox, voice_id=None):
+    async def send(message):
+        inbox.setdefault(listener_id, []).append(message)
+
+    return Listener(listener_id, user_id, language, send, voice_id)
+
+
+class TestCallFanout:
+    @pytest.mark.asyncio
+    @patch("app.services.pipeline.tts_service")
+    @patch("app.services.pipeline.translation_service")
+    @patch("app.services.call_fanout_service.stt_service")
+    async def test_one_stt_one_translation_per_language(self, mock_stt, mock_translate, mock_tts):
+        mock_stt.transcribe = AsyncMock(return_value="hello everyone")
+        translated, synthesized = [], []
+
+        async def fake_translate_stream(text, target_language, **kwargs):
+            translated.append(target_language)
+            yield f"[{target_language}] {text}"
+
+        async def fake_synthesize_stream(text, voice_id=None, language="en", output_format=None):
+            synthesized.append((language, voice_id))
+            yield f"{language}:{voice_id}".encode()
+
+        mock_translate.translate_stream = fake_translate_stream
+        mock_tts.synthesize_stream = fake_synthesize_stream
+
+        service = CallFanoutService()
+        inbox: dict[str, list[dict]] = {}
+        for listener in [
+            _listener("speaker", "u0", "en", inbox),
+            _listener("a", "u1", "th", inbox),
+            _listener("b", "u2", "th", inbox),
+            _listener("c", "u3", "ja", inbox),
+            _listener("d", "u4", "ja", inbox, voice_id="custom"),
+            _listener("e", "u5", "en", inbox),
+        ]:
+            fanout = service.join("call-1", listener)
+
+        ctx = TranslationContext(source_language="en")
+        await fanout.broadcast("u0", b"audio", ctx, voice_id="speaker-voice")
+
+        mock_stt.transcribe.assert_awaited_once()
+        assert sorted(translated) == ["ja", "th"]
+        assert sorted(synthesized) == [
+            ("ja", "custom"), ("ja", "speaker-voice"), ("th", "speaker-voice"),
+        ]
+
+        def audio_for(listener_id):
+            return [m["data"] for m in inbox.get(listener_id, []) if m["type"] == "audio"]
+
+        assert audio_for("a") == audio_for("b") != []
+        assert audio_for("c") != audio_for("d")
+        assert audio_for("speaker") == [] and audio_for("e") == []
+        assert all(m["speaker_id"] == "u0" for msgs in inbox.values() for m in msgs)
+        assert service.stats.deliveries == 4
+        assert service.stats.provider_calls_saved == 4 * 3 - (1 + 2 + 3)
+
+    def test_leave_removes_empty_call(self):
+        service = CallFanoutService()
+        service.join("call-1", _listener("a", "u1", "th", {}))
+        service.leave("call-1", "a")
+        assert service.get("call-1") is None
+
+    @pytest.mark.asyncio
+    @patch("app.services.pipeline.tts_service")
+    @patch("app.services.pipeline.translation_service")
+    @patch("app.services.call_fanout_service.stt_service")
+    async def test_binary_listener_gets_raw_frames(self, mock_stt, mock_translate, mock_tts):
+        mock_stt.transcribe = AsyncMock(return_value="hi")
+
+        async def fake_translate_stream(text, target_language, **kwargs):
+            yield "สวัสดี"
+
+        async def fake_synthesize_stream(text, voice_id=None, language="en", output_format=None):
+            yield b"raw-mp3"
+
+        mock_translate.translate_stream = fake_translate_stream
+        mock_tts.synthesize_stream = fake_synthesize_stream
+
+        service = CallFanoutService()
+        inbox: dict[str, list[dict]] = {}
+        writer = AsyncMock()
+        writer.open_stream = AsyncMock(return_value=5)
+        binary = _listener("a", "u1", "th", inbox)
+        binary.audio_writer = writer
+        service.join("call-1", binary)
+        fanout = service.join("call-1", _listener("b", "u2", "th", inbox))
+
+        await fanout.broadcast("u0", b"audio", TranslationContext(source_language="en"))
+
+        writer.send.assert_awaited_once_with(5, b"raw-mp3")
+        writer.end.assert_awaited_once_with(5)
+        assert not any(m["type"] == "audio" for m in inbox.get("a", []))
+        assert any(m["type"] == "audio" for m in inbox["b"])
@@ -0,0 +1,73 @@
+"""Unit tests for progressive chat translation delivery."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.routers import websocket
+
+
+class _Session:
+    def __init__(self):
+        self.execute = AsyncMock()
+        self.commit = AsyncMock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class TestProgressiveDelivery:
+    @pytest.mark.asyncio
+    async def test_original_is_stored_first(self):
+        with patch.object(websocket.get_settings(), "chat_progressive_delivery", True):
+            assert await websocket.translate_for_send("Hi", "en", {"fr"}) == {"en": "Hi"}
+
+    @pytest.mark.asyncio
+    async def test_complete_mode_translates_before_sending(self):
+        with (
+            patch.object(websocket.get_settings(), "chat_progressive_delivery", False),
+            patch.object(
+                websocket.translation_service,
+                "translate_many",
+                AsyncMock(return_value={"fr": "Salut"}),
+            ),
+        ):
+            assert await websocket.translate_for_send("Hi", "en", {"fr"}) == {
+                "en": "Hi",
+                "fr": "Salut",
+            }
+
+    @pytest.mark.asyncio
+    async def test_each_language_is_pushed_and_persisted(self):
+        async def translate_each(text, source, targets, timeout_s=None):
+            assert sorted(targets) == ["de", "fr"]
+            yield "fr", "Salut"
+            yield "de", "Hallo"
+
+        session = _Session()
+        send = AsyncMock()
+        with (
+            patch.object(websocket.translation_service, "translate_each", translate_each),
+            patch.object(websocket, "async_session", MagicMock(return_value=session)),
+            patch.object(websocket.manager, "send_to_user", send),
+        ):
+            await websocket._deliver_translations(
+                "m1", "c1", "Hi", "en", {"u1": "en", "u2": "fr", "u3": "de", "u4": "fr"}
+            )
+
+        assert session.commit.await_count == 2  # patched once per language
+        sent = [(call.args[0], call.args[1]["data"]) for call in send.await_args_list]
+        assert [(uid, data["language"]) for uid, data in sent] == [
+            ("u2", "fr"),
+            ("u4", "fr"),
+            ("u3", "de"),
+        ]
+        assert sent[0][1] == {
+            "message_id": "m1",
+            "chat_id": "c1",
+            "language": "fr",
+            "translated_content": "Salut",
+        }
@@ -0,0 +1,164 @@
+"""Unit tests for the per-connection /ws scheduler."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.connection_scheduler import MAX_AUDIO_QUEUE_SIZE, ConnectionScheduler
+
+
+def _scheduler(handle_audio, policy="drop_oldest", queue_size=2, max_age_ms=10_000):
+    notify = AsyncMock()
+    scheduler = ConnectionScheduler(
+        handle_audio=handle_audio,
+        on_error=AsyncMock(),
+        notify=notify,
+        queue_size=queue_size,
+        policy=policy,
+        max_age_ms=max_age_ms,
+    )
+    return scheduler, notify
+
+
+class TestConnectionScheduler:
+    @pytest.mark.asyncio
+    async def test_control_lane_not_blocked_by_audio(self):
+        release = asyncio.Event()
+        control_done = asyncio.Event()
+
+        async def slow_audio(data):
+            await release.wait()
+
+        async def chat_job():
+            control_done.set()
+
+        scheduler, _ = _scheduler(slow_audio)
+        scheduler.start()
+        await scheduler.submit_audio(b"a")
+        await asyncio.sleep(0)
+        scheduler.submit_control(chat_job)
+
+        await asyncio.wait_for(control_done.wait(), timeout=1)
+        release.set()
+        await scheduler.close()
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_on_overflow(self):
+        handled = []
+
+        async def record(data):
+            handled.append(data)
+
+        scheduler, notify = _scheduler(record, policy="drop_oldest", queue_size=2)
+        for chunk in (b"1", b"2", b"3"):
+            await scheduler.submit_audio(chunk)
+        scheduler.start()
+        await asyncio.sleep(0.01)
+        await scheduler.close()
+
+        assert handled == [b"2", b"3"]
+        assert scheduler.dropped == 1
+        assert notify.call_args[0][0]["data"]["reason"] == "queue_full"
+
+    @pytest.mark.asyncio
+    async def test_drop_newest_on_overflow(self):
+        handled = []
+
+        async def record(data):
+            handled.append(data)
+
+        scheduler, _ = _scheduler(record, policy="drop_newest", queue_size=2)
+        for chunk in (b"1", b"2", b"3"):
+            await scheduler.submit_audio(chunk)
+        scheduler.start()
+        await asyncio.sleep(0.01)
+        await scheduler.close()
+
+        assert handled == [b"1", b"2"]
+
+    @pytest.mark.asyncio
+    async def test_merge_on_overflow(self):
+        handled = []
+
+        async def record(data):
+            handled.append(data)
+
+        scheduler, _ = _scheduler(record, policy="merge", queue_size=2)
+        for chunk in (b"1", b"2", b"3"):
+            await scheduler.submit_audio(chunk)
+        scheduler.start()
+        await asyncio.sleep(0.01)
+        await scheduler.close()
+
+        assert handled == [b"1", b"23"]
+        assert scheduler.dropped == 0
+
+    @pytest.mark.asyncio
+    async def test_merge_falls_back_to_drop_oldest_for_containers(self):
+        handled = []
+
+        async def record(data):
+            handled.append(data)
+
+        scheduler, notify = _scheduler(record, policy="merge", queue_size=2)
+        chunks = [b"\x1aE\xdf\xa3" + bytes([i]) for i in range(3)]  # webm blobs
+        for chunk in chunks:
+            await scheduler.submit_audio(chunk)
+        scheduler.start()
+        await asyncio.sleep(0.01)
+        await scheduler.close()
+
+        assert handled == chunks[1:]
+        assert scheduler.merged == 0
+        assert notify.call_args[0][0]["data"]["reason"] == "queue_full"
+
+    def test_configure_ignores_or_clamps_bad_values(self):
+        scheduler, _ = _scheduler(AsyncMock(), queue_size=2)
+        scheduler.configure(policy="fastest", queue_size="lots")
+        assert (scheduler.policy, scheduler.queue_size) == ("drop_oldest", 2)
+        scheduler.configure(queue_size="3")
+        assert scheduler.queue_size == 3
+        scheduler.configure(queue_size=10_000)
+        assert scheduler.queue_size == MAX_AUDIO_QUEUE_SIZE
+        scheduler.configure(queue_size=-1)
+        assert scheduler.queue_size == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_audio_dropped_but_newest_kept(self):
+        handled = []
+
+        async def record(data):
+            handled.append(data)
+
+        scheduler, notify = _scheduler(record, queue_size=5, max_age_ms=1)
+        for chunk in (b"1", b"2", b"3"):
+            await scheduler.submit_audio(chunk)
+        await asyncio.sleep(0.01)
+        scheduler.start()
+        await asyncio.sleep(0.01)
+        await scheduler.close()
+
+        assert handled == [b"3"]
+        assert notify.call_args[0][0]["data"] == {
+            "count": 2, "reason": "stale", "policy": "drop_oldest"
+        }
+
+    @pytest.mark.asyncio
+    async def test_audio_errors_reported_and_worker_survives(self):
+        handled = []
+
+        async def flaky(data):
+            if data == b"bad":
+                raise RuntimeError("boom")
+            handled.append(data)
+
+        scheduler, _ = _scheduler(flaky, queue_size=5)
+        scheduler.start()
+        await scheduler.submit_audio(b"bad")
+        await scheduler.submit_audio(b"good")
+        await asyncio.sleep(0.01)
+        await scheduler.close()
+
+        assert handled == [b"good"]
+        scheduler._on_error.assert_awaited_once()
@@ -0,0 +1,80 @@
+"""Unit tests for credit reservation leases."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.credit_lease_service import CreditLeaseService
+
+DB = object()
+
+
+def _credit_service(*reserve_results):
+    mock = MagicMock()
+    mock.reserve = AsyncMock(side_effect=list(reserve_results))
+    mock.settle_reservation = AsyncMock()
+    return mock
+
+
+class TestCreditLeases:
+    @pytest.mark.asyncio
+    async def test_one_reservation_for_many_chunks(self):
+        service = CreditLeaseService()
+        credits = _credit_service(100)
+        with patch("app.services.credit_lease_service.credit_service", credits):
+            for _ in range(10):
+                assert await service.charge("u1", DB, 4, language_pair="th→en")
+        credits.reserve.assert_awaited_once()
+        credits.settle_reservation.assert_not_called()
+        assert service._leases["u1"].used_cents == 40
+
+    @pytest.mark.asyncio
+    async def test_exhausted_lease_settles_and_never_overdraws(self):
+        service = CreditLeaseService()
+        credits = _credit_service(8, 0)
+        with patch("app.services.credit_lease_service.credit_service", credits):
+            assert await service.charge("u1", DB, 4)
+            assert await service.charge("u1", DB, 4)
+            assert not await service.charge("u1", DB, 4)
+        settle = credits.settle_reservation.await_args.kwargs
+        assert settle["reserved_cents"] == 8
+        assert settle["used_cents"] == 8
+        assert service.stats.rejected == 1
+
+    @pytest.mark.asyncio
+    async def test_refund_and_release_settle_actual_usage(self):
+        service = CreditLeaseService()
+        credits = _credit_service(100)
+        with patch("app.services.credit_lease_service.credit_service", credits):
+            await service.charge("u1", DB, 4)
+            lease_id = await service.charge("u1", DB, 4)
+            await service.refund("u1", lease_id, 4)
+            await service.release("u1", DB)
+        settle = credits.settle_reservation.await_args.kwargs
+        assert settle["used_cents"] == 4
+        assert settle["metadata"]["chunks"] == 1
+        assert "u1" not in service._leases
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_settles_on_next_charge(self):
+        service = CreditLeaseService()
+        credits = _credit_service(100, 100)
+        with patch("app.services.credit_lease_service.credit_service", credits):
+            await service.charge("u1", DB, 4)
+            service._leases["u1"].expires_at = 0
+            await service.charge("u1", DB, 4)
+        credits.settle_reservation.assert_awaited_once()
+        assert credits.reserve.await_count == 2
+        assert service._leases["u1"].used_cents == 4
+
+    @pytest.mark.asyncio
+    async def test_refund_after_the_lease_settled_is_a_no_op(self):
+        service = CreditLeaseService()
+        credits = _credit_service(4, 100)
+        with patch("app.services.credit_lease_service.credit_service", credits):
+            old = await service.charge("u1", DB, 4)
+            new = await service.charge("u1", DB, 4)  # exhausted: settles, reserves anew
+            await service.refund("u1", old, 4)
+        assert old != new
+        assert service._leases["u1"].used_cents == 4
+        assert service._leases["u1"].chunks == 1
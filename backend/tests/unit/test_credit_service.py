@@ -0,0 +1,85 @@
+"""Unit tests for credit reservations."""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.models import CreditBalance, CreditTransaction
+from app.services.credit_service import CreditService
+
+
+def _db(balance: CreditBalance | None) -> MagicMock:
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = balance
+    return MagicMock(
+        execute=AsyncMock(return_value=result),
+        commit=AsyncMock(),
+        rollback=AsyncMock(),
+        add=MagicMock(),
+    )
+
+
+def _balance(cents: int, reserved: int = 0) -> CreditBalance:
+    return CreditBalance(
+        id=uuid.uuid4(), balance_cents=cents, reserved_cents=reserved, total_used_cents=0
+    )
+
+
+class TestReserve:
+    @pytest.mark.asyncio
+    async def test_moves_credits_into_reserved(self):
+        bal = _balance(500)
+        db = _db(bal)
+        assert await CreditService().reserve("u1", db, 100, 4) == 100
+        assert (bal.balance_cents, bal.reserved_cents) == (400, 100)
+        db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_reserves_what_is_left_down_to_the_minimum(self):
+        bal = _balance(30)
+        assert await CreditService().reserve("u1", _db(bal), 100, 4) == 30
+        assert (bal.balance_cents, bal.reserved_cents) == (0, 30)
+
+    @pytest.mark.asyncio
+    async def test_reserves_nothing_below_the_minimum(self):
+        bal = _balance(3)
+        db = _db(bal)
+        assert await CreditService().reserve("u1", db, 100, 4) == 0
+        assert await CreditService().reserve("u1", _db(None), 100, 4) == 0
+        assert (bal.balance_cents, bal.reserved_cents) == (3, 0)
+        db.rollback.assert_awaited_once()
+        db.commit.assert_not_awaited()
+
+
+class TestSettleReservation:
+    @pytest.mark.asyncio
+    async def test_charges_usage_and_returns_the_rest(self):
+        bal = _balance(400, reserved=100)
+        db = _db(bal)
+        await CreditService().settle_reservation(
+            "u1", db, reserved_cents=100, used_cents=36, transaction_type="pipeline"
+        )
+        assert (bal.balance_cents, bal.reserved_cents, bal.total_used_cents) == (464, 0, 36)
+        row = db.add.call_args.args[0]
+        assert isinstance(row, CreditTransaction)
+        assert row.amount_cents == -36
+        db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_never_charges_more_than_reserved(self):
+        bal = _balance(0, reserved=8)
+        await CreditService().settle_reservation(
+            "u1", _db(bal), reserved_cents=8, used_cents=12, transaction_type="pipeline"
+        )
+        assert (bal.balance_cents, bal.reserved_cents, bal.total_used_cents) == (0, 0, 8)
+
+    @pytest.mark.asyncio
+    async def test_unused_reservation_writes_no_ledger_row(self):
+        bal = _balance(0, reserved=100)
+        db = _db(bal)
+        await CreditService().settle_reservation(
+            "u1", db, reserved_cents=100, used_cents=0, transaction_type="pipeline"
+        )
+        assert bal.balance_cents == 100
+        db.add.assert_not_called()
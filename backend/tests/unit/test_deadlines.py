@@ -0,0 +1,130 @@
+"""Unit tests for per-utterance deadline propagation."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.connection_scheduler import ConnectionScheduler
+from app.services.deadlines import Deadline, DeadlineExceeded, current_deadline
+from app.services.pipeline import TranslationContext, TranslationPipeline
+
+
+class TestDeadline:
+    def test_check_requires_minimum_budget(self):
+        deadline = Deadline.start(budget_ms=100)
+        deadline.check("stt", min_ms=50)
+        with pytest.raises(DeadlineExceeded) as exc:
+            deadline.check("stt", min_ms=200)
+        assert exc.value.stage == "stt"
+
+    def test_budget_counts_from_start_time(self):
+        deadline = Deadline.start(budget_ms=1000, started_at=time.monotonic() - 2)
+        assert deadline.remaining_ms() < -900
+        with pytest.raises(DeadlineExceeded) as exc:
+            deadline.check("queue")
+        assert exc.value.summary()["late_ms"] > 900
+
+    @pytest.mark.asyncio
+    async def test_stage_cancels_work_past_the_deadline(self):
+        cancelled = asyncio.Event()
+
+        async def slow_provider():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        deadline = Deadline.start(budget_ms=300)
+        with pytest.raises(DeadlineExceeded) as exc:
+            async with deadline.stage("translate"):
+                await slow_provider()
+        assert exc.value.stage == "translate"
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_inner_timeouts_are_not_the_deadline(self):
+        async def provider_with_own_timeout():
+            await asyncio.wait_for(asyncio.sleep(10), 0.01)
+
+        deadline = Deadline.start(budget_ms=5_000)
+        with pytest.raises(TimeoutError):
+            async with deadline.stage("stt"):
+                await provider_with_own_timeout()
+        with pytest.raises(TimeoutError):
+            await deadline.wait(provider_with_own_timeout(), "translate")
+
+
+class TestPipelineDeadlines:
+    @pytest.mark.asyncio
+    @patch("app.services.pipeline.tts_service")
+    @patch("app.services.pipeline.translation_service")
+    @patch("app.services.pipeline.stt_service")
+    async def test_slow_tts_is_dropped(self, mock_stt, mock_translate, mock_tts):
+        mock_stt.transcribe = AsyncMock(return_value="hello. how are you?")
+
+        async def fake_translate_stream(**kwargs):
+            for token in ["Hola. ", "¿Cómo estás?"]:
+                yield token
+
+        async def slow_synthesize_stream(text, voice_id=None, language="en", output_format=None):
+            yield b"first"
+            await asyncio.sleep(10)
+            yield b"too late"
+
+        mock_translate.translate_stream = fake_translate_stream
+        mock_tts.synthesize_stream = slow_synthesize_stream
+
+        ctx = TranslationContext(source_language="en", target_language="es")
+        events = [
+            e async for e in TranslationPipeline().process_audio_streaming(
+                b"raw_audio", ctx, deadline=Deadline.start(budget_ms=400)
+            )
+        ]
+        assert [e["data"] for e in events if e["type"] == "audio"] == [b"first"]
+        assert events[-1]["type"] == "dropped"
+        assert events[-1]["data"]["stage"] == "tts"
+        assert not any(e["type"] == "metrics" for e in events)
+
+    @pytest.mark.asyncio
+    @patch("app.services.pipeline.stt_service")
+    async def test_expired_utterance_never_reaches_providers(self, mock_stt):
+        mock_stt.transcribe = AsyncMock(return_value="hello")
+        stale = Deadline.start(budget_ms=1000, started_at=time.monotonic() - 5)
+        token = current_deadline.set(stale)
+        try:
+            ctx = TranslationContext(source_language="en", target_language="es")
+            events = [e async for e in TranslationPipeline().process_audio_streaming(b"raw", ctx)]
+        finally:
+            current_deadline.reset(token)
+
+        assert [e["type"] for e in events] == ["dropped"]
+        assert events[0]["data"]["stage"] == "queue"
+        mock_stt.transcribe.assert_not_awaited()
+
+
+class TestSchedulerDeadline:
+    @pytest.mark.asyncio
+    async def test_deadline_starts_when_audio_is_queued(self):
+        seen: list[Deadline | None] = []
+        handled = asyncio.Event()
+
+        async def handle_audio(data):
+            seen.append(current_deadline.get())
+            handled.set()
+
+        scheduler = ConnectionScheduler(
+            handle_audio=handle_audio, on_error=AsyncMock(), notify=AsyncMock()
+        )
+        queued_at = time.monotonic()
+        await scheduler.submit_audio(b"a")
+        await asyncio.sleep(0.05)
+        scheduler.start()
+        await asyncio.wait_for(handled.wait(), 1)
+        await scheduler.close()
+
+        [deadline] = seen
+        assert deadline.expires_at == pytest.approx(queued_at + deadline.budget_ms / 1000, abs=0.01)
+        assert current_deadline.get() is None
@@ -0,0 +1,79 @@
+"""Unit tests for glossary term matching."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.config import get_settings
+from app.services.glossary_matcher import GlossaryMatcher, GlossaryMatchers
+from app.services.translation_service import TranslationService
+
+
+class TestGlossaryMatcher:
+    def test_finds_overlapping_terms_in_one_pass(self):
+        matcher = GlossaryMatcher({"he": "x", "she": "y", "hers": "z", "his": "w"})
+        assert matcher.find("ushers") == []  # none are whole words here
+        assert matcher.find("she said his and hers") == ["she", "hers", "his"]
+
+    def test_case_whitespace_and_word_boundaries(self):
+        matcher = GlossaryMatcher({"Torque  Wrench": "ประแจ", "art": "ศิลปะ"})
+        assert matcher.find("Pass me the torque\nwrench.") == ["Torque  Wrench"]
+        assert matcher.find("start the engine") == []
+        assert matcher.find("modern art!") == ["art"]
+
+    def test_unspaced_scripts_match_inside_text(self):
+        matcher = GlossaryMatcher({"สลักเกลียว": "bolt", "螺栓": "bolt"})
+        assert matcher.find("กรุณาขันสลักเกลียวให้แน่น") == ["สลักเกลียว"]
+        assert matcher.find("请拧紧螺栓") == ["螺栓"]
+
+    def test_matchers_are_compiled_once_per_glossary(self):
+        matchers = GlossaryMatchers(max_size=1)
+        glossary = {"bolt": "สลักเกลียว", "nut": "น็อต"}
+        assert matchers.relevant(glossary, "tighten the bolt") == {"bolt": "สลักเกลียว"}
+        assert matchers.relevant(dict(glossary), "and the nut") == {"nut": "น็อต"}
+        assert matchers.stats.matchers_built == 1
+        matchers.relevant({"washer": "แหวน"}, "washer")
+        matchers.relevant(glossary, "bolt")
+        assert matchers.stats.matchers_built == 3  # evicted at max_size=1
+        assert matchers.missing({"bolt": "สลักเกลียว"}, "ขันน็อต") == {"bolt": "สลักเกลียว"}
+
+
+class TestGlossaryPrompt:
+    @pytest.mark.asyncio
+    async def test_only_matched_terms_reach_the_prompt(self):
+        service = TranslationService()
+        glossary = {f"term{i}": f"คำ{i}" for i in range(500)} | {"bolt": "สลักเกลียว"}
+        with (
+            patch.object(service, "_translate_openai", new_callable=AsyncMock) as mock_openai,
+            patch("app.services.translation_service.redis_service") as mock_redis,
+        ):
+            mock_openai.return_value = "ขันสลักเกลียว"
+            mock_redis.get_translation = AsyncMock(return_value=None)
+            mock_redis.set_translation = AsyncMock()
+            mock_redis.increment_counter = AsyncMock()
+            await service.translate("Tighten the bolt", "en", "th", glossary=glossary)
+
+        system_prompt = mock_openai.await_args.args[1]
+        assert "bolt → สลักเกลียว" in system_prompt
+        assert "term1" not in system_prompt
+
+    @pytest.mark.asyncio
+    async def test_verify_retries_once_when_a_term_is_missing(self):
+        service = TranslationService()
+        with (
+            patch.object(service, "_translate_openai", new_callable=AsyncMock) as mock_openai,
+            patch("app.services.translation_service.redis_service") as mock_redis,
+            patch.object(get_settings(), "glossary_verify", True),
+        ):
+            mock_openai.side_effect = ["ขันน็อต", "ขันสลักเกลียว"]
+            mock_redis.get_translation = AsyncMock(return_value=None)
+            mock_redis.set_translation = AsyncMock()
+            mock_redis.increment_counter = AsyncMock()
+            result = await service.translate(
+                "Tighten the bolt", "en", "th", glossary={"bolt": "สลักเกลียว"}
+            )
+
+        assert result == "ขันสลักเกลียว"
+        assert mock_openai.await_count == 2
+        assert "REQUIRED" in mock_openai.await_args.args[1]
+
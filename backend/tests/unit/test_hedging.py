@@ -0,0 +1,132 @@
+"""Unit tests for hedged provider calls."""
+
+import asyncio
+
+import pytest
+
+from app.services.hedging import MIN_SAMPLES, HedgeBudget, Hedger, LatencyWindow
+
+
+def _hedger(delay_ms=20, max_rate=1.0, **kwargs) -> Hedger:
+    return Hedger(
+        min_delay_ms=delay_ms,
+        max_delay_ms=delay_ms,
+        budget=HedgeBudget(max_rate=max_rate),
+        **kwargs,
+    )
+
+
+def _provider(name, result, delay=0.0, fail=False, calls=None):
+    async def call():
+        if calls is not None:
+            calls.append(name)
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError(f"{name} down")
+        return result
+    return name, call
+
+
+class TestHedger:
+    @pytest.mark.asyncio
+    async def test_fast_primary_never_hedges(self):
+        hedger, calls = _hedger(), []
+        result = await hedger.run(
+            _provider("a", "A", calls=calls), _provider("b", "B", calls=calls)
+        )
+        assert result == ("a", "A")
+        assert calls == ["a"]
+        assert hedger.stats.hedged == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_cancelled(self):
+        hedger = _hedger()
+        cancelled = asyncio.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        result = await hedger.run(("a", slow), _provider("b", "B"))
+        assert result == ("b", "B")
+        assert cancelled.is_set()
+        assert (hedger.stats.hedged, hedger.stats.hedge_wins) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_failed_primary_falls_back_without_spending_budget(self):
+        hedger = _hedger(max_rate=0.0)
+        hedger.budget.tokens = 0
+        result = await hedger.run(_provider("a", "", fail=True), _provider("b", "B"))
+        assert result == ("b", "B")
+        assert hedger.stats.fallbacks == 1
+        assert hedger.stats.hedged == 0
+
+    @pytest.mark.asyncio
+    async def test_rate_cap_and_budget_block_hedges(self):
+        hedger = _hedger(max_rate=0.0, max_tokens=100)
+        hedger.budget.tokens = 0
+        result = await hedger.run(_provider("a", "A", delay=0.05), _provider("b", "B"))
+        assert result == ("a", "A")
+        assert hedger.stats.throttled == 1
+
+        hedger.budget.tokens = 5
+        await hedger.run(_provider("a", "A", delay=0.05), _provider("b", "B"), cost_tokens=101)
+        assert hedger.stats.over_budget == 1
+        assert hedger.stats.hedged == 0
+
+    @pytest.mark.asyncio
+    async def test_loser_results_are_discarded(self):
+        hedger, discarded = _hedger(), []
+
+        async def discard(result):
+            discarded.append(result)
+
+        # Primary answers empty (not accepted), hedge answers; the empty one is disposed of
+        result = await hedger.run(
+            _provider("a", "", delay=0.05), _provider("b", "B", delay=0.1), discard=discard
+        )
+        assert result == ("b", "B")
+        assert discarded == [""]
+
+    def test_delay_tracks_primary_percentile(self):
+        hedger = Hedger(percentile=0.9, min_delay_ms=10, max_delay_ms=1000)
+        assert hedger.delay_ms("a") == 1000  # no samples yet
+        hedger.latency["a"] = window = LatencyWindow()
+        for ms in range(MIN_SAMPLES * 5):
+            window.record(float(ms))
+        assert 85 <= hedger.delay_ms("a") <= 95
+
+
+class TestStreamHedging:
+    @pytest.mark.asyncio
+    async def test_slow_first_token_reads_the_faster_stream(self):
+        from unittest.mock import patch
+
+        from app.services.translation_service import TranslationService, translation_provider
+
+        closed = []
+
+        async def slow_openai(text, prompt):
+            try:
+                await asyncio.sleep(5)
+                yield "never"
+            finally:
+                closed.append("openai")
+
+        async def claude(text, prompt):
+            for token in ("Bon", "jour"):
+                yield token
+
+        service = TranslationService()
+        service.stream_hedger = _hedger()
+        with patch.object(service, "_stream_openai", slow_openai), \
+             patch.object(service, "_stream_claude", claude), \
+             patch("app.services.translation_service._can_hedge", return_value=True):
+            tokens = [t async for t in service.translate_stream("Hello", "en", "fr")]
+            assert translation_provider.get() == "anthropic"
+
+        assert tokens == ["Bon", "jour"]
+        assert closed == ["openai"]
@@ -0,0 +1,97 @@
+"""Unit tests for the shared provider HTTP client pools."""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.config import get_settings
+from app.services.http_clients import HTTPClientRegistry, PoolStats, _MeteredTransport
+
+
+class _Body(httpx.AsyncByteStream):
+    async def __aiter__(self):
+        yield b"x" * 10
+
+
+class _Upstream(httpx.AsyncBaseTransport):
+    """Streams its body like a pooled transport (MockTransport reads it up front)."""
+
+    def __init__(self, fail: Exception | None = None):
+        self.fail = fail
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.fail:
+            raise self.fail
+        return httpx.Response(200, stream=_Body())
+
+
+def _metered(upstream: _Upstream) -> tuple[httpx.AsyncClient, PoolStats]:
+    stats = PoolStats(max_connections=4)
+    return httpx.AsyncClient(transport=_MeteredTransport(upstream, stats)), stats
+
+
+class TestRegistry:
+    @pytest.mark.asyncio
+    async def test_one_client_per_provider(self):
+        registry = HTTPClientRegistry()
+        try:
+            assert registry.get("deepgram") is registry.get("deepgram")
+            assert registry.get("deepgram") is not registry.get("elevenlabs")
+        finally:
+            await registry.close()
+
+    @pytest.mark.asyncio
+    async def test_sdk_clients_share_the_pool(self):
+        registry = HTTPClientRegistry()
+        keys = {"openai_api_key": "sk-test", "anthropic_api_key": "sk-ant-test"}
+        with patch.multiple(get_settings(), **keys):
+            openai = registry.openai()
+            assert registry.openai() is openai
+            assert openai._client is registry.get("openai")
+            assert registry.anthropic() is registry.anthropic()
+        await registry.close()
+
+    @pytest.mark.asyncio
+    async def test_close_then_reopen(self):
+        registry = HTTPClientRegistry()
+        client = registry.get("sendgrid")
+        await registry.close()
+        assert client.is_closed
+        assert registry.get("sendgrid") is not client
+
+    def test_client_is_rebuilt_on_a_new_event_loop(self):
+        registry = HTTPClientRegistry()
+
+        async def get():
+            return registry.get("webhooks")
+
+        first = asyncio.run(get())
+        assert asyncio.run(get()) is not first
+
+
+class TestPoolStats:
+    @pytest.mark.asyncio
+    async def test_in_flight_counts_until_the_body_is_closed(self):
+        client, stats = _metered(_Upstream())
+        async with client:
+            async with client.stream("GET", "https://provider.test/a") as response:
+                assert stats.in_flight == 1
+                await response.aread()
+            assert stats.in_flight == 0
+
+            await client.get("https://provider.test/b")
+        summary = stats.summary()
+        assert summary["requests"] == 2
+        assert summary["peak_in_flight"] == 1
+        assert summary["peak_saturation"] == 0.25
+
+    @pytest.mark.asyncio
+    async def test_failed_request_is_released(self):
+        client, stats = _metered(_Upstream(fail=httpx.PoolTimeout("no free connection")))
+        async with client:
+            with pytest.raises(httpx.PoolTimeout):
+                await client.get("https://provider.test/")
+        assert stats.in_flight == 0
+        assert stats.pool_timeouts == 1
@@ -0,0 +1,73 @@
+"""Unit tests for local language identification."""
+
+import pytest
+
+from app.services.language_id import LanguageIdentifier, LanguageTracker, detect_language
+from app.services.pipeline import TranslationContext
+
+
+class TestLanguageIdentifier:
+    @pytest.mark.parametrize(
+        ("text", "language"),
+        [
+            ("Can we move the meeting to tomorrow afternoon?", "en"),
+            ("¿Podemos mover la reunión a mañana?", "es"),
+            ("merci, à plus tard", "fr"),
+            ("ich glaube die Lieferung ist wieder verspätet", "de"),
+            ("Possiamo spostare la riunione a domani pomeriggio?", "it"),
+            ("Czy możemy przełożyć spotkanie na jutro?", "pl"),
+            ("Chúng ta có thể dời cuộc họp sang chiều mai không?", "vi"),
+            ("เราเลื่อนประชุมไปพรุ่งนี้บ่ายได้ไหม", "th"),
+            ("会議を明日の午後に移動できますか", "ja"),
+            ("我们可以把会议改到明天下午吗", "zh"),
+            ("회의를 내일 오후로 옮길 수 있을까요", "ko"),
+            ("Можем перенести встречу на завтра?", "ru"),
+        ],
+    )
+    def test_detects(self, text, language):
+        assert LanguageIdentifier().detect(text).language == language
+
+    @pytest.mark.parametrize("text", ["hello", "ok 👍", "12:30", ""])
+    def test_short_or_wordless_text_is_unsure(self, text):
+        assert LanguageIdentifier().detect(text).language == ""
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "Meet me in São Paulo next week please",
+            "I just got back from España yesterday",
+            "We are opening an office in Łódź soon",
+            "Jürgen will join the call later today",
+        ],
+    )
+    def test_a_marker_letter_in_a_name_does_not_decide(self, text):
+        detection = LanguageIdentifier().detect(text)
+        assert detection.language == "en"
+        assert detection.confidence < 1.0
+
+    def test_hint_wins_when_unsure_or_confusable(self):
+        assert detect_language("hello", "th") == "th"
+        assert detect_language("see you at the office tomorrow", "th") == "en"
+        assert detect_language("Terima kasih banyak ya", "ms") == "ms"  # id/ms
+
+
+class TestLanguageTracker:
+    def test_stt_hint_needs_agreement_and_rechecks(self, monkeypatch):
+        from app.config import get_settings
+
+        monkeypatch.setattr(get_settings(), "language_id_recheck", 2)
+        tracker = LanguageTracker()
+        assert tracker.observe("Can we move the meeting to tomorrow?") == "en"
+        assert tracker.stt_language() == "auto"  # one detection isn't a majority
+        tracker.observe("I think the shipment is delayed again")
+        assert [tracker.stt_language() for _ in range(3)] == ["en", "en", "auto"]
+
+    def test_transcript_in_target_language_skips_translation(self):
+        context = TranslationContext(source_language="th", target_language="en")
+        spoken = context.for_transcript("where is the invoice for last month")
+        assert spoken.source_language == "en"
+        assert context.for_transcript("สวัสดีครับ").source_language == "th"
+
+        auto = TranslationContext(source_language="auto", target_language="en")
+        assert auto.for_transcript("ich glaube die Lieferung ist verspätet").source_language == "de"
+        assert auto.for_transcript("ok").source_language == "auto"
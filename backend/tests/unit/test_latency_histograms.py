@@ -0,0 +1,57 @@
+"""Unit tests for the process-wide latency histograms."""
+
+from app.services.latency_histograms import LatencyRegistry, LogHistogram
+from app.services.pipeline import PipelineMetrics
+
+
+class TestLogHistogram:
+    def test_percentiles_within_bucket_error(self):
+        h = LogHistogram()
+        for ms in range(1, 1001):
+            h.record(float(ms))
+        assert abs(h.percentile(0.50) - 500) / 500 < 0.06
+        assert abs(h.percentile(0.90) - 900) / 900 < 0.06
+        assert abs(h.percentile(0.99) - 990) / 990 < 0.06
+        assert h.percentile(1.0) == 1000
+
+    def test_constant_memory(self):
+        h = LogHistogram()
+        size = len(h.counts)
+        for ms in (0.001, 5.0, 1e9):
+            h.record(ms)
+        assert len(h.counts) == size
+        assert h.count == 3
+
+    def test_empty(self):
+        assert LogHistogram().summary()["p99_ms"] == 0.0
+
+
+class TestLatencyRegistry:
+    def test_observe_labels_stages(self):
+        registry = LatencyRegistry()
+        m = PipelineMetrics(
+            stt_start=0.0, stt_end=0.1,
+            translate_start=0.1, translate_end=0.3,
+            tts_start=0.3, tts_end=0.4,
+            total_start=0.0, total_end=0.4,
+            first_audio=0.35, translate_provider="anthropic",
+        )
+        registry.observe(m, "th", "en")
+        snap = registry.snapshot()
+        assert snap["stt"]["th→en|deepgram"]["count"] == 1
+        assert snap["translate"]["th→en|anthropic"]["count"] == 1
+        assert snap["tts"]["th→en|elevenlabs"]["count"] == 1
+        assert abs(snap["ttfa"]["th→en|anthropic"]["p50_ms"] - 350) / 350 < 0.06
+
+    def test_skips_stages_that_did_not_run(self):
+        registry = LatencyRegistry()
+        registry.observe(PipelineMetrics(total_start=1.0, total_end=1.2), "th", "en")
+        snap = registry.snapshot()
+        assert snap["stt"] == {}
+        assert "th→en|unknown" in snap["total"]
+
+    def test_series_cap(self):
+        registry = LatencyRegistry(max_series=2)
+        for pair in ("a→b", "c→d", "e→f", "g→h"):
+            registry.record("total", 10.0, pair, "openai")
+        assert registry.snapshot()["total"]["other|openai"]["count"] == 2
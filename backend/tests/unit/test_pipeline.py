@@ -1,10 +1,18 @@
 """Unit tests for translation pipeline."""
 
+import asyncio
+import time
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from app.services.pipeline import PipelineMetrics, TranslationContext, TranslationPipeline
+from app.services.pipeline import (
+    MAX_PARALLEL_TTS,
+    PipelineMetrics,
+    TranslationContext,
+    TranslationPipeline,
+)
+from app.services.segmenter import ClauseSegmenter
 
 
 class TestPipelineMetrics:
@@ -34,6 +42,40 @@ class TestPipelineMetrics:
         assert "total_ms" in s
         assert s["total_ms"] == 250.0
 
+    def test_time_to_first_audio(self):
+        m = PipelineMetrics(total_start=1.0, first_audio=1.2)
+        assert abs(m.time_to_first_audio_ms - 200.0) < 0.1
+        assert PipelineMetrics(total_start=1.0).time_to_first_audio_ms == 0.0
+
+
+class TestClauseSegmenter:
+    def test_splits_on_sentence_end(self):
+        seg = ClauseSegmenter()
+        assert seg.feed("Hello. How are") == ["Hello."]
+        assert seg.feed(" you? Fine") == ["How are you?"]
+        assert seg.flush() == "Fine"
+
+    def test_keeps_decimal_numbers(self):
+        seg = ClauseSegmenter()
+        assert seg.feed("It costs 3") == []
+        assert seg.feed(".50 today. ") == ["It costs 3.50 today."]
+
+    def test_cjk_terminators(self):
+        seg = ClauseSegmenter()
+        assert seg.feed("こんにちは。元気ですか？はい") == ["こんにちは。", "元気ですか？"]
+        assert seg.flush() == "はい"
+
+    def test_long_clause_split_on_comma(self):
+        seg = ClauseSegmenter(min_clause_chars=10)
+        assert seg.feed("short, then a longer clause, and more") == [
+            "short, then a longer clause,"
+        ]
+
+    def test_unpunctuated_text_split_at_cap(self):
+        seg = ClauseSegmenter(min_clause_chars=5, max_clause_chars=20)
+        clauses = seg.feed("สวัสดีครับ วันนี้อากาศดีมาก เราจะไปเที่ยว")
+        assert clauses and all(len(c) <= 20 for c in clauses)
+
 
 class TestTranslationContext:
     def test_defaults(self):
@@ -101,3 +143,97 @@ class TestTranslationPipeline:
         assert text == ""
         mock_translate.translate.assert_not_called()
         mock_tts.synthesize.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("app.services.pipeline.tts_service")
+    @patch("app.services.pipeline.translation_service")
+    @patch("app.services.pipeline.stt_service")
+    async def test_streaming_speaks_each_clause_in_order(
+        self, mock_stt, mock_translate, mock_tts
+    ):
+        mock_stt.transcribe = AsyncMock(return_value="hello. how are you?")
+
+        async def fake_translate_stream(**kwargs):
+            for token in ["Hola", ". ", "¿Cómo", " estás?"]:
+                yield token
+
+        async def fake_synthesize_stream(text, voice_id=None, language="en", output_format=None):
+            yield f"{text}-1".encode()
+            yield f"{text}-2".encode()
+
+        mock_translate.translate_stream = fake_translate_stream
+        mock_tts.synthesize_stream = fake_synthesize_stream
+
+        pipeline = TranslationPipeline()
+        ctx = TranslationContext(source_language="en", target_language="es")
+        events = [e async for e in pipeline.process_audio_streaming(b"raw_audio", ctx)]
+
+        audio = [e["data"] for e in events if e["type"] == "audio"]
+        assert audio == [
+            b"Hola.-1", b"Hola.-2", "¿Cómo estás?-1".encode(), "¿Cómo estás?-2".encode()
+        ]
+        text = "".join(e["data"] for e in events if e["type"] == "text")
+        assert text == "Hola. ¿Cómo estás?"
+        assert events[-1]["type"] == "metrics"
+        assert "ttfa_ms" in events[-1]["data"]
+
+    @pytest.mark.asyncio
+    @patch("app.services.pipeline.tts_service")
+    async def test_synthesis_overlaps_translation(self, mock_tts):
+        first_clause_spoken = asyncio.Event()
+
+        async def tokens():
+            yield "Hola. "
+            # The rest of the translation only arrives once the first clause is in TTS
+            await asyncio.wait_for(first_clause_spoken.wait(), 1)
+            yield "¿Cómo estás?"
+
+        async def fake_synthesize_stream(text, voice_id=None, language="en", output_format=None):
+            first_clause_spoken.set()
+            yield text.encode()
+
+        mock_tts.synthesize_stream = fake_synthesize_stream
+
+        ctx = TranslationContext(source_language="en", target_language="es")
+        metrics = PipelineMetrics(total_start=time.time())
+        events = [
+            e async for e in TranslationPipeline().translate_and_speak(
+                "hello. how are you?", ctx, None, metrics, tokens=tokens()
+            )
+        ]
+
+        assert [e["data"] for e in events if e["type"] == "audio"] == [
+            b"Hola.", "¿Cómo estás?".encode()
+        ]
+        assert metrics.tts_start < metrics.translate_end
+
+    @pytest.mark.asyncio
+    @patch("app.services.pipeline.tts_service")
+    async def test_tts_lookahead_is_bounded_by_playback(self, mock_tts):
+        started = 0
+        played = 0
+        ahead = []
+
+        async def tokens():
+            for i in range(6):
+                yield f"Clause {i}. "
+
+        async def fake_synthesize_stream(text, voice_id=None, language="en", output_format=None):
+            nonlocal started
+            started += 1
+            ahead.append(started - played)
+            yield text.encode()
+
+        mock_tts.synthesize_stream = fake_synthesize_stream
+
+        ctx = TranslationContext(source_language="en", target_language="es")
+        metrics = PipelineMetrics(total_start=time.time())
+        async for event in TranslationPipeline().translate_and_speak(
+            "", ctx, None, metrics, tokens=tokens()
+        ):
+            if event["type"] == "audio":
+                await asyncio.sleep(0.01)  # a slow listener
+                played += 1
+
+        assert played == 6
+        assert max(ahead) <= MAX_PARALLEL_TTS
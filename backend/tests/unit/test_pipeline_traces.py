@@ -0,0 +1,200 @@
+"""Unit tests for sampled pipeline traces."""
+
+import os
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.pipeline import TranslationContext, TranslationPipeline
+from app.services.pipeline_traces import (
+    UNTRACED,
+    TraceRecorder,
+    format_waterfall,
+    load_traces,
+    waterfall,
+)
+from app.services.stt_service import TranscriptResult
+from tests.benchmarks.replay import profile_from_trace
+
+
+class TestTraceRecorder:
+    def test_unsampled_utterances_are_not_traced(self, tmp_path):
+        recorder = TraceRecorder(sample_rate=0.0, trace_dir=str(tmp_path))
+        assert recorder.begin(b"audio", "en", "es") is UNTRACED
+        assert TraceRecorder(sample_rate=1.0, trace_dir="").begin(b"audio", "en", "es") is UNTRACED
+        assert recorder.stats.sampled == 0
+
+    @pytest.mark.asyncio
+    @patch("app.services.pipeline.tts_service")
+    @patch("app.services.pipeline.translation_service")
+    @patch("app.services.pipeline.stt_service")
+    async def test_pipeline_trace_round_trips(self, mock_stt, mock_translate, mock_tts, tmp_path):
+        mock_stt.transcribe = AsyncMock(return_value="hello. how are you?")
+
+        async def fake_translate_stream(**kwargs):
+            for token in ["Hola. ", "¿Cómo ", "estás?"]:
+                yield token
+
+        async def fake_synthesize_stream(text, voice_id=None, language="en", output_format=None):
+            yield b"12345"
+
+        mock_translate.translate_stream = fake_translate_stream
+        mock_tts.synthesize_stream = fake_synthesize_stream
+
+        recorder = TraceRecorder(sample_rate=1.0, trace_dir=str(tmp_path))
+        ctx = TranslationContext(source_language="en", target_language="es")
+        with patch("app.services.pipeline.trace_recorder", recorder):
+            async for _ in TranslationPipeline().process_audio_streaming(b"raw_audio", ctx):
+                pass
+        await recorder.flush()
+
+        [record] = load_traces(tmp_path)
+        assert record["audio_bytes"] == len(b"raw_audio")
+        assert record["transcript"] == "hello. how are you?"
+        assert record["translation"] == "Hola. ¿Cómo estás?"
+        assert record["outcome"] == "ok"
+        kinds = [kind for _, kind, *_ in record["events"]]
+        assert kinds[:2] == ["stt.start", "stt.end"]
+        assert kinds.count("token") == 3
+        assert kinds.count("tts.start") == 2  # one per clause
+        assert kinds.count("audio") == 2
+        assert kinds[-1] == "end"
+        times = [t for t, *_ in record["events"]]
+        assert times == sorted(times)
+        assert recorder.stats.written == 1
+
+    @pytest.mark.asyncio
+    @patch("app.services.pipeline.tts_service")
+    @patch("app.services.pipeline.translation_service")
+    @patch("app.services.pipeline.stt_service")
+    async def test_batch_pipeline_is_traced(self, mock_stt, mock_translate, mock_tts, tmp_path):
+        mock_stt.transcribe = AsyncMock(return_value="hello")
+        mock_translate.translate = AsyncMock(return_value="hola")
+        mock_tts.synthesize = AsyncMock(return_value=b"12345")
+
+        recorder = TraceRecorder(sample_rate=1.0, trace_dir=str(tmp_path))
+        ctx = TranslationContext(source_language="en", target_language="es")
+        with patch("app.services.pipeline.trace_recorder", recorder):
+            await TranslationPipeline().process_audio(b"raw_audio", ctx)
+        await recorder.flush()
+
+        [record] = load_traces(tmp_path)
+        assert (record["transcript"], record["translation"]) == ("hello", "hola")
+        assert record["outcome"] == "ok"
+        kinds = [kind for _, kind, *_ in record["events"]]
+        assert kinds == [
+            "stt.start", "stt.end", "translate.start", "translate.end",
+            "tts.start", "tts.end", "audio", "end",
+        ]
+
+    @pytest.mark.asyncio
+    @patch("app.services.pipeline.tts_service")
+    @patch("app.services.pipeline.translation_service")
+    async def test_each_stream_segment_is_traced(self, mock_translate, mock_tts, tmp_path):
+        async def fake_translate_stream(text, **kwargs):
+            yield f"<{text}>"
+
+        async def fake_synthesize_stream(text, voice_id=None, language="en", output_format=None):
+            yield text.encode()
+
+        async def stream():
+            for text in ("one two", "three four"):
+                yield TranscriptResult(text=text, is_final=True, received_at=time.time())
+
+        mock_translate.translate_stream = fake_translate_stream
+        mock_tts.synthesize_stream = fake_synthesize_stream
+
+        recorder = TraceRecorder(sample_rate=1.0, trace_dir=str(tmp_path))
+        ctx = TranslationContext(source_language="en", target_language="th")
+        with patch("app.services.pipeline.trace_recorder", recorder):
+            async for _ in TranslationPipeline().process_stream(stream(), ctx):
+                pass
+        await recorder.flush()
+
+        records = list(load_traces(tmp_path))
+        assert [r["transcript"] for r in records] == ["one two", "three four"]
+        assert all(r["outcome"] == "ok" and r["audio_bytes"] == 0 for r in records)
+        kinds = [kind for _, kind, *_ in records[0]["events"]]
+        assert kinds[0] == "stt.end"
+        assert "token" in kinds and "audio" in kinds
+
+    def test_prune_enforces_retention_and_size(self, tmp_path):
+        recorder = TraceRecorder(
+            sample_rate=1.0, trace_dir=str(tmp_path), retention_hours=1, max_bytes=150
+        )
+        old = tmp_path / "traces-20200101-00-1.jsonl.gz"
+        older_kept = tmp_path / "traces-20200101-01-1.jsonl.gz"
+        recent = tmp_path / "traces-20200101-02-1.jsonl.gz"
+        for path, age_s in ((old, 7200), (older_kept, 600), (recent, 60)):
+            path.write_bytes(bytes(100))
+            os.utime(path, (time.time() - age_s,) * 2)
+
+        recorder._write(b"member")
+        assert not old.exists()  # past retention
+        assert not older_kept.exists()  # over the byte budget, oldest first
+        assert recent.exists()
+        assert recorder.stats.pruned_files == 2
+
+
+class TestWaterfall:
+    RECORD = {
+        "id": "abc",
+        "source_language": "en",
+        "target_language": "es",
+        "queued_ms": 40.0,
+        "outcome": "ok",
+        "events": [
+            [0.0, "stt.start"],
+            [200.0, "stt.end", 5],
+            [200.0, "translate.start"],
+            [350.0, "token", 6],
+            [380.0, "tts.start", 0],
+            [500.0, "tts.chunk", [0, 100]],
+            [510.0, "audio", 100],
+            [520.0, "tts.end", 0],
+            [600.0, "translate.end", "openai"],
+        ],
+    }
+
+    def test_spans(self):
+        spans = {s.name: s for s in waterfall(self.RECORD)}
+        assert list(spans) == ["queue", "stt", "translate", "tts 0", "audio"]
+        assert (spans["queue"].start_ms, spans["queue"].end_ms) == (-40.0, 0.0)
+        assert (spans["translate"].start_ms, spans["translate"].end_ms) == (200.0, 600.0)
+        assert spans["translate"].ticks == [350.0]
+        assert (spans["tts 0"].start_ms, spans["tts 0"].end_ms) == (380.0, 520.0)
+
+    def test_format(self):
+        lines = format_waterfall(self.RECORD, width=64).splitlines()
+        assert lines[0].startswith("trace abc  en→es  640 ms  ok")
+        assert len(lines) == 6
+        assert lines[1].split()[1].startswith("=")  # queue starts at the left edge
+
+    def test_replay_profile_comes_from_the_trace(self):
+        record = {
+            **self.RECORD,
+            "events": [
+                [0.0, "stt.start"],
+                [200.0, "stt.end", 5],
+                [200.0, "translate.start"],
+                [350.0, "token", 6],
+                [370.0, "token", 4],
+                [380.0, "tts.start", 0],
+                [500.0, "tts.chunk", [0, 100]],
+                [530.0, "tts.chunk", [0, 100]],
+                [540.0, "tts.end", 0],
+                [600.0, "translate.end", "openai"],
+            ],
+        }
+        profile = profile_from_trace(record)
+        assert profile.stt.median_ms == 200.0
+        assert profile.llm_ttft.median_ms == 150.0
+        assert profile.llm_token.median_ms == 20.0
+        assert profile.tts_first_byte.median_ms == 120.0
+        assert profile.tts_chunk.median_ms == 30.0
+
+    def test_replay_profile_without_timings_is_instant(self):
+        profile = profile_from_trace({**self.RECORD, "events": [[0.0, "stt.end", 5]]})
+        assert profile.stt.sample_ms() == 0.0
+        assert profile.llm_ttft.sample_ms() == 0.0
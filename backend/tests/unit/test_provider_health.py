@@ -0,0 +1,123 @@
+"""Unit tests for provider circuit breakers and health-scored routing."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.provider_health import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitOpenError,
+    ProviderHealthRegistry,
+    is_provider_fault,
+)
+
+
+def _status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://provider.test")
+    response = httpx.Response(status, request=request)
+    return httpx.HTTPStatusError("err", request=request, response=response)
+
+
+async def _ok():
+    return "ok"
+
+
+async def _down():
+    raise httpx.ConnectTimeout("timed out")
+
+
+async def _fail_times(registry, provider, n):
+    for _ in range(n):
+        with pytest.raises(httpx.ConnectTimeout):
+            await registry.call(provider, "m", _down)
+
+
+def _cool_down(registry, provider):
+    registry.breaker(provider, "m").opened_at -= 10_000
+
+
+class TestCircuitBreaker:
+    @pytest.mark.asyncio
+    async def test_consecutive_failures_open_the_circuit(self):
+        registry = ProviderHealthRegistry()
+        await _fail_times(registry, "deepgram", 5)
+        assert registry.breaker("deepgram", "m").state == OPEN
+
+        calls = []
+
+        async def tracked():
+            calls.append(1)
+            return "ok"
+
+        with pytest.raises(CircuitOpenError):
+            await registry.call("deepgram", "m", tracked)
+        assert calls == []  # refused without touching the provider
+
+    @pytest.mark.asyncio
+    async def test_probe_success_closes_and_failure_backs_off(self):
+        registry = ProviderHealthRegistry()
+        await _fail_times(registry, "deepgram", 5)
+        breaker = registry.breaker("deepgram", "m")
+        first_cooldown = breaker.open_seconds
+
+        _cool_down(registry, "deepgram")
+        assert breaker.state == HALF_OPEN
+        await _fail_times(registry, "deepgram", 1)
+        assert breaker.state == OPEN
+        assert breaker.open_seconds == first_cooldown * 2
+
+        _cool_down(registry, "deepgram")
+        assert await registry.call("deepgram", "m", _ok) == "ok"
+        assert breaker.state == CLOSED
+
+    def test_client_errors_are_not_provider_faults(self):
+        assert not is_provider_fault(_status_error(400))
+        assert is_provider_fault(_status_error(429))
+        assert is_provider_fault(_status_error(503))
+        assert is_provider_fault(httpx.ReadTimeout("slow"))
+
+
+class TestRouting:
+    @pytest.mark.asyncio
+    async def test_open_provider_is_skipped_and_shadow_probed(self):
+        registry = ProviderHealthRegistry()
+        await _fail_times(registry, "openai", 5)
+
+        routes = registry.plan({("openai", "m"): _ok, ("anthropic", "m"): _ok})
+        assert [p for p, _ in routes] == ["anthropic"]
+
+        _cool_down(registry, "openai")
+        routes = registry.plan({("openai", "m"): _ok, ("anthropic", "m"): _ok})
+        assert [p for p, _ in routes] == ["anthropic"]  # real traffic stays on the healthy one
+        await asyncio.sleep(0.01)  # shadow probe runs in the background
+        assert registry.breaker("openai", "m").state == CLOSED
+
+    @pytest.mark.asyncio
+    async def test_degraded_provider_is_demoted(self):
+        registry = ProviderHealthRegistry()
+        for _ in range(3):
+            await registry.call("anthropic", "m", _ok)
+        for _ in range(2):
+            await registry.call("openai", "m", _ok)
+        await _fail_times(registry, "openai", 2)  # 50% errors, not yet open
+
+        routes = registry.plan({("openai", "m"): _ok, ("anthropic", "m"): _ok})
+        assert [p for p, _ in routes] == ["anthropic", "openai"]
+
+    @pytest.mark.asyncio
+    async def test_stream_failure_counts_against_provider(self):
+        registry = ProviderHealthRegistry()
+
+        async def broken_stream():
+            raise httpx.RemoteProtocolError("reset")
+            yield b""
+
+        for _ in range(5):
+            with pytest.raises(httpx.RemoteProtocolError):
+                async for _ in registry.stream("elevenlabs", "m", broken_stream):
+                    pass
+        assert registry.breaker("elevenlabs", "m").state == OPEN
+        assert registry.snapshot()["elevenlabs:m"]["error_rate"] == 1.0
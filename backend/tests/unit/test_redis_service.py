@@ -38,6 +38,13 @@ class TestTranslationCacheKey:
         k2 = svc._translation_key("en", "fr", "hello")
         assert k1 == k2
 
+    def test_namespaced_keys_are_separate(self):
+        svc = RedisService()
+        plain = svc._translation_key("en", "fr", "hello")
+        namespaced = svc._translation_key("en", "fr", "hello", namespace="user-1:abc")
+        assert namespaced != plain
+        assert namespaced.startswith("trans:ns:user-1:abc:")
+
 
 class TestRateLimit:
     @pytest.mark.asyncio
@@ -0,0 +1,112 @@
+"""Unit tests for speculative translation of interim transcripts."""
+
+import asyncio
+
+import pytest
+
+from app.services.speculation import (
+    SpeculationStats,
+    Speculator,
+    estimate_tokens,
+    remainder,
+    stable_prefix,
+)
+
+
+class TestStablePrefix:
+    def test_common_word_prefix(self):
+        assert stable_prefix("i want to go", "i want to see it") == "i want to"
+
+    def test_no_overlap(self):
+        assert stable_prefix("hello", "goodbye") == ""
+
+
+class TestRemainder:
+    def test_match_and_continuation_past_a_clause(self):
+        assert remainder("see you at noon", "See you at noon") == ""
+        assert remainder("see you at noon,", "See you at noon, bring the slides") == (
+            "bring the slides"
+        )
+
+    def test_continuation_mid_clause_or_divergence(self):
+        assert remainder("i want to", "I want to go home") is None
+        assert remainder("see you at noon", "see you at nine") is None
+
+
+class TestSpeculationStats:
+    def test_rates(self):
+        stats = SpeculationStats(hits=3, misses=1, tokens_total=100, tokens_wasted=25)
+        assert stats.hit_rate == 0.75
+        assert stats.wasted_token_rate == 0.25
+
+    def test_empty_rates(self):
+        assert SpeculationStats().hit_rate == 0.0
+        assert SpeculationStats().wasted_token_rate == 0.0
+
+
+def _speculator(stats, previews, translated):
+    async def translate(text):
+        translated.append(text)
+        return f"<{text}>"
+
+    return Speculator(translate, lambda t, seg, rev: previews.append((t, seg, rev)), stats)
+
+
+class TestSpeculator:
+    @pytest.mark.asyncio
+    async def test_hit_when_final_matches_stable_interim(self):
+        stats, previews, translated = SpeculationStats(), [], []
+        spec = _speculator(stats, previews, translated)
+
+        spec.observe_interim("see you at noon")
+        spec.observe_interim("see you at noon")  # unchanged → stable
+        await asyncio.sleep(0.01)
+        claim = spec.claim()
+
+        assert await claim.resolve("See you at noon", stats) == ("<see you at noon>", "")
+        assert stats.hits == 1 and stats.misses == 0
+        assert previews == [("<see you at noon>", 0, 1)]
+        assert claim.revision == 1
+
+    @pytest.mark.asyncio
+    async def test_miss_rolls_back_and_counts_waste(self):
+        stats, previews, translated = SpeculationStats(), [], []
+        spec = _speculator(stats, previews, translated)
+
+        spec.observe_interim("see you at noon")
+        spec.observe_interim("see you at noon")
+        await asyncio.sleep(0.01)
+        claim = spec.claim()
+
+        assert await claim.resolve("see you at nine tomorrow", stats) is None
+        assert stats.misses == 1
+        assert stats.tokens_wasted == estimate_tokens("see you at noon") + estimate_tokens(
+            "<see you at noon>"
+        )
+
+    @pytest.mark.asyncio
+    async def test_short_or_unstable_interims_not_speculated(self):
+        stats, previews, translated = SpeculationStats(), [], []
+        spec = _speculator(stats, previews, translated)
+
+        spec.observe_interim("hi")
+        spec.observe_interim("hi there")
+        spec.observe_interim("hi there my friend")
+        await asyncio.sleep(0.01)
+
+        assert translated == []
+        assert stats.attempts == 0
+
+    @pytest.mark.asyncio
+    async def test_partial_hit_keeps_the_clause_translation(self):
+        stats, previews, translated = SpeculationStats(), [], []
+        spec = _speculator(stats, previews, translated)
+
+        spec.observe_interim("see you at noon, bring")
+        spec.observe_interim("see you at noon, take")  # stable up to the clause boundary
+        await asyncio.sleep(0.01)
+        claim = spec.claim()
+
+        resolved = await claim.resolve("See you at noon, bring the slides", stats)
+        assert resolved == ("<see you at noon,>", "bring the slides")
+        assert stats.hits == 1 and stats.partial_hits == 1 and stats.misses == 0
@@ -0,0 +1,122 @@
+"""Unit tests for the streaming STT session — runs against a local fake Deepgram."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.routers.websocket import _drain_stt_stream
+from app.services.pipeline import TranslationContext, TranslationPipeline
+from app.services.stt_service import STTService, _parse_stream_message
+from tests.fakes.deepgram import FakeDeepgramServer
+
+
+def _settings(url: str) -> MagicMock:
+    settings = MagicMock()
+    settings.deepgram_ws_url = url
+    settings.deepgram_api_key = "test-key"
+    return settings
+
+
+class TestParseStreamMessage:
+    def test_ignores_non_results(self):
+        assert _parse_stream_message({"type": "Metadata"}) is None
+
+    def test_parses_words(self):
+        result = _parse_stream_message({
+            "type": "Results",
+            "is_final": True,
+            "channel": {"alternatives": [{
+                "transcript": "hi there",
+                "words": [{"word": "hi", "punctuated_word": "Hi", "start": 0.1, "end": 0.4}],
+            }]},
+        })
+        assert result.is_final is True
+        assert result.text == "hi there"
+        assert result.words[0]["word"] == "Hi"
+
+
+class TestSTTStream:
+    @pytest.mark.asyncio
+    async def test_interims_then_finals(self):
+        async with FakeDeepgramServer(["hello there friend", "how are you"]) as fake:
+            with patch("app.services.stt_service.get_settings", return_value=_settings(fake.url)):
+                stream = await STTService().open_stream(language="en")
+
+            for _ in range(8):
+                await stream.send(b"\x00" * 800)
+            await stream.finish()
+            results = [r async for r in stream]
+            await stream.close()
+
+        finals = [r.text for r in results if r.is_final]
+        assert finals == ["hello there friend", "how are you"]
+        assert any(not r.is_final for r in results)
+        assert results[-1].words[-1]["end"] > results[-1].words[0]["start"]
+        assert "interim_results=true" in fake.requests[0]
+        assert "language=en" in fake.requests[0]
+
+    @pytest.mark.asyncio
+    async def test_close_stream_flushes_partial_utterance(self):
+        async with FakeDeepgramServer(["partial words"], bytes_per_utterance=10_000) as fake:
+            with patch("app.services.stt_service.get_settings", return_value=_settings(fake.url)):
+                stream = await STTService().open_stream()
+
+            await stream.send(b"\x00" * 1000)
+            await stream.finish()
+            finals = [r.text async for r in stream if r.is_final]
+            await stream.close()
+
+        assert finals == ["partial words"]
+        assert "language=multi" in fake.requests[0]
+
+    @pytest.mark.asyncio
+    async def test_ended_session_drains_its_last_finals(self):
+        async with FakeDeepgramServer(["last words"], bytes_per_utterance=10_000) as fake:
+            with patch("app.services.stt_service.get_settings", return_value=_settings(fake.url)):
+                stream = await STTService().open_stream()
+            await stream.send(b"\x00" * 1000)
+
+            finals = []
+
+            async def consume():
+                finals.extend([r.text async for r in stream if r.is_final])
+
+            task = asyncio.create_task(consume())
+            await stream.finish()
+            assert stream.closed  # the next audio frame opens a new session...
+            await _drain_stt_stream(stream, task)  # ...while this one is handed off
+
+        assert finals == ["last words"]
+
+
+class TestPipelineOverStream:
+    @pytest.mark.asyncio
+    @patch("app.services.pipeline.tts_service")
+    @patch("app.services.pipeline.translation_service")
+    async def test_translates_each_final(self, mock_translate, mock_tts):
+        async def fake_translate_stream(text, **kwargs):
+            yield f"<{text}>"
+
+        async def fake_synthesize_stream(text, voice_id=None, language="en", output_format=None):
+            yield text.encode()
+
+        mock_translate.translate_stream = fake_translate_stream
+        mock_tts.synthesize_stream = fake_synthesize_stream
+
+        async with FakeDeepgramServer(["one two", "three four"], bytes_per_utterance=1600) as fake:
+            with patch("app.services.stt_service.get_settings", return_value=_settings(fake.url)):
+                stream = await STTService().open_stream(language="en")
+            for _ in range(4):
+                await stream.send(b"\x00" * 800)
+            await stream.finish()
+
+            ctx = TranslationContext(source_language="en", target_language="th")
+            events = [e async for e in TranslationPipeline().process_stream(stream, ctx)]
+            await stream.close()
+
+        transcripts = [e["data"] for e in events if e["type"] == "transcript"]
+        audio = [e["data"] for e in events if e["type"] == "audio"]
+        assert transcripts == ["one two", "three four"]
+        assert audio == [b"<one two>", b"<three four>"]
+        assert sum(e["type"] == "metrics" for e in events) == 2
@@ -0,0 +1,239 @@
+"""Unit tests for the in-process translation cache tier and request coalescing."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.translation_cache import (
+    CacheScope,
+    MemoryTier,
+    Singleflight,
+    context_hash,
+    translation_key,
+)
+from app.services.translation_service import TranslationService
+
+
+class TestMemoryTier:
+    def test_lru_eviction(self):
+        tier = MemoryTier(max_entries=2, ttl_s=60)
+        tier.put("a", "A")
+        tier.put("b", "B")
+        assert tier.get("a") == "A"  # "b" is now least recent
+        tier.put("c", "C")
+        assert tier.get("b") is None
+        assert (tier.get("a"), tier.get("c")) == ("A", "C")
+        assert tier.stats.evictions == 1
+        assert (tier.stats.hits, tier.stats.misses) == (3, 1)
+
+    def test_entries_expire(self):
+        tier = MemoryTier(max_entries=10, ttl_s=-1)
+        tier.put("a", "A")
+        assert tier.get("a") is None
+        assert len(tier) == 0
+        assert tier.stats.evictions == 1
+
+    def test_key_matches_redis_normalization(self):
+        assert translation_key(" Hello ", "en", "fr") == translation_key("hello", "en", "fr")
+        assert translation_key("hello", "en", "fr") != translation_key("hello", "en", "de")
+
+
+class TestSingleflight:
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_fail_the_others(self):
+        flight = Singleflight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flight.do("k", work))
+        second = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        assert await second == ("done", True)
+        assert len(flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_work_is_cancelled_when_every_caller_leaves(self):
+        flight = Singleflight()
+        cancelled = asyncio.Event()
+
+        async def work():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        caller = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        assert len(flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_new_caller_does_not_join_cancelled_work(self):
+        flight = Singleflight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            try:
+                await asyncio.sleep(0.01)
+            except asyncio.CancelledError:
+                await asyncio.sleep(0.01)  # slow to wind down
+                raise
+            return calls
+
+        caller = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.sleep(0)
+        assert await flight.do("k", work) == (2, False)
+
+
+class TestTranslateCaching:
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_provider_call(self):
+        service = TranslationService()
+
+        async def slow_openai(text, system_prompt):
+            await asyncio.sleep(0.05)
+            return "Bonjour"
+
+        with (
+            patch.object(service, "_translate_openai", side_effect=slow_openai) as mock_openai,
+            patch("app.services.translation_service.redis_service") as mock_redis,
+        ):
+            mock_redis.get_translation = AsyncMock(return_value=None)
+            mock_redis.set_translation = AsyncMock()
+            mock_redis.increment_counter = AsyncMock()
+
+            results = await asyncio.gather(
+                *(service.translate("Hello", "en", "fr") for _ in range(20))
+            )
+
+        assert results == ["Bonjour"] * 20
+        assert mock_openai.call_count == 1
+        assert mock_redis.get_translation.await_count == 1
+        assert service.cache_stats.coalesced == 19
+        assert service.cache_stats.redis.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_memory_hit_skips_redis(self):
+        service = TranslationService()
+        with (
+            patch.object(service, "_translate_openai", new_callable=AsyncMock) as mock_openai,
+            patch("app.services.translation_service.redis_service") as mock_redis,
+        ):
+            mock_openai.return_value = "Bonjour"
+            mock_redis.get_translation = AsyncMock(return_value=None)
+            mock_redis.set_translation = AsyncMock()
+            mock_redis.increment_counter = AsyncMock()
+
+            await service.translate("Hello", "en", "fr")
+            assert await service.translate("hello ", "en", "fr") == "Bonjour"
+
+        assert mock_openai.await_count == 1
+        assert mock_redis.get_translation.await_count == 1
+        assert service.cache_stats.memory.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_fills_memory_tier(self):
+        service = TranslationService()
+        with patch("app.services.translation_service.redis_service") as mock_redis:
+            mock_redis.get_translation = AsyncMock(return_value="Bonjour")
+            mock_redis.increment_counter = AsyncMock()
+            assert await service.translate("Hello", "en", "fr") == "Bonjour"
+            assert await service.translate("Hello", "en", "fr") == "Bonjour"
+
+        assert mock_redis.get_translation.await_count == 1
+        assert service.cache_stats.redis.hits == 1
+        assert service.cache_stats.memory.hits == 1
+
+
+class TestContextKeys:
+    def test_context_hash_is_stable(self):
+        assert context_hash() == ""
+        a = context_hash("Formal  tone", "", {"bolt": "สลักเกลียว", "nut": "น็อต"})
+        b = context_hash(" Formal tone ", "", {"nut": "น็อต", "bolt": "สลักเกลียว"})
+        assert a == b
+        assert a != context_hash("Formal tone", "", {"bolt": "สลักเกลียว"})
+
+    def test_scope_namespaces_context_keys_by_owner(self):
+        plain = CacheScope.of("hello", "en", "th")
+        assert (plain.namespace, plain.redis_namespace) == ("", "")
+        mine = CacheScope.of("hello", "en", "th", glossary={"hello": "สวัสดี"}, owner="u1")
+        theirs = CacheScope.of("hello", "en", "th", glossary={"hello": "สวัสดี"}, owner="u2")
+        assert mine.key != plain.key
+        assert mine.namespace == "u1"
+        assert mine.redis_namespace.startswith("u1:")
+        assert theirs.namespace == "u2"
+
+    def test_namespace_budget_only_evicts_its_own_entries(self):
+        tier = MemoryTier(max_entries=10, ttl_s=60, namespace_bytes=200, max_namespaces=10)
+        tier.put("shared", "hello")
+        tier.put("quiet", "x" * 50, namespace="u1")
+        for i in range(20):
+            tier.put(f"noisy-{i}", "y" * 50, namespace="u2")
+        assert tier.namespace_size("u2") <= 200
+        assert tier.get("quiet", namespace="u1") == "x" * 50
+        assert tier.get("shared") == "hello"
+        assert tier.get("noisy-0", namespace="u2") is None
+
+        assert tier.invalidate("u2") > 0
+        assert tier.namespace_size("u2") == 0
+        assert tier.get("quiet", namespace="u1") == "x" * 50
+
+    @pytest.mark.asyncio
+    async def test_glossary_translations_are_cached_and_invalidated(self):
+        service = TranslationService()
+        glossary = {"bolt": "สลักเกลียว"}
+        with (
+            patch.object(service, "_translate_openai", new_callable=AsyncMock) as mock_openai,
+            patch("app.services.translation_service.redis_service") as mock_redis,
+        ):
+            mock_openai.return_value = "สลักเกลียว"
+            mock_redis.get_translation = AsyncMock(return_value=None)
+            mock_redis.set_translation = AsyncMock()
+            mock_redis.increment_counter = AsyncMock()
+            mock_redis.delete_translations = AsyncMock(return_value=1)
+
+            await service.translate("bolt", "en", "th", glossary=glossary, namespace="u1")
+            await service.translate("bolt", "en", "th", glossary=glossary, namespace="u1")
+            assert mock_openai.await_count == 1
+            assert mock_redis.set_translation.await_args.kwargs["namespace"].startswith("u1:")
+
+            await service.invalidate_namespace("u1")
+            mock_redis.delete_translations.assert_awaited_once_with("u1")
+            await service.translate("bolt", "en", "th", glossary=glossary, namespace="u1")
+            assert mock_openai.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_fills_and_reads_the_cache(self):
+        service = TranslationService()
+
+        async def stream(text, system_prompt):
+            for token in ["Bon", "jour"]:
+                yield token
+
+        with (
+            patch.object(service, "_stream_openai", side_effect=stream) as mock_stream,
+            patch("app.services.translation_service.redis_service") as mock_redis,
+        ):
+            mock_redis.get_translation = AsyncMock(return_value=None)
+            mock_redis.set_translation = AsyncMock()
+            mock_redis.increment_counter = AsyncMock()
+
+            first = [c async for c in service.translate_stream("Hello", "en", "fr", persona="x")]
+            second = [c async for c in service.translate_stream("Hello", "en", "fr", persona="x")]
+
+        assert first == ["Bon", "jour"]
+        assert second == ["Bonjour"]
+        assert mock_stream.call_count == 1
@@ -0,0 +1,123 @@
+"""Unit tests for the translation memory."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.translation_memory import (
+    MemoryMatch,
+    TranslationMemory,
+    band_keys,
+    normalize,
+    shingles,
+    similarity,
+)
+from app.services.translation_service import TranslationService, translation_provider
+
+
+class TestNearDuplicates:
+    def test_similar_texts_share_a_band(self):
+        a = shingles(normalize("Can we move the meeting to tomorrow afternoon?"))
+        b = shingles(normalize("can we move the meeting to tomorrow afternoon"))
+        c = shingles(normalize("The invoice was paid last week."))
+        assert similarity(a, b) > 0.8
+        assert similarity(a, c) < 0.2
+        assert set(band_keys(a)) & set(band_keys(b))
+        assert not set(band_keys(a)) & set(band_keys(c))
+
+    def test_only_exact_matches_are_reused_directly(self):
+        a = shingles(normalize("Monday, not Tuesday"))
+        b = shingles(normalize("Tuesday, not Monday"))
+        assert similarity(a, b) > 0.85  # trigram sets barely see word order
+        reordered = MemoryMatch("Tuesday, not Monday", "Mardi, pas lundi", 0.89, False)
+        assert not reordered.direct()
+        assert reordered.reference()
+        assert MemoryMatch("Monday, not Tuesday", "Lundi, pas mardi", 1.0, True).direct()
+        assert not MemoryMatch("x", "y", 0.5, False).reference()
+
+
+class TestMemoryStore:
+    @pytest.mark.asyncio
+    async def test_add_skips_what_is_not_worth_keeping(self):
+        memory = TranslationMemory()
+        db = MagicMock(execute=AsyncMock())
+        assert not await memory.add(db, "auto", "fr", "Hello there", "Bonjour")
+        assert not await memory.add(db, "en", "fr", "Hello there", "hello  there")
+        assert not await memory.add(db, "en", "fr", "👍 https://example.com", "👍")
+        assert not await memory.add(db, "en", "fr", "Hello there", "Salut", context="a1b2c3")
+        assert not await memory.add(db, "en", "fr", "Hello there", "Bonjour", context=None)
+        assert await memory.add(db, "en", "fr", "Hello there", "Bonjour", owner="u1")
+        assert db.execute.await_count == 1
+        assert memory.stats.added == 1
+
+    @pytest.mark.asyncio
+    async def test_near_matches_need_an_owner(self):
+        memory = TranslationMemory()
+        result = MagicMock(first=MagicMock(return_value=None), all=MagicMock(return_value=[]))
+        db = MagicMock(execute=AsyncMock(return_value=result))
+        assert await memory._lookup(db, "hello there", "en", "fr", "") is None
+        assert db.execute.await_count == 1  # exact lookup only
+        assert await memory._lookup(db, "hello there", "en", "fr", "u1") is None
+        assert db.execute.await_count == 3
+        fuzzy = db.execute.await_args.args[0]
+        assert "owner_id" in str(fuzzy)
+
+    @pytest.mark.asyncio
+    async def test_lookup_pauses_after_a_database_error(self):
+        memory = TranslationMemory()
+        broken = MagicMock(side_effect=OSError("connection refused"))
+        with patch("app.services.translation_memory.async_session", broken):
+            assert await memory.lookup("Hello there", "en", "fr") is None
+            assert await memory.lookup("Hello there", "en", "fr") is None
+        assert broken.call_count == 1
+        assert memory.stats.errors == 1
+
+
+class TestTranslateWithMemory:
+    def _mock_redis(self, mock_redis):
+        mock_redis.get_translation = AsyncMock(return_value=None)
+        mock_redis.set_translation = AsyncMock()
+        mock_redis.increment_counter = AsyncMock()
+
+    @pytest.mark.asyncio
+    async def test_direct_match_skips_the_llm(self):
+        service = TranslationService()
+        match = MemoryMatch("Can we meet tomorrow?", "On se voit demain ?", 1.0, True)
+        with (
+            patch.object(service, "_translate_openai", new_callable=AsyncMock) as mock_openai,
+            patch("app.services.translation_service.redis_service") as mock_redis,
+            patch(
+                "app.services.translation_service.translation_memory.lookup",
+                AsyncMock(return_value=match),
+            ),
+        ):
+            self._mock_redis(mock_redis)
+            assert await service.translate("can we meet tomorrow", "en", "fr") == (
+                "On se voit demain ?"
+            )
+            assert translation_provider.get() == "memory"
+
+        mock_openai.assert_not_awaited()
+        mock_redis.set_translation.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_near_match_is_given_as_a_reference(self):
+        service = TranslationService()
+        match = MemoryMatch("Can we meet on Monday?", "On se voit lundi ?", 0.7, False)
+        with (
+            patch.object(service, "_translate_openai", new_callable=AsyncMock) as mock_openai,
+            patch("app.services.translation_service.redis_service") as mock_redis,
+            patch(
+                "app.services.translation_service.translation_memory.lookup",
+                AsyncMock(return_value=match),
+            ),
+        ):
+            self._mock_redis(mock_redis)
+            mock_openai.return_value = "On se voit mardi ?"
+            assert await service.translate("Can we meet on Tuesday?", "en", "fr") == (
+                "On se voit mardi ?"
+            )
+
+        system_prompt = mock_openai.await_args.args[1]
+        assert "REFERENCE" in system_prompt
+        assert "Can we meet on Monday? → On se voit lundi ?" in system_prompt
@@ -1,9 +1,11 @@
 """Unit tests for translation service."""
 
+import asyncio
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from app.services.translation_cache import translation_key
 from app.services.translation_service import (
     SUPPORTED_LANGUAGES,
     TranslationService,
@@ -85,3 +87,67 @@ class TestTranslationService:
 
                 assert result == "Bonjour"
                 mock_claude.assert_called_once()
+
+
+def _mock_redis(mock_redis):
+    mock_redis.get_translation = AsyncMock(return_value=None)
+    mock_redis.set_translation = AsyncMock()
+    mock_redis.increment_counter = AsyncMock()
+
+
+class TestTranslateMany:
+    @pytest.mark.asyncio
+    async def test_one_call_for_all_targets(self):
+        service = TranslationService()
+        reply = '```json\n{"fr": "Bonjour", "de": "Hallo", "th": "สวัสดี"}\n```'
+        with (
+            patch.object(service, "_translate_openai", new_callable=AsyncMock) as mock_openai,
+            patch("app.services.translation_service.redis_service") as mock_redis,
+        ):
+            _mock_redis(mock_redis)
+            mock_openai.return_value = reply
+            result = await service.translate_many("Hello", "en", ["fr", "de", "th", "en"])
+            # Per-language cache entries were filled
+            assert await service.translate("Hello", "en", "de") == "Hallo"
+
+        assert result == {"en": "Hello", "fr": "Bonjour", "de": "Hallo", "th": "สวัสดี"}
+        mock_openai.assert_called_once()
+        assert mock_redis.set_translation.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_unparseable_reply_falls_back_per_language(self):
+        service = TranslationService()
+
+        async def openai(text, system_prompt):
+            if "JSON" in system_prompt:
+                return '{"fr": "Bonjour"'  # truncated
+            return "Hallo" if "German" in system_prompt else "Bonjour"
+
+        with (
+            patch.object(service, "_translate_openai", side_effect=openai) as mock_openai,
+            patch("app.services.translation_service.redis_service") as mock_redis,
+        ):
+            _mock_redis(mock_redis)
+            result = await service.translate_many("Hello", "en", ["fr", "de"])
+
+        assert result == {"fr": "Bonjour", "de": "Hallo"}
+        assert mock_openai.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_slow_languages_fall_back_to_original(self):
+        service = TranslationService()
+        service.memory_cache.put(translation_key("Hello", "en", "fr"), "Bonjour")
+
+        async def slow(text, system_prompt):
+            await asyncio.sleep(10)
+
+        with (
+            patch.object(service, "_translate_openai", side_effect=slow),
+            patch("app.services.translation_service.redis_service") as mock_redis,
+        ):
+            _mock_redis(mock_redis)
+            events = [
+                e async for e in service.translate_each("Hello", "en", ["fr", "de"], timeout_s=0.05)
+            ]
+
+        assert events == [("fr", "Bonjour"), ("de", "Hello")]
@@ -0,0 +1,93 @@
+"""Unit tests for the phrase-level TTS cache."""
+
+import tempfile
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.tts_cache import TTSCache, tts_cache_key
+from app.services.tts_service import STREAM_CHUNK_SIZE, TTSService
+
+SETTINGS = {"stability": 0.5}
+
+
+class TestTTSCacheKey:
+    def test_whitespace_normalized(self):
+        a = tts_cache_key("Hello,  can you\nhear me?", "v1", "en", "m", SETTINGS)
+        b = tts_cache_key(" Hello, can you hear me? ", "v1", "en", "m", SETTINGS)
+        assert a == b
+
+    def test_voice_language_and_settings_matter(self):
+        base = tts_cache_key("Hello", "v1", "en", "m", SETTINGS)
+        assert base != tts_cache_key("Hello", "v2", "en", "m", SETTINGS)
+        assert base != tts_cache_key("Hello", "v1", "th", "m", SETTINGS)
+        assert base != tts_cache_key("Hello", "v1", "en", "m2", SETTINGS)
+        assert base != tts_cache_key("Hello", "v1", "en", "m", {"stability": 0.9})
+
+
+class TestTTSCache:
+    @pytest.mark.asyncio
+    async def test_memory_lru_respects_byte_budget(self):
+        cache = TTSCache(memory_bytes=10, disk_dir="", max_phrase_chars=200)
+        await cache.put("a", b"12345")
+        await cache.put("b", b"12345")
+        await cache.get("a")  # a is now most recent
+        await cache.put("c", b"12345")
+        assert await cache.get("b") is None
+        assert await cache.get("a") == b"12345"
+        assert cache.stats.evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_disk_tier_survives_new_process(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = TTSCache(
+                memory_bytes=1000, disk_dir=tmp, disk_bytes=1000, max_phrase_chars=200
+            )
+            await first.put("k", b"audio")
+            second = TTSCache(
+                memory_bytes=1000, disk_dir=tmp, disk_bytes=1000, max_phrase_chars=200
+            )
+            assert await second.get("k") == b"audio"
+            assert second.stats.disk_hits == 1
+            assert second.stats.bytes_saved == 5
+
+    @pytest.mark.asyncio
+    async def test_disk_budget_evicts_oldest(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = TTSCache(memory_bytes=0, disk_dir=tmp, disk_bytes=8, max_phrase_chars=200)
+            await cache.put("old", b"1234")
+            await cache.put("mid", b"1234")
+            await cache.put("new", b"1234")
+            assert await cache.get("old") is None
+            assert await cache.get("new") == b"1234"
+
+
+class TestTTSServiceCaching:
+    @pytest.mark.asyncio
+    async def test_repeated_phrase_hits_cache(self):
+        service = TTSService()
+        cache = TTSCache(memory_bytes=1 << 20, disk_dir="", max_phrase_chars=200)
+        remote = AsyncMock(return_value=b"mp3")
+        with patch("app.services.tts_service.tts_cache", cache), \
+             patch.object(service, "_synthesize_remote", remote):
+            assert await service.synthesize("Hello, can you hear me?") == b"mp3"
+            assert await service.synthesize("Hello,  can you hear me?") == b"mp3"
+        remote.assert_awaited_once()
+        assert cache.stats.hit_rate == 0.5
+
+    @pytest.mark.asyncio
+    async def test_stream_from_cache_uses_same_chunking(self):
+        service = TTSService()
+        cache = TTSCache(memory_bytes=1 << 20, disk_dir="", max_phrase_chars=200)
+        audio = b"x" * (STREAM_CHUNK_SIZE + 10)
+
+        async def remote_stream(text, voice_id, language, model, output_format):
+            yield audio[:STREAM_CHUNK_SIZE]
+            yield audio[STREAM_CHUNK_SIZE:]
+
+        with patch("app.services.tts_service.tts_cache", cache), \
+             patch.object(service, "_stream_remote", remote_stream):
+            live = [c async for c in service.synthesize_stream("Good morning")]
+            cached = [c async for c in service.synthesize_stream("Good morning")]
+        assert live == cached
+        assert cache.stats.memory_hits == 1
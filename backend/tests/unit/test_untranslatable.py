@@ -0,0 +1,79 @@
+"""Unit tests for the untranslatable-content fast path."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.translation_service import TranslationService
+from app.services.untranslatable import is_untranslatable, mask
+
+
+class TestClassifier:
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "😂😂👍",
+            "42!!",
+            "https://example.com/a?b=1.",
+            "@bob @alice",
+            "```py\nprint('hello world')\n```",
+            "`git status` 🙏",
+            "",
+        ],
+    )
+    def test_verbatim(self, text):
+        assert is_untranslatable(text)
+
+    @pytest.mark.parametrize("text", ["ok", "see https://example.com", "สวัสดี 🙏", "日本語"])
+    def test_needs_translation(self, text):
+        assert not is_untranslatable(text)
+
+    def test_mask_round_trip(self):
+        masked = mask("ask @bob about https://example.com/x, run `make test`")
+        assert masked.text == "ask ⟦0⟧ about ⟦1⟧, run ⟦2⟧"
+        restored, lost = masked.restore("demande à ⟦0⟧ pour ⟦ 1 ⟧, lance ⟦2⟧")
+        assert restored == "demande à @bob pour https://example.com/x, lance `make test`"
+        assert lost == 0
+
+    def test_lost_placeholders_are_appended(self):
+        masked = mask("see https://example.com")
+        assert masked.restore("voir") == ("voir https://example.com", 1)
+
+
+class TestFastPath:
+    @pytest.mark.asyncio
+    async def test_verbatim_messages_skip_the_llm(self):
+        service = TranslationService()
+        with patch.object(service, "_translate_openai", new_callable=AsyncMock) as mock_openai:
+            assert await service.translate("👍 https://example.com", "en", "fr") == (
+                "👍 https://example.com"
+            )
+            assert await service.translate_many("@bob 42", "en", ["fr", "de", "en"]) == {
+                "fr": "@bob 42",
+                "de": "@bob 42",
+                "en": "@bob 42",
+            }
+
+        mock_openai.assert_not_awaited()
+        assert service.fast_path.verbatim == 2
+        assert service.fast_path.llm_calls_saved == 3
+
+    @pytest.mark.asyncio
+    async def test_spans_are_masked_from_the_llm(self):
+        service = TranslationService()
+        with (
+            patch.object(service, "_translate_openai", new_callable=AsyncMock) as mock_openai,
+            patch("app.services.translation_service.redis_service") as mock_redis,
+        ):
+            mock_openai.return_value = "voir ⟦0⟧"
+            mock_redis.get_translation = AsyncMock(return_value=None)
+            mock_redis.set_translation = AsyncMock()
+            mock_redis.increment_counter = AsyncMock()
+            result = await service.translate("see https://example.com/a", "en", "fr")
+            # Another link reuses the cached masked translation
+            other = await service.translate("see https://example.com/b", "en", "fr")
+
+        assert mock_openai.await_args.args[0] == "see ⟦0⟧"
+        assert (result, other) == ("voir https://example.com/a", "voir https://example.com/b")
+        assert mock_openai.await_count == 1
+        assert service.fast_path.masked == 2
@@ -0,0 +1,110 @@
+"""Unit tests for the utterance assembler / jitter buffer."""
+
+import asyncio
+import io
+import wave
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from app.services.utterance_assembler import UtteranceAssembler
+
+RATE = 16000
+
+
+def _slice(samples: np.ndarray) -> bytes:
+    out = io.BytesIO()
+    with wave.open(out, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes(samples.astype("<i2").tobytes())
+    return out.getvalue()
+
+
+def _speech(ms: int) -> bytes:
+    t = np.arange(RATE * ms // 1000) / RATE
+    return _slice(8000 * np.sin(2 * np.pi * 220 * t))
+
+
+def _silence(ms: int) -> bytes:
+    return _slice(np.zeros(RATE * ms // 1000))
+
+
+def _duration_ms(wav_bytes: bytes) -> float:
+    with wave.open(io.BytesIO(wav_bytes)) as wav:
+        return wav.getnframes() * 1000 / wav.getframerate()
+
+
+class TestUtteranceAssembler:
+    @pytest.mark.asyncio
+    async def test_closes_on_trailing_silence(self):
+        dispatch = AsyncMock()
+        asm = UtteranceAssembler(dispatch, silence_ms=300, max_duration_ms=10_000, max_bytes=10**7)
+        for _ in range(10):
+            await asm.feed(_speech(100))
+        dispatch.assert_not_called()
+        for _ in range(3):
+            await asm.feed(_silence(100))
+        dispatch.assert_awaited_once()
+        assert 1000 <= _duration_ms(dispatch.await_args.args[0]) <= 1300
+        asm.close()
+
+    @pytest.mark.asyncio
+    async def test_closes_on_max_duration(self):
+        dispatch = AsyncMock()
+        asm = UtteranceAssembler(dispatch, silence_ms=300, max_duration_ms=500, max_bytes=10**7)
+        for _ in range(12):
+            await asm.feed(_speech(100))
+        assert dispatch.await_count == 2
+        asm.close()
+
+    @pytest.mark.asyncio
+    async def test_leading_silence_never_dispatched(self):
+        dispatch = AsyncMock()
+        asm = UtteranceAssembler(dispatch, silence_ms=300, max_duration_ms=500, max_bytes=10**7)
+        for _ in range(20):
+            await asm.feed(_silence(100))
+        await asm.flush()
+        dispatch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_webm_splits_only_at_clusters(self):
+        dispatch = AsyncMock()
+        asm = UtteranceAssembler(dispatch, silence_ms=300, max_duration_ms=60_000, max_bytes=40)
+        header = b"\x1a\x45\xdf\xa3HEAD"
+        cluster = b"\x1f\x43\xb6\x75"
+        await asm.feed(header + cluster + b"a" * 40)
+        await asm.feed(b"b" * 10)  # over the limit, but mid-cluster: keep going
+        dispatch.assert_not_called()
+        await asm.feed(b"c" * 5 + cluster + b"d" * 5)
+        await asm.flush()
+        first, second = (call.args[0] for call in dispatch.await_args_list)
+        assert first == header + cluster + b"a" * 40 + b"b" * 10 + b"c" * 5
+        assert second == header + cluster + b"d" * 5
+
+    @pytest.mark.asyncio
+    async def test_webm_after_flush_resumes_at_next_cluster(self):
+        dispatch = AsyncMock()
+        asm = UtteranceAssembler(dispatch, silence_ms=300, max_duration_ms=60_000, max_bytes=10**6)
+        header = b"\x1a\x45\xdf\xa3HEAD"
+        cluster = b"\x1f\x43\xb6\x75"
+        await asm.feed(header + cluster + b"a" * 10)
+        await asm.flush()
+        await asm.feed(b"b" * 10)  # rest of the flushed cluster: undecodable on its own
+        await asm.feed(b"c" * 3 + cluster + b"d" * 5)
+        await asm.flush()
+        first, second = (call.args[0] for call in dispatch.await_args_list)
+        assert first == header + cluster + b"a" * 10
+        assert second == header + cluster + b"d" * 5
+        assert asm.skipped_bytes == 13
+
+    @pytest.mark.asyncio
+    async def test_idle_flush(self):
+        dispatch = AsyncMock()
+        asm = UtteranceAssembler(dispatch, silence_ms=300, max_duration_ms=10_000, max_bytes=10**7)
+        with patch("app.services.utterance_assembler.IDLE_FLUSH_MS", 20):
+            await asm.feed(_speech(200))
+            await asyncio.sleep(0.05)
+        dispatch.assert_awaited_once()
@@ -0,0 +1,111 @@
+"""Unit tests for server-side voice activity detection."""
+
+import io
+import wave
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from app.services.pipeline import TranslationContext, TranslationPipeline
+from app.services.vad_service import VADService
+
+RATE = 16000
+
+
+def _wav(*segments: np.ndarray) -> bytes:
+    samples = np.concatenate(segments).astype("<i2")
+    out = io.BytesIO()
+    with wave.open(out, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes(samples.tobytes())
+    return out.getvalue()
+
+
+def _silence(seconds: float) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return rng.normal(0, 20, int(RATE * seconds))  # ~-64 dBFS room noise
+
+
+def _tone(seconds: float, hz: float = 220.0) -> np.ndarray:
+    t = np.arange(int(RATE * seconds)) / RATE
+    return 8000 * np.sin(2 * np.pi * hz * t)
+
+
+def _duration(wav_bytes: bytes) -> float:
+    with wave.open(io.BytesIO(wav_bytes)) as wav:
+        return wav.getnframes() / wav.getframerate()
+
+
+class TestVADService:
+    def test_drops_all_silence(self):
+        vad = VADService()
+        result = vad.process(_wav(_silence(1.0)))
+        assert result.analyzed
+        assert not result.has_speech
+        assert result.audio == b""
+        assert vad.stats.dropped == 1
+
+    def test_trims_leading_and_trailing_silence(self):
+        vad = VADService()
+        result = vad.process(_wav(_silence(1.0), _tone(0.5), _silence(1.0)))
+        assert result.has_speech
+        # 0.5 s of speech plus up to 200 ms padding either side
+        assert 0.5 <= _duration(result.audio) <= 0.95
+        assert 0.15 < result.speech_ratio < 0.3
+
+    def test_passes_through_compressed_audio(self):
+        vad = VADService()
+        webm = b"\x1aE\xdf\xa3" + b"\x00" * 500
+        result = vad.process(webm)
+        assert not result.analyzed
+        assert result.has_speech
+        assert result.audio == webm
+
+
+class TestPipelineVAD:
+    @pytest.mark.asyncio
+    async def test_silent_chunk_skips_stt_and_credits(self):
+        pipe = TranslationPipeline()
+        credits = AsyncMock(return_value=True)
+        with patch("app.services.pipeline.stt_service.transcribe", new=AsyncMock()) as stt, \
+             patch("app.services.pipeline.credit_lease_service.charge", new=credits):
+            events = [
+                e async for e in pipe.process_audio_streaming(
+                    _wav(_silence(1.0)), TranslationContext(), user_id="u1", db=object()
+                )
+            ]
+        assert events == []
+        stt.assert_not_called()
+        credits.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_speech_ratio_reported_in_metrics(self):
+        pipe = TranslationPipeline()
+        transcribe = AsyncMock(return_value="")
+        with patch("app.services.pipeline.stt_service.transcribe", new=transcribe) as stt:
+            _, _, metrics = await pipe.process_audio(
+                _wav(_silence(0.5), _tone(0.5), _silence(0.5)), TranslationContext()
+            )
+        stt.assert_awaited_once()
+        assert 0 < metrics.summary()["speech_ratio"] < 1
+
+    @pytest.mark.asyncio
+    async def test_compressed_chunk_is_decoded_before_vad(self):
+        pipe = TranslationPipeline()
+        webm = b"\x1aE\xdf\xa3" + b"\x00" * 500
+        decoded = AsyncMock(return_value=(_wav(_silence(1.0)), "audio/wav"))
+        credits = AsyncMock(return_value="lease")
+        with patch("app.services.pipeline.dsp_stage.prepare_for_stt", new=decoded), \
+             patch("app.services.pipeline.stt_service.transcribe", new=AsyncMock()) as stt, \
+             patch("app.services.pipeline.credit_lease_service.charge", new=credits):
+            audio, _, metrics = await pipe.process_audio(
+                webm, TranslationContext(), user_id="u1", db=object()
+            )
+        decoded.assert_awaited_once_with(webm)
+        assert audio == b""
+        assert metrics.summary()["speech_ratio"] == 0
+        stt.assert_not_called()
+        credits.assert_not_called()
@@ -0,0 +1,60 @@
+"""Unit tests for WebSocket config validation and pipeline event forwarding."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.routers.websocket import (
+    MAX_GLOSSARY_TERMS,
+    MAX_PERSONA_CHARS,
+    _profile_error,
+    _send_pipeline_events,
+)
+from app.services.audio_frames import AudioFrameWriter
+
+
+class TestProfileValidation:
+    def test_accepts_a_valid_profile(self):
+        assert _profile_error({"type": "config"}) is None
+        assert _profile_error({
+            "persona": "Factory owner, formal tone",
+            "industry": None,
+            "glossary": {"lead time": "ระยะเวลารอคอย"},
+        }) is None
+
+    @pytest.mark.parametrize(
+        "msg",
+        [
+            {"persona": ["formal"]},
+            {"persona": "x" * (MAX_PERSONA_CHARS + 1)},
+            {"industry": 42},
+            {"glossary": ["lead time"]},
+            {"glossary": "lead time=ระยะเวลารอคอย"},
+            {"glossary": {"lead time": 3}},
+            {"glossary": {"": "x"}},
+            {"glossary": {f"term {i}": "x" for i in range(MAX_GLOSSARY_TERMS + 1)}},
+        ],
+    )
+    def test_rejects_wrong_types_and_sizes(self, msg):
+        assert _profile_error(msg)
+
+
+class TestSendPipelineEvents:
+    @pytest.mark.asyncio
+    async def test_binary_audio_enabled_mid_stream_takes_effect(self):
+        websocket = AsyncMock()
+        writer = None
+
+        async def events():
+            nonlocal writer
+            yield {"type": "audio", "data": b"first"}
+            yield {"type": "metrics", "data": {}}
+            writer = AudioFrameWriter(websocket)  # client switched to binary audio
+            yield {"type": "audio", "data": b"second"}
+            yield {"type": "metrics", "data": {}}
+
+        await _send_pipeline_events(websocket, events(), lambda: writer)
+
+        sent = [call.args[0]["type"] for call in websocket.send_json.await_args_list]
+        assert sent == ["audio", "metrics", "audio_stream", "metrics"]
+        assert websocket.send_bytes.await_count == 2  # the chunk, then end-of-stream
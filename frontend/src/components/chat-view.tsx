@@ -168,6 +168,29 @@ export function ChatView({ chatId, currentUser, socket }: ChatViewProps) {
     return unsub;
   }, [chatId, socket]);
 
+  // Translations of group messages arrive after the original
+  useEffect(() => {
+    const unsub = socket.on("message_translation", (data: any) => {
+      if (data.chat_id === chatId) {
+        setMessages((prev) =>
+          prev.map((m) =>
+            m.id === data.message_id
+              ? {
+                  ...m,
+                  translated_content: data.translated_content,
+                  translations: {
+                    ...m.translations,
+                    [data.language]: data.translated_content,
+                  },
+                }
+              : m
+          )
+        );
+      }
+    });
+    return unsub;
+  }, [chatId, socket]);
+
   // Typing indicators
   useEffect(() => {
     const unsub = socket.on("typing", (data: any) => {